@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Measure search recall against exact brute-force ground truth and trade it off against latency.
+
+Ground truth is the exact cosine top-k computed with numpy over every chunk
+(and document) embedding in the benchmark database. Each ``VectorStore``
+retrieval path and each search strategy is then run over a grid of tuning
+parameters and scored against that ground truth:
+
+- ``recall@k``: share of the exact top-k found in the first k results
+- ``candidate_recall``: share of the exact top-k found anywhere in the fetched candidates
+  (what the re-ranker can still recover)
+- ``ndcg@k``: nDCG of the first k results, using the exact cosine similarity as gain
+
+Tuning parameters swept:
+
+- ``HNSW_EF_SEARCH`` (``--ef-search``)
+- ``SEMANTIC_FETCH_COUNT`` (``--semantic-fetch``), ``KEYWORD_FETCH_COUNT`` (``--keyword-fetch``)
+- ``MAX_CHUNKS_PER_DOCUMENT`` (``--max-chunks``, strategies only)
+- HNSW build parameters (``--hnsw-builds m:ef_construction ...``), which rebuild the
+  benchmark database indexes before each sweep
+
+The output is a Pareto table of recall vs p50 latency per path/strategy; points
+that no other configuration beats on both recall and latency are marked ``*``.
+
+Usage:
+    python benchmarks/evaluate_recall.py [--db-url URL] [--queries FILE] [--k N]
+                                         [--paths semantic keyword document_level]
+                                         [--strategies S ...] [--skip-strategies]
+                                         [--ef-search N ...] [--semantic-fetch N ...]
+                                         [--keyword-fetch N ...] [--max-chunks N ...]
+                                         [--hnsw-builds M:EFC ...] [--output FILE]
+"""
+
+import argparse
+import itertools
+import math
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Sequence
+
+import numpy as np
+import psycopg
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import (  # noqa: E402
+    DEFAULT_DATA_DIR,
+    DEFAULT_DB_URL,
+    configure_vector_api,
+    default_result_path,
+    load_queries,
+    run_metadata,
+    summarize,
+    write_results,
+)
+from corpus import build_hnsw_indexes  # noqa: E402
+
+# Short column labels for the swept settings in the printed table
+PARAM_LABELS = {
+    "HNSW_EF_SEARCH": "ef",
+    "SEMANTIC_FETCH_COUNT": "sem",
+    "KEYWORD_FETCH_COUNT": "kw",
+    "MAX_CHUNKS_PER_DOCUMENT": "max",
+}
+
+
+class GroundTruth:
+    """Exact cosine nearest neighbours over all chunk and document embeddings."""
+
+    def __init__(self, db_url: str):
+        from pgvector.psycopg import register_vector  # pylint: disable=import-outside-toplevel
+
+        with psycopg.connect(db_url) as conn:
+            register_vector(conn)
+            with conn.cursor() as cur:
+                cur.execute("SELECT id, document_id, content, embedding FROM document_chunks WHERE embedding IS NOT NULL")
+                chunk_rows = cur.fetchall()
+                cur.execute("SELECT document_id, embedding FROM documents WHERE embedding IS NOT NULL")
+                document_rows = cur.fetchall()
+
+        self.chunk_ids = [str(row[0]) for row in chunk_rows]
+        # Formatted strategy results carry no chunk id, so they are matched on (document_id, content)
+        self.chunk_keys = {(str(row[1]), row[2]): str(row[0]) for row in chunk_rows}
+        self.chunk_matrix = self._normalize(np.stack([np.asarray(row[3], dtype=np.float32) for row in chunk_rows]))
+        self.document_ids = [str(row[0]) for row in document_rows]
+        self.document_matrix = self._normalize(np.stack([np.asarray(row[1], dtype=np.float32) for row in document_rows]))
+        self._chunk_index = {cid: i for i, cid in enumerate(self.chunk_ids)}
+        self._document_index = {did: i for i, did in enumerate(self.document_ids)}
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+    @staticmethod
+    def _top_k(matrix: np.ndarray, ids: Sequence[str], query_vector: np.ndarray, k: int) -> Dict[str, float]:
+        scores = matrix @ query_vector
+        k = min(k, len(ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return {ids[i]: float(scores[i]) for i in top}
+
+    def chunks(self, query_vector: np.ndarray, k: int) -> Dict[str, float]:
+        """Return the exact top-k chunk ids and similarities, best first."""
+        return self._top_k(self.chunk_matrix, self.chunk_ids, query_vector, k)
+
+    def documents(self, query_vector: np.ndarray, k: int) -> Dict[str, float]:
+        """Return the exact top-k document ids and similarities, best first."""
+        return self._top_k(self.document_matrix, self.document_ids, query_vector, k)
+
+    def chunk_similarities(self, query_vector: np.ndarray, chunk_ids: Iterable[str]) -> Dict[str, float]:
+        """Return exact similarities for arbitrary chunks (gains for nDCG)."""
+        rows = [self._chunk_index[cid] for cid in chunk_ids if cid in self._chunk_index]
+        scores = self.chunk_matrix[rows] @ query_vector if rows else []
+        return {self.chunk_ids[r]: float(s) for r, s in zip(rows, scores)}
+
+    def document_similarities(self, query_vector: np.ndarray, document_ids: Iterable[str]) -> Dict[str, float]:
+        """Return exact similarities for arbitrary documents (gains for nDCG)."""
+        rows = [self._document_index[did] for did in document_ids if did in self._document_index]
+        scores = self.document_matrix[rows] @ query_vector if rows else []
+        return {self.document_ids[r]: float(s) for r, s in zip(rows, scores)}
+
+
+def score(retrieved: List[str], truth: Dict[str, float], gains: Dict[str, float], k: int) -> Dict[str, float]:
+    """Score a ranked result list against the exact top-k.
+
+    Args:
+        retrieved: Retrieved ids in ranked order (all fetched candidates)
+        truth: Exact top-k ids mapped to similarity, best first
+        gains: Exact similarity of every retrieved id
+        k: Cut-off
+
+    Returns:
+        dict: recall@k, candidate_recall and ndcg@k
+    """
+    if not truth:
+        return {"recall": None, "candidate_recall": None, "ndcg": None}
+    first_k = retrieved[:k]
+    dcg = sum(max(gains.get(rid, 0.0), 0.0) / math.log2(rank + 2) for rank, rid in enumerate(first_k))
+    idcg = sum(max(sim, 0.0) / math.log2(rank + 2) for rank, sim in enumerate(truth.values()))
+    return {
+        "recall": len(set(first_k) & truth.keys()) / len(truth),
+        "candidate_recall": len(set(retrieved) & truth.keys()) / len(truth),
+        "ndcg": dcg / idcg if idcg > 0 else 0.0,
+    }
+
+
+def run_path(path: str, vec_store, query: str, params: Dict[str, int]) -> List[str]:
+    """Run one VectorStore retrieval path and return ranked ids."""
+    from flask import current_app  # pylint: disable=import-outside-toplevel
+    from services.vector_search import perform_keyword_search  # pylint: disable=import-outside-toplevel
+
+    chunk_table = current_app.vector_settings.vector_table_name
+    if path == "semantic":
+        results = vec_store.semantic_search(chunk_table, query, limit=params["SEMANTIC_FETCH_COUNT"])
+        return [str(i) for i in results["id"]] if not results.empty else []
+    if path == "keyword":
+        results, _ = perform_keyword_search(vec_store, chunk_table, query, params["KEYWORD_FETCH_COUNT"])
+        return [str(i) for i in results["id"]] if not results.empty else []
+    if path == "document_level":
+        results = vec_store.document_level_search(query, limit=params["KEYWORD_FETCH_COUNT"])
+        return [str(i) for i in results["document_id"]] if not results.empty else []
+    raise ValueError(f"Unknown path '{path}'")
+
+
+def path_grid(path: str, args) -> List[Dict[str, int]]:
+    """Return the parameter combinations relevant to a retrieval path."""
+    if path == "semantic":
+        return [{"HNSW_EF_SEARCH": ef, "SEMANTIC_FETCH_COUNT": fetch}
+                for ef, fetch in itertools.product(args.ef_search, args.semantic_fetch)]
+    return [{"KEYWORD_FETCH_COUNT": fetch} for fetch in args.keyword_fetch]
+
+
+def strategy_grid(args) -> List[Dict[str, int]]:
+    """Return the parameter combinations swept for the search strategies."""
+    return [
+        {"HNSW_EF_SEARCH": ef, "SEMANTIC_FETCH_COUNT": sf, "KEYWORD_FETCH_COUNT": kf, "MAX_CHUNKS_PER_DOCUMENT": mc}
+        for ef, sf, kf, mc in itertools.product(args.ef_search, args.semantic_fetch, args.keyword_fetch, args.max_chunks)
+    ]
+
+
+def evaluate(app, truth: GroundTruth, queries: List[Dict], args, hnsw_build: str) -> List[Dict[str, Any]]:
+    """Run every path and strategy over its grid and collect recall/latency points."""
+    from services.embedding import get_embedding  # pylint: disable=import-outside-toplevel
+    from services.vector_search import search  # pylint: disable=import-outside-toplevel
+    from services.vector_store import VectorStore  # pylint: disable=import-outside-toplevel
+
+    points = []
+    with app.app_context():
+        vectors = get_embedding([q["query"] for q in queries])
+        vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        chunk_truth = [truth.chunks(v, args.k) for v in vectors]
+        document_truth = [truth.documents(v, args.k) for v in vectors]
+        vec_store = VectorStore()
+
+        targets = [("path", p, path_grid(p, args)) for p in args.paths]
+        targets += [("strategy", s, strategy_grid(args)) for s in args.strategies]
+        for kind, name, grid in targets:
+            for params in grid:
+                app.config.update(params)
+                latencies, scores = [], []
+                for query, vector, c_truth, d_truth in zip(queries, vectors, chunk_truth, document_truth):
+                    start = time.perf_counter()
+                    if kind == "path":
+                        retrieved = run_path(name, vec_store, query["query"], params)
+                    else:
+                        results, _ = search(query["query"], top_n=args.k, min_relevance_score=args.min_relevance_score,
+                                            search_strategy=name)
+                        retrieved = [truth.chunk_keys.get((str(r.get("document_id")), r.get("content"))) for r in results]
+                        retrieved = [rid for rid in retrieved if rid]
+                    latencies.append((time.perf_counter() - start) * 1000)
+
+                    if name == "document_level":
+                        scores.append(score(retrieved, d_truth, truth.document_similarities(vector, retrieved), args.k))
+                    else:
+                        scores.append(score(retrieved, c_truth, truth.chunk_similarities(vector, retrieved), args.k))
+
+                point = {
+                    "kind": kind,
+                    "name": name,
+                    "hnsw_build": hnsw_build,
+                    "params": params,
+                    "latency_ms": summarize(latencies),
+                    f"recall@{args.k}": _mean(s["recall"] for s in scores),
+                    "candidate_recall": _mean(s["candidate_recall"] for s in scores),
+                    f"ndcg@{args.k}": _mean(s["ndcg"] for s in scores),
+                }
+                points.append(point)
+                print(f"[RECALL] {name} {hnsw_build} {params}: recall@{args.k}={point[f'recall@{args.k}']} "
+                      f"ndcg@{args.k}={point[f'ndcg@{args.k}']} p50={point['latency_ms'].get('p50')}ms")
+    return points
+
+
+def _mean(values: Iterable[float]):
+    data = [v for v in values if v is not None]
+    return round(sum(data) / len(data), 4) if data else None
+
+
+def mark_pareto(points: List[Dict[str, Any]], recall_key: str) -> None:
+    """Flag points not dominated on (recall, p50 latency) within the same path/strategy."""
+    for point in points:
+        peers = [p for p in points if p["name"] == point["name"] and p is not point]
+        recall, latency = point[recall_key] or 0.0, point["latency_ms"].get("p50", float("inf"))
+        point["pareto"] = not any(
+            (p[recall_key] or 0.0) >= recall and p["latency_ms"].get("p50", float("inf")) <= latency
+            and ((p[recall_key] or 0.0) > recall or p["latency_ms"].get("p50", float("inf")) < latency)
+            for p in peers
+        )
+
+
+def print_pareto_table(points: List[Dict[str, Any]], k: int) -> None:
+    """Print recall vs latency per path/strategy, fastest first."""
+    header = f"{'':2}{'path/strategy':<26}{'hnsw':>8}  {'params':<34}{'recall':>8}{'cand':>7}{'ndcg':>7}{'p50':>9}{'p95':>9}"
+    print(header)
+    print("-" * len(header))
+    for name in dict.fromkeys(p["name"] for p in points):
+        for point in sorted((p for p in points if p["name"] == name), key=lambda p: p["latency_ms"].get("p50", 0)):
+            params = " ".join(f"{PARAM_LABELS[key]}={value}" for key, value in point["params"].items())
+            print(f"{'*' if point['pareto'] else ' ':2}{name:<26}{point['hnsw_build']:>8}  {params:<34}"
+                  f"{point[f'recall@{k}'] or 0:>8.3f}{point['candidate_recall'] or 0:>7.3f}{point[f'ndcg@{k}'] or 0:>7.3f}"
+                  f"{point['latency_ms'].get('p50', 0):>9.1f}{point['latency_ms'].get('p95', 0):>9.1f}")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall vs latency evaluation against exact nearest neighbours")
+    parser.add_argument("--db-url", default=os.getenv("BENCHMARK_DB_URL", DEFAULT_DB_URL))
+    parser.add_argument("--queries", default=os.path.join(DEFAULT_DATA_DIR, "queries.json"))
+    parser.add_argument("--limit", type=int, help="Only use the first N queries")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--paths", nargs="*", default=["semantic", "keyword", "document_level"],
+                        choices=["semantic", "keyword", "document_level"])
+    parser.add_argument("--strategies", nargs="*", help="Strategies to evaluate (default: all ranked strategies)")
+    parser.add_argument("--skip-strategies", action="store_true", help="Only evaluate the VectorStore paths")
+    parser.add_argument("--ef-search", nargs="*", type=int, default=[40, 100, 200, 400])
+    parser.add_argument("--semantic-fetch", nargs="*", type=int, default=[50, 100, 200])
+    parser.add_argument("--keyword-fetch", nargs="*", type=int, default=[50, 100])
+    parser.add_argument("--max-chunks", nargs="*", type=int, default=[10])
+    parser.add_argument("--hnsw-builds", nargs="*", default=[],
+                        help="HNSW build parameters as m:ef_construction; rebuilds the benchmark indexes for each")
+    parser.add_argument("--min-relevance-score", type=float, default=None,
+                        help="Re-ranker score cut-off for strategies (default: MIN_RELEVANCE_SCORE config)")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    app = configure_vector_api(args.db_url)
+    from services.search_strategies import list_available_strategies  # pylint: disable=import-outside-toplevel
+
+    if args.skip_strategies:
+        args.strategies = []
+    elif not args.strategies:
+        # DOCUMENT_ONLY lists documents by date and has no query ranking to score
+        args.strategies = [s for s in list_available_strategies() if s != "DOCUMENT_ONLY"]
+
+    queries = load_queries(args.queries)[:args.limit]
+    print("[RECALL] Loading embeddings for exact ground truth...")
+    truth = GroundTruth(args.db_url)
+    print(f"[RECALL] {len(truth.chunk_ids)} chunks, {len(truth.document_ids)} documents, {len(queries)} queries")
+
+    points = []
+    for build in args.hnsw_builds or ["current"]:
+        if build != "current":
+            m, ef_construction = (int(v) for v in build.split(":"))
+            start = time.perf_counter()
+            with psycopg.connect(args.db_url) as conn:
+                with conn.cursor() as cur:
+                    cur.execute("DROP INDEX IF EXISTS ix_document_chunks_embedding_vector")
+                    cur.execute("DROP INDEX IF EXISTS ix_documents_embedding_vector")
+                conn.commit()
+                build_hnsw_indexes(conn, m=m, ef_construction=ef_construction)
+            print(f"[RECALL] Rebuilt HNSW indexes with m={m}, ef_construction={ef_construction} "
+                  f"in {time.perf_counter() - start:.1f}s")
+        points.extend(evaluate(app, truth, queries, args, build))
+
+    recall_key = f"recall@{args.k}"
+    mark_pareto(points, recall_key)
+    output = args.output or default_result_path("recall")
+    write_results(output, {
+        "meta": run_metadata({
+            "db_url": args.db_url.rsplit("@", 1)[-1],
+            "queries_file": args.queries,
+            "query_count": len(queries),
+            "k": args.k,
+            "chunk_count": len(truth.chunk_ids),
+            "document_count": len(truth.document_ids),
+        }),
+        "points": points,
+    })
+    print()
+    print_pareto_table(points, args.k)
+    print(f"[RECALL] Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Replay a query set through every vector-api search strategy and report latency.
+
+The vector-api search pipeline (inference, strategy execution, re-ranking and
+formatting) runs in-process against the benchmark database created by
+``corpus.py``. For each strategy and concurrency level the script records:
+
+- wall-clock latency percentiles per query
+- per-stage latency percentiles from the strategy's ``search_metrics`` (``*_ms`` keys)
+- candidate counts before re-ranking and final result counts
+- re-rank time and overall throughput (queries/second)
+
+Results are written as JSON so two runs (e.g. two commits) can be compared with
+``--baseline``; any strategy whose p50 or p95 latency regresses by more than
+``--regression-threshold`` is reported and the script exits non-zero.
+
+Usage:
+    python benchmarks/run_benchmark.py [--db-url URL] [--queries FILE] [--strategies S ...]
+                                       [--concurrency N ...] [--repeat N] [--warmup N]
+                                       [--top-n N] [--inference NAME ...] [--scope-projects]
+                                       [--output FILE] [--baseline FILE] [--regression-threshold PCT]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import (  # noqa: E402
+    DEFAULT_DATA_DIR,
+    DEFAULT_DB_URL,
+    configure_vector_api,
+    default_result_path,
+    load_queries,
+    run_metadata,
+    summarize,
+    write_results,
+)
+
+# Pre-rerank candidate counts, in order of preference, as reported in search_metrics
+CANDIDATE_KEYS = ("filtering_total_chunks", "documents_found", "chunks_found")
+
+
+def run_query(app, search_service, query: Dict[str, Any], strategy: str, args) -> Dict[str, Any]:
+    """Execute a single search and extract its timings and counts."""
+    project_ids = query.get("project_ids")
+    if project_ids is None and args.scope_projects and query.get("project_id"):
+        project_ids = [query["project_id"]]
+
+    with app.app_context():
+        start = time.perf_counter()
+        try:
+            response = search_service.get_documents_by_query(
+                query["query"],
+                project_ids=project_ids,
+                document_type_ids=query.get("document_type_ids"),
+                inference=args.inference,
+                top_n=args.top_n,
+                search_strategy=strategy,
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            return {"error": str(e), "wall_ms": (time.perf_counter() - start) * 1000}
+        wall_ms = (time.perf_counter() - start) * 1000
+
+    vector_search = response.get("vector_search", {})
+    metrics = vector_search.get("search_metrics", {}) or {}
+    results = vector_search.get("document_chunks", vector_search.get("documents", [])) or []
+    stages = {k: v for k, v in metrics.items() if k.endswith("_ms") and isinstance(v, (int, float))}
+    candidates = next((metrics[k] for k in CANDIDATE_KEYS if isinstance(metrics.get(k), (int, float))), None)
+    return {
+        "wall_ms": wall_ms,
+        "stages": stages,
+        "candidates": candidates,
+        "results": len(results),
+        "search_mode": vector_search.get("search_mode"),
+    }
+
+
+def run_strategy(app, search_service, queries: List[Dict], strategy: str, concurrency: int, args) -> Dict[str, Any]:
+    """Replay the query set for one strategy at one concurrency level."""
+    workload = [q for _ in range(args.repeat) for q in queries]
+
+    for query in queries[:args.warmup]:
+        run_query(app, search_service, query, strategy, args)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        samples = list(executor.map(lambda q: run_query(app, search_service, q, strategy, args), workload))
+    elapsed = time.perf_counter() - start
+
+    ok = [s for s in samples if "error" not in s]
+    errors = [s["error"] for s in samples if "error" in s]
+    stage_names = sorted({name for s in ok for name in s["stages"]})
+    return {
+        "strategy": strategy,
+        "concurrency": concurrency,
+        "queries": len(workload),
+        "errors": len(errors),
+        "error_samples": errors[:3],
+        "elapsed_s": round(elapsed, 3),
+        "throughput_qps": round(len(ok) / elapsed, 2) if elapsed > 0 else None,
+        "latency_ms": summarize(s["wall_ms"] for s in ok),
+        "stages_ms": {name: summarize(s["stages"].get(name) for s in ok) for name in stage_names},
+        "rerank_ms": summarize(s["stages"].get("reranking_ms") for s in ok),
+        "candidates": summarize(s["candidates"] for s in ok),
+        "results": summarize(s["results"] for s in ok),
+    }
+
+
+def compare_with_baseline(runs: List[Dict], baseline_path: str, threshold_pct: float) -> List[str]:
+    """Return a list of regression messages for runs slower than the baseline."""
+    with open(baseline_path, "r", encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    previous = {(r["strategy"], r["concurrency"]): r for r in baseline.get("runs", [])}
+
+    regressions = []
+    for run in runs:
+        base = previous.get((run["strategy"], run["concurrency"]))
+        if not base:
+            continue
+        for pct in ("p50", "p95"):
+            old = base.get("latency_ms", {}).get(pct)
+            new = run.get("latency_ms", {}).get(pct)
+            if old and new and (new - old) / old * 100 > threshold_pct:
+                regressions.append(
+                    f"{run['strategy']} @ concurrency {run['concurrency']}: {pct} {old:.1f}ms -> {new:.1f}ms "
+                    f"(+{(new - old) / old * 100:.1f}%)"
+                )
+    return regressions
+
+
+def print_table(runs: List[Dict]) -> None:
+    """Print a compact summary table of the runs."""
+    header = f"{'strategy':<26}{'conc':>5}{'qps':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'rerank50':>10}{'cand50':>8}{'err':>5}"
+    print(header)
+    print("-" * len(header))
+    for run in runs:
+        latency = run["latency_ms"]
+        print(f"{run['strategy']:<26}{run['concurrency']:>5}{run['throughput_qps'] or 0:>8.1f}"
+              f"{latency.get('p50', 0):>9.1f}{latency.get('p95', 0):>9.1f}{latency.get('p99', 0):>9.1f}"
+              f"{run['rerank_ms'].get('p50', 0):>10.1f}{run['candidates'].get('p50', 0):>8.0f}{run['errors']:>5}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vector-api search strategies against a synthetic corpus")
+    parser.add_argument("--db-url", default=os.getenv("BENCHMARK_DB_URL", DEFAULT_DB_URL))
+    parser.add_argument("--queries", default=os.path.join(DEFAULT_DATA_DIR, "queries.json"))
+    parser.add_argument("--strategies", nargs="*", help="Strategies to run (default: all available)")
+    parser.add_argument("--concurrency", nargs="*", type=int, default=[1, 4, 8])
+    parser.add_argument("--repeat", type=int, default=1, help="Times to replay the query set per run")
+    parser.add_argument("--warmup", type=int, default=5, help="Queries run before timing each strategy")
+    parser.add_argument("--limit", type=int, help="Only use the first N queries")
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--inference", nargs="*", default=[],
+                        help="Inference pipelines to enable (default: none, to isolate search cost)")
+    parser.add_argument("--scope-projects", action="store_true",
+                        help="Filter each query to the project it was generated from")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", help="Previous result file to compare against")
+    parser.add_argument("--regression-threshold", type=float, default=10.0, help="Allowed latency increase in percent")
+    args = parser.parse_args()
+
+    app = configure_vector_api(args.db_url)
+    from services.search_service import SearchService  # pylint: disable=import-outside-toplevel
+    from services.search_strategies import list_available_strategies  # pylint: disable=import-outside-toplevel
+
+    queries = load_queries(args.queries)[:args.limit]
+    strategies = args.strategies or list(list_available_strategies().keys())
+    print(f"[BENCH] {len(queries)} queries x {len(strategies)} strategies x concurrency {args.concurrency}")
+
+    runs = []
+    for strategy in strategies:
+        for concurrency in args.concurrency:
+            run = run_strategy(app, SearchService, queries, strategy, concurrency, args)
+            runs.append(run)
+            print(f"[BENCH] {strategy} @ {concurrency}: p50={run['latency_ms'].get('p50')}ms "
+                  f"qps={run['throughput_qps']} errors={run['errors']}")
+
+    output = args.output or default_result_path("benchmark")
+    write_results(output, {
+        "meta": run_metadata({
+            "db_url": args.db_url.rsplit("@", 1)[-1],
+            "queries_file": args.queries,
+            "query_count": len(queries),
+            "repeat": args.repeat,
+            "top_n": args.top_n,
+            "inference": args.inference,
+            "scope_projects": args.scope_projects,
+        }),
+        "runs": runs,
+    })
+    print()
+    print_table(runs)
+    print(f"\n[BENCH] Results written to {output}")
+
+    if args.baseline:
+        regressions = compare_with_baseline(runs, args.baseline, args.regression_threshold)
+        if regressions:
+            print("\n[BENCH] Latency regressions against baseline:")
+            for message in regressions:
+                print(f"  - {message}")
+            sys.exit(1)
+        print("[BENCH] No latency regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,12 @@ TIMEOUT=${GUNICORN_TIMEOUT:-300}
 WORKERS=2
 echo "Workers set : $WORKERS"
 echo "Timeout set : $TIMEOUT"
+# APP_SERVER=asgi serves searches on an asyncio event loop per worker
+APP_SERVER=${APP_SERVER:-wsgi}
+echo "App server : $APP_SERVER"
 # Start Gunicorn with increased timeout
 echo 'Starting application'
+if [ "$APP_SERVER" = "asgi" ]; then
+  exec gunicorn --bind 0.0.0.0:8080 --workers $WORKERS --timeout $TIMEOUT -k uvicorn.workers.UvicornWorker asgi:application
+fi
 exec gunicorn --bind 0.0.0.0:8080 --workers $WORKERS --timeout $TIMEOUT wsgi:application
\ No newline at end of file
@@ -13,8 +13,11 @@ from flask_cors import CORS
 from werkzeug.exceptions import NotFound
 
 from search_api.auth import jwt
+from search_api.clients import http_transport
 from search_api.config import get_named_config
+from search_api.utils import tracing
 from search_api.utils.cache import cache
+from search_api.utils.json_codec import OrjsonProvider
 from search_api.utils.util import allowedorigins
 
 # Configure logging to match Vector API
@@ -54,6 +57,7 @@ def create_app(run_mode=os.getenv("FLASK_ENV", "development")):
 
     # Flask app initialize
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
 
     # All configuration are in config file
     app.config.from_object(get_named_config(run_mode))
@@ -69,6 +73,17 @@ def create_app(run_mode=os.getenv("FLASK_ENV", "development")):
     if os.getenv("FLASK_ENV", "production") != "testing":
         setup_jwt_manager(app, jwt)
 
+    # W3C trace context propagation and request spans
+    tracing.init_app(app)
+
+    # Per-request time budget for vector API calls
+    http_transport.init_app(app)
+
+    # Load the Ollama model before the first query needs it
+    if os.getenv("LLM_PROVIDER", "openai").lower() == "ollama" and run_mode != "testing":
+        from search_api.services.generation.implementations.ollama.ollama_client import warm_up_async
+        warm_up_async()
+
     @app.before_request
     def log_request_info():
         """Log request information for debugging."""
@@ -0,0 +1,210 @@
+"""ASGI entry point that serves searches on an asyncio request pipeline.
+
+Under WSGI every search holds a gunicorn worker thread for its whole duration,
+although most of that time is spent waiting on the vector API and the LLM. Here
+``POST /api/search/query`` runs as a coroutine on the worker's event loop: the
+vector search, summary and feedback session calls are awaited, so one worker keeps
+many searches in flight. Each downstream call holds a slot of its downstream's
+concurrency limit (see ``search_api.utils.concurrency``), so bursts queue inside
+the worker instead of overloading the vector API or the LLM.
+
+The search request still runs inside a Flask request context, so the app's
+before/after request hooks (logging, CORS, tracing, the request time budget) and
+the role check apply as they do under WSGI. Every other route is served by the
+Flask app through ``a2wsgi``'s WSGI adapter, which runs each request on a thread of
+its own pool (ASGI_WSGI_THREADS per worker), so slow routes such as document
+downloads do not queue behind one another.
+
+Run with an ASGI server, e.g.::
+
+    gunicorn -k uvicorn.workers.UvicornWorker asgi:application
+"""
+
+import json
+import os
+import time
+import traceback
+from http import HTTPStatus
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import Flask, Response, current_app, request
+
+from search_api.auth import auth
+
+SEARCH_PATH = "/api/search/query"
+
+
+@auth.requires_epic_search_role(["viewer", "admin"])
+def _authorize() -> None:
+    """Return None when the caller may search, otherwise the auth error response."""
+    return None
+
+
+def _environ(scope: Dict[str, Any], body: bytes) -> Dict[str, Any]:
+    """Build a WSGI environ for an ASGI HTTP request."""
+    server = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf8").decode("latin1"),
+        "PATH_INFO": scope["path"].encode("utf8").decode("latin1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("ascii"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1] or 80),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": (scope.get("client") or ("", 0))[0],
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": BytesIO(body),
+        "wsgi.errors": BytesIO(),
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+        "CONTENT_LENGTH": str(len(body)),
+    }
+    for raw_name, raw_value in scope.get("headers", []):
+        name = raw_name.decode("latin1").upper().replace("-", "_")
+        value = raw_value.decode("latin1")
+        if name == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+            continue
+        if name == "CONTENT_LENGTH":
+            continue
+        key = f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+async def _search() -> Response:
+    """Asyncio version of the ``POST /api/search/query`` resource."""
+    # pylint: disable=import-outside-toplevel
+    from search_api.clients.vector_search_client import VectorSearchClient
+    from search_api.schemas.search import SearchRequestSchema
+    from search_api.services.search_service import SearchService
+    from search_api.utils import json_codec, single_flight
+
+    current_app.logger.info("=== Search query request started (async) ===")
+    try:
+        request_data = SearchRequestSchema().load(request.get_json())
+        query = request_data.get("query", None)
+        project_ids = request_data.get("projectIds", None)
+        document_type_ids = request_data.get("documentTypeIds", None)
+        mode = request_data.get("mode", "rag")
+        current_app.logger.info(f"Search parameters - Query: {query[:100] if query else None}, Mode: {mode}")
+
+        start_time = time.time()
+        documents = await single_flight.run_async(
+            single_flight.search_key(request_data),
+            SearchService.get_documents_by_query_async,
+            query,
+            project_ids,
+            document_type_ids,
+            inference=request_data.get("inference", None),
+            ranking=request_data.get("ranking", None),
+            search_strategy=request_data.get("searchStrategy", None),
+            mode=mode,
+            user_location=request_data.get("userLocation", None),
+            project_status=request_data.get("projectStatus", None),
+            years=request_data.get("years", None),
+        )
+        current_app.logger.info(f"SearchService completed in {(time.time() - start_time):.2f} seconds")
+
+        session_id = await VectorSearchClient.create_feedback_session_async(
+            query_text=query,
+            project_ids=project_ids,
+            document_type_ids=document_type_ids,
+            search_result=documents
+        )
+        documents["feedback_session_id"] = session_id
+
+        current_app.logger.info("=== Search query request completed successfully ===")
+        return json_codec.response(documents)
+    except Exception as e:  # pylint: disable=broad-except
+        current_app.logger.error(f"Search error occurred: {str(e)}")
+        current_app.logger.error(f"Full traceback: {traceback.format_exc()}")
+        current_app.logger.error("=== Search query request ended with error ===")
+        error_response = {"error": "Internal server error occurred"}
+        return Response(json.dumps(error_response), status=HTTPStatus.INTERNAL_SERVER_ERROR,
+                        mimetype="application/json")
+
+
+class AsgiApplication:
+    """ASGI application serving searches natively and everything else through Flask."""
+
+    def __init__(self, flask_app: Flask):
+        # pylint: disable=import-outside-toplevel
+        from a2wsgi import WSGIMiddleware
+
+        self.flask_app = flask_app
+        self.wsgi = WSGIMiddleware(flask_app, workers=int(os.getenv("ASGI_WSGI_THREADS", "10")))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http" and scope["method"] == "POST" and scope["path"] == SEARCH_PATH:
+            await self._handle_search(scope, receive, send)
+        else:
+            await self.wsgi(scope, receive, send)
+
+    @staticmethod
+    async def _lifespan(receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _read_body(receive) -> Optional[bytes]:
+        """Read the request body, or return None when the client disconnected."""
+        chunks: List[bytes] = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return None
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                return b"".join(chunks)
+
+    async def _handle_search(self, scope, receive, send) -> None:
+        body = await self._read_body(receive)
+        if body is None:
+            return
+        app = self.flask_app
+        with app.request_context(_environ(scope, body)):
+            try:
+                response = app.preprocess_request()
+                if response is None:
+                    denied = _authorize()
+                    response = await _search() if denied is None else self._error_response(denied)
+                response = app.process_response(app.make_response(response))
+            except Exception as e:  # pylint: disable=broad-except
+                response = app.make_response(app.handle_exception(e))
+            status, headers, payload = self._serialize(response)
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": payload})
+
+    @staticmethod
+    def _error_response(denied: Tuple[Dict[str, Any], int]) -> Response:
+        payload, status = denied
+        return Response(json.dumps(payload), status=status, mimetype="application/json")
+
+    @staticmethod
+    def _serialize(response: Response) -> Tuple[int, List[Tuple[bytes, bytes]], bytes]:
+        payload = response.get_data()
+        headers = [(name.lower().encode("latin1"), value.encode("latin1"))
+                   for name, value in response.headers.to_wsgi_list()
+                   if name.lower() != "content-length"]
+        headers.append((b"content-length", str(len(payload)).encode("latin1")))
+        return response.status_code, headers, payload
+
+
+def create_asgi_app(flask_app: Optional[Flask] = None) -> AsgiApplication:
+    """Create the ASGI application, creating the Flask app when none is given."""
+    if flask_app is None:
+        from search_api import create_app  # pylint: disable=import-outside-toplevel
+
+        flask_app = create_app()
+    return AsgiApplication(flask_app)
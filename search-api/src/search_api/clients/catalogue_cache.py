@@ -0,0 +1,194 @@
+"""Revalidating cache for the vector search API catalogue endpoints.
+
+The vector API tags its catalogue responses (/tools/projects, /tools/document-types,
+/tools/search-strategies) with an ETag derived from the catalogue version. This
+module keeps one decoded copy of each catalogue response per process, shared by all
+threads and callers, and revalidates it with If-None-Match once the revalidation
+interval has passed. An unchanged catalogue then costs a 304 with an empty body
+instead of a full payload, and a new project becomes visible within one interval
+instead of up to a day.
+
+Cached payloads are shared between callers and must be treated as read-only.
+
+When a shared cache backend is configured (``CACHE_BACKEND=disk``), fetched
+payloads are also written there, so a worker that has no copy yet starts from
+another worker's payload and only needs a 304 to confirm it.
+
+Configuration (environment):
+    CATALOGUE_REVALIDATE_SECONDS: How long a copy is served before it is revalidated (default: 60)
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from flask import current_app
+
+from ..utils.cache import MemoryCacheBackend, get_backend
+from ..utils.tracing import inject_headers
+from .http_transport import vector_api_transport
+
+
+# How long a payload stays in the shared backend; it is revalidated on every use
+_SHARED_TTL_SECONDS = 86400
+
+
+class _CatalogueEntry:  # pylint: disable=too-few-public-methods
+    """A decoded catalogue payload with its ETag and last validation time."""
+
+    __slots__ = ("etag", "data", "validated_at")
+
+    def __init__(self, etag: Optional[str], data: Any, validated_at: float):
+        self.etag = etag
+        self.data = data
+        self.validated_at = validated_at
+
+
+class CatalogueCache:
+    """Per-process cache of catalogue responses revalidated with ETags."""
+
+    def __init__(self, revalidate_seconds: Optional[float] = None):
+        self._revalidate_seconds = revalidate_seconds
+        self._entries: Dict[str, _CatalogueEntry] = {}
+        self._url_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "revalidated": 0, "fetched": 0, "stale_served": 0}
+
+    @property
+    def revalidate_seconds(self) -> float:
+        """Seconds a copy is served before it is revalidated."""
+        if self._revalidate_seconds is not None:
+            return self._revalidate_seconds
+        return float(os.getenv("CATALOGUE_REVALIDATE_SECONDS", "60"))
+
+    def get(self, url: str, endpoint: str = "catalogue") -> Any:
+        """Return the decoded JSON payload for a catalogue URL.
+
+        Serves the shared copy while it is within the revalidation interval; otherwise
+        one caller revalidates it with If-None-Match while concurrent callers for the
+        same URL wait for that result. If revalidation fails and a copy exists, the
+        stale copy is served and revalidation is retried after the next interval.
+
+        Args:
+            url: Full URL of the catalogue endpoint
+            endpoint: Endpoint name used for transport metrics
+
+        Returns:
+            The decoded JSON payload (shared; do not mutate)
+
+        Raises:
+            requests.RequestException: If the request fails and no copy is cached
+        """
+        entry = self._fresh_entry(url)
+        if entry is not None:
+            return entry.data
+
+        with self._lock_for(url):
+            # Another thread may have revalidated while we waited
+            entry = self._fresh_entry(url)
+            if entry is not None:
+                return entry.data
+            return self._revalidate(url, self._entries.get(url), endpoint)
+
+    def _fresh_entry(self, url: str) -> Optional[_CatalogueEntry]:
+        entry = self._entries.get(url)
+        if entry is not None and time.monotonic() - entry.validated_at < self.revalidate_seconds:
+            self._count("hits")
+            return entry
+        return None
+
+    def _revalidate(self, url: str, entry: Optional[_CatalogueEntry], endpoint: str) -> Any:
+        if entry is None:
+            entry = self._shared_entry(url)
+        headers = {"If-None-Match": entry.etag} if entry is not None and entry.etag else {}
+        try:
+            response = vector_api_transport.get(url, endpoint, headers=inject_headers(headers))
+            if response.status_code == 304 and entry is not None:
+                entry.validated_at = time.monotonic()
+                self._entries[url] = entry
+                self._count("revalidated")
+                return entry.data
+            response.raise_for_status()
+            data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            if entry is None:
+                raise
+            current_app.logger.warning(f"Catalogue revalidation failed for {url}, serving cached copy: {e}")
+            entry.validated_at = time.monotonic()
+            self._entries[url] = entry
+            self._count("stale_served")
+            return entry.data
+
+        if isinstance(data, dict) and "error" in data:
+            # Never keep error payloads; the next call fetches again
+            self._entries.pop(url, None)
+        else:
+            self._entries[url] = _CatalogueEntry(response.headers.get("ETag"), data, time.monotonic())
+            backend = self._shared_backend()
+            if backend is not None:
+                try:
+                    backend.set(self._shared_key(url), (response.headers.get("ETag"), data), _SHARED_TTL_SECONDS)
+                except Exception as e:  # pylint: disable=broad-except
+                    current_app.logger.warning(f"Shared catalogue cache write failed for {url}: {e}")
+        self._count("fetched")
+        return data
+
+    @staticmethod
+    def _shared_key(url: str) -> str:
+        return f"catalogue:{url}"
+
+    @staticmethod
+    def _shared_backend():
+        backend = get_backend()
+        # The per-process memory backend adds nothing over our own entries
+        return None if isinstance(backend, MemoryCacheBackend) else backend
+
+    def _shared_entry(self, url: str) -> Optional[_CatalogueEntry]:
+        """Seed an entry from another worker's payload; it is revalidated before use."""
+        backend = self._shared_backend()
+        if backend is None:
+            return None
+        try:
+            found, value = backend.get(self._shared_key(url))
+        except Exception as e:  # pylint: disable=broad-except
+            current_app.logger.warning(f"Shared catalogue cache read failed for {url}: {e}")
+            return None
+        if not found:
+            return None
+        etag, data = value
+        return _CatalogueEntry(etag, data, 0.0)
+
+    def _lock_for(self, url: str) -> threading.Lock:
+        with self._lock:
+            return self._url_locks.setdefault(url, threading.Lock())
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters and the age of each cached catalogue."""
+        now = time.monotonic()
+        with self._lock:
+            counters = dict(self._stats)
+        return {
+            **counters,
+            "revalidate_seconds": self.revalidate_seconds,
+            "entries": [
+                {"url": url, "etag": entry.etag, "age_seconds": int(now - entry.validated_at)}
+                for url, entry in list(self._entries.items())
+            ],
+        }
+
+    def clear(self) -> int:
+        """Drop all cached catalogues; returns the number removed."""
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+        return removed
+
+
+# Shared by every caller in this process
+catalogue_cache = CatalogueCache()
@@ -0,0 +1,389 @@
+"""Pooled HTTP transport for calls from the search-api to the vector search API.
+
+All vector API calls go through one ``HttpTransport`` so that:
+
+- Connections are reused. One urllib3 pool, bounded to ``VECTOR_API_POOL_SIZE``
+  connections, is shared by every thread; each thread uses its own
+  ``requests.Session`` mounted on that pool, because sessions themselves are not
+  thread-safe.
+- Idempotent calls are retried on connection errors, timeouts and 502/503/504
+  responses with full-jitter exponential backoff.
+- Every call gets separate connect and read timeouts, both capped by the time left
+  in the current request's budget, so a slow downstream cannot hold a request past
+  its deadline and retries stop once the budget is spent.
+- Latency, error and retry counts are recorded per endpoint.
+
+``AsyncHttpTransport`` does the same on httpx for the asyncio request pipeline
+(see ``utils.concurrency``), recording into the same metrics.
+
+The request budget is a context variable set at the start of every HTTP request
+(``SEARCH_REQUEST_BUDGET_SECONDS``). Work submitted with
+``tracing.submit_with_context`` runs in a copy of the caller's context and therefore
+shares its deadline.
+
+Configuration (environment):
+    VECTOR_API_POOL_SIZE: Maximum pooled connections to the vector API (default: 20)
+    VECTOR_API_CONNECT_TIMEOUT: Connect timeout in seconds (default: 3.05)
+    VECTOR_API_READ_TIMEOUT: Read timeout in seconds (default: 300)
+    VECTOR_API_MAX_RETRIES: Retries for idempotent calls (default: 2)
+    VECTOR_API_RETRY_BACKOFF: Base backoff in seconds, doubled per retry (default: 0.2)
+    SEARCH_REQUEST_BUDGET_SECONDS: Time budget for one incoming request (default: 300)
+"""
+
+import asyncio
+import contextvars
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..utils import concurrency
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+# Longest single backoff sleep between retries
+_MAX_BACKOFF_SECONDS = 2.0
+# Latency samples kept per endpoint for percentiles
+_LATENCY_SAMPLES = 512
+
+_request_deadline: contextvars.ContextVar = contextvars.ContextVar("search_api_request_deadline", default=None)
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """Raised when the request budget is spent before a call could be made."""
+
+
+def set_deadline(seconds: Optional[float]) -> contextvars.Token:
+    """Set the deadline for the current context to ``seconds`` from now (None clears it)."""
+    deadline = time.monotonic() + seconds if seconds is not None else None
+    return _request_deadline.set(deadline)
+
+
+def reset_deadline(token: contextvars.Token) -> None:
+    """Restore the deadline that was active before ``set_deadline``."""
+    _request_deadline.reset(token)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]):
+    """Run a block with its own deadline, never extending an outer one."""
+    remaining = remaining_budget()
+    if remaining is not None and (seconds is None or remaining < seconds):
+        seconds = remaining
+    token = set_deadline(seconds)
+    try:
+        yield
+    finally:
+        reset_deadline(token)
+
+
+def remaining_budget() -> Optional[float]:
+    """Return the seconds left in the current request budget, or None if unbounded."""
+    deadline = _request_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+class _EndpointStats:
+    """Call counters and recent latencies for one endpoint."""
+
+    __slots__ = ("calls", "errors", "retries", "total_ms", "max_ms", "latencies")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.latencies = deque(maxlen=_LATENCY_SAMPLES)
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+
+        def percentile(p):
+            if not ordered:
+                return 0.0
+            return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))], 2)
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "avg_ms": round(self.total_ms / self.calls, 2) if self.calls else 0.0,
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class HttpTransport:
+    """Thread-safe keep-alive HTTP transport with retries, deadlines and metrics."""
+
+    def __init__(self, pool_size: Optional[int] = None):
+        self._pool_size = pool_size
+        self._adapter: Optional[HTTPAdapter] = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _EndpointStats] = {}
+
+    def _get_adapter(self) -> HTTPAdapter:
+        # Created lazily so the pool size is read after the environment is loaded
+        if self._adapter is None:
+            with self._lock:
+                if self._adapter is None:
+                    pool_size = self._pool_size or int(os.getenv("VECTOR_API_POOL_SIZE", "20"))
+                    # pool_block keeps the number of open connections bounded under load;
+                    # retries are handled here so they can respect the request budget
+                    self._adapter = HTTPAdapter(
+                        pool_connections=1, pool_maxsize=pool_size, pool_block=True, max_retries=0
+                    )
+        return self._adapter
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = self._get_adapter()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
+
+    @staticmethod
+    def _timeouts(remaining: Optional[float]) -> tuple:
+        connect = float(os.getenv("VECTOR_API_CONNECT_TIMEOUT", "3.05"))
+        read = float(os.getenv("VECTOR_API_READ_TIMEOUT", "300"))
+        if remaining is not None:
+            connect = min(connect, remaining)
+            read = min(read, remaining)
+        return connect, read
+
+    def request(self, method: str, url: str, endpoint: str, idempotent: Optional[bool] = None,
+                **kwargs) -> requests.Response:
+        """Send a request through the shared pool.
+
+        Args:
+            method: HTTP method
+            url: Full request URL
+            endpoint: Stable endpoint name used for metrics (e.g. "search", "tools/projects")
+            idempotent: Whether the call may be retried; defaults to True for idempotent
+                methods. Read-only POSTs such as searches can opt in.
+            **kwargs: Passed to ``requests.Session.request`` (json, params, headers, ...)
+
+        Returns:
+            The final response; callers still check the status code
+
+        Raises:
+            DeadlineExceeded: If the request budget is spent before the call is sent
+            requests.RequestException: If the last attempt fails
+        """
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        max_retries = int(os.getenv("VECTOR_API_MAX_RETRIES", "2")) if idempotent else 0
+        backoff = float(os.getenv("VECTOR_API_RETRY_BACKOFF", "0.2"))
+        kwargs.pop("timeout", None)
+
+        stats = self._endpoint_stats(endpoint)
+        start = time.perf_counter()
+        attempt = 0
+        try:
+            while True:
+                remaining = remaining_budget()
+                if remaining is not None and remaining <= 0:
+                    raise DeadlineExceeded(f"Request budget exhausted before calling {endpoint}")
+                try:
+                    response = self._session().request(method, url, timeout=self._timeouts(remaining), **kwargs)
+                    if response.status_code not in RETRY_STATUSES or attempt >= max_retries:
+                        if response.status_code >= 500:
+                            self._count(stats, "errors")
+                        return response
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                    if attempt >= max_retries:
+                        self._count(stats, "errors")
+                        raise
+                    response = None
+
+                # Full jitter: sleep anywhere up to the capped exponential backoff
+                delay = random.uniform(0, min(_MAX_BACKOFF_SECONDS, backoff * (2 ** attempt)))
+                remaining = remaining_budget()
+                if remaining is not None and remaining <= delay:
+                    self._count(stats, "errors")
+                    if response is not None:
+                        return response
+                    raise DeadlineExceeded(f"Request budget exhausted while retrying {endpoint}")
+                if response is not None:
+                    response.close()
+                time.sleep(delay)
+                attempt += 1
+                self._count(stats, "retries")
+        finally:
+            self._record(stats, (time.perf_counter() - start) * 1000)
+
+    def get(self, url: str, endpoint: str, **kwargs) -> requests.Response:
+        """Send a GET request (retried on transient failures)."""
+        return self.request("GET", url, endpoint, **kwargs)
+
+    def post(self, url: str, endpoint: str, **kwargs) -> requests.Response:
+        """Send a POST request (not retried unless ``idempotent=True``)."""
+        return self.request("POST", url, endpoint, **kwargs)
+
+    def patch(self, url: str, endpoint: str, **kwargs) -> requests.Response:
+        """Send a PATCH request (not retried unless ``idempotent=True``)."""
+        return self.request("PATCH", url, endpoint, **kwargs)
+
+    def _endpoint_stats(self, endpoint: str) -> _EndpointStats:
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = self._stats[endpoint] = _EndpointStats()
+            return stats
+
+    def _count(self, stats: _EndpointStats, field: str) -> None:
+        with self._lock:
+            setattr(stats, field, getattr(stats, field) + 1)
+
+    def _record(self, stats: _EndpointStats, elapsed_ms: float) -> None:
+        with self._lock:
+            stats.calls += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.latencies.append(elapsed_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-endpoint latency and error metrics."""
+        with self._lock:
+            endpoints = {name: stats.to_dict() for name, stats in self._stats.items()}
+        return {
+            "pool_size": self._pool_size or int(os.getenv("VECTOR_API_POOL_SIZE", "20")),
+            "endpoints": endpoints,
+        }
+
+
+class AsyncHttpTransport:
+    """asyncio counterpart of ``HttpTransport`` for the ASGI request pipeline.
+
+    Each event loop gets one ``httpx.AsyncClient`` bounded to ``VECTOR_API_POOL_SIZE``
+    connections, and every call holds a slot of the downstream's concurrency limit.
+    Retries, timeouts and the request budget follow the same rules as the
+    synchronous transport, whose per-endpoint metrics are shared.
+    """
+
+    def __init__(self, transport: HttpTransport, downstream: str):
+        self._transport = transport
+        self._downstream = downstream
+
+    def _client(self):
+        def create():
+            pool_size = self._transport._pool_size or int(os.getenv("VECTOR_API_POOL_SIZE", "20"))
+            return httpx.AsyncClient(limits=httpx.Limits(max_connections=pool_size,
+                                                         max_keepalive_connections=pool_size))
+        return concurrency.loop_local(("http", id(self)), create)
+
+    async def request(self, method: str, url: str, endpoint: str, idempotent: Optional[bool] = None,
+                      **kwargs):
+        """Send a request through the event loop's pool.
+
+        Args:
+            method: HTTP method
+            url: Full request URL
+            endpoint: Stable endpoint name used for metrics (e.g. "search", "tools/projects")
+            idempotent: Whether the call may be retried; defaults to True for idempotent
+                methods. Read-only POSTs such as searches can opt in.
+            **kwargs: Passed to ``httpx.AsyncClient.request`` (json, params, headers, ...)
+
+        Returns:
+            The final ``httpx.Response``; callers still check the status code
+
+        Raises:
+            DeadlineExceeded: If the request budget is spent before the call is sent
+            httpx.HTTPError: If the last attempt fails
+        """
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        max_retries = int(os.getenv("VECTOR_API_MAX_RETRIES", "2")) if idempotent else 0
+        backoff = float(os.getenv("VECTOR_API_RETRY_BACKOFF", "0.2"))
+        kwargs.pop("timeout", None)
+
+        transport = self._transport
+        stats = transport._endpoint_stats(endpoint)
+        start = time.perf_counter()
+        attempt = 0
+        try:
+            async with concurrency.limit(self._downstream):
+                while True:
+                    remaining = remaining_budget()
+                    if remaining is not None and remaining <= 0:
+                        raise DeadlineExceeded(f"Request budget exhausted before calling {endpoint}")
+                    connect, read = HttpTransport._timeouts(remaining)
+                    try:
+                        response = await self._client().request(
+                            method, url, timeout=httpx.Timeout(read, connect=connect), **kwargs
+                        )
+                        if response.status_code not in RETRY_STATUSES or attempt >= max_retries:
+                            if response.status_code >= 500:
+                                transport._count(stats, "errors")
+                            return response
+                    except httpx.TransportError:
+                        if attempt >= max_retries:
+                            transport._count(stats, "errors")
+                            raise
+                        response = None
+
+                    delay = random.uniform(0, min(_MAX_BACKOFF_SECONDS, backoff * (2 ** attempt)))
+                    remaining = remaining_budget()
+                    if remaining is not None and remaining <= delay:
+                        transport._count(stats, "errors")
+                        if response is not None:
+                            return response
+                        raise DeadlineExceeded(f"Request budget exhausted while retrying {endpoint}")
+                    if response is not None:
+                        await response.aclose()
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    transport._count(stats, "retries")
+        finally:
+            transport._record(stats, (time.perf_counter() - start) * 1000)
+
+    async def get(self, url: str, endpoint: str, **kwargs):
+        """Send a GET request (retried on transient failures)."""
+        return await self.request("GET", url, endpoint, **kwargs)
+
+    async def post(self, url: str, endpoint: str, **kwargs):
+        """Send a POST request (not retried unless ``idempotent=True``)."""
+        return await self.request("POST", url, endpoint, **kwargs)
+
+
+def init_app(app) -> None:
+    """Give every incoming request its own time budget for downstream calls."""
+    from flask import g  # pylint: disable=import-outside-toplevel
+
+    @app.before_request
+    def start_request_budget():
+        g.deadline_token = set_deadline(float(os.getenv("SEARCH_REQUEST_BUDGET_SECONDS", "300")))
+
+    @app.teardown_request
+    def end_request_budget(exc):  # pylint: disable=unused-argument
+        token = g.pop("deadline_token", None)
+        if token is not None:
+            try:
+                reset_deadline(token)
+            except ValueError:
+                # Token was created in a different context (e.g. streamed response)
+                pass
+
+
+# Shared by every vector API call in this process
+vector_api_transport = HttpTransport()
+# Vector API calls made from the asyncio request pipeline
+async_vector_api_transport = AsyncHttpTransport(vector_api_transport, "vector_api")
@@ -46,11 +46,15 @@ The vector API uses both parameters:
 """
 
 import os
+import httpx
 import requests
 from typing import Optional
 from flask import current_app
-from ..utils.cache import cache_with_ttl
+from ..utils import json_codec
 from ..utils.token_info import get_user_id
+from ..utils.tracing import SpanKind, inject_headers, traced
+from .catalogue_cache import catalogue_cache
+from .http_transport import async_vector_api_transport, vector_api_transport
 
 class VectorSearchClient:
     """Client for communicating with the external vector search API."""
@@ -60,7 +64,8 @@ class VectorSearchClient:
     # =============================================================================
 
     @staticmethod
-    def search(query, project_ids=None, document_type_ids=None, project_names=None, document_type_names=None, inference=None, ranking=None, search_strategy=None, semantic_query=None, location=None, user_location=None, project_status=None, years=None):
+    @traced("vector_search_client.search", kind=SpanKind.CLIENT)
+    def search(query, project_ids=None, document_type_ids=None, project_names=None, document_type_names=None, inference=None, ranking=None, search_strategy=None, semantic_query=None, location=None, user_location=None, project_status=None, years=None, query_variants=None, fields=None, snippet_chars=None, passthrough=False):
         """Advanced two-stage hybrid search with comprehensive parameters.
         
         Endpoint: POST /vector-search
@@ -96,142 +101,206 @@ class VectorSearchClient:
                 "region": "British Columbia", "country": "Canada", "timestamp": 1696291200000}
             project_status (str, optional): Project status parameter for status filtering  
             years (list, optional): Years parameter for temporal filtering
+            query_variants (list, optional): Paraphrases of the query retrieved by the vector API
+                in the same request, over the union of their nearest chunks (used by agentic mode)
+            fields (list, optional): Result fields to return, for callers that only need ids and scores
+            snippet_chars (int, optional): Maximum length of each result's content
+            passthrough (bool, optional): Keep the result list encoded (a ``json_codec.RawJSONList``)
+                for callers that forward it unchanged
             
         Returns:
             dict: Complete search results with metadata for better agentic integration
         """
+        base_url = os.getenv("VECTOR_SEARCH_API_URL", "http://localhost:8080/api")
+        vector_search_url = f"{base_url}/vector-search"
         try:
-            base_url = os.getenv("VECTOR_SEARCH_API_URL", "http://localhost:8080/api")
-            vector_search_url = f"{base_url}/vector-search"
-            
-            # Use semantic_query as the primary query if provided, otherwise use the original query
-            primary_query = semantic_query if semantic_query else query
-            payload = {"query": primary_query}
-            
-            # Add optional parameters if provided - maintains backward compatibility
-            if project_ids:
-                payload["projectIds"] = project_ids
-            if document_type_ids:
-                payload["documentTypeIds"] = document_type_ids
-            if project_names:
-                payload["projectNames"] = project_names  # For fuzzy matching by vector API
-            if document_type_names:
-                payload["documentTypeNames"] = document_type_names  # For fuzzy matching by vector API
-            if inference:
-                payload["inference"] = inference
-            if ranking:
-                payload["ranking"] = ranking
-            if search_strategy:
-                payload["searchStrategy"] = search_strategy
-            if location:
-                # Handle different location formats  
-                if isinstance(location, dict):
-                    # Convert location object to string format that vector API expects
-                    current_app.logger.info(f"Converting location object to string format for vector API")
-                    
-                    # Build location string from available fields
-                    location_parts = []
-                    if location.get('city'):
-                        location_parts.append(location['city'])
-                    if location.get('region'):
-                        location_parts.append(location['region'])
-                    if location.get('country'):
-                        location_parts.append(location['country'])
-                    
-                    if location_parts:
-                        location_string = ', '.join(location_parts)
-                        current_app.logger.info(f"Converted location object to string: '{location_string}'")
-                        payload["location"] = location_string
-                    else:
-                        # Fallback - use coordinates as string
-                        lat = location.get('latitude')
-                        lng = location.get('longitude') 
-                        if lat is not None and lng is not None:
-                            location_string = f"{lat},{lng}"
-                            current_app.logger.info(f"Using coordinates as location string: '{location_string}'")
-                            payload["location"] = location_string
-                        else:
-                            current_app.logger.warning(f"Location object has no usable fields: {location}")
-                elif isinstance(location, str):
-                    # If it's already a string, use as-is
-                    payload["location"] = location
-                else:
-                    current_app.logger.warning(f"Unexpected location format: {type(location)} - {location}")
-                    payload["location"] = str(location)
-            if user_location:
-                payload["userLocation"] = user_location
-                current_app.logger.info(f"Added userLocation to payload: {user_location}")
-            if project_status:
-                payload["projectStatus"] = project_status
-            if years:
-                payload["years"] = years
-            # Note: We don't send semanticQuery separately since we're using it as the primary query
-                
+            payload = VectorSearchClient._search_payload(
+                query, project_ids, document_type_ids, project_names, document_type_names, inference, ranking,
+                search_strategy, semantic_query, location, user_location, project_status, years, query_variants,
+                fields, snippet_chars
+            )
             current_app.logger.info(f"Calling vector search API at address: {vector_search_url}")
             current_app.logger.info(f"Search payload: {payload}")
             if semantic_query:
                 current_app.logger.info(f"Using semantic query as primary query: '{semantic_query}' (original: '{query}')")
-            response = requests.post(vector_search_url, json=payload, timeout=300)
+            response = vector_api_transport.post(
+                vector_search_url, "search", idempotent=True, json=payload, headers=inject_headers()
+            )
             response.raise_for_status()
-
-            api_response = response.json()
-            
-            # Extract both documents and document_chunks from the response separately
-            vector_search_data = api_response.get("vector_search", {})
-            documents = vector_search_data.get("documents", [])
-            document_chunks = vector_search_data.get("document_chunks", [])
-            
-            current_app.logger.info(f"Vector API returned {len(documents)} documents and {len(document_chunks)} document chunks")
-            
-            # Return tuple format (documents, document_chunks, api_response) for proper separation
-            return documents, document_chunks, api_response
+            return VectorSearchClient._search_result(
+                json_codec.load_search_response(response.content, response.headers, passthrough)
+            )
         except requests.exceptions.ConnectionError as e:
             current_app.logger.error(f"Vector search API connection failed: {str(e)}")
             current_app.logger.error(f"Check if vector search service is running on: {vector_search_url}")
-            # Return tuple format with empty documents, chunks and error response
-            return [], [], {
-                "vector_search": {
-                    "documents": [],
-                    "document_chunks": []
-                },
-                "status": "error",
-                "error": f"Vector API connection failed: {str(e)}",
-                "error_type": "connection_error"
-            }
+            return VectorSearchClient._search_error(f"Vector API connection failed: {str(e)}", "connection_error")
         except requests.exceptions.HTTPError as e:
             # Log specific HTTP errors like 500
             current_app.logger.error(f"Vector search API HTTP error: {str(e)}")
             if hasattr(e, 'response') and e.response is not None:
-                current_app.logger.error(f"HTTP Status: {e.response.status_code}")
-                try:
-                    error_details = e.response.json()
-                    current_app.logger.error(f"API Error Details: {error_details}")
-                except:
-                    current_app.logger.error(f"API Error Text: {e.response.text}")
-            # Return tuple format with empty documents, chunks and error response
-            return [], [], {
-                "vector_search": {
-                    "documents": [],
-                    "document_chunks": []
-                },
-                "status": "error", 
-                "error": f"Vector API HTTP error: {str(e)}",
-                "error_type": "http_error"
-            }
+                VectorSearchClient._log_error_response(e.response)
+            return VectorSearchClient._search_error(f"Vector API HTTP error: {str(e)}", "http_error")
+        except requests.exceptions.Timeout as e:
+            current_app.logger.error(f"Vector search API timed out: {str(e)}")
+            return VectorSearchClient._search_error(f"Vector API timed out: {str(e)}", "timeout")
         except Exception as e:
             current_app.logger.error(f"Error calling vector search API: {str(e)}")
-            # Return tuple format with empty documents, chunks and error response
-            return [], [], {
-                "vector_search": {
-                    "documents": [],
-                    "document_chunks": []
-                },
-                "status": "error",
-                "error": str(e),
-                "error_type": "unknown_error"
-            }
+            return VectorSearchClient._search_error(str(e), "unknown_error")
 
     @staticmethod
+    @traced("vector_search_client.search", kind=SpanKind.CLIENT)
+    async def search_async(query, project_ids=None, document_type_ids=None, project_names=None, document_type_names=None, inference=None, ranking=None, search_strategy=None, semantic_query=None, location=None, user_location=None, project_status=None, years=None, query_variants=None, fields=None, snippet_chars=None, passthrough=False):
+        """Async version of ``search`` for the asyncio request pipeline.
+        
+        Takes the same arguments and returns the same (documents, document_chunks,
+        api_response) tuple; the call waits on the event loop instead of a thread.
+        """
+        base_url = os.getenv("VECTOR_SEARCH_API_URL", "http://localhost:8080/api")
+        vector_search_url = f"{base_url}/vector-search"
+        try:
+            payload = VectorSearchClient._search_payload(
+                query, project_ids, document_type_ids, project_names, document_type_names, inference, ranking,
+                search_strategy, semantic_query, location, user_location, project_status, years, query_variants,
+                fields, snippet_chars
+            )
+            current_app.logger.info(f"Calling vector search API at address: {vector_search_url} (async)")
+            current_app.logger.info(f"Search payload: {payload}")
+            response = await async_vector_api_transport.post(
+                vector_search_url, "search", idempotent=True, json=payload, headers=inject_headers()
+            )
+            response.raise_for_status()
+            return VectorSearchClient._search_result(
+                json_codec.load_search_response(response.content, response.headers, passthrough)
+            )
+        except httpx.ConnectError as e:
+            current_app.logger.error(f"Vector search API connection failed: {str(e)}")
+            current_app.logger.error(f"Check if vector search service is running on: {vector_search_url}")
+            return VectorSearchClient._search_error(f"Vector API connection failed: {str(e)}", "connection_error")
+        except httpx.HTTPStatusError as e:
+            current_app.logger.error(f"Vector search API HTTP error: {str(e)}")
+            VectorSearchClient._log_error_response(e.response)
+            return VectorSearchClient._search_error(f"Vector API HTTP error: {str(e)}", "http_error")
+        except (httpx.TimeoutException, requests.exceptions.Timeout) as e:
+            current_app.logger.error(f"Vector search API timed out: {str(e)}")
+            return VectorSearchClient._search_error(f"Vector API timed out: {str(e)}", "timeout")
+        except Exception as e:
+            current_app.logger.error(f"Error calling vector search API: {str(e)}")
+            return VectorSearchClient._search_error(str(e), "unknown_error")
+
+    @staticmethod
+    def _search_payload(query, project_ids, document_type_ids, project_names, document_type_names, inference, ranking,
+                        search_strategy, semantic_query, location, user_location, project_status, years, query_variants,
+                        fields=None, snippet_chars=None):
+        """Build the /vector-search request body from the search arguments."""
+        # Use semantic_query as the primary query if provided, otherwise use the original query
+        primary_query = semantic_query if semantic_query else query
+        payload = {"query": primary_query}
+        
+        # Add optional parameters if provided - maintains backward compatibility
+        if project_ids:
+            payload["projectIds"] = project_ids
+        if document_type_ids:
+            payload["documentTypeIds"] = document_type_ids
+        if project_names:
+            payload["projectNames"] = project_names  # For fuzzy matching by vector API
+        if document_type_names:
+            payload["documentTypeNames"] = document_type_names  # For fuzzy matching by vector API
+        if inference:
+            payload["inference"] = inference
+        if ranking:
+            payload["ranking"] = ranking
+        if search_strategy:
+            payload["searchStrategy"] = search_strategy
+        if location:
+            # Handle different location formats  
+            if isinstance(location, dict):
+                # Convert location object to string format that vector API expects
+                current_app.logger.info(f"Converting location object to string format for vector API")
+                
+                # Build location string from available fields
+                location_parts = []
+                if location.get('city'):
+                    location_parts.append(location['city'])
+                if location.get('region'):
+                    location_parts.append(location['region'])
+                if location.get('country'):
+                    location_parts.append(location['country'])
+                
+                if location_parts:
+                    location_string = ', '.join(location_parts)
+                    current_app.logger.info(f"Converted location object to string: '{location_string}'")
+                    payload["location"] = location_string
+                else:
+                    # Fallback - use coordinates as string
+                    lat = location.get('latitude')
+                    lng = location.get('longitude') 
+                    if lat is not None and lng is not None:
+                        location_string = f"{lat},{lng}"
+                        current_app.logger.info(f"Using coordinates as location string: '{location_string}'")
+                        payload["location"] = location_string
+                    else:
+                        current_app.logger.warning(f"Location object has no usable fields: {location}")
+            elif isinstance(location, str):
+                # If it's already a string, use as-is
+                payload["location"] = location
+            else:
+                current_app.logger.warning(f"Unexpected location format: {type(location)} - {location}")
+                payload["location"] = str(location)
+        if user_location:
+            payload["userLocation"] = user_location
+            current_app.logger.info(f"Added userLocation to payload: {user_location}")
+        if project_status:
+            payload["projectStatus"] = project_status
+        if years:
+            payload["years"] = years
+        if query_variants:
+            payload["queryVariants"] = query_variants
+        if fields:
+            payload["fields"] = fields
+        if snippet_chars:
+            payload["snippetChars"] = snippet_chars
+        # Note: We don't send semanticQuery separately since we're using it as the primary query
+
+        return payload
+
+    @staticmethod
+    def _search_result(api_response):
+        """Split a /vector-search response into (documents, document_chunks, api_response)."""
+        # Extract both documents and document_chunks from the response separately
+        vector_search_data = api_response.get("vector_search", {})
+        documents = vector_search_data.get("documents", [])
+        document_chunks = vector_search_data.get("document_chunks", [])
+        
+        current_app.logger.info(f"Vector API returned {len(documents)} documents and {len(document_chunks)} document chunks")
+        
+        # Return tuple format (documents, document_chunks, api_response) for proper separation
+        return documents, document_chunks, api_response
+
+    @staticmethod
+    def _search_error(error, error_type):
+        """Result tuple with empty documents, chunks and an error response."""
+        return [], [], {
+            "vector_search": {
+                "documents": [],
+                "document_chunks": []
+            },
+            "status": "error",
+            "error": error,
+            "error_type": error_type
+        }
+
+    @staticmethod
+    def _log_error_response(response):
+        """Log the status and body of a failed vector API response."""
+        current_app.logger.error(f"HTTP Status: {response.status_code}")
+        try:
+            error_details = response.json()
+            current_app.logger.error(f"API Error Details: {error_details}")
+        except Exception:
+            current_app.logger.error(f"API Error Text: {response.text}")
+
+    @staticmethod
+    @traced("vector_search_client.document_similarity", kind=SpanKind.CLIENT)
     def document_similarity_search(document_id, project_ids=None, limit=10):
         """Document-level embedding similarity search.
         
@@ -258,7 +327,9 @@ class VectorSearchClient:
                 payload["projectIds"] = project_ids
                 
             current_app.logger.info(f"Calling vector search document similarity API at: {vector_search_url}")
-            response = requests.post(vector_search_url, json=payload, timeout=300)
+            response = vector_api_transport.post(
+                vector_search_url, "document-similarity", idempotent=True, json=payload, headers=inject_headers()
+            )
             response.raise_for_status()
             
             return response.json()
@@ -266,12 +337,42 @@ class VectorSearchClient:
             current_app.logger.error(f"Error calling vector search document similarity API: {str(e)}")
             return {}
 
+    @staticmethod
+    @traced("vector_search_client.score_relevance", kind=SpanKind.CLIENT)
+    def score_relevance(pairs):
+        """Score query/text pairs with the vector API's cross-encoder in one batch.
+        
+        Endpoint: POST /relevance
+        
+        Args:
+            pairs (list): Dicts with "query" and "content"; pairs may use different queries
+            
+        Returns:
+            list: Cross-encoder scores in the order of the pairs, or None if scoring failed
+        """
+        if not pairs:
+            return []
+        try:
+            base_url = os.getenv("VECTOR_SEARCH_API_URL", "http://localhost:8080/api")
+            url = f"{base_url}/relevance"
+            
+            response = vector_api_transport.post(
+                url, "relevance", idempotent=True, json={"pairs": pairs}, headers=inject_headers()
+            )
+            response.raise_for_status()
+            
+            relevance = response.json().get("relevance", {})
+            current_app.logger.info(f"Vector API scored {len(pairs)} pairs in {relevance.get('metrics', {}).get('scoring_ms')}ms")
+            return relevance.get("scores")
+        except Exception as e:
+            current_app.logger.error(f"Error calling vector search relevance API: {str(e)}")
+            return None
+
     # =============================================================================
     # DISCOVERY OPERATIONS - Metadata and capability discovery (6 methods)
     # =============================================================================
 
     @staticmethod
-    @cache_with_ttl(ttl_seconds=86400)  # Cache for 24 hours (86400 seconds)
     def get_projects_list(include_metadata: bool = False):
         """Get list of available projects for filtering (optionally with metadata).
         
@@ -285,11 +386,7 @@ class VectorSearchClient:
             base_url = os.getenv("VECTOR_SEARCH_API_URL", "http://localhost:8080/api")
             vector_search_url = f"{base_url}/tools/projects"
             
-            current_app.logger.info(f"Calling vector search projects list API at: {vector_search_url}")
-            response = requests.get(vector_search_url, timeout=300)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = catalogue_cache.get(vector_search_url, "tools/projects")
 
             projects = data.get('projects', [])
 
@@ -304,7 +401,6 @@ class VectorSearchClient:
             return []
 
     @staticmethod
-    @cache_with_ttl(ttl_seconds=86400)  # Cache for 24 hours (86400 seconds)
     def get_document_types():
         """Get document types with aliases and descriptions.
         
@@ -318,11 +414,7 @@ class VectorSearchClient:
             base_url = os.getenv("VECTOR_SEARCH_API_URL", "http://localhost:8080/api")
             vector_search_url = f"{base_url}/tools/document-types"
             
-            current_app.logger.info(f"Calling vector search document types API at: {vector_search_url}")
-            response = requests.get(vector_search_url, timeout=300)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = catalogue_cache.get(vector_search_url, "tools/document-types")
             
             # Normalize the response format to be consistent with get_projects_list
             # Convert from {id: {name: "Letter", aliases: [...]}} to [{document_type_id: "id", document_type_name: "Letter", aliases: [...]}]
@@ -346,7 +438,6 @@ class VectorSearchClient:
             return []
 
     @staticmethod
-    @cache_with_ttl(ttl_seconds=86400)  # Cache for 24 hours (86400 seconds)
     def get_document_type_details(type_id):
         """Get detailed information for a specific document type.
         
@@ -363,17 +454,12 @@ class VectorSearchClient:
             base_url = os.getenv("VECTOR_SEARCH_API_URL", "http://localhost:8080/api")
             vector_search_url = f"{base_url}/tools/document-types/{type_id}"
             
-            current_app.logger.info(f"Calling vector search document type details API at: {vector_search_url}")
-            response = requests.get(vector_search_url, timeout=300)
-            response.raise_for_status()
-            
-            return response.json()
+            return catalogue_cache.get(vector_search_url, "tools/document-types/detail")
         except Exception as e:
             current_app.logger.error(f"Error calling vector search document type details API: {str(e)}")
             return {}
 
     @staticmethod
-    @cache_with_ttl(ttl_seconds=86400)  # Cache for 24 hours (86400 seconds)
     def get_search_strategies():
         """Get available search strategies and capabilities.
         
@@ -387,11 +473,7 @@ class VectorSearchClient:
             base_url = os.getenv("VECTOR_SEARCH_API_URL", "http://localhost:8080/api")
             vector_search_url = f"{base_url}/tools/search-strategies"
             
-            current_app.logger.info(f"Calling vector search strategies API at: {vector_search_url}")
-            response = requests.get(vector_search_url, timeout=300)
-            response.raise_for_status()
-            
-            return response.json()
+            return catalogue_cache.get(vector_search_url, "tools/search-strategies")
         except Exception as e:
             current_app.logger.error(f"Error calling vector search strategies API: {str(e)}")
             return {}
@@ -411,7 +493,7 @@ class VectorSearchClient:
             vector_search_url = f"{base_url}/tools/inference-options"
             
             current_app.logger.info(f"Calling vector search inference options API at: {vector_search_url}")
-            response = requests.get(vector_search_url, timeout=300)
+            response = vector_api_transport.get(vector_search_url, "tools/inference-options", headers=inject_headers())
             response.raise_for_status()
             
             return response.json()
@@ -434,7 +516,7 @@ class VectorSearchClient:
             vector_search_url = f"{base_url}/tools/api-capabilities"
             
             current_app.logger.info(f"Calling vector search capabilities API at: {vector_search_url}")
-            response = requests.get(vector_search_url, timeout=300)
+            response = vector_api_transport.get(vector_search_url, "tools/api-capabilities", headers=inject_headers())
             response.raise_for_status()
             
             return response.json()
@@ -467,7 +549,7 @@ class VectorSearchClient:
             if project_ids:
                 current_app.logger.info(f"Note: project_ids filter ({project_ids}) ignored - vector API handles filtering internally")
             
-            response = requests.get(vector_search_url, timeout=300)
+            response = vector_api_transport.get(vector_search_url, "stats/processing", headers=inject_headers())
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -492,7 +574,7 @@ class VectorSearchClient:
             vector_search_url = f"{base_url}/stats/processing/{project_id}"
             
             current_app.logger.info(f"Calling vector search project details API at: {vector_search_url}")
-            response = requests.get(vector_search_url, timeout=300)
+            response = vector_api_transport.get(vector_search_url, "stats/processing/project", headers=inject_headers())
             response.raise_for_status()
             
             return response.json()
@@ -515,7 +597,7 @@ class VectorSearchClient:
             vector_search_url = f"{base_url}/stats/summary"
             
             current_app.logger.info(f"Calling vector search system summary API at: {vector_search_url}")
-            response = requests.get(vector_search_url, timeout=300)
+            response = vector_api_transport.get(vector_search_url, "stats/summary", headers=inject_headers())
             response.raise_for_status()
             
             return response.json()
@@ -552,7 +634,7 @@ class VectorSearchClient:
                     params["project_ids"] = ",".join(project_ids)
             
             current_app.logger.info(f"Calling vector search project health API at: {vector_search_url}")
-            response = requests.get(vector_search_url, params=params, timeout=300)
+            response = vector_api_transport.get(vector_search_url, "stats/health", params=params, headers=inject_headers())
             response.raise_for_status()
             
             return response.json()
@@ -583,19 +665,32 @@ class VectorSearchClient:
         try:
             base_url = os.getenv("VECTOR_SEARCH_API_URL", "http://localhost:8080/api")
             url = f"{base_url}/tools/feedback"
+            payload = VectorSearchClient._feedback_session_payload(query_text, project_ids, document_type_ids, search_result)
 
-            payload = {
-                "userId": get_user_id(),
-                "queryText": query_text,
-                "projectIds": project_ids,
-                "documentTypeIds": document_type_ids
-            }
+            current_app.logger.info(f"Creating feedback session via POST {url} with payload: {payload}")
+            response = vector_api_transport.post(url, "tools/feedback", data=json_codec.dumps(payload),
+                                                 headers=inject_headers({"Content-Type": "application/json"}))
+            response.raise_for_status()
+            data = response.json()
+            return data.get("sessionId")
 
-            if search_result is not None:
-                payload["searchResult"] = search_result
+        except Exception as e:
+            current_app.logger.error(f"Error creating feedback session: {e}")
+            return None
 
-            current_app.logger.info(f"Creating feedback session via POST {url} with payload: {payload}")
-            response = requests.post(url, json=payload, timeout=300)
+    @staticmethod
+    async def create_feedback_session_async(query_text: str = None,
+                                            project_ids: list = None, document_type_ids: list = None,
+                                            search_result: dict = None) -> str:
+        """Async version of ``create_feedback_session`` for the asyncio request pipeline."""
+        try:
+            base_url = os.getenv("VECTOR_SEARCH_API_URL", "http://localhost:8080/api")
+            url = f"{base_url}/tools/feedback"
+            payload = VectorSearchClient._feedback_session_payload(query_text, project_ids, document_type_ids, search_result)
+
+            current_app.logger.info(f"Creating feedback session via POST {url} (async)")
+            response = await async_vector_api_transport.post(url, "tools/feedback", content=json_codec.dumps(payload),
+                                                             headers=inject_headers({"Content-Type": "application/json"}))
             response.raise_for_status()
             data = response.json()
             return data.get("sessionId")
@@ -604,6 +699,23 @@ class VectorSearchClient:
             current_app.logger.error(f"Error creating feedback session: {e}")
             return None
 
+    @staticmethod
+    def _feedback_session_payload(query_text, project_ids, document_type_ids, search_result) -> dict:
+        """Build the feedback session request body.
+
+        The body is encoded with ``json_codec`` so pass-through result lists are sent as they are.
+        """
+        payload = {
+            "userId": get_user_id(),
+            "queryText": query_text,
+            "projectIds": project_ids,
+            "documentTypeIds": document_type_ids
+        }
+
+        if search_result is not None:
+            payload["searchResult"] = search_result
+        return payload
+
     @staticmethod
     def update_feedback(        
         session_id: str,
@@ -644,7 +756,7 @@ class VectorSearchClient:
             }
 
             current_app.logger.info(f"Updating feedback via PATCH {url} with payload: {payload}")
-            response = requests.patch(url, json=payload, timeout=300)
+            response = vector_api_transport.patch(url, "tools/feedback", json=payload, headers=inject_headers())
             response.raise_for_status()
             return True
 
@@ -22,6 +22,7 @@ That are used to expose operational health information about the service, and me
 """
 
 from flask import Blueprint
+from search_api.utils.json_codec import output_json
 from .apihelper import Api
 from .search import API as SEARCH_API
 from .ops import API as OPS_API
@@ -67,6 +68,10 @@ HEALTH = Api(
     description="Health Endpoints",
 )
 
+# Encode resource responses with orjson
+API.representation("application/json")(output_json)
+HEALTH.representation("application/json")(output_json)
+
 API.add_namespace(SEARCH_API)
 API.add_namespace(DOCUMENT_API)
 API.add_namespace(STATS_API)
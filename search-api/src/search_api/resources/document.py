@@ -1,15 +1,18 @@
 """API endpoints for managing document resources."""
 
-import hashlib
 import mimetypes
 import os
 
 from http import HTTPStatus
-from flask import Response, current_app, request
+from botocore.exceptions import ClientError
+from flask import Response, current_app, request, send_file, stream_with_context
 from flask_restx import Namespace, Resource
 from urllib.parse import unquote
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
+from werkzeug.http import http_date
 from search_api.utils.util import cors_preflight
-from search_api.services.s3_reader import read_file_from_s3
+from search_api.services.document_cache import get_document_cache
+from search_api.services.s3_reader import head_s3_object, open_s3_object
 from search_api.exceptions import ResourceNotFoundError
 from search_api.schemas.document import DocumentDownloadSchema
 # from search_api.auth import auth
@@ -88,6 +91,160 @@ def detect_mimetype(file_name, file_data=None):
     current_app.logger.warning(f"Could not detect mimetype for '{file_name}', using default 'application/octet-stream'")
     return 'application/octet-stream'
 
+# Bytes read from S3 and written to the client at a time
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Shown inline in the browser; everything else is sent as an attachment
+VIEWABLE_TYPES = [
+    'application/pdf',
+    'image/jpeg',
+    'image/png',
+    'image/gif',
+    'text/plain'
+]
+
+
+def _stream_body(body, first_chunk=b''):
+    """Yield an S3 StreamingBody in chunks, closing it when the client is done."""
+    try:
+        if first_chunk:
+            yield first_chunk
+        for chunk in body.iter_chunks(chunk_size=STREAM_CHUNK_SIZE):
+            yield chunk
+    finally:
+        body.close()
+
+
+def _validator_matches(if_range, s3_object):
+    """Check an If-Range value against the object's ETag or Last-Modified date."""
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == s3_object.get("ETag")
+    last_modified = s3_object.get("LastModified")
+    return last_modified is not None and if_range == http_date(last_modified)
+
+
+def _error_status(error):
+    """Return the HTTP status and error code of an S3 ClientError."""
+    return (
+        error.response.get('ResponseMetadata', {}).get('HTTPStatusCode'),
+        error.response.get('Error', {}).get('Code'),
+    )
+
+
+def _is_not_modified(error):
+    status, code = _error_status(error)
+    return status == 304 or code in ('304', 'NotModified')
+
+
+def _is_range_not_satisfiable(error):
+    status, code = _error_status(error)
+    return status == 416 or code == 'InvalidRange'
+
+
+def _not_modified_response(error, s3_key):
+    """
+    Build a 304 for a conditional GetObject that S3 answered with Not Modified.
+
+    The response carries the object's own ETag and Last-Modified (RFC 9110 section 15.4.5),
+    not the client's If-None-Match value, which may list several tags.
+    """
+    s3_headers = error.response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+    etag = s3_headers.get('etag')
+    last_modified = s3_headers.get('last-modified')
+    if not etag:
+        s3_object = head_s3_object(s3_key)
+        etag = s3_object.get('ETag')
+        last_modified = http_date(s3_object['LastModified']) if s3_object.get('LastModified') else None
+    headers = {'ETag': etag, 'Accept-Ranges': 'bytes'}
+    if last_modified:
+        headers['Last-Modified'] = last_modified
+    return Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+
+def _range_not_satisfiable_response(s3_key, size=None):
+    """Build a 416 with the ``Content-Range: bytes */<size>`` header required by RFC 9110 section 14.4."""
+    if size is None:
+        size = head_s3_object(s3_key)['ContentLength']
+    return Response(
+        status=HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE,
+        headers={'Content-Range': f'bytes */{size}', 'Accept-Ranges': 'bytes'}
+    )
+
+
+def _open_in_app(app, s3_key):
+    """Open a full S3 object from a background thread."""
+    with app.app_context():
+        return open_s3_object(s3_key)
+
+
+def _sniff_in_app(app, first_chunk):
+    """Sniff a mimetype from content from a background thread."""
+    with app.app_context():
+        return detect_mimetype('', first_chunk)
+
+
+def _serve_from_cache(document_cache, s3_key, file_name, range_header=None):
+    """
+    Serve a document from the local disk cache.
+
+    Entries older than the revalidation interval are checked with a conditional
+    GetObject for the client's range first. If S3 cannot be reached the cached
+    copy is served anyway.
+
+    Returns:
+        tuple: (response, s3_object). The response is None when the document is not
+        cached, has changed or was evicted before it could be sent. When revalidation
+        found a changed object, s3_object is its GetObject response for the client's
+        range, so the caller streams (and re-caches) it instead of fetching it again.
+    """
+    entry = document_cache.lookup(s3_key)
+    if entry is None:
+        return None, None
+
+    if document_cache.needs_revalidation(entry):
+        try:
+            # 200/206: the object changed; hand the open response to the caller
+            return None, open_s3_object(s3_key, byte_range=range_header, if_none_match=entry.etag)
+        except ClientError as e:
+            if not _is_not_modified(e):
+                return None, None
+            document_cache.mark_validated(entry)
+        except Exception as e:  # pylint: disable=broad-except
+            current_app.logger.warning(f"S3 revalidation failed for {s3_key}, serving cached copy: {e}")
+            document_cache.count("stale_served")
+
+    mimetype = (
+        mimetypes.guess_type(file_name)[0]
+        or entry.meta.get('sniffed_mimetype')
+        or entry.meta.get('content_type')
+        or 'application/octet-stream'
+    )
+    # send_file streams with the server's sendfile support and handles Range,
+    # If-Range, If-None-Match and If-Modified-Since against the cached file
+    try:
+        response = send_file(
+            entry.path,
+            mimetype=mimetype,
+            as_attachment=mimetype not in VIEWABLE_TYPES,
+            download_name=file_name,
+            conditional=True,
+            etag=entry.etag.strip('"'),
+            last_modified=entry.meta.get('last_modified'),
+            max_age=3600
+        )
+    except RequestedRangeNotSatisfiable:
+        return _range_not_satisfiable_response(s3_key, entry.size), None
+    except FileNotFoundError:
+        # Evicted by another request or worker since the lookup; serve it from S3
+        current_app.logger.info(f"Cached copy of {s3_key} was evicted, fetching from S3")
+        document_cache.count("misses")
+        return None, None
+    response.headers['Cache-Control'] = 'public, max-age=3600, immutable'
+    document_cache.record_hit(response.content_length or 0)
+    current_app.logger.info(f"Served {s3_key} from document cache ({response.status_code}, {response.content_length} bytes)")
+    return response, None
+
+
 document_download_model = ApiHelper.convert_ma_schema_to_restx_model(
     API, DocumentDownloadSchema(), "DocumentDownload"
 )
@@ -102,7 +259,10 @@ class DocumentDownload(Resource):
     The document is returned with appropriate headers for inline viewing (for supported types)
     or as downloadable attachments (for other types).
     
-    The mimetype is automatically detected based on file extension and content analysis.
+    The mimetype is automatically detected based on file extension and content analysis
+    of the first bytes. The object is streamed from S3 in chunks rather than buffered;
+    Range, If-Range, If-None-Match and If-Modified-Since are forwarded to S3, and the S3
+    ETag and Last-Modified are returned so browsers can revalidate without a download.
     
     Example:
         GET /api/document/view?key=path%2Fto%2Fdocument.pdf&file_name=document.pdf
@@ -120,9 +280,11 @@ class DocumentDownload(Resource):
     @API.param('key', 'The S3 key of the document to view (URL encoded)')
     @API.param('file_name', 'The filename to display in the browser (URL encoded)')
     @API.response(200, "Document content with appropriate mimetype")
+    @API.response(206, "Partial Content (Range requests)")
     @API.response(304, "Not Modified (cached version is current)")
     @API.response(400, "Bad Request")
     @API.response(404, "Document Not Found")
+    @API.response(416, "Range Not Satisfiable")
     @API.response(500, "Internal Server Error")
     def get():
         """View a document from S3 storage with automatic mimetype detection."""
@@ -167,57 +329,104 @@ class DocumentDownload(Resource):
             current_app.logger.info(f"Validation successful: {validation_result}")
             
             try:
-                current_app.logger.info(f"Attempting to read file from S3: {s3_key}")
-                
-                # Get the file from S3
-                file_data = read_file_from_s3(s3_key)
-                current_app.logger.info(f"Successfully read file from S3. File size: {len(file_data)} bytes")
-                
-                # Generate ETag from file content
-                current_app.logger.info("Generating ETag for file")
-                file_hash = hashlib.md5(file_data).hexdigest()
-                current_app.logger.info(f"Generated ETag: {file_hash}")
-                
-                # Check if the client has a cached version
+                range_header = request.headers.get('Range')
+                if_range = request.headers.get('If-Range')
                 if_none_match = request.headers.get('If-None-Match')
-                current_app.logger.info(f"Client If-None-Match header: {if_none_match}")
-                if if_none_match and if_none_match == file_hash:
-                    current_app.logger.info("File not modified, returning 304")
-                    return Response(status=304)  # Not Modified
-                
-                # Create response with the file data
-                current_app.logger.info("Creating response with file data")
-                
-                # Detect the actual mimetype based on filename and file content
-                detected_mimetype = detect_mimetype(file_name, file_data)
+
+                s3_object = None
+                document_cache = get_document_cache()
+                if document_cache is not None:
+                    cached_response, s3_object = _serve_from_cache(document_cache, s3_key, file_name, range_header)
+                    if cached_response is not None:
+                        current_app.logger.info("=== Document view request ended (served from cache) ===")
+                        return cached_response
+
+                current_app.logger.info(f"Opening S3 object for streaming: {s3_key}")
+                current_app.logger.info(f"Client Range: {range_header}, If-Range: {if_range}, If-None-Match: {if_none_match}")
+
+                try:
+                    if s3_object is not None:
+                        # Changed object already fetched while revalidating the cached copy
+                        if if_none_match and s3_object.get("ETag") in [tag.strip() for tag in if_none_match.split(',')]:
+                            s3_object["Body"].close()
+                            return Response(status=HTTPStatus.NOT_MODIFIED, headers={
+                                'ETag': s3_object["ETag"], 'Accept-Ranges': 'bytes'
+                            })
+                    else:
+                        s3_object = open_s3_object(
+                            s3_key,
+                            byte_range=range_header,
+                            if_none_match=if_none_match,
+                            # If-Modified-Since is ignored when If-None-Match is present (RFC 9110)
+                            if_modified_since=None if if_none_match else request.if_modified_since
+                        )
+                    if range_header and if_range and not _validator_matches(if_range, s3_object):
+                        # The client's partial copy is stale; send the full current object
+                        current_app.logger.info("If-Range does not match, sending full object")
+                        s3_object["Body"].close()
+                        s3_object = open_s3_object(s3_key)
+                except ClientError as e:
+                    if _is_not_modified(e):
+                        current_app.logger.info("File not modified, returning 304")
+                        return _not_modified_response(e, s3_key)
+                    if _is_range_not_satisfiable(e):
+                        current_app.logger.info(f"Unsatisfiable range requested: {range_header}")
+                        size = e.response.get('Error', {}).get('ActualObjectSize')
+                        return _range_not_satisfiable_response(s3_key, int(size) if size else None)
+                    raise
+
+                body = s3_object["Body"]
+                content_range = s3_object.get("ContentRange")
+                current_app.logger.info(f"S3 object opened. Length: {s3_object.get('ContentLength')}, range: {content_range}")
+
+                # Sniff the mimetype from the first bytes only, and only when they are
+                # the start of the file; later ranges rely on the name and S3 content type
+                first_chunk = b''
+                if not content_range or content_range.startswith('bytes 0-'):
+                    first_chunk = body.read(STREAM_CHUNK_SIZE)
+                    detected_mimetype = detect_mimetype(file_name, first_chunk)
+                else:
+                    detected_mimetype = mimetypes.guess_type(file_name)[0] or s3_object.get('ContentType') or 'application/octet-stream'
                 current_app.logger.info(f"Using mimetype: {detected_mimetype}")
-                
-                # Determine Content-Disposition based on file type
+
                 # Use 'inline' for viewable types (PDF, images) and 'attachment' for downloadable types
-                viewable_types = [
-                    'application/pdf', 
-                    'image/jpeg', 
-                    'image/png', 
-                    'image/gif', 
-                    'text/plain'
-                ]
-                disposition = 'inline' if detected_mimetype in viewable_types else 'attachment'
-                
-                # For large files, we might want to stream the response
-                # But for now, return the full file data
+                disposition = 'inline' if detected_mimetype in VIEWABLE_TYPES else 'attachment'
+
+                headers = {
+                    'Content-Disposition': f'{disposition}; filename="{file_name}"',
+                    'Content-Length': str(s3_object["ContentLength"]),
+                    'Cache-Control': 'public, max-age=3600, immutable',  # Cache for 1 hour
+                    'ETag': s3_object.get("ETag", ''),
+                    'Accept-Ranges': 'bytes'
+                }
+                if s3_object.get("LastModified"):
+                    headers['Last-Modified'] = http_date(s3_object["LastModified"])
+                if content_range:
+                    headers['Content-Range'] = content_range
+
+                chunks = _stream_body(body, first_chunk)
+                if document_cache is not None:
+                    if document_cache.cacheable(s3_object):
+                        # Keep a copy of complete objects as they are streamed
+                        chunks = document_cache.tee(s3_key, s3_object, chunks, detect_mimetype('', first_chunk))
+                    elif content_range and not if_none_match:
+                        # Viewers fetch large PDFs by range; fetch the whole object for next time
+                        app = current_app._get_current_object()  # pylint: disable=protected-access
+                        document_cache.fill_async(
+                            s3_key,
+                            lambda: _open_in_app(app, s3_key),
+                            lambda first: _sniff_in_app(app, first)
+                        )
+
                 response = Response(
-                    file_data,
+                    stream_with_context(chunks),
+                    status=HTTPStatus.PARTIAL_CONTENT if content_range else HTTPStatus.OK,
                     mimetype=detected_mimetype,
-                    headers={
-                        'Content-Disposition': f'{disposition}; filename="{file_name}"',
-                        'Content-Length': str(len(file_data)),
-                        'Cache-Control': 'public, max-age=3600, immutable',  # Cache for 1 hour
-                        'ETag': file_hash,
-                        'Accept-Ranges': 'bytes'  # Enable range requests
-                    }
+                    headers=headers,
+                    direct_passthrough=True
                 )
-                
-                current_app.logger.info(f"Response created with {len(file_data)} bytes")
+
+                current_app.logger.info(f"Streaming {s3_object['ContentLength']} bytes")
                 current_app.logger.info("Document view request completed successfully")
                 current_app.logger.info("=== Document view request ended ===")
                 return response
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Endpoints to check and manage the health of the service."""
+import os
+
 from flask import current_app
 from flask_restx import Namespace, Resource
 
@@ -74,6 +76,24 @@ class Version(Resource):
         }, 200
 
 
+@API.route('transport-status')
+class TransportStatus(Resource):
+    """Vector API connection pool and latency metrics."""
+
+    @staticmethod
+    def get():
+        """Return per-endpoint latency, error and retry counts for vector API calls, async concurrency limits and Ollama queue metrics."""
+        current_app.logger.info("Transport status endpoint called")
+        from ..clients.http_transport import vector_api_transport
+        from ..utils import concurrency
+        stats = vector_api_transport.stats()
+        stats["async_limits"] = concurrency.stats()
+        if os.getenv("LLM_PROVIDER", "openai").lower() == "ollama":
+            from ..services.generation.implementations.ollama.ollama_client import get_ollama_stats
+            stats["ollama"] = get_ollama_stats()
+        return stats, 200
+
+
 @API.route('cache-status')
 class CacheStatus(Resource):
     """Cache monitoring and management endpoint."""
@@ -84,8 +104,13 @@ class CacheStatus(Resource):
         current_app.logger.info("Cache status endpoint called")
         
         try:
+            from ..utils import single_flight
             from ..utils.cache import get_cache_stats
+            from ..clients.catalogue_cache import catalogue_cache
+            from ..services.document_cache import get_document_cache
+            from ..services.generation.implementations import answer_cache, candidate_shortlist, complexity_classifier, extraction_cache
             stats = get_cache_stats()
+            document_cache = get_document_cache()
             
             # Add human readable information
             cache_info = {
@@ -94,7 +119,9 @@ class CacheStatus(Resource):
                     'total_entries': stats['total_entries'],
                     'expired_entries': stats['expired_entries'],
                     'active_entries': stats['total_entries'] - stats['expired_entries'],
-                    'cache_hit_potential': f"{((stats['total_entries'] - stats['expired_entries']) / max(stats['total_entries'], 1)) * 100:.1f}%"
+                    'cache_hit_potential': f"{((stats['total_entries'] - stats['expired_entries']) / max(stats['total_entries'], 1)) * 100:.1f}%",
+                    'hit_ratio': f"{stats['hit_ratio'] * 100:.1f}%",
+                    'size_used': f"{stats['total_bytes'] / max(stats['max_bytes'], 1) * 100:.1f}%"
                 },
                 'cache_keys_summary': [
                     {
@@ -103,7 +130,14 @@ class CacheStatus(Resource):
                         'is_expired': key_info['is_expired']
                     }
                     for key_info in stats['cache_keys']
-                ]
+                ],
+                'catalogue_cache': catalogue_cache.stats(),
+                'document_cache': document_cache.stats() if document_cache is not None else {'enabled': False},
+                'extraction_cache': extraction_cache.stats(),
+                'answer_cache': answer_cache.stats(),
+                'prompt_shortlist': candidate_shortlist.stats(),
+                'auto_mode_classifier': complexity_classifier.stats(),
+                'search_coalescing': single_flight.stats()
             }
             
             current_app.logger.info(f"Cache status: {stats['total_entries']} total, {stats['expired_entries']} expired")
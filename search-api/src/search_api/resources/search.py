@@ -15,16 +15,18 @@
 
 from http import HTTPStatus
 from flask_restx import Namespace, Resource
-from flask import Response, current_app, request
+from flask import Response, current_app, request, stream_with_context
 import time
 import json
 
 from search_api.clients.vector_search_client import VectorSearchClient
 from search_api.services.search_service import SearchService
+from search_api.utils import json_codec, single_flight
 from search_api.utils.util import cors_preflight
 from search_api.schemas.search import SearchRequestSchema
 from search_api.schemas.search import SimilaritySearchRequestSchema
 from search_api.schemas.search import FeedbackSchema
+from search_api.services.generation.factories import SummarizerFactory
 from search_api.auth import auth
 from .apihelper import Api as ApiHelper
 from flask import Response, current_app
@@ -94,7 +96,12 @@ class Search(Resource):
 
             current_app.logger.info("Calling SearchService.get_documents_by_query")
             start_time = time.time()
-            documents = SearchService.get_documents_by_query(query, project_ids, document_type_ids, inference, ranking, search_strategy, mode, user_location, project_status, years)
+            # Identical searches already in flight in this worker share their result
+            documents = single_flight.run(
+                single_flight.search_key(request_data),
+                SearchService.get_documents_by_query,
+                query, project_ids, document_type_ids, inference, ranking, search_strategy, mode, user_location, project_status, years
+            )
             end_time = time.time()
             
             current_app.logger.info(f"SearchService completed in {(end_time - start_time):.2f} seconds")
@@ -114,7 +121,7 @@ class Search(Resource):
             
             current_app.logger.info("=== Search query request completed successfully ===")
             
-            return Response(json.dumps(documents), status=HTTPStatus.OK, mimetype='application/json')
+            return json_codec.response(documents)
         except Exception as e:
             # Log the error internally
             current_app.logger.error(f"Search error occurred: {str(e)}")
@@ -127,6 +134,135 @@ class Search(Resource):
             return Response(json.dumps(error_response), status=HTTPStatus.INTERNAL_SERVER_ERROR, mimetype='application/json')
 
 
+def _sse_event(event: str, data) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json_codec.dumps(data).decode('utf-8')}\n\n"
+
+
+# Sent between summaries when a search requested more than one
+SUMMARY_SEPARATOR = "\n\n"
+
+
+def _deferred_summary_metrics(pending) -> dict:
+    """Context packing and answer cache metrics of the streamed summaries.
+
+    A single summary keeps the metric shape of ``/api/search/query``; with several,
+    each key holds one entry per summary, in the order they were streamed.
+    """
+    metrics = {}
+    for key, attribute in (("summary_context_packing", "context_packing"), ("summary_answer_cache", "answer_cache")):
+        values = [getattr(deferred, attribute) for deferred in pending]
+        if len(values) == 1:
+            if values[0]:
+                metrics[key] = values[0]
+        elif any(values):
+            metrics[key] = values
+    return metrics
+
+
+@cors_preflight("POST, OPTIONS")
+@API.route("/query/stream", methods=["POST", "OPTIONS"])
+class SearchStream(Resource):
+    """Resource for search with a streamed summary."""
+    @staticmethod
+    @auth.requires_epic_search_role(["viewer", "admin"])
+    @ApiHelper.swagger_decorators(API, endpoint_description="Search Query with the summary streamed as server-sent events")
+    @API.expect(search_request_model)
+    @API.response(400, "Bad Request")
+    def post():
+        """Search, streaming the summary as it is generated.
+
+        Sends a ``documents`` event with the full search response as soon as the
+        search completes (its ``response`` is empty), ``token`` events carrying
+        summary text as the LLM produces it, then a ``done`` event with the complete
+        summary, summary timings and the feedback session id. Failures are sent as an
+        ``error`` event. If the handler requested several summaries they are all
+        streamed, in order, separated by a blank line. Modes that do not summarize
+        send no ``token`` events and ``done`` carries the handler's own response.
+        """
+        current_app.logger.info("=== Streaming search query request started ===")
+        request_data = SearchRequestSchema().load(API.payload)
+
+        query = request_data.get("query", None)
+        project_ids = request_data.get("projectIds", None)
+        document_type_ids = request_data.get("documentTypeIds", None)
+        search_args = (
+            query, project_ids, document_type_ids,
+            request_data.get("inference", None),
+            request_data.get("ranking", None),
+            request_data.get("searchStrategy", None),
+            request_data.get("mode", "rag"),
+            request_data.get("userLocation", None),
+            request_data.get("projectStatus", None),
+            request_data.get("years", None),
+        )
+        current_app.logger.info(f"Streaming search parameters - Query: {query[:100] if query else None}, Mode: {search_args[6]}")
+
+        def generate():
+            start_time = time.time()
+            try:
+                # Summaries requested by the handler are recorded instead of generated,
+                # so the documents can be sent before the LLM is called
+                with SummarizerFactory.deferred() as pending:
+                    documents = SearchService.get_documents_by_query(*search_args)
+                yield _sse_event("documents", documents)
+                documents_ms = round((time.time() - start_time) * 1000, 2)
+
+                summary_parts = []
+                summary_metrics = {"documents_sent_ms": documents_ms}
+                if len(pending) > 1:
+                    current_app.logger.warning(f"Search requested {len(pending)} summaries; streaming all of them in order")
+                summary_start = time.time()
+                for index, deferred in enumerate(pending):
+                    if index:
+                        summary_parts.append(SUMMARY_SEPARATOR)
+                        yield _sse_event("token", {"text": SUMMARY_SEPARATOR, "summary": index})
+                    for text in deferred.stream():
+                        if "summary_first_token_ms" not in summary_metrics:
+                            summary_metrics["summary_first_token_ms"] = round((time.time() - summary_start) * 1000, 2)
+                        summary_parts.append(text)
+                        yield _sse_event("token", {"text": text, "summary": index})
+                if pending:
+                    summary_metrics["summary_time_ms"] = round((time.time() - summary_start) * 1000, 2)
+                    summary_metrics.update(_deferred_summary_metrics(pending))
+                summary = "".join(summary_parts)
+                summary_metrics["total_time_ms"] = round((time.time() - start_time) * 1000, 2)
+
+                result = documents.get("result", {}) if isinstance(documents, dict) else {}
+                if pending:
+                    result["response"] = summary
+                    result["cached"] = all(
+                        bool(deferred.answer_cache and deferred.answer_cache.get("hit")) for deferred in pending
+                    )
+                result.setdefault("metrics", {}).update(summary_metrics)
+
+                session_id = VectorSearchClient.create_feedback_session(
+                    query_text=query,
+                    project_ids=project_ids,
+                    document_type_ids=document_type_ids,
+                    search_result=documents
+                )
+                yield _sse_event("done", {
+                    "response": result.get("response"),
+                    "cached": result.get("cached", False),
+                    "metrics": summary_metrics,
+                    "feedback_session_id": session_id
+                })
+                current_app.logger.info(f"=== Streaming search query request completed in {summary_metrics['total_time_ms']}ms ===")
+            except Exception as e:
+                current_app.logger.error(f"Streaming search error occurred: {str(e)}")
+                import traceback
+                current_app.logger.error(f"Full traceback: {traceback.format_exc()}")
+                yield _sse_event("error", {"error": "Internal server error occurred"})
+
+        return Response(
+            stream_with_context(generate()),
+            status=HTTPStatus.OK,
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+
 @cors_preflight("POST, OPTIONS")
 @API.route("/document-similarity", methods=["POST", "OPTIONS"])
 class DocumentSimilaritySearch(Resource):
@@ -0,0 +1,313 @@
+"""
+Local disk cache for documents served from S3.
+
+Popular documents are viewed repeatedly, so complete S3 objects are kept in a
+size-bounded directory and served from disk with ``send_file`` (which uses the WSGI
+server's ``sendfile`` support), avoiding a round trip to the object store.
+
+Each S3 key has a metadata file pointing at the data file for its current ETag, so a
+changed object never serves old bytes. Entries are trusted for
+``DOCUMENT_CACHE_REVALIDATE_SECONDS`` and then revalidated with a conditional
+GetObject. Files are written to a temporary name and renamed into place, so every
+worker process on the host can share the directory. Least recently used data files
+(by modification time, refreshed on every hit) are evicted when the directory
+exceeds ``DOCUMENT_CACHE_MAX_BYTES``.
+
+Configuration (environment):
+    DOCUMENT_CACHE_MAX_BYTES: Total size of the cache; 0 disables it (default: 0)
+    DOCUMENT_CACHE_DIR: Cache directory (default: <tmp>/search-api-documents)
+    DOCUMENT_CACHE_MAX_OBJECT_BYTES: Largest object that is cached (default: 268435456)
+    DOCUMENT_CACHE_REVALIDATE_SECONDS: Seconds before an entry is revalidated against S3 (default: 300)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Background downloads started by ranged requests for uncached documents
+_FILL_WORKERS = 2
+
+
+class CachedDocument:  # pylint: disable=too-few-public-methods
+    """Metadata for a cached S3 object."""
+
+    def __init__(self, meta: Dict[str, Any], path: str, meta_path: str):
+        self.meta = meta
+        self.path = path
+        self.meta_path = meta_path
+
+    @property
+    def etag(self) -> str:
+        """The S3 ETag (quoted, as returned by S3)."""
+        return self.meta["etag"]
+
+    @property
+    def size(self) -> int:
+        """Object size in bytes."""
+        return self.meta["size"]
+
+
+class DocumentCache:
+    """Size-bounded LRU cache of S3 objects on local disk."""
+
+    def __init__(self, directory: str, max_bytes: int, max_object_bytes: int, revalidate_seconds: float):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_object_bytes = max_object_bytes
+        self.revalidate_seconds = revalidate_seconds
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._filling = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats = {
+            "hits": 0, "misses": 0, "revalidated": 0, "replaced": 0, "stale_served": 0,
+            "fills": 0, "fill_errors": 0, "evictions": 0, "bytes_saved": 0,
+        }
+
+    # ------------------------------------------------------------------ lookups
+
+    def _paths(self, s3_key: str, etag: Optional[str] = None):
+        key_hash = hashlib.sha256(s3_key.encode("utf-8")).hexdigest()[:32]
+        meta_path = os.path.join(self.directory, f"{key_hash}.json")
+        if etag is None:
+            return meta_path, None
+        etag_hash = hashlib.sha256(etag.encode("utf-8")).hexdigest()[:16]
+        return meta_path, os.path.join(self.directory, f"{key_hash}-{etag_hash}.bin")
+
+    def lookup(self, s3_key: str) -> Optional[CachedDocument]:
+        """Return the cached entry for a key, or None on a miss."""
+        meta_path, _ = self._paths(s3_key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            self.count("misses")
+            return None
+        _, data_path = self._paths(s3_key, meta["etag"])
+        try:
+            if os.path.getsize(data_path) != meta["size"]:
+                raise OSError("size mismatch")
+            # Refresh the LRU position
+            os.utime(data_path)
+        except OSError:
+            self.count("misses")
+            return None
+        return CachedDocument(meta, data_path, meta_path)
+
+    def needs_revalidation(self, entry: CachedDocument) -> bool:
+        """Whether an entry has been trusted for longer than the revalidation interval."""
+        return time.time() - entry.meta.get("validated_at", 0) >= self.revalidate_seconds
+
+    def mark_validated(self, entry: CachedDocument) -> None:
+        """Record that S3 confirmed the entry is still current."""
+        entry.meta["validated_at"] = time.time()
+        self._write_meta(entry.meta_path, entry.meta)
+        self.count("revalidated")
+
+    def record_hit(self, bytes_served: int) -> None:
+        """Count a hit and the S3 bytes it avoided."""
+        with self._lock:
+            self._stats["hits"] += 1
+            self._stats["bytes_saved"] += bytes_served
+
+    def count(self, name: str) -> None:
+        """Increment a counter."""
+        with self._lock:
+            self._stats[name] += 1
+
+    # ------------------------------------------------------------------ fills
+
+    def cacheable(self, s3_object: Dict[str, Any]) -> bool:
+        """Whether a full GetObject response can be stored."""
+        return (
+            "ContentRange" not in s3_object and
+            bool(s3_object.get("ETag")) and
+            s3_object.get("ContentLength", 0) <= self.max_object_bytes
+        )
+
+    def tee(self, s3_key: str, s3_object: Dict[str, Any], chunks: Iterator[bytes],
+            sniffed_mimetype: Optional[str] = None) -> Iterator[bytes]:
+        """Yield ``chunks`` while writing them to the cache.
+
+        The entry is only committed once every byte has been written, so a client
+        that disconnects early leaves nothing behind.
+        """
+        _, data_path = self._paths(s3_key, s3_object["ETag"])
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        written = 0
+        complete = False
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    written += len(chunk)
+                    yield chunk
+            complete = written == s3_object["ContentLength"]
+            if complete:
+                self._commit(s3_key, s3_object, tmp_path, data_path, sniffed_mimetype)
+        except OSError as e:
+            logger.warning(f"Document cache write failed for {s3_key}: {e}")
+            self.count("fill_errors")
+        finally:
+            if not complete and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def fill_async(self, s3_key: str, open_object, sniff) -> None:
+        """Download a whole object into the cache in the background.
+
+        Used when an uncached document is requested by range, so the next request
+        is served from disk.
+
+        Args:
+            s3_key: The S3 key
+            open_object: Callable returning a full GetObject response for the key;
+                runs in a worker thread, so it must carry its own app context
+            sniff: Callable returning the mimetype for the first bytes of the object
+        """
+        with self._lock:
+            if s3_key in self._filling:
+                return
+            self._filling.add(s3_key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=_FILL_WORKERS, thread_name_prefix="document-cache")
+
+        def fill():
+            try:
+                s3_object = open_object()
+                body = s3_object["Body"]
+                try:
+                    if not self.cacheable(s3_object):
+                        return
+                    first = body.read(64 * 1024)
+                    chunks = _prepend(first, body.iter_chunks(chunk_size=1024 * 1024))
+                    for _ in self.tee(s3_key, s3_object, chunks, sniff(first)):
+                        pass
+                finally:
+                    body.close()
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning(f"Background document cache fill failed for {s3_key}: {e}")
+                self.count("fill_errors")
+            finally:
+                with self._lock:
+                    self._filling.discard(s3_key)
+
+        self._executor.submit(fill)
+
+    def _commit(self, s3_key, s3_object, tmp_path, data_path, sniffed_mimetype) -> None:
+        meta_path, _ = self._paths(s3_key)
+        previous = self._read_meta(meta_path)
+        os.replace(tmp_path, data_path)
+        last_modified = s3_object.get("LastModified")
+        self._write_meta(meta_path, {
+            "key": s3_key,
+            "etag": s3_object["ETag"],
+            "size": s3_object["ContentLength"],
+            "last_modified": last_modified.timestamp() if last_modified else None,
+            "content_type": s3_object.get("ContentType"),
+            "sniffed_mimetype": sniffed_mimetype,
+            "validated_at": time.time(),
+        })
+        if previous and previous.get("etag") != s3_object["ETag"]:
+            _, old_path = self._paths(s3_key, previous["etag"])
+            _remove_quietly(old_path)
+            self.count("replaced")
+        self.count("fills")
+        self._evict()
+
+    @staticmethod
+    def _read_meta(meta_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, meta_path: str, meta: Dict[str, Any]) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def _scan(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".bin"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def _evict(self) -> None:
+        """Remove least recently used data files until the cache fits ``max_bytes``."""
+        files = self._scan()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            _remove_quietly(path)
+            # The metadata file is left behind; lookups treat a missing data file as a miss
+            total -= size
+            self.count("evictions")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and disk usage."""
+        with self._lock:
+            counters = dict(self._stats)
+        files = self._scan()
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "hit_ratio": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": len(files),
+            "total_bytes": sum(size for _, size, _ in files),
+            "max_bytes": self.max_bytes,
+            "directory": self.directory,
+        }
+
+
+def _prepend(first: bytes, chunks: Iterator[bytes]) -> Iterator[bytes]:
+    if first:
+        yield first
+    yield from chunks
+
+
+def _remove_quietly(path: Optional[str]) -> None:
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+_document_cache: Optional[DocumentCache] = None
+_document_cache_lock = threading.Lock()
+
+
+def get_document_cache() -> Optional[DocumentCache]:
+    """Return the document cache for this worker, or None when it is disabled."""
+    global _document_cache  # pylint: disable=global-statement
+    max_bytes = int(os.getenv("DOCUMENT_CACHE_MAX_BYTES", "0"))
+    if max_bytes <= 0:
+        return None
+    if _document_cache is None:
+        with _document_cache_lock:
+            if _document_cache is None:
+                _document_cache = DocumentCache(
+                    directory=os.getenv("DOCUMENT_CACHE_DIR") or
+                    os.path.join(tempfile.gettempdir(), "search-api-documents"),
+                    max_bytes=max_bytes,
+                    max_object_bytes=int(os.getenv("DOCUMENT_CACHE_MAX_OBJECT_BYTES", str(256 * 1024 * 1024))),
+                    revalidate_seconds=float(os.getenv("DOCUMENT_CACHE_REVALIDATE_SECONDS", "300")),
+                )
+    return _document_cache
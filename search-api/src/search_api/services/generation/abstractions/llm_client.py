@@ -1,7 +1,10 @@
 """Abstract base class for LLM clients."""
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional
+
+from search_api.utils import concurrency
 
 
 class LLMClient(ABC):
@@ -23,6 +26,48 @@ class LLMClient(ABC):
         """
         pass
     
+    def chat_completion_stream(self, messages: List[Dict[str, str]], temperature: float = 0.3,
+                               max_tokens: Optional[int] = None) -> Iterator[str]:
+        """Stream the text of a chat completion as it is generated.
+        
+        Providers that cannot stream yield the whole completion at once.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            temperature: Temperature for response generation
+            max_tokens: Maximum tokens to generate
+            
+        Yields:
+            Pieces of the completion text in order
+        """
+        response = self.chat_completions_create(
+            model=self.get_model_name(), messages=messages, temperature=temperature, max_tokens=max_tokens
+        )
+        content = response["choices"][0]["message"]["content"]
+        if content:
+            yield content
+    
+    async def chat_completion_async(self, messages: List[Dict[str, str]], temperature: float = 0.3,
+                                    max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """Create a chat completion without blocking the event loop.
+        
+        Providers without an async client run the synchronous call on a worker
+        thread. Either way the call holds a slot of the ``llm`` concurrency limit.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            temperature: Temperature for response generation
+            max_tokens: Maximum tokens to generate
+            
+        Returns:
+            Chat completion response in the same format as ``chat_completions_create``
+        """
+        async with concurrency.limit("llm"):
+            return await asyncio.to_thread(
+                self.chat_completions_create,
+                model=self.get_model_name(), messages=messages, temperature=temperature, max_tokens=max_tokens
+            )
+    
     @abstractmethod
     def get_provider_name(self) -> str:
         """Get the provider name (e.g., 'openai', 'ollama')."""
@@ -1,7 +1,10 @@
 """Abstract base class for summarizers."""
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
+
+from search_api.utils import concurrency
 
 
 class Summarizer(ABC):
@@ -28,4 +31,38 @@ class Summarizer(ABC):
                 'model': str
             }
         """
-        pass
\ No newline at end of file
+        pass
+    
+    async def summarize_search_results_async(self, query: str, documents_or_chunks: List[Dict[str, Any]],
+                                             search_context: Optional[Dict] = None) -> Dict[str, Any]:
+        """Summarize search results without blocking the event loop.
+        
+        Summarizers without an async implementation run ``summarize_search_results``
+        on a worker thread, holding a slot of the ``llm`` concurrency limit.
+        
+        Args:
+            query: Original search query
+            documents_or_chunks: List of document/chunk dictionaries
+            search_context: Additional context about the search
+            
+        Returns:
+            Dict containing the summarization result, as ``summarize_search_results``
+        """
+        async with concurrency.limit("llm"):
+            return await asyncio.to_thread(self.summarize_search_results, query, documents_or_chunks, search_context)
+    
+    def stream_search_results(self, query: str, documents_or_chunks: List[Dict[str, Any]],
+                              search_context: Optional[Dict] = None) -> Iterator[str]:
+        """Stream the summary of search results as it is generated.
+        
+        Summarizers that cannot stream yield the whole summary at once.
+        
+        Args:
+            query: Original search query
+            documents_or_chunks: List of document/chunk dictionaries
+            search_context: Additional context about the search
+            
+        Yields:
+            Pieces of the summary text in order
+        """
+        yield self.summarize_search_results(query, documents_or_chunks, search_context)['summary']
@@ -1,25 +1,75 @@
 """Factory for creating query complexity analyzer instances."""
 
 import os
-from typing import Type
+import time
+from typing import Any, Dict, List, Optional
 from ..abstractions.query_complexity_analyzer import QueryComplexityAnalyzer
+from ..implementations import complexity_classifier
+
+
+class _LocalFirstComplexityAnalyzer(QueryComplexityAnalyzer):
+    """Classifies locally, asking the LLM analyzer only when the local classifier is unsure."""
+
+    def __init__(self):
+        self._llm_analyzer: Optional[QueryComplexityAnalyzer] = None
+
+    def analyze_complexity(self, query: str, project_ids: Optional[List[str]] = None,
+                           document_type_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        start = time.perf_counter()
+        result = complexity_classifier.classify(query, project_ids, document_type_ids)
+        result["source"] = "local"
+        result["local_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+        threshold = complexity_classifier.confidence_threshold()
+        if result["confidence"] < threshold:
+            if self._llm_analyzer is None:
+                self._llm_analyzer = QueryComplexityFactory.create_llm_analyzer()
+            local = result
+            result = self._llm_analyzer.analyze_complexity(query, project_ids, document_type_ids)
+            result["source"] = "llm"
+            result["local"] = local
+            result["escalation_reason"] = f"Local confidence {local['confidence']} below {threshold}"
+            # Failed LLM analyses report confidence 0.0 and are not learned
+            complexity_classifier.learn(query, result.get("complexity_tier"), float(result.get("confidence") or 0))
+
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        complexity_classifier.record(query, result, project_ids, document_type_ids)
+        return result
 
 
 class QueryComplexityFactory:
     """Factory for creating query complexity analyzer instances based on configuration."""
-    
+
     @staticmethod
     def create_analyzer() -> QueryComplexityAnalyzer:
         """Create and return a query complexity analyzer instance based on configuration.
-        
+
+        Unless AUTO_MODE_CLASSIFIER is "llm", the analyzer classifies queries locally
+        and only calls the configured LLM analyzer when its confidence is below
+        AUTO_MODE_CONFIDENCE_THRESHOLD.
+
         Returns:
             QueryComplexityAnalyzer: An instance of the configured query complexity analyzer.
-            
+
+        Raises:
+            ValueError: If the provider is not supported or configuration is missing.
+        """
+        if complexity_classifier.is_enabled():
+            return _LocalFirstComplexityAnalyzer()
+        return QueryComplexityFactory.create_llm_analyzer()
+
+    @staticmethod
+    def create_llm_analyzer() -> QueryComplexityAnalyzer:
+        """Create the LLM-backed analyzer for the configured provider.
+
+        Returns:
+            QueryComplexityAnalyzer: An instance of the provider's query complexity analyzer.
+
         Raises:
             ValueError: If the provider is not supported or configuration is missing.
         """
         provider = os.environ.get("LLM_PROVIDER", "openai").lower()
-        
+
         if provider == "openai":
             from ..implementations.openai.openai_query_complexity_analyzer import OpenAIQueryComplexityAnalyzer
             return OpenAIQueryComplexityAnalyzer()
@@ -28,8 +78,8 @@ class QueryComplexityFactory:
             return OllamaQueryComplexityAnalyzer()
         else:
             raise ValueError(f"Unsupported LLM provider: {provider}. Supported: openai, ollama")
-    
+
     @staticmethod
     def get_provider() -> str:
         """Get the current provider name."""
-        return os.environ.get("LLM_PROVIDER", "openai").lower()
\ No newline at end of file
+        return os.environ.get("LLM_PROVIDER", "openai").lower()
@@ -1,35 +1,212 @@
 """Factory for creating summarizer instances."""
 
+import contextvars
 import os
-from typing import Type
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Type
 from ..abstractions.summarizer import Summarizer
+from ..implementations import answer_cache
+
+# Set while a streaming request defers its summary until the documents have been sent
+_deferred_summaries: contextvars.ContextVar = contextvars.ContextVar("deferred_summaries", default=None)
+
+
+class DeferredSummary:
+    """A summary request recorded during a streaming search, generated afterwards."""
+
+    def __init__(self, query: str, documents_or_chunks: List[Dict[str, Any]], search_context: Optional[Dict] = None):
+        self.query = query
+        self.documents_or_chunks = documents_or_chunks
+        self.search_context = search_context
+        self.summarizer: Optional[Summarizer] = None
+
+    def stream(self) -> Iterator[str]:
+        """Generate the summary with the configured summarizer, yielding text as it arrives."""
+        self.summarizer = SummarizerFactory.create_summarizer()
+        return self.summarizer.stream_search_results(self.query, self.documents_or_chunks, self.search_context)
+
+    @property
+    def context_packing(self) -> Optional[Dict[str, Any]]:
+        """Prompt context packing statistics, once the summary has been generated."""
+        return getattr(self.summarizer, "last_context_packing", None)
+
+    @property
+    def answer_cache(self) -> Optional[Dict[str, Any]]:
+        """Answer cache outcome, once the summary has been generated."""
+        return getattr(self.summarizer, "last_answer_cache", None)
+
+
+class _DeferringSummarizer(Summarizer):
+    """Stands in for the summarizer while summaries are deferred; records the request."""
+
+    def __init__(self, pending: List[DeferredSummary]):
+        self._pending = pending
+
+    def summarize_search_results(self, query: str, documents_or_chunks: List[Dict[str, Any]],
+                                 search_context: Optional[Dict] = None) -> Dict[str, Any]:
+        self._pending.append(DeferredSummary(query, documents_or_chunks, search_context))
+        return {
+            'summary': '',
+            'method': 'streamed',
+            'confidence': 0.8,
+            'documents_count': len(documents_or_chunks),
+            'provider': SummarizerFactory.get_provider(),
+            'model': 'streamed'
+        }
+
+
+class _CachingSummarizer(Summarizer):
+    """Serves summaries from the answer cache, generating them with the wrapped summarizer on a miss."""
+
+    def __init__(self, summarizer: Summarizer):
+        self._summarizer = summarizer
+        self.last_answer_cache: Optional[Dict[str, Any]] = None
+
+    @property
+    def last_context_packing(self) -> Optional[Dict[str, Any]]:
+        """Context packing statistics of the wrapped summarizer (None on a cache hit)."""
+        if self.last_answer_cache and self.last_answer_cache.get("hit"):
+            return None
+        return getattr(self._summarizer, "last_context_packing", None)
+
+    def _key(self, documents_or_chunks: List[Dict[str, Any]], search_context: Optional[Dict]) -> str:
+        context = search_context.get("context") if search_context else None
+        return answer_cache.context_key(documents_or_chunks, answer_cache.prompt_version(self._summarizer, context))
+
+    def _is_fallback(self, summary: str, query: str, documents_or_chunks: List[Dict[str, Any]]) -> bool:
+        """Whether the summarizer fell back to its canned summary (the LLM call failed)."""
+        fallback = getattr(self._summarizer, "_fallback_summary", None)
+        return callable(fallback) and summary == fallback(documents_or_chunks, query)
+
+    def summarize_search_results(self, query: str, documents_or_chunks: List[Dict[str, Any]],
+                                 search_context: Optional[Dict] = None) -> Dict[str, Any]:
+        if not documents_or_chunks:
+            return self._summarizer.summarize_search_results(query, documents_or_chunks, search_context)
+        key = self._key(documents_or_chunks, search_context)
+        cached = answer_cache.lookup(query, key)
+        if cached is not None:
+            self.last_answer_cache = cached["answer_cache"]
+            return cached
+
+        start = time.time()
+        result = self._summarizer.summarize_search_results(query, documents_or_chunks, search_context)
+        return self._store(query, key, documents_or_chunks, result, start)
+
+    async def summarize_search_results_async(self, query: str, documents_or_chunks: List[Dict[str, Any]],
+                                             search_context: Optional[Dict] = None) -> Dict[str, Any]:
+        if not documents_or_chunks:
+            return await self._summarizer.summarize_search_results_async(query, documents_or_chunks, search_context)
+        key = self._key(documents_or_chunks, search_context)
+        cached = answer_cache.lookup(query, key)
+        if cached is not None:
+            self.last_answer_cache = cached["answer_cache"]
+            return cached
+
+        start = time.time()
+        result = await self._summarizer.summarize_search_results_async(query, documents_or_chunks, search_context)
+        return self._store(query, key, documents_or_chunks, result, start)
+
+    def _store(self, query: str, key: str, documents_or_chunks: List[Dict[str, Any]],
+               result: Dict[str, Any], start: float) -> Dict[str, Any]:
+        """Cache a freshly generated summary unless the LLM call failed."""
+        latency_ms = round((time.time() - start) * 1000, 2)
+        if result.get("method") == "error_fallback" or self._is_fallback(result.get("summary", ""), query, documents_or_chunks):
+            answer_cache.skip(result, "llm_failed")
+        else:
+            answer_cache.store(query, key, result, latency_ms)
+        self.last_answer_cache = result["answer_cache"]
+        return result
+
+    def stream_search_results(self, query: str, documents_or_chunks: List[Dict[str, Any]],
+                              search_context: Optional[Dict] = None) -> Iterator[str]:
+        if not documents_or_chunks:
+            yield from self._summarizer.stream_search_results(query, documents_or_chunks, search_context)
+            return
+        key = self._key(documents_or_chunks, search_context)
+        cached = answer_cache.lookup(query, key)
+        if cached is not None:
+            self.last_answer_cache = cached["answer_cache"]
+            yield cached["summary"]
+            return
+
+        start = time.time()
+        parts: List[str] = []
+        for text in self._summarizer.stream_search_results(query, documents_or_chunks, search_context):
+            parts.append(text)
+            yield text
+        latency_ms = round((time.time() - start) * 1000, 2)
+        summary = "".join(parts)
+        client = getattr(self._summarizer, "client", None)
+        result = {
+            'summary': summary,
+            'method': f"{SummarizerFactory.get_provider()}_summarization",
+            'confidence': 0.8,
+            'documents_count': len(documents_or_chunks),
+            'provider': SummarizerFactory.get_provider(),
+            'model': client.get_model_name() if client is not None else 'unknown',
+            'context_packing': getattr(self._summarizer, "last_context_packing", None)
+        }
+        if not summary or self._is_fallback(summary, query, documents_or_chunks):
+            answer_cache.skip(result, "llm_failed")
+        else:
+            answer_cache.store(query, key, result, latency_ms)
+        self.last_answer_cache = result["answer_cache"]
 
 
 class SummarizerFactory:
     """Factory for creating summarizer instances based on configuration."""
-    
+
     @staticmethod
     def create_summarizer() -> Summarizer:
         """Create and return a summarizer instance based on configuration.
-        
+
+        Inside ``SummarizerFactory.deferred()`` the returned summarizer only records
+        what it was asked to summarize, so the caller can stream the summary later.
+        Otherwise, unless ANSWER_CACHE_ENABLED is "false", the summarizer is wrapped so
+        that a paraphrased question over the same results is answered from the cache.
+
         Returns:
             Summarizer: An instance of the configured summarizer.
-            
+
         Raises:
             ValueError: If the provider is not supported or configuration is missing.
         """
+        pending = _deferred_summaries.get()
+        if pending is not None:
+            return _DeferringSummarizer(pending)
+
         provider = os.environ.get("LLM_PROVIDER", "openai").lower()
-        
+
         if provider == "openai":
             from ..implementations.openai.openai_summarizer import OpenAISummarizer
-            return OpenAISummarizer()
+            summarizer = OpenAISummarizer()
         elif provider == "ollama":
             from ..implementations.ollama.ollama_summarizer import OllamaSummarizer
-            return OllamaSummarizer()
+            summarizer = OllamaSummarizer()
         else:
             raise ValueError(f"Unsupported LLM provider: {provider}. Supported: openai, ollama")
-    
+
+        if answer_cache.is_enabled():
+            return _CachingSummarizer(summarizer)
+        return summarizer
+
+    @staticmethod
+    @contextmanager
+    def deferred():
+        """Defer every summary requested in this block.
+
+        Yields the list of ``DeferredSummary`` requests recorded in the block. Work
+        submitted with ``tracing.submit_with_context`` shares the list.
+        """
+        pending: List[DeferredSummary] = []
+        token = _deferred_summaries.set(pending)
+        try:
+            yield pending
+        finally:
+            _deferred_summaries.reset(token)
+
     @staticmethod
     def get_provider() -> str:
         """Get the current provider name."""
-        return os.environ.get("LLM_PROVIDER", "openai").lower()
\ No newline at end of file
+        return os.environ.get("LLM_PROVIDER", "openai").lower()
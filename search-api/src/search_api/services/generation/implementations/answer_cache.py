@@ -0,0 +1,270 @@
+"""
+Answer Cache
+Serves a recent LLM summary again when a question is a paraphrase of an earlier one
+asked over the same retrieved chunks.
+
+Entries are grouped by a context key: a hash of the retrieved documents/chunks (their
+ids, page numbers and content), the summarization prompt template and the LLM
+provider/model. Within a group, the cached answer is reused when the query embedding
+is close enough (cosine similarity) to the query it was generated for. A change of
+retrieved chunks, prompt wording or model therefore never serves a stale summary.
+
+Query embeddings are computed locally by feature hashing the query's content words
+(stemmed to a shared prefix) and their character trigrams into a sparse vector, so a
+lookup costs well under a millisecond and needs no model or network call. Reordered,
+re-punctuated or slightly reworded questions ("caribou impacts at Site C" / "What are
+the impacts on caribou at Site C?") land close together.
+
+Hashed features barely move when a single word changes, so similarity alone would
+answer "Which conditions were not met?" with the answer to "Which conditions were
+met?". An entry is therefore only considered when the query has exactly the same
+content terms: the same word stems (including question words such as "when" or
+"why" and quantifiers such as "all" or "any"), the same numbers and the same
+negation ("not", "never", "no", "didn't", ...). The similarity threshold then only
+has to tolerate rewording, punctuation and word order.
+
+Entries are kept in memory per worker, bounded in number (least recently used entries
+are evicted first) and in age.
+
+Configuration (environment):
+    ANSWER_CACHE_ENABLED: Set to "false" to always call the LLM for summaries (default: true)
+    ANSWER_CACHE_SIMILARITY: Cosine similarity (0-1) needed to reuse an answer (default: 0.85)
+    ANSWER_CACHE_TTL_SECONDS: Lifetime of a cached answer (default: 1800)
+    ANSWER_CACHE_MAX_ENTRIES: Answers kept per worker (default: 256)
+"""
+import copy
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Shortest shared prefix treated as the same stem ("assess" for "assessment"/"assessments")
+_STEM_LENGTH = 5
+# Weight of character trigrams relative to whole words
+_TRIGRAM_WEIGHT = 0.5
+_DIMENSIONS = 1 << 20
+
+# Interrogatives (who, when, why, ...) and quantifiers (all, any) are not stopwords:
+# they change what is asked, so they are content terms that must match
+_STOPWORDS = frozenset({
+    "a", "about", "an", "and", "are", "as", "at", "be", "by", "can", "could",
+    "did", "do", "does", "for", "from", "give", "has", "have", "i", "in", "is", "it",
+    "its", "me", "of", "on", "or", "please", "regarding", "tell", "that", "the", "their",
+    "there", "these", "this", "those", "to", "us", "was", "were", "will", "with", "would",
+})
+
+_NEGATIONS = frozenset({
+    "no", "not", "never", "none", "nor", "neither", "nobody", "nothing", "nowhere", "without", "cannot",
+})
+
+_lock = threading.Lock()
+# context key -> [entry, ...]; ordered by last use, oldest first
+_entries: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+_size = 0
+_stats = {"hits": 0, "misses": 0, "stores": 0, "skipped": 0, "evicted": 0, "saved_ms": 0.0}
+
+
+def is_enabled() -> bool:
+    """Whether summaries are served from the answer cache."""
+    return os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+
+
+def _content_words(query: str) -> List[str]:
+    """Lower-cased words of a query without stopwords; contractions such as "didn't" become "did not"."""
+    text = re.sub(r"n['\u2019]t\b", " not", (query or "").lower())
+    return [w for w in re.findall(r"[a-z0-9]+", text) if w not in _STOPWORDS]
+
+
+def query_terms(query: str) -> frozenset:
+    """The content terms that must match for a cached answer to be reused.
+
+    Words are compared by stem, numbers (any word containing a digit) exactly, and
+    every negation word counts as the same ``not`` term.
+    """
+    terms = set()
+    for word in _content_words(query):
+        if word in _NEGATIONS:
+            terms.add("not")
+        elif any(ch.isdigit() for ch in word):
+            terms.add(word)
+        else:
+            terms.add(word[:_STEM_LENGTH])
+    return frozenset(terms)
+
+
+def embed_query(query: str) -> Dict[int, float]:
+    """Embed a query as a normalized sparse vector of hashed words and trigrams."""
+    vector: Dict[int, float] = {}
+    words = _content_words(query)
+    for word in words:
+        features = [(f"w:{word[:_STEM_LENGTH]}", 1.0)]
+        padded = f" {word} "
+        features.extend((f"t:{padded[i:i + 3]}", _TRIGRAM_WEIGHT) for i in range(len(padded) - 2))
+        for feature, weight in features:
+            index = zlib.crc32(feature.encode("utf-8")) % _DIMENSIONS
+            vector[index] = vector.get(index, 0.0) + weight
+    norm = math.sqrt(sum(v * v for v in vector.values()))
+    return {k: v / norm for k, v in vector.items()} if norm else {}
+
+
+def cosine(a: Dict[int, float], b: Dict[int, float]) -> float:
+    """Cosine similarity of two normalized sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+
+def prompt_version(summarizer: Any, context: Optional[str] = None) -> str:
+    """Hash the summarizer's prompt template, provider and model.
+
+    The template is rendered with a placeholder query, so any change to the prompt
+    wording gives new keys without a version number to maintain.
+    """
+    build = getattr(summarizer, "_build_summarization_prompt", None)
+    template = build("{query}", context) if callable(build) else ""
+    client = getattr(summarizer, "client", None)
+    model = client.get_model_name() if client is not None and hasattr(client, "get_model_name") else ""
+    payload = json.dumps([type(summarizer).__name__, model, template])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def context_key(documents_or_chunks: List[Dict[str, Any]], version: str) -> str:
+    """Hash the retrieved documents/chunks (order independent) and the prompt version."""
+    ids = []
+    for doc in documents_or_chunks:
+        if not isinstance(doc, dict):
+            ids.append(str(doc))
+            continue
+        content = doc.get("content") or ""
+        ids.append("|".join([
+            str(doc.get("chunk_id") or doc.get("document_id") or ""),
+            str(doc.get("page_number") or ""),
+            hashlib.sha1(content.encode("utf-8")).hexdigest()[:16],
+        ]))
+    payload = json.dumps([version, sorted(ids)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _count(name: str, amount: float = 1) -> None:
+    with _lock:
+        _stats[name] += amount
+
+
+def _best_match(key: str, terms: frozenset, vector: Dict[int, float],
+                now: float) -> Tuple[Optional[Dict[str, Any]], float]:
+    """Most similar live entry with the same content terms for a context key (call with the lock held)."""
+    global _size  # pylint: disable=global-statement
+    ttl = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "1800"))
+    group = _entries.get(key)
+    if not group:
+        return None, 0.0
+    live = [e for e in group if now - e["stored_at"] < ttl]
+    _size -= len(group) - len(live)
+    if not live:
+        del _entries[key]
+        return None, 0.0
+    _entries[key] = live
+    _entries.move_to_end(key)
+    best, best_similarity = None, 0.0
+    for entry in live:
+        if entry["terms"] != terms:
+            continue
+        similarity = cosine(vector, entry["vector"])
+        if similarity > best_similarity:
+            best, best_similarity = entry, similarity
+    return best, best_similarity
+
+
+def lookup(query: str, key: str) -> Optional[Dict[str, Any]]:
+    """Return a copy of a cached summary result for a similar query, or None.
+
+    The copy carries ``cached: True`` and an ``answer_cache`` block describing the hit.
+    """
+    terms = query_terms(query)
+    vector = embed_query(query)
+    threshold = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.85"))
+    now = time.time()
+    with _lock:
+        entry, similarity = _best_match(key, terms, vector, now)
+        hit = entry is not None and similarity >= threshold
+        _stats["hits" if hit else "misses"] += 1
+        if hit:
+            _stats["saved_ms"] += entry["latency_ms"]
+    if not hit:
+        return None
+    result = copy.deepcopy(entry["result"])
+    result["cached"] = True
+    result["answer_cache"] = {
+        "hit": True,
+        "similarity": round(similarity, 4),
+        "cached_query": entry["query"],
+        "saved_ms": entry["latency_ms"],
+        "age_seconds": round(now - entry["stored_at"], 1),
+    }
+    logger.info(f"Answer cache hit (similarity {similarity:.3f}, saved ~{entry['latency_ms']}ms of LLM time)")
+    return result
+
+
+def store(query: str, key: str, result: Dict[str, Any], latency_ms: float) -> None:
+    """Cache a summary result and annotate it as a miss."""
+    global _size  # pylint: disable=global-statement
+    max_entries = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "256"))
+    entry = {
+        "query": query,
+        "terms": query_terms(query),
+        "vector": embed_query(query),
+        "result": {k: copy.deepcopy(v) for k, v in result.items() if k not in ("cached", "answer_cache")},
+        "latency_ms": latency_ms,
+        "stored_at": time.time(),
+    }
+    with _lock:
+        _entries.setdefault(key, []).append(entry)
+        _entries.move_to_end(key)
+        _size += 1
+        _stats["stores"] += 1
+        while _size > max_entries and _entries:
+            oldest_key = next(iter(_entries))
+            group = _entries[oldest_key]
+            group.pop(0)
+            _size -= 1
+            _stats["evicted"] += 1
+            if not group:
+                del _entries[oldest_key]
+    result["cached"] = False
+    result["answer_cache"] = {"hit": False, "latency_ms": latency_ms}
+
+
+def skip(result: Dict[str, Any], reason: str) -> None:
+    """Record that a summary was not cached (e.g. the LLM call failed)."""
+    _count("skipped")
+    result["cached"] = False
+    result["answer_cache"] = {"hit": False, "stored": False, "reason": reason}
+
+
+def clear() -> None:
+    """Drop every cached answer."""
+    global _size  # pylint: disable=global-statement
+    with _lock:
+        _entries.clear()
+        _size = 0
+
+
+def stats() -> Dict[str, Any]:
+    """Return hit ratio, size and LLM time saved since the worker started."""
+    with _lock:
+        counters = dict(_stats)
+        counters["entries"] = _size
+    lookups = counters["hits"] + counters["misses"]
+    counters["saved_ms"] = round(counters["saved_ms"], 2)
+    counters["hit_ratio"] = round(counters["hits"] / lookups, 4) if lookups else 0.0
+    counters["enabled"] = is_enabled()
+    return counters
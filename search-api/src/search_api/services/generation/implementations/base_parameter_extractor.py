@@ -4,10 +4,13 @@ Contains common logic for parameter extraction approach.
 """
 import json
 import logging
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional, Any, Union
 
 from search_api.services.generation.abstractions.parameter_extractor import ParameterExtractor
+from search_api.services.generation.implementations import candidate_shortlist, extraction_cache
+from search_api.utils.tracing import submit_with_context
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +19,10 @@ class BaseParameterExtractor(ParameterExtractor):
    
     def __init__(self, client):
         self.client = client
+        # Set when any part of an extraction fell back to heuristics; such results are not cached
+        self._used_fallback = False
+        # Candidate shortlist decisions and prompt token estimates for the current extraction
+        self._prompt_shortlist = {}
    
     def extract_parameters(
         self,
@@ -54,6 +61,27 @@ class BaseParameterExtractor(ParameterExtractor):
         logger.info("=== PARAMETER EXTRACTION START ===")
         logger.info(f"Query to extract from: '{query}'")
         logger.info(f"Use parallel execution: {use_parallel}")
+
+        cache_key = None
+        if extraction_cache.is_enabled():
+            cache_key = extraction_cache.make_key(
+                query,
+                user_location,
+                extraction_cache.catalogue_version(available_projects, available_document_types, available_strategies),
+                self._model_identity(),
+                {
+                    "project_ids": supplied_project_ids,
+                    "document_type_ids": supplied_document_type_ids,
+                    "search_strategy": supplied_search_strategy,
+                    "location": supplied_location,
+                    "project_status": supplied_project_status,
+                    "years": supplied_years,
+                }
+            )
+            cached_result = extraction_cache.get(cache_key)
+            if cached_result is not None:
+                logger.info("=== PARAMETER EXTRACTION END (cached) ===")
+                return cached_result
        
         # Log available context data - SHOW ALL DATA (no truncation)
         logger.info("=== AVAILABLE CONTEXT DATA ===")
@@ -99,26 +127,57 @@ class BaseParameterExtractor(ParameterExtractor):
         projects_dict = self._convert_projects_array_to_dict(available_projects)
         document_types_dict = self._convert_document_types_array_to_dict(available_document_types)
        
+        self._used_fallback = False
+        self._prompt_shortlist = {}
+        extraction_start = time.perf_counter()
         if use_parallel:
             try:
-                return self._extract_parameters_parallel(
+                result = self._extract_parameters_parallel(
                     query, projects_dict, available_projects_metadata, document_types_dict, available_strategies,
                     supplied_project_ids, supplied_document_type_ids, supplied_search_strategy,
                     user_location, supplied_location, supplied_project_status, supplied_years
                 )
             except Exception as e:
                 logger.warning(f"Parallel extraction failed, falling back to sequential: {e}")
-                return self._extract_parameters_sequential(
+                result = self._extract_parameters_sequential(
                     query, projects_dict, available_projects_metadata, document_types_dict, available_strategies,
                     supplied_project_ids, supplied_document_type_ids, supplied_search_strategy,
                     user_location, supplied_location, supplied_project_status, supplied_years
                 )
         else:
-            return self._extract_parameters_sequential(
+            result = self._extract_parameters_sequential(
                 query, projects_dict, available_projects_metadata, document_types_dict, available_strategies,
                 supplied_project_ids, supplied_document_type_ids, supplied_search_strategy,
                 user_location, supplied_location, supplied_project_status, supplied_years
             )
+
+        if self._prompt_shortlist:
+            result["prompt_shortlist"] = dict(self._prompt_shortlist)
+
+        if cache_key is not None:
+            if self._used_fallback:
+                # Do not pin a degraded result (e.g. during an LLM outage) for the TTL
+                extraction_cache.skip(result, "fallback_used")
+            else:
+                latency_ms = round((time.perf_counter() - extraction_start) * 1000, 2)
+                extraction_cache.put(cache_key, result, latency_ms)
+        return result
+
+    def _record_shortlist(self, info: Dict[str, Any], prompt: str, lines: List[str], full_lines: List[str]) -> None:
+        """Record estimated prompt tokens with and without the candidate shortlist."""
+        prompt_tokens = candidate_shortlist.estimate_tokens(prompt)
+        full_prompt_tokens = prompt_tokens
+        if lines is not full_lines:
+            full_prompt_tokens += (candidate_shortlist.estimate_tokens("\n".join(full_lines))
+                                   - candidate_shortlist.estimate_tokens("\n".join(lines)))
+        self._prompt_shortlist[info["kind"]] = candidate_shortlist.record(info, full_prompt_tokens, prompt_tokens)
+
+    def _model_identity(self) -> str:
+        """Identify the provider and model/deployment answering the extraction prompts."""
+        try:
+            return f"{self.client.get_provider_name()}:{self.client.get_model_name()}"
+        except Exception:  # pylint: disable=broad-except
+            return type(self.client).__name__
    
     def _extract_parameters_sequential(
         self,
@@ -311,7 +370,7 @@ class BaseParameterExtractor(ParameterExtractor):
                 with ThreadPoolExecutor(max_workers=min(len(tasks), 4)) as executor:
                     # Submit all tasks
                     future_to_name = {
-                        executor.submit(task): name
+                        submit_with_context(executor, task): name
                         for task, name in zip(tasks, task_names)
                     }
                    
@@ -375,6 +434,7 @@ class BaseParameterExtractor(ParameterExtractor):
         available_strategies: Optional[Dict] = None
     ) -> Any:
         """Get fallback result for a specific failed task."""
+        self._used_fallback = True
         if task_name == "project_ids":
             return self._fallback_project_extraction(query, available_projects or {})
         elif task_name == "document_type_ids":
@@ -436,6 +496,7 @@ class BaseParameterExtractor(ParameterExtractor):
                    
             except Exception as e:
                 logger.warning(f"Project extraction attempt {attempt + 1} failed with error: {e}")
+                self._used_fallback = True
                 if attempt == 2:  # Last attempt
                     logger.error("All LLM attempts failed, using fallback")
                     break
@@ -452,6 +513,7 @@ class BaseParameterExtractor(ParameterExtractor):
         try:
             # ✅ Extract and format relevant fields from metadata for the LLM
             project_lines = []
+            candidates = []
             for proj in available_projects:
                 project_id = proj.get("project_id", "")
                 project_name = proj.get("project_name", "")
@@ -477,6 +539,20 @@ class BaseParameterExtractor(ParameterExtractor):
                     f"Location: {relevant_meta['location']}, "
                     f"Description: {relevant_meta['description'][:200]}..."  # Trim long text
                 )
+                candidates.append(candidate_shortlist.Candidate(
+                    len(candidates), [project_name],
+                    [str(value) for value in relevant_meta.values() if value]
+                ))
+
+            # Only the projects most similar to the query go into the prompt
+            selected, shortlist_info = candidate_shortlist.shortlist(query, candidates, "projects")
+            full_project_lines = project_lines
+            if selected is not None:
+                project_lines = [full_project_lines[i] for i in selected]
+                logger.info(f"Shortlisted {len(project_lines)} of {len(full_project_lines)} projects "
+                            f"(top score {shortlist_info['top_score']})")
+            else:
+                logger.info(f"Using all {len(project_lines)} projects in prompt ({shortlist_info['reason']})")
 
             prompt = f"""
 You are given a user query and a list of projects. Each project has the following metadata:
@@ -549,6 +625,8 @@ Available Projects:
 Query: "{query}"
 """
 
+            self._record_shortlist(shortlist_info, prompt, project_lines, full_project_lines)
+
             logger.info("=== PROJECT EXTRACTION PROMPT (METADATA-AWARE) ===")
             logger.info(f"Prompt: {prompt}")
             logger.info("=== END PROJECT EXTRACTION PROMPT ===")
@@ -621,6 +699,7 @@ Query: "{query}"
                
         except Exception as e:
             logger.warning(f"Project ID extraction failed: {e}")
+            self._used_fallback = True
             return self._fallback_project_extraction(query, available_projects)
    
     def _extract_document_types(self, query: str, available_document_types: Optional[Dict] = None) -> List[str]:
@@ -642,11 +721,23 @@ Query: "{query}"
         try:
             # Build comprehensive document type info including aliases
             doc_context = []
+            candidates = []
             for doc_id, doc_data in available_document_types.items():
                 name = doc_data.get('name', 'Unknown')
                 aliases = doc_data.get('aliases', [])
                 alias_text = f" (aliases: {', '.join(aliases)})" if aliases else ""
                 doc_context.append(f"- {name}{alias_text} (ID: {doc_id})")
+                candidates.append(candidate_shortlist.Candidate(len(candidates), [name] + list(aliases)))
+
+            # Only the document types most similar to the query go into the prompt
+            selected, shortlist_info = candidate_shortlist.shortlist(query, candidates, "document_types")
+            full_doc_context = doc_context
+            if selected is not None:
+                doc_context = [full_doc_context[i] for i in selected]
+                logger.info(f"Shortlisted {len(doc_context)} of {len(full_doc_context)} document types "
+                            f"(top score {shortlist_info['top_score']})")
+            else:
+                logger.info(f"Using all {len(doc_context)} document types in prompt ({shortlist_info['reason']})")
            
             prompt = f"""
 You are a **document type classification specialist** working for the **Environmental Assessment Office (EAO) of British Columbia**.
@@ -748,6 +839,8 @@ Query: "{query}"
 Return the **document type IDs** as a JSON array of strings (e.g., `["5cf00c03a266b7e1877504cb"]`), or `[]` if no specific document types apply.
 """
 
+            self._record_shortlist(shortlist_info, prompt, doc_context, full_doc_context)
+
             logger.info("=== DOCUMENT TYPE EXTRACTION PROMPT ===")
             logger.info(f"Prompt: {prompt}")
             logger.info("=== END DOCUMENT TYPE EXTRACTION PROMPT ===")
@@ -861,6 +954,7 @@ Return the **document type IDs** as a JSON array of strings (e.g., `["5cf00c03a2
                
         except Exception as e:
             logger.warning(f"Document type extraction failed: {e}")
+            self._used_fallback = True
             return self._fallback_document_extraction(query, available_document_types)
    
     def _extract_search_strategy(self, query: str, available_strategies: Optional[Dict] = None) -> str:
@@ -926,6 +1020,7 @@ Query: "{query}"
                
         except Exception as e:
             logger.warning(f"Search strategy extraction failed: {e}")
+            self._used_fallback = True
             return "HYBRID_PARALLEL"
 
     def _extract_semantic_query(self, query: str) -> str:
@@ -997,6 +1092,7 @@ Return ONLY the optimized semantic query (no quotes, no explanation).
                
         except Exception as e:
             logger.warning(f"Semantic query extraction failed: {e}")
+            self._used_fallback = True
             logger.info("=== SEMANTIC QUERY EXTRACTION END ===")
             return query
    
@@ -1095,6 +1191,7 @@ Return ONLY the optimized semantic query (no quotes, no explanation).
                            supplied_document_type_ids: Optional[List[str]] = None,
                            supplied_search_strategy: Optional[str] = None) -> Dict[str, Any]:
         """Complete fallback extraction."""
+        self._used_fallback = True
         return {
             "project_ids": supplied_project_ids or self._fallback_project_extraction(query, available_projects or {}),
             "document_type_ids": supplied_document_type_ids or self._fallback_document_extraction(query, available_document_types or {}),
@@ -1237,6 +1334,7 @@ Response: {{"location": "Vancouver", "project_status": null, "years": [], "reaso
            
         except Exception as e:
             logger.error(f"Error extracting temporal parameters: {e}")
+            self._used_fallback = True
             return {
                 "location": None,
                 "project_status": None,
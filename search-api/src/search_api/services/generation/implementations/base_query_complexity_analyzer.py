@@ -4,6 +4,7 @@ import json
 import logging
 from typing import Dict, Any, List, Optional
 from ..abstractions.query_complexity_analyzer import QueryComplexityAnalyzer
+from .complexity_classifier import AGENT_PATTERNS, COMPLEX_PATTERNS
 from ....clients.vector_search_client import VectorSearchClient
 from ....utils.cache import cache_with_ttl
 
@@ -262,33 +263,14 @@ JSON response only:
                 logger.info("Applying rule-based validation...")
                 
                 # Check for agent-required keywords (using word boundaries for accuracy)
-                agent_patterns = [
-                    r'\bcompare\b', r'\bcomparison\b', r'\bversus\b', r'\bvs\b',
-                    r'\btrend\b', r'\btrends\b', r'over time', r'\bbefore\b', 
-                    r'\bafter\b', r'\bsince\b', r'\byears?\b', r'\bevolution\b', 
-                    r'\bevolved\b', r'\bpattern\b', r'\bpatterns\b', 
-                    r'similar projects', r'across projects', r'\bbut not\b', 
-                    r'\band not\b', r'mountain projects', r'all projects', 
-                    r'any projects', r'anything related', r'\bmultiple projects\b',
-                    r'near my', r'near me', r'nearby', r'local', r'in my area',
-                    r'impact on', r'effect on', r'influence on', r'affect.*traffic',
-                    r'traffic.*impact', r'population.*impact', r'environmental.*impact'
-                ]
-                
-                agent_detected = any(re.search(pattern, query_lower) for pattern in agent_patterns)
+                agent_detected = any(re.search(pattern, query_lower) for pattern in AGENT_PATTERNS)
                 logger.info(f"Agent keywords detected: {agent_detected}")
                 if agent_detected and tier in ["simple", "complex"]:
                     logger.info(f"Rule-based correction: detected agent keywords, upgrading from {tier} to agent_required")
                     tier = "agent_required"
                 
                 # Check for complex keywords - requiring NLP parameter extraction
-                complex_patterns = [
-                    r'environmental docs?', r'the .+ project', r'pipeline project',
-                    r'big .+ project', r'near .+', r'show me .+ project',
-                    r'environmental .+ for', r'reports? for the'
-                ]
-                
-                complex_detected = any(re.search(pattern, query_lower) for pattern in complex_patterns)
+                complex_detected = any(re.search(pattern, query_lower) for pattern in COMPLEX_PATTERNS)
                 logger.info(f"Complex keywords detected (NLP extraction needed): {complex_detected}")
                 if complex_detected and tier == "simple":
                     logger.info(f"Rule-based correction: detected NLP extraction needs, upgrading from {tier} to complex")
@@ -0,0 +1,192 @@
+"""
+Candidate Shortlist
+Narrows the project and document type catalogues to the entries most similar to the
+query before they are written into an extraction prompt.
+
+Every project (with metadata) and every document type (with aliases) used to go into
+the prompt, so prompt size, token cost and LLM latency grew with the catalogue. Each
+candidate is now scored locally against the query:
+
+- Query terms are matched against a candidate's name/aliases (full weight) and its
+  metadata such as proponent, region and description (reduced weight).
+- Terms match exactly, by a shared stem (prefix), or as a close spelling variant
+  found with difflib against the catalogue vocabulary, so "emails" finds "Email"
+  and "Tilbery" finds "Tilbury".
+
+The best scoring candidates are sent to the LLM. When the best score is below
+SHORTLIST_MIN_SCORE the query does not clearly name anything in the catalogue and the
+full list is used, so ambiguous or descriptive queries lose nothing.
+
+Estimated prompt tokens (about four characters per token) are recorded for the full
+and the shortlisted prompt.
+
+Configuration (environment):
+    SHORTLIST_ENABLED: Set to "false" to always send the full catalogue (default: true)
+    SHORTLIST_PROJECTS_TOP_K: Projects kept in the prompt (default: 30)
+    SHORTLIST_DOCUMENT_TYPES_TOP_K: Document types kept in the prompt (default: 12)
+    SHORTLIST_MIN_SCORE: Best score (0-1) needed to trust the shortlist (default: 0.3)
+"""
+import difflib
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Weight of a term found only in a candidate's metadata rather than its name/aliases
+METADATA_WEIGHT = 0.5
+# Weight of a close spelling variant relative to an exact or stem match
+FUZZY_WEIGHT = 0.8
+# Shortest shared prefix treated as the same stem ("assess" for "assessment"/"assessments")
+_STEM_LENGTH = 5
+
+_STOPWORDS = frozenset({
+    "a", "about", "all", "an", "and", "any", "are", "as", "at", "be", "by", "can", "did", "do",
+    "does", "document", "documents", "find", "for", "from", "get", "give", "has", "have", "how",
+    "i", "in", "is", "it", "its", "me", "near", "of", "on", "or", "please", "project", "projects",
+    "regarding", "related", "show", "tell", "that", "the", "their", "there", "this", "to", "was",
+    "were", "what", "when", "where", "which", "who", "why", "with",
+})
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, float]] = {}
+
+
+def is_enabled() -> bool:
+    """Whether catalogues are shortlisted before prompting."""
+    return os.getenv("SHORTLIST_ENABLED", "true").lower() == "true"
+
+
+def top_k(kind: str) -> int:
+    """Number of candidates kept for a catalogue ("projects" or "document_types")."""
+    if kind == "projects":
+        return int(os.getenv("SHORTLIST_PROJECTS_TOP_K", "30"))
+    return int(os.getenv("SHORTLIST_DOCUMENT_TYPES_TOP_K", "12"))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for prompt accounting (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens of a text, without stopwords."""
+    return [t for t in re.findall(r"[a-z0-9]+", (text or "").lower()) if t not in _STOPWORDS]
+
+
+class Candidate:  # pylint: disable=too-few-public-methods
+    """A catalogue entry with the text it is matched on."""
+
+    def __init__(self, key: Any, names: Iterable[str], metadata: Iterable[str] = ()):
+        self.key = key
+        self.name_terms = set(t for name in names for t in tokenize(name))
+        self.metadata_terms = set(t for text in metadata for t in tokenize(text)) - self.name_terms
+
+
+def _term_matches(term: str, terms: set) -> bool:
+    if term in terms:
+        return True
+    if len(term) >= _STEM_LENGTH:
+        stem = term[:_STEM_LENGTH]
+        return any(t.startswith(stem) for t in terms if len(t) >= _STEM_LENGTH)
+    return False
+
+
+def score_candidates(query: str, candidates: Sequence[Candidate]) -> List[Tuple[float, Candidate]]:
+    """Score every candidate against the query, best first.
+
+    The score is the weighted fraction of query terms found in the candidate.
+    """
+    query_terms = list(dict.fromkeys(tokenize(query)))
+    if not query_terms:
+        return [(0.0, c) for c in candidates]
+
+    vocabulary = set()
+    for candidate in candidates:
+        vocabulary |= candidate.name_terms
+        vocabulary |= candidate.metadata_terms
+    # Close spelling variants are looked up once per query term against the whole
+    # catalogue vocabulary rather than per candidate
+    variants = {
+        term: set(difflib.get_close_matches(term, vocabulary, n=5, cutoff=0.85)) - {term}
+        for term in query_terms if len(term) >= 4
+    }
+
+    scored = []
+    for candidate in candidates:
+        total = 0.0
+        for term in query_terms:
+            if _term_matches(term, candidate.name_terms):
+                total += 1.0
+            elif variants.get(term) and variants[term] & candidate.name_terms:
+                total += FUZZY_WEIGHT
+            elif _term_matches(term, candidate.metadata_terms):
+                total += METADATA_WEIGHT
+            elif variants.get(term) and variants[term] & candidate.metadata_terms:
+                total += METADATA_WEIGHT * FUZZY_WEIGHT
+        scored.append((round(total / len(query_terms), 4), candidate))
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return scored
+
+
+def shortlist(query: str, candidates: Sequence[Candidate], kind: str) -> Tuple[Optional[List[Any]], Dict[str, Any]]:
+    """Pick the candidates to show the LLM.
+
+    Args:
+        query: The user query
+        candidates: Every catalogue entry
+        kind: "projects" or "document_types" (selects the top-K setting)
+
+    Returns:
+        The keys of the shortlisted candidates in score order, or None when the full
+        list should be used, and a dict describing the decision.
+    """
+    limit = top_k(kind)
+    info = {"kind": kind, "candidates": len(candidates), "top_k": limit, "shortlisted": False}
+    if not is_enabled():
+        info["reason"] = "disabled"
+        return None, info
+    if len(candidates) <= limit:
+        info["reason"] = "catalogue_within_top_k"
+        return None, info
+
+    scored = score_candidates(query, candidates)
+    best = scored[0][0] if scored else 0.0
+    info["top_score"] = best
+    if best < float(os.getenv("SHORTLIST_MIN_SCORE", "0.3")):
+        info["reason"] = "low_confidence"
+        return None, info
+
+    keys = [candidate.key for score, candidate in scored[:limit] if score > 0]
+    info.update({"shortlisted": True, "kept": len(keys)})
+    return keys, info
+
+
+def record(info: Dict[str, Any], full_prompt_tokens: int, prompt_tokens: int) -> Dict[str, Any]:
+    """Add prompt token estimates to a shortlist decision and count it."""
+    info["prompt_tokens_full"] = full_prompt_tokens
+    info["prompt_tokens"] = prompt_tokens
+    with _stats_lock:
+        counters = _stats.setdefault(info["kind"], {
+            "prompts": 0, "shortlisted": 0, "low_confidence": 0,
+            "prompt_tokens_full": 0, "prompt_tokens": 0,
+        })
+        counters["prompts"] += 1
+        counters["shortlisted"] += 1 if info["shortlisted"] else 0
+        counters["low_confidence"] += 1 if info.get("reason") == "low_confidence" else 0
+        counters["prompt_tokens_full"] += full_prompt_tokens
+        counters["prompt_tokens"] += prompt_tokens
+    return info
+
+
+def stats() -> Dict[str, Any]:
+    """Return shortlist rates and estimated prompt tokens saved per catalogue."""
+    with _stats_lock:
+        result = {kind: dict(counters) for kind, counters in _stats.items()}
+    for counters in result.values():
+        saved = counters["prompt_tokens_full"] - counters["prompt_tokens"]
+        counters["prompt_tokens_saved"] = saved
+        counters["prompt_token_reduction"] = (
+            round(saved / counters["prompt_tokens_full"], 4) if counters["prompt_tokens_full"] else 0.0
+        )
+    result["enabled"] = is_enabled()
+    return result
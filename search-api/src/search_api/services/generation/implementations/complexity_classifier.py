@@ -0,0 +1,287 @@
+"""
+Complexity Classifier
+Classifies query complexity for auto mode locally, without an LLM round trip.
+
+Two kinds of evidence are combined into a score per tier (simple, complex,
+agent_required):
+
+- Rule features: the keyword patterns the LLM analyzer uses to correct its own
+  answers (temporal, comparison, location and impact wording → agent_required;
+  references that need entity resolution → complex), plus simple-tier cues
+  (projects/document types already selected in the UI, content-search wording).
+- A k-nearest-neighbour vote over labelled example queries, embedded with the
+  answer cache's local hashed word/trigram vectors. Seed examples ship with the
+  module; more are loaded from AUTO_MODE_EXAMPLES_PATH.
+
+Confidence is the top tier's share of the evidence, with a fixed prior that keeps
+weak evidence from looking certain. Below AUTO_MODE_CONFIDENCE_THRESHOLD the caller
+escalates to the LLM analyzer; confident LLM answers are added to the examples in
+memory, so repeated query shapes stop escalating.
+
+Every decision can be appended to a JSON lines log (AUTO_MODE_DECISION_LOG).
+``train_from_log`` turns the LLM decisions (and any entries given a corrected
+"label") in that log into an examples file for AUTO_MODE_EXAMPLES_PATH.
+
+Configuration (environment):
+    AUTO_MODE_CLASSIFIER: "local" to classify locally and escalate when unsure, or "llm" to always ask
+        the LLM (default: local)
+    AUTO_MODE_CONFIDENCE_THRESHOLD: Local confidence (0-1) below which the LLM analyzer decides (default: 0.6)
+    AUTO_MODE_EXAMPLES_PATH: JSON lines file of labelled queries ({"query", "complexity_tier"}) added to
+        the seed examples (default: unset)
+    AUTO_MODE_DECISION_LOG: JSON lines file every auto mode decision is appended to (default: unset)
+"""
+import json
+import logging
+import os
+import re
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .answer_cache import cosine, embed_query
+
+logger = logging.getLogger(__name__)
+
+TIERS = ("simple", "complex", "agent_required")
+
+AGENT_PATTERNS = [
+    r'\bcompare\b', r'\bcomparison\b', r'\bversus\b', r'\bvs\b',
+    r'\btrend\b', r'\btrends\b', r'over time', r'\bbefore\b',
+    r'\bafter\b', r'\bsince\b', r'\byears?\b', r'\bevolution\b',
+    r'\bevolved\b', r'\bpattern\b', r'\bpatterns\b',
+    r'similar projects', r'across projects', r'\bbut not\b',
+    r'\band not\b', r'mountain projects', r'all projects',
+    r'any projects', r'anything related', r'\bmultiple projects\b',
+    r'near my', r'near me', r'nearby', r'local', r'in my area',
+    r'impact on', r'effect on', r'influence on', r'affect.*traffic',
+    r'traffic.*impact', r'population.*impact', r'environmental.*impact'
+]
+
+COMPLEX_PATTERNS = [
+    r'environmental docs?', r'the .+ project', r'pipeline project',
+    r'big .+ project', r'near .+', r'show me .+ project',
+    r'environmental .+ for', r'reports? for the'
+]
+
+CONTENT_SEARCH_PATTERNS = [r'\bmentions?\b', r'\bmentioning\b', r'\babout\b', r'\bcontains?\b',
+                           r'\bdiscuss(es|ing)?\b', r'\brefer(s|ring)? to\b']
+
+SEED_EXAMPLES = [
+    ("I want all letters that mention the 'Nooaitch Indian Band'", "simple"),
+    ("documents about First Nations consultation", "simple"),
+    ("LNG Canada project environmental reports", "simple"),
+    ("letters mentioning caribou", "simple"),
+    ("documents that discuss water quality monitoring", "simple"),
+    ("inspection records mentioning dust control", "simple"),
+    ("Show me environmental docs for the pipeline project", "complex"),
+    ("the big LNG project near Prince George", "complex"),
+    ("reports for the mine in the Kootenays", "complex"),
+    ("show me the hydro dam project correspondence", "complex"),
+    ("certificate documents for the copper mine project", "complex"),
+    ("Compare environmental impacts across projects", "agent_required"),
+    ("Documents from before 2020", "agent_required"),
+    ("anything related to First Nations", "agent_required"),
+    ("projects near my address that mention beaver populations impact on traffic", "agent_required"),
+    ("how have fish habitat concerns evolved over time", "agent_required"),
+    ("trends in greenhouse gas emissions across mining projects in the last 5 years", "agent_required"),
+    ("similar projects to Site C and their effect on wildlife", "agent_required"),
+]
+
+# Weight of the nearest neighbours' vote relative to the rule features
+_KNN_WEIGHT = 1.5
+_NEIGHBOURS = 5
+# Evidence mass that is not attributed to any tier; weak evidence stays unconfident
+_PRIOR = 0.4
+# Confidence an LLM answer needs before it is learned as an example
+_LEARN_CONFIDENCE = 0.7
+_MAX_EXAMPLES = 5000
+
+_lock = threading.Lock()
+_examples: Optional[deque] = None
+_stats = {"local": 0, "escalated": 0, "learned": 0}
+
+
+def is_enabled() -> bool:
+    """Whether auto mode classifies locally before asking the LLM."""
+    return os.getenv("AUTO_MODE_CLASSIFIER", "local").lower() == "local"
+
+
+def confidence_threshold() -> float:
+    """Local confidence below which the LLM analyzer decides."""
+    return float(os.getenv("AUTO_MODE_CONFIDENCE_THRESHOLD", "0.6"))
+
+
+def _load_examples(path: Optional[str]) -> List[Tuple[str, str]]:
+    examples = []
+    if not path or not os.path.exists(path):
+        return examples
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("query") and entry.get("complexity_tier") in TIERS:
+                examples.append((entry["query"], entry["complexity_tier"]))
+    logger.info(f"🧠 COMPLEXITY: Loaded {len(examples)} labelled examples from {path}")
+    return examples
+
+
+def _get_examples() -> deque:
+    """Embedded examples, loaded on first use (call with the lock held)."""
+    global _examples  # pylint: disable=global-statement
+    if _examples is None:
+        labelled = SEED_EXAMPLES + _load_examples(os.getenv("AUTO_MODE_EXAMPLES_PATH"))
+        _examples = deque(((embed_query(q), tier) for q, tier in labelled), maxlen=_MAX_EXAMPLES)
+    return _examples
+
+
+def rule_scores(query: str, project_ids: Optional[List[str]] = None,
+                document_type_ids: Optional[List[str]] = None) -> Dict[str, float]:
+    """Score each tier from the keyword and request context features."""
+    text = (query or "").lower()
+    agent_hits = sum(1 for p in AGENT_PATTERNS if re.search(p, text))
+    complex_hits = sum(1 for p in COMPLEX_PATTERNS if re.search(p, text))
+    content_search = any(re.search(p, text) for p in CONTENT_SEARCH_PATTERNS)
+    ui_context = bool(project_ids) or bool(document_type_ids)
+    return {
+        "simple": 0.5 * ui_context + 0.5 * content_search,
+        "complex": 0.6 if complex_hits else 0.0,
+        "agent_required": min(1.5, 0.9 + 0.3 * (agent_hits - 1)) if agent_hits else 0.0,
+    }
+
+
+def knn_scores(query: str) -> Dict[str, float]:
+    """Similarity-weighted vote of the nearest labelled examples."""
+    vector = embed_query(query)
+    with _lock:
+        neighbours = sorted(((cosine(vector, v), tier) for v, tier in _get_examples()), reverse=True)[:_NEIGHBOURS]
+    scores = dict.fromkeys(TIERS, 0.0)
+    for similarity, tier in neighbours:
+        # Squared so that one close neighbour outweighs several loosely related ones
+        scores[tier] += max(similarity, 0.0) ** 2
+    return scores
+
+
+def classify(query: str, project_ids: Optional[List[str]] = None,
+             document_type_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Classify a query locally.
+
+    Returns:
+        Dict with complexity_tier, reason and confidence (the analyzer result
+        format), plus the per-tier evidence.
+    """
+    rules = rule_scores(query, project_ids, document_type_ids)
+    neighbours = knn_scores(query)
+    scores = {tier: rules[tier] + _KNN_WEIGHT * neighbours[tier] for tier in TIERS}
+    tier = max(TIERS, key=lambda t: scores[t])
+    confidence = scores[tier] / (sum(scores.values()) + _PRIOR)
+    _count("local")
+    return {
+        "complexity_tier": tier,
+        "reason": f"Local classifier (rules {rules[tier]:.2f}, neighbours {neighbours[tier]:.2f})",
+        "confidence": round(confidence, 3),
+        "evidence": {
+            "rules": {t: round(s, 3) for t, s in rules.items()},
+            "neighbours": {t: round(s, 3) for t, s in neighbours.items()},
+        },
+    }
+
+
+def learn(query: str, tier: str, confidence: float = 1.0) -> bool:
+    """Add a labelled query to the in-memory examples when the label is confident."""
+    if tier not in TIERS or confidence < _LEARN_CONFIDENCE:
+        return False
+    vector = embed_query(query)
+    with _lock:
+        _get_examples().append((vector, tier))
+        _stats["learned"] += 1
+    return True
+
+
+def _count(name: str) -> None:
+    with _lock:
+        _stats[name] += 1
+
+
+def record(query: str, result: Dict[str, Any], project_ids: Optional[List[str]] = None,
+           document_type_ids: Optional[List[str]] = None) -> None:
+    """Append a decision to AUTO_MODE_DECISION_LOG, when configured."""
+    if result.get("source") == "llm":
+        _count("escalated")
+    path = os.getenv("AUTO_MODE_DECISION_LOG")
+    if not path:
+        return
+    entry = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "query": query,
+        "project_context": bool(project_ids),
+        "document_type_context": bool(document_type_ids),
+        "complexity_tier": result.get("complexity_tier"),
+        "confidence": result.get("confidence"),
+        "source": result.get("source"),
+        "latency_ms": result.get("latency_ms"),
+    }
+    try:
+        with _lock, open(path, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry) + "\n")
+    except OSError as e:
+        logger.warning(f"🧠 COMPLEXITY: Could not write decision log {path}: {e}")
+
+
+def train_from_log(log_path: str, examples_path: str) -> int:
+    """Build a labelled examples file from a decision log.
+
+    LLM decisions and entries with a corrected "label" become examples; they are
+    merged with the examples already in examples_path, the latest label of a query
+    winning.
+
+    Returns:
+        The number of examples written.
+    """
+    labelled: Dict[str, str] = {q.lower(): tier for q, tier in _load_examples(examples_path)}
+    queries: Dict[str, str] = {q.lower(): q for q, _ in _load_examples(examples_path)}
+    with open(log_path, encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            tier = entry.get("label") or (entry.get("complexity_tier") if entry.get("source") == "llm" else None)
+            if entry.get("query") and tier in TIERS:
+                labelled[entry["query"].lower()] = tier
+                queries[entry["query"].lower()] = entry["query"]
+    with open(examples_path, "w", encoding="utf-8") as handle:
+        for key, tier in labelled.items():
+            handle.write(json.dumps({"query": queries[key], "complexity_tier": tier}) + "\n")
+    return len(labelled)
+
+
+def reset(examples: Optional[Iterable[Tuple[str, str]]] = None) -> None:
+    """Reload the examples on next use, or replace them with the given ones."""
+    global _examples  # pylint: disable=global-statement
+    with _lock:
+        _examples = None if examples is None else deque(
+            ((embed_query(q), tier) for q, tier in examples), maxlen=_MAX_EXAMPLES
+        )
+
+
+def stats() -> Dict[str, Any]:
+    """Return local and escalated decision counts since the worker started."""
+    with _lock:
+        counters = dict(_stats)
+        counters["examples"] = len(_examples) if _examples is not None else None
+    decisions = counters["local"]
+    counters["escalation_ratio"] = round(counters["escalated"] / decisions, 4) if decisions else 0.0
+    counters["enabled"] = is_enabled()
+    return counters
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 3:
+        sys.exit("Usage: python -m search_api.services.generation.implementations.complexity_classifier "
+                 "<decision_log.jsonl> <examples.jsonl>")
+    print(f"Wrote {train_from_log(sys.argv[1], sys.argv[2])} examples to {sys.argv[2]}")
@@ -0,0 +1,140 @@
+"""
+Context Packer
+Builds the document context of a summarization prompt within a token budget.
+
+Retrieved chunks often overlap (neighbouring chunk windows, the same passage found by
+several searches in agent mode), and their order does not reflect their value. The
+packer:
+
+1. Tokenizes every chunk once; the word list is used both for duplicate detection
+   and for the token estimate (about four characters per token).
+2. Orders chunks by ``relevance_score`` (best first; chunks without a score keep
+   their retrieval order after the scored ones).
+3. Drops near-duplicates: chunks whose word 5-gram shingles are mostly contained in
+   an already packed chunk.
+4. Adds chunks until the provider's token budget is spent, truncating the last one
+   that only partly fits and dropping the rest.
+
+Budgets are set per provider. The defaults match the size of the character caps
+the summarizers used before; a larger model context can be given a larger budget.
+
+Configuration (environment):
+    SUMMARY_CONTEXT_BUDGET_OPENAI: Token budget for document context with Azure OpenAI (default: 1500)
+    SUMMARY_CONTEXT_BUDGET_OLLAMA: Token budget for document context with Ollama (default: 1400)
+    SUMMARY_CONTEXT_MAX_CHUNK_TOKENS: Largest share of the budget one chunk may use (default: 750)
+    SUMMARY_CONTEXT_DEDUP_THRESHOLD: Shingle containment (0-1) above which a chunk is a duplicate (default: 0.8)
+"""
+import os
+from typing import Any, Callable, Dict, List, Tuple
+
+_SHINGLE_SIZE = 5
+# A partly fitting chunk is truncated only if at least this many tokens of it fit
+_MIN_TRUNCATED_TOKENS = 64
+_DEFAULT_BUDGETS = {"openai": 1500, "ollama": 1400}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def context_budget(provider: str) -> int:
+    """Token budget for the document context of one summarization prompt."""
+    default = _DEFAULT_BUDGETS.get(provider, 1400)
+    return int(os.getenv(f"SUMMARY_CONTEXT_BUDGET_{provider.upper()}", str(default)))
+
+
+class _Chunk:  # pylint: disable=too-few-public-methods
+    """A document/chunk with its text tokenized once."""
+
+    __slots__ = ("index", "doc", "text", "words", "tokens", "score")
+
+    def __init__(self, index: int, doc: Dict[str, Any]):
+        self.index = index
+        self.doc = doc
+        self.text = doc.get("content") or ""
+        self.words = self.text.split()
+        self.tokens = estimate_tokens(self.text)
+        score = doc.get("relevance_score")
+        self.score = float(score) if isinstance(score, (int, float)) else None
+
+    def shingles(self) -> set:
+        words = [w.lower() for w in self.words]
+        if len(words) < _SHINGLE_SIZE:
+            return {hash(tuple(words))} if words else set()
+        return {hash(tuple(words[i:i + _SHINGLE_SIZE])) for i in range(len(words) - _SHINGLE_SIZE + 1)}
+
+
+def _truncate(chunk: _Chunk, max_tokens: int) -> str:
+    """Cut a chunk's text to about ``max_tokens`` tokens on a word boundary."""
+    limit = max_tokens * 4
+    kept, length = [], 0
+    for word in chunk.words:
+        length += len(word) + 1
+        if length > limit:
+            break
+        kept.append(word)
+    return " ".join(kept) + "..."
+
+
+def pack(documents: List[Dict[str, Any]], budget_tokens: int,
+         header: Callable[[int, Dict[str, Any]], str]) -> Tuple[str, Dict[str, Any]]:
+    """Pack documents/chunks into a prompt context.
+
+    Args:
+        documents: Documents or chunks with "content" and optionally "relevance_score"
+        budget_tokens: Tokens available for the whole context, including headers
+        header: Builds the heading line for the n-th packed document
+
+    Returns:
+        The context text and packing statistics for the response metrics.
+    """
+    max_chunk_tokens = int(os.getenv("SUMMARY_CONTEXT_MAX_CHUNK_TOKENS", "750"))
+    threshold = float(os.getenv("SUMMARY_CONTEXT_DEDUP_THRESHOLD", "0.8"))
+
+    chunks = [_Chunk(i, doc) for i, doc in enumerate(documents)]
+    # Scored chunks first, best first; unscored chunks keep retrieval order
+    chunks.sort(key=lambda c: (c.score is None, -(c.score or 0.0), c.index))
+
+    stats = {
+        "input_chunks": len(chunks),
+        "input_tokens": sum(c.tokens for c in chunks),
+        "budget_tokens": budget_tokens,
+        "duplicates_dropped": 0,
+        "budget_dropped": 0,
+        "truncated": 0,
+        "packed_chunks": 0,
+        "packed_tokens": 0,
+    }
+    parts: List[str] = []
+    packed_shingles: List[set] = []
+    remaining = budget_tokens
+
+    for chunk in chunks:
+        if not chunk.words:
+            continue
+        shingles = chunk.shingles()
+        if any(len(shingles & other) >= threshold * min(len(shingles), len(other)) for other in packed_shingles):
+            stats["duplicates_dropped"] += 1
+            continue
+
+        heading = header(stats["packed_chunks"] + 1, chunk.doc)
+        heading_tokens = estimate_tokens(heading) + 1
+        available = min(remaining - heading_tokens, max_chunk_tokens)
+        if chunk.tokens <= available:
+            text, tokens = chunk.text, chunk.tokens
+        elif available >= _MIN_TRUNCATED_TOKENS:
+            text = _truncate(chunk, available)
+            tokens = estimate_tokens(text)
+            stats["truncated"] += 1
+        else:
+            stats["budget_dropped"] += 1
+            continue
+
+        parts.append(f"{heading}\n{text}\n")
+        packed_shingles.append(shingles)
+        remaining -= heading_tokens + tokens
+        stats["packed_chunks"] += 1
+        stats["packed_tokens"] += heading_tokens + tokens
+
+    return "\n".join(parts), stats
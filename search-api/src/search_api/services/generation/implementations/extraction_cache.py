@@ -0,0 +1,134 @@
+"""
+Extraction Cache
+Caches structured parameter extraction results so repeated queries skip the LLM calls.
+
+Entries are keyed by the normalized query, a coarse bucket of the user's location, a
+version hash of the projects/document types/strategies catalogue, the supplied
+parameters, the current year (temporal extraction is relative to it) and the LLM
+provider/model. A catalogue or model change therefore never serves a stale result.
+
+Results are stored in the common cache backend (utils.cache), so they persist across
+workers and restarts when CACHE_BACKEND=disk.
+
+Configuration (environment):
+    EXTRACTION_CACHE_ENABLED: Set to "false" to always call the LLM (default: true)
+    EXTRACTION_CACHE_TTL_SECONDS: Lifetime of a cached extraction (default: 3600)
+    EXTRACTION_CACHE_LOCATION_PRECISION: Decimal places kept from user coordinates (default: 1, about 10 km)
+"""
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from search_api.utils.cache import get_backend
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "parameter_extraction"
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "stores": 0, "skipped": 0, "saved_ms": 0.0}
+
+
+def is_enabled() -> bool:
+    """Whether extraction results are cached."""
+    return os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+
+
+def normalize_query(query: str) -> str:
+    """Lower-case a query, collapse whitespace and drop trailing punctuation."""
+    return re.sub(r"\s+", " ", (query or "").strip().lower()).rstrip("?!. ")
+
+
+def location_bucket(user_location: Optional[Dict]) -> Optional[List]:
+    """Reduce a browser location to a coarse grid cell so nearby users share entries."""
+    if not isinstance(user_location, dict):
+        return None
+    precision = int(os.getenv("EXTRACTION_CACHE_LOCATION_PRECISION", "1"))
+    try:
+        lat = round(float(user_location.get("latitude")), precision)
+        lon = round(float(user_location.get("longitude")), precision)
+    except (TypeError, ValueError):
+        lat = lon = None
+    return [lat, lon, (user_location.get("city") or "").lower(), (user_location.get("region") or "").lower()]
+
+
+def catalogue_version(*catalogues: Any) -> str:
+    """Hash the catalogue data given to the extractor."""
+    payload = json.dumps(catalogues, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def make_key(query: str, user_location: Optional[Dict], catalogue: str, model: str, supplied: Dict[str, Any]) -> str:
+    """Build the cache key for one extraction."""
+    parts = {
+        "query": normalize_query(query),
+        "location": location_bucket(user_location),
+        "catalogue": catalogue,
+        "model": model,
+        "supplied": supplied,
+        "year": datetime.now().year,
+    }
+    digest = hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return f"{_KEY_PREFIX}:{digest}"
+
+
+def _count(name: str, amount: float = 1) -> None:
+    with _stats_lock:
+        _stats[name] += amount
+
+
+def get(key: str) -> Optional[Dict[str, Any]]:
+    """Return a copy of a cached extraction annotated with cache metadata, or None."""
+    try:
+        found, entry = get_backend().get(key)
+    except Exception as e:  # pylint: disable=broad-except
+        logger.warning(f"Extraction cache read failed: {e}")
+        found, entry = False, None
+    if not found:
+        _count("misses")
+        return None
+    _count("hits")
+    _count("saved_ms", entry["latency_ms"])
+    result = copy.deepcopy(entry["result"])
+    result["extraction_cache"] = {
+        "hit": True,
+        "saved_ms": entry["latency_ms"],
+        "age_seconds": round(time.time() - entry["stored_at"], 1),
+    }
+    logger.info(f"Extraction cache hit (saved ~{entry['latency_ms']}ms of LLM calls)")
+    return result
+
+
+def put(key: str, result: Dict[str, Any], latency_ms: float) -> None:
+    """Store an extraction result and annotate it as a miss."""
+    entry = {"result": copy.deepcopy(result), "latency_ms": latency_ms, "stored_at": time.time()}
+    try:
+        get_backend().set(key, entry, float(os.getenv("EXTRACTION_CACHE_TTL_SECONDS", "3600")))
+        _count("stores")
+    except Exception as e:  # pylint: disable=broad-except
+        logger.warning(f"Extraction cache write failed: {e}")
+    result["extraction_cache"] = {"hit": False, "latency_ms": latency_ms}
+
+
+def skip(result: Dict[str, Any], reason: str) -> None:
+    """Record that a result was not cached (e.g. an LLM call failed)."""
+    _count("skipped")
+    result["extraction_cache"] = {"hit": False, "stored": False, "reason": reason}
+
+
+def stats() -> Dict[str, Any]:
+    """Return hit ratio and LLM time saved since the worker started."""
+    with _stats_lock:
+        counters = dict(_stats)
+    lookups = counters["hits"] + counters["misses"]
+    counters["saved_ms"] = round(counters["saved_ms"], 2)
+    counters["hit_ratio"] = round(counters["hits"] / lookups, 4) if lookups else 0.0
+    counters["enabled"] = is_enabled()
+    return counters
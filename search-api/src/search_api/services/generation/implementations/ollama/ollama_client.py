@@ -1,15 +1,143 @@
-"""Ollama LLM client implementation."""
+"""Ollama LLM client implementation.
+
+Every OllamaClient in the process shares one connection pool and one concurrency
+limit. A single Ollama server evaluates requests largely one at a time on CPU, so
+parallel extraction tasks and agent steps queue here (with wait-time metrics) rather
+than piling up inside the server where they all hit the HTTP timeout.
+
+Configuration (environment):
+    OLLAMA_MAX_CONCURRENCY: Requests sent to Ollama at the same time (default: 2)
+    OLLAMA_QUEUE_TIMEOUT: Seconds a request may wait for a free slot (default: 120)
+    OLLAMA_TIMEOUT: Read timeout for one Ollama request in seconds (default: 120)
+    OLLAMA_KEEP_ALIVE: How long Ollama keeps the model loaded after a request (default: 30m)
+    OLLAMA_NUM_CTX: Context window requested from Ollama; unset uses the model default
+    OLLAMA_WARMUP: Load the model in the background when the app starts (default: true)
+"""
 
 import os
 import json
 import logging
+import threading
+import time
+from contextlib import contextmanager
 import requests
-from typing import Dict, Any, List, Optional
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Iterator, List, Optional
+from search_api.utils.tracing import SpanKind, start_span
 from ...abstractions.llm_client import LLMClient
 
 logger = logging.getLogger(__name__)
 
 
+class OllamaQueueTimeout(RuntimeError):
+    """Raised when no Ollama slot became free within OLLAMA_QUEUE_TIMEOUT."""
+
+
+class _OllamaConnection:
+    """Connection pool and concurrency limit shared by every OllamaClient."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._adapter: Optional[HTTPAdapter] = None
+        self._semaphore: Optional[threading.BoundedSemaphore] = None
+        self._max_concurrency = 0
+        self._stats = {
+            "calls": 0, "in_flight": 0, "waiting": 0, "max_waiting": 0,
+            "queued_calls": 0, "queue_timeouts": 0, "errors": 0,
+            "total_wait_ms": 0.0, "max_wait_ms": 0.0, "total_call_ms": 0.0,
+        }
+
+    def _setup(self) -> None:
+        # Created lazily so the limits are read after the environment is loaded
+        if self._semaphore is None:
+            with self._lock:
+                if self._semaphore is None:
+                    self._max_concurrency = max(1, int(os.getenv("OLLAMA_MAX_CONCURRENCY", "2")))
+                    self._adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._max_concurrency)
+                    self._semaphore = threading.BoundedSemaphore(self._max_concurrency)
+
+    def session(self) -> requests.Session:
+        """Return this thread's keep-alive session on the shared pool."""
+        self._setup()
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self._adapter)
+            session.mount("https://", self._adapter)
+            self._local.session = session
+        return session
+
+    @contextmanager
+    def slot(self):
+        """Hold one of the OLLAMA_MAX_CONCURRENCY slots for the duration of a call."""
+        self._setup()
+        start = time.perf_counter()
+        acquired = self._semaphore.acquire(blocking=False)
+        if not acquired:
+            with self._lock:
+                self._stats["queued_calls"] += 1
+                self._stats["waiting"] += 1
+                self._stats["max_waiting"] = max(self._stats["max_waiting"], self._stats["waiting"])
+            try:
+                acquired = self._semaphore.acquire(timeout=float(os.getenv("OLLAMA_QUEUE_TIMEOUT", "120")))
+            finally:
+                with self._lock:
+                    self._stats["waiting"] -= 1
+            if not acquired:
+                with self._lock:
+                    self._stats["queue_timeouts"] += 1
+                raise OllamaQueueTimeout("Timed out waiting for a free Ollama slot")
+
+        wait_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["in_flight"] += 1
+            self._stats["total_wait_ms"] += wait_ms
+            self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], wait_ms)
+        call_start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            self._semaphore.release()
+            with self._lock:
+                self._stats["in_flight"] -= 1
+                self._stats["total_call_ms"] += (time.perf_counter() - call_start) * 1000
+
+    def stats(self) -> Dict[str, Any]:
+        """Return concurrency and queue-wait metrics."""
+        self._setup()
+        with self._lock:
+            counters = dict(self._stats)
+        calls = counters["calls"]
+        counters["avg_wait_ms"] = round(counters["total_wait_ms"] / calls, 2) if calls else 0.0
+        counters["avg_call_ms"] = round(counters["total_call_ms"] / calls, 2) if calls else 0.0
+        counters["total_wait_ms"] = round(counters["total_wait_ms"], 2)
+        counters["total_call_ms"] = round(counters["total_call_ms"], 2)
+        counters["max_wait_ms"] = round(counters["max_wait_ms"], 2)
+        counters["max_concurrency"] = self._max_concurrency
+        return counters
+
+
+_connection = _OllamaConnection()
+
+
+def get_ollama_stats() -> Dict[str, Any]:
+    """Return queue and latency metrics for calls to Ollama from this process."""
+    return _connection.stats()
+
+
+def warm_up_async() -> None:
+    """Load the configured model in a background thread so the first query does not pay for it."""
+    if os.getenv("OLLAMA_WARMUP", "true").lower() != "true":
+        return
+    threading.Thread(target=OllamaClient().warm_up, name="ollama-warmup", daemon=True).start()
+
+
 class OllamaClient(LLMClient):
     """Ollama implementation of the LLM client."""
     
@@ -17,6 +145,48 @@ class OllamaClient(LLMClient):
         """Initialize the Ollama client."""
         self.base_url = os.environ.get("LLM_HOST", os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434"))
         self.model_name = os.environ.get("LLM_MODEL", os.environ.get("OLLAMA_MODEL", "llama3.1"))
+        self.timeout = float(os.environ.get("OLLAMA_TIMEOUT", "120"))
+        self.keep_alive = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
+        self.num_ctx = int(os.environ["OLLAMA_NUM_CTX"]) if os.environ.get("OLLAMA_NUM_CTX") else None
+    
+    def _payload(self, messages: List[Dict[str, str]], temperature: float, max_tokens: Optional[int],
+                 stream: bool) -> Dict[str, Any]:
+        """Build an /api/chat request body with the configured model options."""
+        payload = {
+            "model": self.model_name,
+            "messages": messages,
+            "stream": stream,
+            "keep_alive": self.keep_alive,
+            "options": {
+                "temperature": temperature
+            }
+        }
+        if max_tokens is not None:
+            payload["options"]["num_predict"] = max_tokens
+        if self.num_ctx is not None:
+            payload["options"]["num_ctx"] = self.num_ctx
+        return payload
+    
+    def warm_up(self) -> bool:
+        """Load the model into memory without generating anything.
+        
+        Returns:
+            bool: True if Ollama confirmed the model is loaded.
+        """
+        start = time.perf_counter()
+        try:
+            with _connection.slot():
+                response = _connection.session().post(
+                    f"{self.base_url}/api/generate",
+                    json={"model": self.model_name, "keep_alive": self.keep_alive},
+                    timeout=(5, self.timeout)
+                )
+                response.raise_for_status()
+            logger.info(f"Ollama model {self.model_name} warmed up in {(time.perf_counter() - start) * 1000:.0f}ms")
+            return True
+        except Exception as e:
+            logger.warning(f"Ollama warm-up failed: {e}")
+            return False
         
     def chat_completions_create(
         self,
@@ -72,17 +242,7 @@ class OllamaClient(LLMClient):
         """
         try:
             # Build the request payload
-            payload = {
-                "model": self.model_name,
-                "messages": messages,
-                "stream": False,
-                "options": {
-                    "temperature": temperature
-                }
-            }
-            
-            if max_tokens is not None:
-                payload["options"]["num_predict"] = max_tokens
+            payload = self._payload(messages, temperature, max_tokens, stream=False)
             
             # Handle tools/function calling for Ollama
             if tools:
@@ -93,14 +253,25 @@ class OllamaClient(LLMClient):
             
             logger.info(f"Sending chat completion request to Ollama with {len(messages)} messages")
             
-            response = requests.post(
-                f"{self.base_url}/api/chat",
-                json=payload,
-                timeout=120
-            )
-            response.raise_for_status()
-            
-            ollama_response = response.json()
+            with start_span("llm.chat_completion", {
+                "llm.provider": "ollama",
+                "llm.model": self.model_name,
+                "llm.message_count": len(messages),
+                "llm.max_tokens": max_tokens,
+            }, kind=SpanKind.CLIENT) as span:
+                with _connection.slot():
+                    response = _connection.session().post(
+                        f"{self.base_url}/api/chat",
+                        json=payload,
+                        timeout=(5, self.timeout)
+                    )
+                    response.raise_for_status()
+                
+                ollama_response = response.json()
+                span.set_attributes({
+                    "llm.prompt_tokens": ollama_response.get("prompt_eval_count"),
+                    "llm.completion_tokens": ollama_response.get("eval_count"),
+                })
             
             # Convert Ollama response to OpenAI-compatible format
             result = {
@@ -124,6 +295,59 @@ class OllamaClient(LLMClient):
             logger.error(f"Ollama chat completion failed: {str(e)}")
             raise
     
+    def chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.3,
+        max_tokens: Optional[int] = None
+    ) -> Iterator[str]:
+        """Stream a chat completion from Ollama.
+        
+        Ollama sends one JSON object per line, each carrying the next piece of the
+        message, and a final object with "done": true and the token counts.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'.
+            temperature: Sampling temperature (0.0 to 2.0).
+            max_tokens: Maximum tokens to generate.
+            
+        Yields:
+            Pieces of the completion text in order.
+            
+        Raises:
+            Exception: If the API request fails.
+        """
+        payload = self._payload(messages, temperature, max_tokens, stream=True)
+        
+        logger.info(f"Sending streaming chat completion request to Ollama with {len(messages)} messages")
+        with start_span("llm.chat_completion_stream", {
+            "llm.provider": "ollama",
+            "llm.model": self.model_name,
+            "llm.message_count": len(messages),
+            "llm.max_tokens": max_tokens,
+        }, kind=SpanKind.CLIENT) as span:
+            # The slot is held until the whole answer has been streamed
+            with _connection.slot(), _connection.session().post(
+                f"{self.base_url}/api/chat", json=payload, stream=True, timeout=(5, self.timeout)
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise RuntimeError(f"Ollama streaming error: {chunk['error']}")
+                    content = (chunk.get("message") or {}).get("content")
+                    if content:
+                        yield content
+                    if chunk.get("done"):
+                        span.set_attributes({
+                            "llm.prompt_tokens": chunk.get("prompt_eval_count"),
+                            "llm.completion_tokens": chunk.get("eval_count"),
+                        })
+                        break
+        logger.info("Streaming chat completion request completed successfully")
+    
     def get_provider_name(self) -> str:
         """Get the provider name."""
         return "ollama"
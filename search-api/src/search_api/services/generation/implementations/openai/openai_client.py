@@ -3,13 +3,23 @@
 import os
 import json
 import logging
-from typing import Dict, Any, List, Optional
-from openai import AzureOpenAI
+from typing import Dict, Any, Iterator, List, Optional
+from openai import AsyncAzureOpenAI, AzureOpenAI
+from search_api.utils import concurrency
+from search_api.utils.tracing import SpanKind, start_span
 from ...abstractions.llm_client import LLMClient
 
 logger = logging.getLogger(__name__)
 
 
+def _create_async_client() -> AsyncAzureOpenAI:
+    return AsyncAzureOpenAI(
+        api_key=os.environ.get("AZURE_OPENAI_API_KEY"),
+        api_version=os.environ.get("AZURE_OPENAI_API_VERSION", "2024-02-15-preview"),
+        azure_endpoint=os.environ.get("AZURE_OPENAI_ENDPOINT")
+    )
+
+
 class OpenAIClient(LLMClient):
     """OpenAI implementation of the LLM client."""
     
@@ -96,7 +106,19 @@ class OpenAIClient(LLMClient):
                 kwargs["tool_choice"] = tool_choice
             
             logger.info(f"Sending chat completion request to OpenAI with {len(messages)} messages")
-            response = self.client.chat.completions.create(**kwargs)
+            with start_span("llm.chat_completion", {
+                "llm.provider": "openai",
+                "llm.model": self.deployment_name,
+                "llm.message_count": len(messages),
+                "llm.max_tokens": max_tokens,
+            }, kind=SpanKind.CLIENT) as span:
+                response = self.client.chat.completions.create(**kwargs)
+                usage = getattr(response, "usage", None)
+                if usage is not None:
+                    span.set_attributes({
+                        "llm.prompt_tokens": usage.prompt_tokens,
+                        "llm.completion_tokens": usage.completion_tokens,
+                    })
             
             # Convert response to dictionary format
             result = {
@@ -135,6 +157,111 @@ class OpenAIClient(LLMClient):
             logger.error(f"OpenAI chat completion failed: {str(e)}")
             raise
     
+    async def chat_completion_async(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.3,
+        max_tokens: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Send a chat completion request to Azure OpenAI from the event loop.
+        
+        Uses one AsyncAzureOpenAI client per event loop and holds a slot of the
+        ``llm`` concurrency limit for the duration of the call.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'.
+            temperature: Sampling temperature (0.0 to 2.0).
+            max_tokens: Maximum tokens to generate.
+            
+        Returns:
+            Dict containing the response data.
+            
+        Raises:
+            Exception: If the API request fails.
+        """
+        kwargs = {
+            "model": self.deployment_name,
+            "messages": messages,
+            "temperature": temperature
+        }
+        if max_tokens is not None:
+            kwargs["max_tokens"] = max_tokens
+        
+        logger.info(f"Sending async chat completion request to OpenAI with {len(messages)} messages")
+        async with concurrency.limit("llm"):
+            with start_span("llm.chat_completion", {
+                "llm.provider": "openai",
+                "llm.model": self.deployment_name,
+                "llm.message_count": len(messages),
+                "llm.max_tokens": max_tokens,
+            }, kind=SpanKind.CLIENT) as span:
+                client = concurrency.loop_local("openai", _create_async_client)
+                response = await client.chat.completions.create(**kwargs)
+                usage = getattr(response, "usage", None)
+                if usage is not None:
+                    span.set_attributes({
+                        "llm.prompt_tokens": usage.prompt_tokens,
+                        "llm.completion_tokens": usage.completion_tokens,
+                    })
+        
+        return {
+            "choices": [
+                {
+                    "message": {"role": choice.message.role, "content": choice.message.content},
+                    "finish_reason": choice.finish_reason
+                }
+                for choice in response.choices
+            ]
+        }
+    
+    def chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.3,
+        max_tokens: Optional[int] = None
+    ) -> Iterator[str]:
+        """Stream a chat completion from Azure OpenAI.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'.
+            temperature: Sampling temperature (0.0 to 2.0).
+            max_tokens: Maximum tokens to generate.
+            
+        Yields:
+            Pieces of the completion text in order.
+            
+        Raises:
+            Exception: If the API request fails.
+        """
+        kwargs = {
+            "model": self.deployment_name,
+            "messages": messages,
+            "temperature": temperature,
+            "stream": True
+        }
+        if max_tokens is not None:
+            kwargs["max_tokens"] = max_tokens
+        
+        logger.info(f"Sending streaming chat completion request to OpenAI with {len(messages)} messages")
+        with start_span("llm.chat_completion_stream", {
+            "llm.provider": "openai",
+            "llm.model": self.deployment_name,
+            "llm.message_count": len(messages),
+            "llm.max_tokens": max_tokens,
+        }, kind=SpanKind.CLIENT):
+            stream = self.client.chat.completions.create(**kwargs)
+            try:
+                for chunk in stream:
+                    # Azure sends content filter results in chunks without choices
+                    if not chunk.choices:
+                        continue
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        yield content
+            finally:
+                stream.close()
+        logger.info("Streaming chat completion request completed successfully")
+    
     def get_provider_name(self) -> str:
         """Get the provider name."""
         return "openai"
@@ -1,9 +1,10 @@
 """OpenAI summarizer implementation."""
 
 import logging
-from typing import List, Dict, Any, Optional
+from typing import Iterator, List, Dict, Any, Optional
 from flask import current_app
 from .openai_client import OpenAIClient
+from .. import context_packer
 from ...abstractions.summarizer import Summarizer
 
 logger = logging.getLogger(__name__)
@@ -20,6 +21,8 @@ class OpenAISummarizer(Summarizer):
         self.temperature = getattr(current_app.config, 'LLM_TEMPERATURE', 0.3)
         self.max_tokens = getattr(current_app.config, 'LLM_MAX_TOKENS', 1000)
         self.max_context_length = getattr(current_app.config, 'LLM_MAX_CONTEXT_LENGTH', 8192)
+        # Statistics from the last prompt context that was packed
+        self.last_context_packing = None
     
     def summarize_search_results(
         self, 
@@ -47,25 +50,62 @@ class OpenAISummarizer(Summarizer):
                 context=search_context.get('context') if search_context else None
             )
             
-            return {
-                'summary': summary_text,
-                'method': 'openai_summarization',
-                'confidence': 0.8,  # Default confidence for OpenAI
-                'documents_count': len(documents_or_chunks),
-                'provider': self.client.get_provider_name(),
-                'model': self.client.get_model_name()
-            }
+            return self._summary_result(summary_text, documents_or_chunks)
             
         except Exception as e:
             logger.error(f"OpenAI summarization failed: {str(e)}")
-            return {
-                'summary': f"Error generating summary: {str(e)}",
-                'method': 'error_fallback',
-                'confidence': 0.0,
-                'documents_count': len(documents_or_chunks),
-                'provider': 'openai',
-                'model': 'unknown'
-            }
+            return self._error_result(e, documents_or_chunks)
+    
+    async def summarize_search_results_async(
+        self,
+        query: str,
+        documents_or_chunks: List[Dict[str, Any]],
+        search_context: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """Summarize search results using OpenAI without blocking the event loop.
+        
+        Args:
+            query: Original search query
+            documents_or_chunks: List of document/chunk dictionaries
+            search_context: Additional context about the search
+            
+        Returns:
+            Dict containing summarization result
+        """
+        try:
+            logger.info(f"Summarizing {len(documents_or_chunks)} documents/chunks using OpenAI (async)")
+            summary_text = await self.summarize_documents_async(
+                documents=documents_or_chunks,
+                query=query,
+                context=search_context.get('context') if search_context else None
+            )
+            return self._summary_result(summary_text, documents_or_chunks)
+            
+        except Exception as e:
+            logger.error(f"OpenAI summarization failed: {str(e)}")
+            return self._error_result(e, documents_or_chunks)
+    
+    def _summary_result(self, summary_text: str, documents_or_chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            'summary': summary_text,
+            'method': 'openai_summarization',
+            'confidence': 0.8,  # Default confidence for OpenAI
+            'documents_count': len(documents_or_chunks),
+            'provider': self.client.get_provider_name(),
+            'model': self.client.get_model_name(),
+            'context_packing': self.last_context_packing
+        }
+    
+    @staticmethod
+    def _error_result(error: Exception, documents_or_chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            'summary': f"Error generating summary: {str(error)}",
+            'method': 'error_fallback',
+            'confidence': 0.0,
+            'documents_count': len(documents_or_chunks),
+            'provider': 'openai',
+            'model': 'unknown'
+        }
     
     def summarize_documents(
         self,
@@ -90,28 +130,13 @@ class OpenAISummarizer(Summarizer):
             if not documents:
                 return "No documents found to summarize."
             
-            # Build the summarization prompt
-            prompt = self._build_summarization_prompt(query, context)
-            
-            # Prepare document content
-            doc_content = self._prepare_document_content(documents)
-            
-            messages = [
-                {"role": "system", "content": prompt},
-                {
-                    "role": "user",
-                    "content": (
-                        f"Query: {query}\n\n"
-                        f"Summarize the key regulatory findings, project implications, and compliance notes from these documents:\n{doc_content}"
-                    )
-                }
-            ]
+            messages = self._build_summary_messages(documents, query, context)
             
             logger.info(f"Summarizing {len(documents)} documents using OpenAI")
             response = self.client.chat_completion(
                 messages=messages,
                 temperature=self.temperature,
-                max_tokens=min(self.max_tokens, 2000)  # Use config value but cap for summarization
+                max_tokens=self._summary_max_tokens()
             )
             
             summary = response["choices"][0]["message"]["content"]
@@ -123,6 +148,103 @@ class OpenAISummarizer(Summarizer):
             # Return a basic fallback summary
             return self._fallback_summary(documents, query)
     
+    async def summarize_documents_async(
+        self,
+        documents: List[Dict[str, Any]],
+        query: str,
+        context: Optional[str] = None
+    ) -> str:
+        """Async version of summarize_documents; falls back the same way on failure."""
+        try:
+            if not documents:
+                return "No documents found to summarize."
+            
+            messages = self._build_summary_messages(documents, query, context)
+            
+            logger.info(f"Summarizing {len(documents)} documents using OpenAI (async)")
+            response = await self.client.chat_completion_async(
+                messages=messages,
+                temperature=self.temperature,
+                max_tokens=self._summary_max_tokens()
+            )
+            
+            summary = response["choices"][0]["message"]["content"]
+            logger.info("Document summarization completed successfully")
+            return summary
+            
+        except Exception as e:
+            logger.error(f"Document summarization failed: {str(e)}")
+            return self._fallback_summary(documents, query)
+    
+    def stream_search_results(
+        self,
+        query: str,
+        documents_or_chunks: List[Dict[str, Any]],
+        search_context: Optional[Dict] = None
+    ) -> Iterator[str]:
+        """Stream the summary of search results from OpenAI as it is generated.
+        
+        If the call fails before any text was produced the fallback summary is
+        yielded instead, matching summarize_documents.
+        
+        Args:
+            query: Original search query
+            documents_or_chunks: List of document/chunk dictionaries
+            search_context: Additional context about the search
+            
+        Yields:
+            Pieces of the summary text in order
+        """
+        if not documents_or_chunks:
+            yield "No documents found to summarize."
+            return
+        
+        messages = self._build_summary_messages(
+            documents_or_chunks, query, search_context.get('context') if search_context else None
+        )
+        logger.info(f"Streaming summary of {len(documents_or_chunks)} documents using OpenAI")
+        produced = False
+        try:
+            for text in self.client.chat_completion_stream(
+                messages=messages,
+                temperature=self.temperature,
+                max_tokens=self._summary_max_tokens()
+            ):
+                produced = True
+                yield text
+        except Exception as e:
+            logger.error(f"Streaming summarization failed: {str(e)}")
+            if not produced:
+                yield self._fallback_summary(documents_or_chunks, query)
+    
+    def _build_summary_messages(
+        self,
+        documents: List[Dict[str, Any]],
+        query: str,
+        context: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages asking for a summary of the documents."""
+        # Build the summarization prompt
+        prompt = self._build_summarization_prompt(query, context)
+        
+        # Prepare document content
+        doc_content = self._prepare_document_content(documents)
+        
+        return [
+            {"role": "system", "content": prompt},
+            {
+                "role": "user",
+                "content": (
+                    f"Query: {query}\n\n"
+                    f"Summarize the key regulatory findings, project implications, and compliance notes from these documents:\n{doc_content}"
+                )
+            }
+        ]
+    
+    def _summary_max_tokens(self) -> int:
+        """Completion length for summaries."""
+        return min(self.max_tokens, 2000)  # Use config value but cap for summarization
+    
     def create_response(
         self,
         summary: str,
@@ -218,49 +340,25 @@ Instructions:
         return prompt
     
     def _prepare_document_content(self, documents: List[Dict[str, Any]]) -> str:
-        """Prepare document content for summarization with EAO focus.
+        """Pack the most relevant, non-duplicate chunks into the OpenAI context budget.
 
-        Prioritizes sections relevant to environmental assessment, regulatory compliance,
-        and project implications, and truncates less critical content to fit context limits.
+        The packing statistics are kept in ``last_context_packing`` for the response metrics.
         """
-        content_parts = []
-
-        # Reserve ~25% for prompt and response overhead
-        available_tokens = int(self.max_context_length * 0.75)
-        max_doc_length = min(3000, available_tokens // max(len(documents), 1))
-
-        for i, doc in enumerate(documents, 1):
+        def header(i: int, doc: Dict[str, Any]) -> str:
             title = doc.get("title", f"Document {i}")
-            content = doc.get("content", "")
             doc_type = doc.get("document_type", "Unknown")
             section_info = doc.get("section", "")
+            return f"Document {i}: {title} (Type: {doc_type}{', Section: ' + section_info if section_info else ''})"
 
-            # Optional: Highlight EAO-specific sections
-            eao_keywords = ["environmental assessment", "EAO", "compliance", "mitigation", "regulatory", "permit"]
-            lines = content.splitlines()
-            relevant_lines = [line for line in lines if any(k.lower() in line.lower() for k in eao_keywords)]
-
-            # If relevant lines found, use them; else fallback to full content
-            if relevant_lines:
-                content = "\n".join(relevant_lines)
-            else:
-                content = "\n".join(lines[:500])  # Take first 500 lines/characters if no keyword match
-
-            # Truncate content if exceeds max_doc_length
-            if len(content) > max_doc_length:
-                content = content[:max_doc_length] + "..."
-
-            content_parts.append(
-                f"Document {i}: {title} (Type: {doc_type}{', Section: ' + section_info if section_info else ''})\n{content}\n"
-            )
-
-        full_content = "\n".join(content_parts)
-
-        # Safety check for overall context length
-        if len(full_content) > available_tokens:
-            full_content = full_content[:available_tokens] + "\n\n[Content truncated due to context limits...]"
-
-        return full_content
+        budget = context_packer.context_budget("openai")
+        content, self.last_context_packing = context_packer.pack(documents, budget, header)
+        logger.info(
+            f"Packed {self.last_context_packing['packed_chunks']}/{len(documents)} chunks into "
+            f"{self.last_context_packing['packed_tokens']}/{budget} tokens "
+            f"({self.last_context_packing['duplicates_dropped']} duplicates, "
+            f"{self.last_context_packing['budget_dropped']} over budget)"
+        )
+        return content
     
     def _fallback_summary(self, documents: List[Dict[str, Any]], query: str) -> str:
         """Provide a basic fallback summary when LLM fails."""
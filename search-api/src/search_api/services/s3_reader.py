@@ -3,13 +3,101 @@ S3 Reader Service module for retrieving files from S3 storage.
 
 This module provides functionality to connect to an S3-compatible storage service
 and download files using their object keys. It uses the boto3 library to interact
-with the S3 API and retrieves configuration from the application settings.
+with the S3 API and retrieves configuration from the application settings. A single
+client (and its connection pool) is reused by every request in a worker process.
 """
 
+import threading
+
 import boto3
 from botocore.config import Config
 from flask import current_app
 
+# One client per worker process; boto3 clients are thread-safe and pool their connections
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+
+def get_s3_client():
+    """Return the shared S3 client, creating it from the application settings on first use."""
+    global _s3_client  # pylint: disable=global-statement
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = _create_s3_client()
+                current_app.logger.info("S3 Reader: S3 client created")
+    return _s3_client
+
+
+def _create_s3_client():
+    """Create an S3 client from the application settings."""
+    # Configure boto3 with more aggressive timeouts and retries for Azure environment
+    config = Config(
+        connect_timeout=30,      # Increased from 10 to 30 seconds
+        read_timeout=300,        # Increased to 5 minutes for large files
+        retries={
+            'max_attempts': 5,   # Increased retries
+            'mode': 'adaptive'   # Use adaptive retry mode
+        },
+        max_pool_connections=50  # Increase connection pool
+    )
+
+    return boto3.client(
+        "s3",
+        aws_access_key_id=current_app.config["S3_ACCESS_KEY_ID"],
+        aws_secret_access_key=current_app.config["S3_SECRET_ACCESS_KEY"],
+        region_name=current_app.config["S3_REGION"] if current_app.config["S3_REGION"] else None,
+        endpoint_url=current_app.config["S3_ENDPOINT_URI"] if current_app.config["S3_ENDPOINT_URI"] else None,
+        config=config
+    )
+
+
+def open_s3_object(object_key, byte_range=None, if_none_match=None, if_modified_since=None):
+    """
+    Open an S3 object for streaming without reading its body.
+
+    Range and conditional headers are forwarded to GetObject, so S3 returns only the
+    requested bytes, or nothing at all when the client's copy is still current.
+
+    Args:
+        object_key (str): The S3 key (path) of the file
+        byte_range (str, optional): HTTP Range header value, e.g. "bytes=0-65535"
+        if_none_match (str, optional): ETag the client already has
+        if_modified_since (datetime, optional): Last-Modified time the client already has
+
+    Returns:
+        dict: The GetObject response; "Body" is a StreamingBody the caller must close.
+              Includes ETag, LastModified, ContentLength, ContentType and, for ranged
+              requests, ContentRange.
+
+    Raises:
+        botocore.exceptions.ClientError: On missing objects, unsatisfiable ranges, and
+            with an HTTP status of 304 when the client's copy is current
+    """
+    params = {"Bucket": current_app.config["S3_BUCKET_NAME"], "Key": object_key}
+    if byte_range:
+        params["Range"] = byte_range
+    if if_none_match:
+        params["IfNoneMatch"] = if_none_match
+    if if_modified_since:
+        params["IfModifiedSince"] = if_modified_since
+    current_app.logger.info(f"S3 Reader: Opening object '{object_key}' (range={byte_range})")
+    return get_s3_client().get_object(**params)
+
+
+def head_s3_object(object_key):
+    """
+    Fetch an S3 object's metadata without its body.
+
+    Args:
+        object_key (str): The S3 key (path) of the file
+
+    Returns:
+        dict: The HeadObject response, including ETag, LastModified and ContentLength
+    """
+    return get_s3_client().head_object(Bucket=current_app.config["S3_BUCKET_NAME"], Key=object_key)
+
+
 def read_file_from_s3(object_key):
     """
     Download a file from S3 storage.
@@ -33,53 +121,7 @@ def read_file_from_s3(object_key):
     current_app.logger.info(f"S3 Config - Region: {current_app.config.get('S3_REGION')}")
     
     try:
-        # Log network diagnostic information first
-        current_app.logger.info("S3 Reader: Running network diagnostics...")
-        
-        # Test basic connectivity
-        import socket
-        try:
-            # Try to resolve DNS
-            ip_address = socket.gethostbyname('nrs.objectstore.gov.bc.ca')
-            current_app.logger.info(f"S3 Reader: DNS resolution successful - nrs.objectstore.gov.bc.ca -> {ip_address}")
-            
-            # Try to connect to port 443
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(15)  # 15 second timeout for diagnostic
-            result = sock.connect_ex((ip_address, 443))
-            sock.close()
-            
-            if result == 0:
-                current_app.logger.info("S3 Reader: Port 443 connection test SUCCESSFUL")
-            else:
-                current_app.logger.error(f"S3 Reader: Port 443 connection test FAILED with error code: {result}")
-                
-        except socket.gaierror as e:
-            current_app.logger.error(f"S3 Reader: DNS resolution FAILED: {e}")
-        except Exception as e:
-            current_app.logger.error(f"S3 Reader: Network diagnostic error: {e}")
-        
-        # Configure boto3 with more aggressive timeouts and retries for Azure environment
-        config = Config(
-            connect_timeout=30,      # Increased from 10 to 30 seconds
-            read_timeout=300,        # Increased to 5 minutes for large files
-            retries={
-                'max_attempts': 5,   # Increased retries
-                'mode': 'adaptive'   # Use adaptive retry mode
-            },
-            max_pool_connections=50  # Increase connection pool
-        )
-        
-        s3_client = boto3.client(
-             "s3",
-            aws_access_key_id=current_app.config["S3_ACCESS_KEY_ID"],
-            aws_secret_access_key=current_app.config["S3_SECRET_ACCESS_KEY"],
-            region_name=current_app.config["S3_REGION"] if current_app.config["S3_REGION"] else None,
-            endpoint_url=current_app.config["S3_ENDPOINT_URI"] if current_app.config["S3_ENDPOINT_URI"] else None,
-            config=config
-        )
-        current_app.logger.info("S3 Reader: S3 client created successfully with enhanced timeout configuration")
-        
+        s3_client = get_s3_client()
         current_app.logger.info(f"S3 Reader: Attempting to get object from bucket '{current_app.config['S3_BUCKET_NAME']}' with key '{object_key}'")
         response = s3_client.get_object(Bucket=current_app.config["S3_BUCKET_NAME"], Key=object_key)
         current_app.logger.info("S3 Reader: Successfully retrieved S3 object")
@@ -3,10 +3,11 @@
 import json
 import logging
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
 from typing import Dict, Any, List, Optional
 from flask import current_app
 from search_api.clients.vector_search_client import VectorSearchClient
+from . import chunk_validation, search_variations
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +36,16 @@ class VectorSearchAgent:
         """
         self.available_tools = self._get_available_tools()
         self.llm_client = llm_client
+        # Context packing statistics from the last summarize_results call
+        self.last_summary_context_packing = None
+        # Answer cache outcome from the last summarize_results call
+        self.last_summary_answer_cache = None
+        # Chunk validation decisions across all validate_chunks_relevance steps
+        self._chunk_validation_lock = threading.Lock()
+        self.chunk_validation_stats = {
+            "steps": 0, "cross_encoder_steps": 0, "llm_calls": 0, "llm_calls_avoided": 0,
+            "chunks_scored": 0, "low_margin_chunks": 0,
+        }
         self.user_location = user_location
         self.user_project_ids = project_ids
         self.user_document_type_ids = document_type_ids
@@ -73,7 +84,8 @@ class VectorSearchAgent:
                     "project_status": "project status filter - 'active', 'completed', 'recent', etc. (optional string)",
                     "years": "list of years to filter by - [2023, 2024] for recent documents (optional list of integers)",
                     "search_strategy": "search strategy to use (optional string)",
-                    "ranking": "ranking configuration with minScore and topN (optional dict)"
+                    "ranking": "ranking configuration with minScore and topN (optional dict)",
+                    "query_variants": "paraphrases of the query retrieved in the same search (optional list of strings)"
                 },
                 "returns": "search results with documents and similarity scores"
             },
@@ -740,47 +752,78 @@ SEARCH VARIATION STRATEGIES:
         
         return salvaged_objects
 
-    def _group_execution_steps(self, execution_plan: List[Dict[str, Any]]) -> List[List[int]]:
-        """Group consecutive parallelizable steps together for parallel execution.
+    def _create_execution_context(self, original_query: str) -> Dict[str, Any]:
+        """Create the shared context that plan steps read from and write to.
         
         Args:
-            execution_plan: List of execution steps
+            original_query: The user's query
             
         Returns:
-            List of groups, where each group is a list of step indices.
-            Non-parallelizable steps are in individual groups, parallelizable steps are grouped together.
-            Search steps and validate_chunks_relevance steps can be parallelized.
+            Empty execution context with every key the tools expect
         """
-        groups = []
-        search_steps = []
-        validation_steps = []
+        return {
+            "original_query": original_query,
+            "step_results": {},
+            "project_name_to_id_mapping": {},
+            "document_type_name_to_id_mapping": {},
+            "discovered_project_ids": [],
+            "discovered_document_type_ids": [],
+            "search_results": {"documents": [], "document_chunks": [], "search_executions": 0},
+            "consolidated_results": {},
+        }
+
+    def execute_plan(self, execution_plan: List[Dict[str, Any]], context: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute plan steps as a dependency graph.
         
-        for i, step in enumerate(execution_plan):
-            tool_name = step.get("tool")
-            
-            if tool_name == "search":
-                search_steps.append(i)
-            elif tool_name == "validate_chunks_relevance":
-                validation_steps.append(i)
-            else:
-                # Before adding non-parallelizable step, close any open parallel groups
-                if search_steps:
-                    groups.append(search_steps)
-                    search_steps = []
-                if validation_steps:
-                    groups.append(validation_steps)
-                    validation_steps = []
-                    
-                # Add non-parallelizable step as individual group
-                groups.append([i])
+        Each step starts as soon as the steps it references have finished (see
+        plan_scheduler), on the thread pool shared by all agents. Results are applied
+        to the context on the calling thread, in completion order, before any step
+        that depends on them is started.
         
-        # Close any remaining parallel groups at the end
-        if search_steps:
-            groups.append(search_steps)
-        if validation_steps:
-            groups.append(validation_steps)
+        Args:
+            execution_plan: List of execution steps
+            context: Execution context (see _create_execution_context)
             
-        return groups
+        Returns:
+            Dict with the step results in plan order and the schedule timing,
+            including the critical path
+        """
+        from . import plan_scheduler
+        
+        dependencies = plan_scheduler.step_dependencies(execution_plan)
+        names = [step.get("step_name", f"step_{i + 1}") for i, step in enumerate(execution_plan)]
+        app_instance = current_app._get_current_object()
+        
+        def failed(index: int, error: str) -> Dict[str, Any]:
+            step = execution_plan[index]
+            return {
+                "step_index": index,
+                "step": names[index],
+                "tool": step.get("tool", "unknown"),
+                "parameters": step.get("parameters", {}),
+                "original_parameters": step.get("parameters", {}),
+                "reasoning": step.get("reasoning", ""),
+                "result": {"success": False, "error": error}
+            }
+        
+        def on_complete(index: int, step_result: Dict[str, Any]) -> None:
+            tool_result = step_result.get("result") or {}
+            context["step_results"][names[index]] = tool_result
+            self._update_execution_context(context, execution_plan[index].get("tool", ""), tool_result)
+        
+        logger.info(f"🤖 PLAN: Executing {len(execution_plan)} steps, dependencies: {dict(zip(names, dependencies))}")
+        outcome = plan_scheduler.run(
+            dependencies,
+            execute=lambda i: self._execute_search_step_with_context(execution_plan[i], i, context, app_instance),
+            failed=failed,
+            on_complete=on_complete,
+            names=names,
+            max_in_flight=self.max_parallel_workers,
+            parallel=self.parallel_searches_enabled and len(execution_plan) > 1
+        )
+        timing = outcome["timing"]
+        logger.info(f"🤖 PLAN: Finished in {timing['wall_ms']}ms (critical path {timing['critical_path_ms']}ms, parallelism {timing['parallelism']})")
+        return outcome
 
     def _execute_search_step_with_context(self, step: Dict[str, Any], step_index: int, context: Dict[str, Any], app_instance=None) -> Dict[str, Any]:
         """Execute a search step with Flask application context preserved.
@@ -1136,6 +1179,52 @@ Response:"""
         }
         return search_results, fallback_validation
     
+    def _record_chunk_validation(self, summary: Dict[str, Any]) -> None:
+        """Add one validation step's decision to the agent's chunk validation stats."""
+        with self._chunk_validation_lock:
+            stats = self.chunk_validation_stats
+            stats["steps"] += 1
+            stats["llm_calls"] += summary.get("llm_calls", 0)
+            stats["llm_calls_avoided"] += summary.get("llm_calls_avoided", 0)
+            if summary.get("method") == "cross_encoder":
+                stats["cross_encoder_steps"] += 1
+                stats["chunks_scored"] += summary["validation_metrics"]["total_received"]
+                stats["low_margin_chunks"] += summary.get("low_margin_chunks", 0)
+
+    def validate_search_chunks(self, query: str, search_results: List[Dict[str, Any]]) -> None:
+        """Drop the irrelevant chunks of completed searches (AGENT_VALIDATE_SEARCH_CHUNKS).
+        
+        The searches are validated concurrently on the shared agent executor so that
+        their chunks are scored in one request. Each search result's chunks are replaced
+        by the kept chunks and its validation summary is added as "chunk_validation".
+        
+        Args:
+            query: The user query the chunks are judged against
+            search_results: Successful searches as collected by handle_agent_query
+        """
+        from . import plan_scheduler
+        
+        app_instance = current_app._get_current_object()
+        
+        def llm_filter(llm_query, chunks, step_name):
+            with app_instance.app_context():
+                return self._filter_relevant_chunks_with_llm(llm_query, chunks, step_name)
+        
+        steps = []
+        for search_result in search_results:
+            result_data = search_result["result"].get("result")
+            chunks = result_data[1] if isinstance(result_data, tuple) and len(result_data) >= 2 else None
+            steps.append((search_result["step_name"], chunks or []))
+        
+        outcomes = chunk_validation.validate_all(query, steps, llm_filter, plan_scheduler.get_executor())
+        for search_result, (step_name, chunks), (kept, summary) in zip(search_results, steps, outcomes):
+            self._record_chunk_validation(summary)
+            search_result["chunk_validation"] = summary
+            if chunks:
+                result_data = search_result["result"]["result"]
+                search_result["result"] = {**search_result["result"], "result": (result_data[0], kept) + result_data[2:]}
+            logger.info(f"🔍 VALIDATION: {step_name} kept {len(kept)}/{len(chunks)} chunks")
+    
     def _format_tools_for_llm(self) -> str:
         """Format tools list for LLM context with constraints."""
         tools_text = "AVAILABLE TOOLS AND CONSTRAINTS:\n\n"
@@ -1527,7 +1616,8 @@ Return JSON only.
                     years=years,
                     search_strategy=final_search_strategy,
                     ranking=final_ranking,
-                    user_location=user_location
+                    user_location=user_location,
+                    query_variants=parameters.get("query_variants")
                 )
             elif tool_name == "validate_query_relevance":
                 # Execute query validation using the validation service
@@ -1634,10 +1724,13 @@ Return JSON only.
                             "content": chunk_text  # Send full content for better validation
                         })
                     
-                    # Use LLM to filter relevant chunks
-                    logger.info(f"🔍 VALIDATION DEBUG: About to call LLM validation for step '{step_name}' with {len(search_results)} search results")
-                    relevant_chunks, llm_validation_response = self._filter_relevant_chunks_with_llm(query, search_results, step_name)
-                    logger.info(f"🔍 VALIDATION DEBUG: LLM validation completed - {len(relevant_chunks)} relevant chunks returned")
+                    # Score chunks with the cross-encoder (LLM only for low-margin chunks if enabled)
+                    logger.info(f"🔍 VALIDATION DEBUG: About to validate step '{step_name}' with {len(search_results)} search results")
+                    relevant_chunks, llm_validation_response = chunk_validation.validate(
+                        query, search_results, step_name, self._filter_relevant_chunks_with_llm
+                    )
+                    self._record_chunk_validation(llm_validation_response)
+                    logger.info(f"🔍 VALIDATION DEBUG: Validation completed - {len(relevant_chunks)} relevant chunks returned")
                     
                     result = {
                         "original_count": len(search_results),
@@ -1648,8 +1741,9 @@ Return JSON only.
                         "llm_input_chunks": llm_input_chunks,  # What was actually sent to LLM
                         "llm_validation_response": llm_validation_response,  # What the LLM decided
                         "validation_summary": {
-                            "chunks_sent_to_llm": len(llm_input_chunks),
+                            "chunks_sent_to_llm": len(llm_input_chunks) if llm_validation_response.get("method") == "llm" else 0,
                             "chunks_validated_as_relevant": len(relevant_chunks),
+                            "validation_method": llm_validation_response.get("method"),
                             "llm_decision": llm_validation_response
                         }
                     }
@@ -1691,6 +1785,8 @@ Return JSON only.
                             )
                             
                             result = summary_result.get("summary", "Summary generation failed")
+                            self.last_summary_context_packing = summary_result.get("context_packing")
+                            self.last_summary_answer_cache = summary_result.get("answer_cache")
                             logger.info(f"📝 AGENT SUMMARY: Generated summary using {summary_result.get('provider', 'unknown')} with confidence {summary_result.get('confidence', 0)}")
                         else:
                             result = "No relevant documents were found for the given query."
@@ -2586,6 +2682,8 @@ Example usage: "document_type_ids": ["{result_data[0]['document_type_id'] if res
                     )
                     
                     context["summary_result"] = summary_result
+                    self.last_summary_context_packing = summary_result.get("context_packing")
+                    self.last_summary_answer_cache = summary_result.get("answer_cache")
                     logger.info(f"📝 AGENT SUMMARY: Generated summary using {summary_result.get('provider', 'unknown')} with confidence {summary_result.get('confidence', 0)}")
                 else:
                     logger.warning("📝 AGENT SUMMARY: No results to summarize")
@@ -2872,6 +2970,7 @@ def handle_agent_query(query: str, reason: str, llm_client=None, user_location:
         
         # Execute multiple search variations with the optimized parameters
         search_queries = agent._generate_search_variations(optimized_semantic_query, num_searches)
+        variation_summary = {"generated": len(search_queries)}
         logger.info(f"🤖 STEP 3: Generated {len(search_queries)} search variations")
         
         # Helper function to build search parameters for a query
@@ -2901,105 +3000,60 @@ def handle_agent_query(query: str, reason: str, llm_client=None, user_location:
             
             return search_params
         
-        def execute_parallel_searches(search_queries, agent):
-            """Execute searches in parallel using ThreadPoolExecutor."""
-            # Capture the Flask app instance for use in worker threads
-            app = current_app._get_current_object()
-            
-            def execute_single_search(search_data):
-                i, search_query = search_data
-                
-                # Set up Flask application context for the worker thread using captured app
-                try:
-                    with app.app_context():
-                        logger.info(f"🔍 Search {i+1}/{len(search_queries)}: '{search_query}'")
-                        
-                        # Build search parameters using shared function
-                        search_params = build_search_params(search_query)
-                        
-                        try:
-                            search_result = agent.execute_tool("search", search_params)
-                            if search_result.get("success"):
-                                logger.info(f"✅ Search {i+1} completed successfully")
-                                return {
-                                    "index": i,
-                                    "query": search_query,
-                                    "result": search_result,
-                                    "step_name": f"search_{i+1}",
-                                    "success": True
-                                }
-                            else:
-                                logger.warning(f"❌ Search {i+1} failed: {search_result.get('error', 'Unknown error')}")
-                                return {"index": i, "success": False, "error": search_result.get('error', 'Unknown error')}
-                        except Exception as e:
-                            logger.error(f"❌ Search {i+1} exception: {e}")
-                            return {"index": i, "success": False, "error": str(e)}
-                            
-                except RuntimeError as e:
-                    # Flask app context issue - fallback to sequential for this search
-                    logger.warning(f"❌ Search {i+1} app context error, falling back to sequential: {e}")
-                    return {"index": i, "success": False, "error": f"App context error: {str(e)}"}
-            
-            # Execute searches in parallel
-            with ThreadPoolExecutor(max_workers=agent.max_parallel_workers) as executor:
-                # Submit all search tasks
-                future_to_search = {
-                    executor.submit(execute_single_search, (i, query)): i 
-                    for i, query in enumerate(search_queries)
+        # With multi-query dispatch the variations go to the vector API as one request, which
+        # collapses near-paraphrases with the embedding model and retrieves over the union of
+        # the rest; otherwise each variation is a plan step and independent steps run
+        # concurrently on the shared agent executor
+        if search_variations.dispatch_mode() == "multi_query" and len(search_queries) > 1:
+            step_queries = [search_queries[0]]
+            search_params = build_search_params(search_queries[0])
+            search_params["query_variants"] = search_queries[1:]
+            search_plan = [{
+                "step_name": "search_1",
+                "tool": "search",
+                "parameters": search_params,
+                "reasoning": "Optimized query with its search variations retrieved in one request"
+            }]
+            execution_mode = "multi_query"
+        else:
+            step_queries = search_queries
+            search_plan = [
+                {
+                    "step_name": f"search_{i+1}",
+                    "tool": "search",
+                    "parameters": build_search_params(search_query),
+                    "reasoning": "Search variation of the optimized query"
                 }
-                
-                # Collect results as they complete
-                parallel_results = [None] * len(search_queries)
-                for future in as_completed(future_to_search):
-                    try:
-                        result = future.result()
-                        if result["success"]:
-                            parallel_results[result["index"]] = result
-                    except Exception as e:
-                        logger.error(f"❌ Parallel search execution error: {e}")
-                
-                # Add successful results in original order
-                return [r for r in parallel_results if r is not None]
-        
-        def execute_sequential_searches(search_queries, agent):
-            """Execute searches sequentially."""
-            search_results = []
-            
-            for i, search_query in enumerate(search_queries):
-                logger.info(f"🔍 Search {i+1}/{len(search_queries)}: '{search_query}'")
-                
-                # Build search parameters using shared function
-                search_params = build_search_params(search_query)
-                
-                try:
-                    search_result = agent.execute_tool("search", search_params)
-                    if search_result.get("success"):
-                        search_results.append({
-                            "query": search_query,
-                            "result": search_result,
-                            "step_name": f"search_{i+1}"
-                        })
-                        logger.info(f"✅ Search {i+1} completed successfully")
-                    else:
-                        logger.warning(f"❌ Search {i+1} failed: {search_result.get('error', 'Unknown error')}")
-                except Exception as e:
-                    logger.error(f"❌ Search {i+1} exception: {e}")
-            
-            return search_results
-        
-        # Determine execution mode (disable parallel for now due to Flask context issues)
-        execution_mode = "parallel" if agent.parallel_searches_enabled and len(search_queries) > 1 else "sequential"
+                for i, search_query in enumerate(search_queries)
+            ]
+            execution_mode = "parallel" if agent.parallel_searches_enabled and len(search_queries) > 1 else "sequential"
+        variation_summary["dispatch"] = execution_mode
+        variation_summary["searches_sent"] = len(search_plan)
+        variation_summary["searches_avoided"] = len(search_queries) - len(search_plan)
+        logger.info(f"🤖 STEP 3: Executing {len(search_plan)} searches in {execution_mode} mode")
         
-        logger.info(f"🤖 STEP 3: Executing searches in {execution_mode} mode")
+        plan_outcome = agent.execute_plan(search_plan, agent._create_execution_context(optimized_semantic_query))
+        plan_schedule = plan_outcome["timing"]
         
-        # Execute searches using appropriate strategy
-        if parallel_searches_enabled and len(search_queries) > 1:
-            search_results = execute_parallel_searches(search_queries, agent)
-        else:
-            search_results = execute_sequential_searches(search_queries, agent)
+        search_results = []
+        for i, step_result in enumerate(plan_outcome["results"]):
+            tool_result = step_result.get("result") or {}
+            if tool_result.get("success"):
+                logger.info(f"✅ Search {i+1} completed successfully")
+                search_results.append({
+                    "query": step_queries[i],
+                    "query_variants": search_plan[i]["parameters"].get("query_variants", []),
+                    "result": tool_result,
+                    "step_name": step_result.get("step", f"search_{i+1}")
+                })
+            else:
+                logger.warning(f"❌ Search {i+1} failed: {tool_result.get('error', 'Unknown error')}")
         
         logger.info(f"🤖 STEP 3: Completed {len(search_results)} successful searches")
         
+        if search_results and chunk_validation.searches_enabled():
+            agent.validate_search_chunks(query, search_results)
+        
         # STEP 4: Consolidate Results 
         logger.info("🤖 STEP 4: Consolidating search results...")
         
@@ -3110,6 +3164,7 @@ def handle_agent_query(query: str, reason: str, llm_client=None, user_location:
             search_execution_details.append({
                 "search_number": i + 1,
                 "query": search_result["query"],
+                "query_variants": search_result["query_variants"],
                 "parameters": {
                     "project_ids": optimized_project_ids,
                     "document_type_ids": optimized_document_type_ids,
@@ -3148,7 +3203,14 @@ def handle_agent_query(query: str, reason: str, llm_client=None, user_location:
                 "user_location": user_location,
                 "project_status": optimized_project_status,
                 "years": optimized_years
-            }
+            },
+            "extraction_cache": extraction_result.get("extraction_cache"),
+            "prompt_shortlist": extraction_result.get("prompt_shortlist"),
+            "summary_context_packing": agent.last_summary_context_packing,
+            "summary_answer_cache": agent.last_summary_answer_cache,
+            "plan_schedule": plan_schedule,
+            "search_variations": variation_summary,
+            "chunk_validation": agent.chunk_validation_stats
         }
         
     except Exception as e:
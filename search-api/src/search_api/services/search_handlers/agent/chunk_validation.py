@@ -0,0 +1,244 @@
+"""
+Chunk Validation
+Decides which chunks returned by an agent search step are relevant to the query.
+
+Validation used to send the top chunks of every search step to the LLM, one
+multi-second call per step. By default the chunks are now scored with the vector
+API's cross-encoder re-ranker (POST /relevance) and kept when their score reaches
+the threshold:
+
+- Validation steps that run at the same time share one scoring request: the first
+  step to arrive waits a few milliseconds for the others and sends all of their
+  (query, chunk) pairs in a single batch. A batch larger than the vector API accepts
+  in one request is sent as several requests; steps without chunks send nothing.
+- Chunks scoring within the margin of the threshold are low-margin. With the LLM
+  fallback enabled, only those chunks are sent to the LLM for a decision.
+- When the vector API cannot score the chunks, the step is validated by the LLM as
+  before.
+
+Scores are raw cross-encoder logits (see the vector API's MIN_RELEVANCE_SCORE); the
+default threshold keeps moderately and highly relevant chunks.
+
+The default agent pipeline (handle_agent_query) only validates its search chunks when
+AGENT_VALIDATE_SEARCH_CHUNKS is enabled; the searches are then validated together so
+they share one scoring request.
+
+Configuration (environment):
+    AGENT_CHUNK_VALIDATION: "cross_encoder" to score chunks on the vector API or "llm"
+        to ask the LLM per step (default: cross_encoder)
+    AGENT_CHUNK_VALIDATION_THRESHOLD: Cross-encoder score a chunk needs to be kept (default: -3.0)
+    AGENT_CHUNK_VALIDATION_MARGIN: Distance from the threshold below which a score is low-margin (default: 1.0)
+    AGENT_CHUNK_VALIDATION_LLM_FALLBACK: Set to "true" to ask the LLM about low-margin chunks (default: false)
+    AGENT_CHUNK_VALIDATION_BATCH_WINDOW_MS: Time a step waits for other steps to share its scoring request
+        (default: 25)
+    AGENT_CHUNK_VALIDATION_MAX_PAIRS: Most pairs sent in one scoring request; the vector API's
+        POST /relevance accepts up to 500 (default: 500)
+    AGENT_VALIDATE_SEARCH_CHUNKS: Set to "true" to validate the chunks of the default agent
+        pipeline's searches (default: false)
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from search_api.utils.tracing import submit_with_context
+
+logger = logging.getLogger(__name__)
+
+LLMFilter = Callable[[str, List[Dict], str], Tuple[List[Dict], Dict[str, Any]]]
+Scorer = Callable[[List[Dict[str, str]]], Optional[List[float]]]
+
+
+def backend() -> str:
+    """Configured validation backend ("cross_encoder" or "llm")."""
+    return os.getenv("AGENT_CHUNK_VALIDATION", "cross_encoder").lower()
+
+
+def searches_enabled() -> bool:
+    """Whether the default agent pipeline validates the chunks of its searches."""
+    return os.getenv("AGENT_VALIDATE_SEARCH_CHUNKS", "false").lower() == "true"
+
+
+def chunk_text(chunk: Any) -> str:
+    """Text of a chunk as it is judged (content, text or snippet)."""
+    if isinstance(chunk, dict):
+        for field in ("content", "text", "snippet"):
+            if field in chunk:
+                return chunk.get(field) or ""
+    return str(chunk)
+
+
+def _score_with_vector_api(pairs: List[Dict[str, str]]) -> Optional[List[float]]:
+    from search_api.clients.vector_search_client import VectorSearchClient  # pylint: disable=import-outside-toplevel
+    return VectorSearchClient.score_relevance(pairs)
+
+
+class _Batch:  # pylint: disable=too-few-public-methods
+    """Pairs collected in one batch window."""
+
+    def __init__(self):
+        self.pairs: List[Dict[str, str]] = []
+        # One score per pair; None where the request scoring the pair failed
+        self.scores: List[Optional[float]] = []
+        self.done = threading.Event()
+
+
+class ScoreBatcher:
+    """Combines the scoring requests of concurrent validation steps into one call."""
+
+    def __init__(self, scorer: Scorer = _score_with_vector_api):
+        self._scorer = scorer
+        self._lock = threading.Lock()
+        self._open: Optional[_Batch] = None
+
+    def score(self, pairs: List[Dict[str, str]]) -> Tuple[Optional[List[float]], int]:
+        """Score pairs, sharing the request with any steps arriving within the window.
+
+        Returns:
+            The scores for these pairs (None if scoring failed) and the number of
+            pairs in the batch they were scored with.
+        """
+        if not pairs:
+            return [], 0
+        with self._lock:
+            batch = self._open
+            leader = batch is None
+            if leader:
+                batch = self._open = _Batch()
+            offset = len(batch.pairs)
+            batch.pairs.extend(pairs)
+
+        if leader:
+            time.sleep(float(os.getenv("AGENT_CHUNK_VALIDATION_BATCH_WINDOW_MS", "25")) / 1000)
+            with self._lock:
+                self._open = None
+            try:
+                batch.scores = self._score_batch(batch.pairs)
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        scores = batch.scores[offset:offset + len(pairs)]
+        if len(scores) != len(pairs) or any(score is None for score in scores):
+            return None, len(batch.pairs)
+        return scores, len(batch.pairs)
+
+    def _score_batch(self, pairs: List[Dict[str, str]]) -> List[Optional[float]]:
+        """Score a batch in requests of at most AGENT_CHUNK_VALIDATION_MAX_PAIRS pairs.
+
+        A failed request only leaves the pairs it carried unscored.
+        """
+        size = max(1, int(os.getenv("AGENT_CHUNK_VALIDATION_MAX_PAIRS", "500")))
+        scores: List[Optional[float]] = []
+        for start in range(0, len(pairs), size):
+            part = pairs[start:start + size]
+            try:
+                part_scores = self._scorer(part)
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning(f"🔍 CHUNK VALIDATION: Relevance scoring failed: {e}")
+                part_scores = None
+            if part_scores is None or len(part_scores) != len(part):
+                part_scores = [None] * len(part)
+            scores.extend(part_scores)
+        return scores
+
+
+_batcher = ScoreBatcher()
+
+
+def validate(query: str, chunks: Sequence[Any], step_name: str, llm_filter: LLMFilter,
+             batcher: Optional[ScoreBatcher] = None) -> Tuple[List[Any], Dict[str, Any]]:
+    """Keep the chunks relevant to the query.
+
+    Args:
+        query: The user query
+        chunks: Chunks returned by the search step
+        step_name: Name of the search step, used in chunk ids and logs
+        llm_filter: The LLM validation, called as llm_filter(query, chunks, step_name)
+        batcher: Scoring batcher (defaults to the shared vector API batcher)
+
+    Returns:
+        The relevant chunks and a validation summary in the LLM validation's format,
+        with "method", "llm_calls" and "llm_calls_avoided" added.
+    """
+    if backend() != "cross_encoder":
+        kept, summary = llm_filter(query, list(chunks), step_name)
+        summary.update({"method": "llm", "llm_calls": 1, "llm_calls_avoided": 0})
+        return kept, summary
+
+    threshold = float(os.getenv("AGENT_CHUNK_VALIDATION_THRESHOLD", "-3.0"))
+    margin = float(os.getenv("AGENT_CHUNK_VALIDATION_MARGIN", "1.0"))
+    start = time.perf_counter()
+    scores, batch_size = (batcher or _batcher).score([{"query": query, "content": chunk_text(c)} for c in chunks])
+    scoring_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    if scores is None:
+        logger.warning(f"🔍 CHUNK VALIDATION: No scores for step '{step_name}', validating with the LLM")
+        kept, summary = llm_filter(query, list(chunks), step_name)
+        summary.update({"method": "llm", "reason": "scoring_unavailable", "llm_calls": 1, "llm_calls_avoided": 0})
+        return kept, summary
+
+    step_short = step_name.replace("search_", "").replace("filter_", "")[:10]
+    keep = [score >= threshold for score in scores]
+    low_margin = [i for i, score in enumerate(scores) if abs(score - threshold) < margin]
+
+    llm_calls = 0
+    if low_margin and os.getenv("AGENT_CHUNK_VALIDATION_LLM_FALLBACK", "false").lower() == "true":
+        llm_kept, _ = llm_filter(query, [chunks[i] for i in low_margin], step_name)
+        llm_calls = 1
+        kept_ids = {id(chunk) for chunk in llm_kept}
+        for i in low_margin:
+            keep[i] = id(chunks[i]) in kept_ids
+
+    kept = [chunk for chunk, k in zip(chunks, keep) if k]
+    summary = {
+        "step": step_name,
+        "method": "cross_encoder",
+        "validation_metrics": {
+            "total_received": len(chunks),
+            "total_valid": len(kept),
+            "total_invalid": len(chunks) - len(kept),
+        },
+        "valid_chunk_ids": [f"{step_short}_chunk_{i + 1}" for i, k in enumerate(keep) if k],
+        "chunks_kept": len(kept),
+        "removed_chunks": [chunk for chunk, k in zip(chunks, keep) if not k],
+        "scores": [round(score, 3) for score in scores],
+        "threshold": threshold,
+        "low_margin_chunks": len(low_margin),
+        "scoring_ms": scoring_ms,
+        "batch_pairs": batch_size,
+        "llm_calls": llm_calls,
+        "llm_calls_avoided": 1 - llm_calls,
+    }
+    logger.info(
+        f"🔍 CHUNK VALIDATION: Step '{step_name}' kept {len(kept)}/{len(chunks)} chunks by cross-encoder "
+        f"(threshold {threshold}, {len(low_margin)} low-margin, {llm_calls} LLM calls, batch of {batch_size} pairs)"
+    )
+    return kept, summary
+
+
+def validate_all(query: str, steps: Sequence[Tuple[str, Sequence[Any]]], llm_filter: LLMFilter,
+                 executor: Executor, batcher: Optional[ScoreBatcher] = None) -> List[Tuple[List[Any], Dict[str, Any]]]:
+    """Validate the chunks of several search steps concurrently.
+
+    The steps run on the executor at the same time, so their pairs are scored in a
+    single batch.
+
+    Args:
+        query: The user query
+        steps: (step name, chunks) for each search step
+        llm_filter: The LLM validation (see validate)
+        executor: Executor the steps are validated on
+        batcher: Scoring batcher (defaults to the shared vector API batcher)
+
+    Returns:
+        validate's (kept chunks, summary) for each step, in order
+    """
+    futures = [
+        submit_with_context(executor, validate, query, chunks, step_name, llm_filter, batcher)
+        for step_name, chunks in steps
+    ]
+    return [future.result() for future in futures]
@@ -0,0 +1,267 @@
+"""
+Plan Scheduler
+Runs agent execution plan steps as a dependency graph instead of in fixed groups.
+
+Dependencies are compiled from the plan itself:
+
+- A parameter naming an earlier step (``"results_from_search_x"``, ``"search_x"``, or a
+  list such as ``filter_steps``) depends on that step.
+- An ``"obtained ..."`` placeholder for project_ids, document_type_ids or
+  search_strategy depends on the latest earlier get_projects_list,
+  get_document_types or get_search_strategies step. Searches also wait for earlier
+  catalogue steps, whose mappings are used to enhance search parameters.
+- Steps that read the shared execution context wait for the steps that fill it:
+  verify_reduce for the validation steps (when none are named), consolidate_results
+  for every earlier search/validation/reduce step, and summarize_results for the
+  consolidation (or, without one, everything it would have consolidated).
+
+A step is submitted as soon as all of its inputs are ready, so an unrelated slow step
+no longer holds back the rest of the plan. Steps of all requests share one bounded
+thread pool; each plan additionally limits how many of its own steps run at once.
+
+A step that has not finished within its deadline is reported as failed and its
+dependents go ahead without it; the worker thread finishes in the background, so a
+stuck downstream call occupies a pool thread until its own timeout.
+
+The timing returned with the results holds the wall time, the sum of step times
+(their ratio is the achieved parallelism) and the critical path: the chain of
+dependent steps that determined the finish time, with the time each step spent
+queued and running.
+
+Configuration (environment):
+    AGENT_EXECUTOR_WORKERS: Threads in the pool shared by all agent plans (default: 8)
+    AGENT_STEP_TIMEOUT_SECONDS: Deadline for one plan step, including queueing (default: 60)
+"""
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from search_api.utils.tracing import submit_with_context
+
+logger = logging.getLogger(__name__)
+
+_CATALOGUE_SOURCES = {
+    "project_ids": "get_projects_list",
+    "document_type_ids": "get_document_types",
+    "search_strategy": "get_search_strategies",
+}
+_CATALOGUE_TOOLS = ("get_projects_list", "get_document_types")
+_GATHERED_TOOLS = ("search", "validate_chunks_relevance", "verify_reduce")
+_RESULT_REFERENCE = re.compile(r"^results?_from_(.+)$")
+
+_executor_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the thread pool shared by all agent plans, creating it on first use."""
+    global _executor  # pylint: disable=global-statement
+    with _executor_lock:
+        if _executor is None:
+            workers = int(os.getenv("AGENT_EXECUTOR_WORKERS", "8"))
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="agent-step")
+        return _executor
+
+
+def step_timeout() -> float:
+    """Deadline in seconds for a single plan step."""
+    return float(os.getenv("AGENT_STEP_TIMEOUT_SECONDS", "60"))
+
+
+def _strings(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, (list, tuple)):
+        return [item for item in value if isinstance(item, str)]
+    if isinstance(value, dict):
+        return [s for item in value.values() for s in _strings(item)]
+    return []
+
+
+def step_dependencies(plan: Sequence[Dict[str, Any]]) -> List[List[int]]:
+    """Compile an execution plan into the indices each step depends on.
+
+    Steps only ever depend on earlier steps, so plan order is a valid execution order.
+    """
+    dependencies: List[List[int]] = []
+    names: Dict[str, int] = {}
+    latest_tool: Dict[str, int] = {}
+
+    for index, step in enumerate(plan):
+        tool = step.get("tool", "")
+        parameters = step.get("parameters") or {}
+        deps = set()
+
+        for text in _strings(parameters):
+            reference = _RESULT_REFERENCE.match(text)
+            name = reference.group(1) if reference else text
+            if name in names:
+                deps.add(names[name])
+
+        for parameter, source in _CATALOGUE_SOURCES.items():
+            if source in latest_tool and any("obtained" in s.lower() for s in _strings(parameters.get(parameter))):
+                deps.add(latest_tool[source])
+
+        earlier = range(index)
+        if tool == "search":
+            deps.update(i for i in earlier if plan[i].get("tool") in _CATALOGUE_TOOLS)
+        elif tool == "verify_reduce" and not deps:
+            deps.update(i for i in earlier if plan[i].get("tool") == "validate_chunks_relevance")
+        elif tool == "consolidate_results":
+            deps.update(i for i in earlier if plan[i].get("tool") in _GATHERED_TOOLS)
+        elif tool == "summarize_results":
+            if "consolidate_results" in latest_tool:
+                deps.add(latest_tool["consolidate_results"])
+            else:
+                deps.update(i for i in earlier if plan[i].get("tool") in _GATHERED_TOOLS)
+
+        dependencies.append(sorted(deps))
+        names[step.get("step_name", f"step_{index + 1}")] = index
+        latest_tool[tool] = index
+    return dependencies
+
+
+def _critical_path(dependencies: Sequence[Sequence[int]], timings: List[Dict[str, Any]],
+                   names: Sequence[str]) -> Dict[str, Any]:
+    """The chain of dependencies that ended last, walked back from the last step to finish."""
+    finished = [i for i, t in enumerate(timings) if t]
+    if not finished:
+        return {"critical_path": [], "critical_path_ms": 0.0}
+    index = max(finished, key=lambda i: timings[i]["end_ms"])
+    path = []
+    while index is not None:
+        timing = timings[index]
+        path.append({
+            "step": names[index],
+            "queued_ms": round(timing["start_ms"] - timing["ready_ms"], 2),
+            "run_ms": round(timing["end_ms"] - timing["start_ms"], 2),
+            "status": timing["status"],
+        })
+        parents = [d for d in dependencies[index] if timings[d]]
+        index = max(parents, key=lambda d: timings[d]["end_ms"]) if parents else None
+    path.reverse()
+    return {"critical_path": path, "critical_path_ms": round(max(timings[i]["end_ms"] for i in finished), 2)}
+
+
+def run(dependencies: Sequence[Sequence[int]], execute: Callable[[int], Any],
+        failed: Callable[[int, str], Any], on_complete: Optional[Callable[[int, Any], None]] = None,
+        names: Optional[Sequence[str]] = None, max_in_flight: int = 4,
+        timeout: Optional[float] = None, parallel: bool = True) -> Dict[str, Any]:
+    """Run steps as their dependencies complete.
+
+    Args:
+        dependencies: For each step, the indices of the steps it needs
+        execute: Runs one step (in a pool thread) and returns its result
+        failed: Builds the result of a step that raised or missed its deadline
+        on_complete: Called on the calling thread with each result, in completion
+            order and before any dependent step is submitted
+        names: Step names for the timing breakdown
+        max_in_flight: Steps of this plan allowed to run at once
+        timeout: Deadline in seconds per step (defaults to AGENT_STEP_TIMEOUT_SECONDS)
+        parallel: Set to False to run the steps one at a time on the calling thread
+
+    Returns:
+        Dict with "results" (in step order) and "timing".
+    """
+    count = len(dependencies)
+    names = list(names) if names is not None else [f"step_{i + 1}" for i in range(count)]
+    timeout = step_timeout() if timeout is None else timeout
+    results: List[Any] = [None] * count
+    timings: List[Optional[Dict[str, Any]]] = [None] * count
+    ready_at: Dict[int, float] = {}
+    started_at: Dict[int, float] = {}
+    timed_out: List[str] = []
+    origin = time.perf_counter()
+
+    def elapsed_ms(moment: float) -> float:
+        return round((moment - origin) * 1000, 2)
+
+    def finish(index: int, result: Any, status: str) -> None:
+        end = time.perf_counter()
+        start = started_at.get(index, end)
+        results[index] = result
+        timings[index] = {
+            "ready_ms": elapsed_ms(ready_at[index]),
+            "start_ms": elapsed_ms(start),
+            "end_ms": elapsed_ms(end),
+            "status": status,
+        }
+        if on_complete is not None:
+            on_complete(index, result)
+
+    def timed(index: int) -> Any:
+        started_at[index] = time.perf_counter()
+        return execute(index)
+
+    remaining = {i: set(deps) for i, deps in enumerate(dependencies)}
+    dependents: Dict[int, List[int]] = {i: [] for i in range(count)}
+    for i, deps in enumerate(dependencies):
+        for d in deps:
+            dependents[d].append(i)
+    ready = [i for i in range(count) if not remaining[i]]
+    for i in ready:
+        ready_at[i] = origin
+
+    def release(index: int) -> None:
+        for child in dependents[index]:
+            remaining[child].discard(index)
+            if not remaining[child]:
+                ready_at[child] = time.perf_counter()
+                ready.append(child)
+
+    if not parallel:
+        while ready:
+            index = ready.pop(0)
+            try:
+                finish(index, timed(index), "ok")
+            except Exception as e:  # pylint: disable=broad-except
+                finish(index, failed(index, str(e)), "error")
+            release(index)
+    else:
+        executor = get_executor()
+        running: Dict[Future, int] = {}
+        deadlines: Dict[Future, float] = {}
+        while ready or running:
+            while ready and len(running) < max(1, max_in_flight):
+                index = ready.pop(0)
+                future = submit_with_context(executor, timed, index)
+                running[future] = index
+                deadlines[future] = time.perf_counter() + timeout
+
+            wait_for = max(0.0, min(deadlines.values()) - time.perf_counter())
+            done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                deadlines.pop(future)
+                try:
+                    finish(index, future.result(), "ok")
+                except Exception as e:  # pylint: disable=broad-except
+                    finish(index, failed(index, str(e)), "error")
+                release(index)
+
+            now = time.perf_counter()
+            for future in [f for f, deadline in deadlines.items() if deadline <= now]:
+                index = running.pop(future)
+                deadlines.pop(future)
+                future.cancel()
+                logger.warning(f"🤖 PLAN: Step '{names[index]}' missed its {timeout}s deadline")
+                timed_out.append(names[index])
+                finish(index, failed(index, f"Step timed out after {timeout}s"), "timeout")
+                release(index)
+
+    wall_ms = elapsed_ms(time.perf_counter())
+    step_ms = sum(t["end_ms"] - t["start_ms"] for t in timings if t)
+    timing = {
+        "steps": count,
+        "wall_ms": wall_ms,
+        "sum_step_ms": round(step_ms, 2),
+        "parallelism": round(step_ms / wall_ms, 2) if wall_ms else 0.0,
+        "timed_out": timed_out,
+        "mode": "parallel" if parallel else "sequential",
+    }
+    timing.update(_critical_path(dependencies, timings, names))
+    return {"results": results, "timing": timing}
@@ -0,0 +1,26 @@
+"""
+Search Variations
+Decides how the agent's search variations are dispatched to the vector API.
+
+The agent generates several rewordings of the optimized query and used to run each
+one as a full vector search. Rewordings that differ only in word order or
+inflection retrieve the same chunks, which were then thrown away again by
+deduplication.
+
+By default the variations are dispatched as a single multi-query request: the base
+query with the others as ``query_variants``. The vector API embeds them with its
+embedding model, drops near-paraphrases (QUERY_VARIANT_SIMILARITY,
+MAX_QUERY_VARIANTS) and retrieves in one pass over the union of the rest, so the
+agent forwards the variations as generated. ``separate`` dispatch runs one search
+per variation.
+
+Configuration (environment):
+    AGENT_VARIATION_DISPATCH: "multi_query" to send one vector API request or "separate" for one per
+        variation (default: multi_query)
+"""
+import os
+
+
+def dispatch_mode() -> str:
+    """Configured dispatch mode ("multi_query" or "separate")."""
+    return os.getenv("AGENT_VARIATION_DISPATCH", "multi_query").lower()
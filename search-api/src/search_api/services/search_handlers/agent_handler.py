@@ -7,6 +7,8 @@ import time
 from typing import Dict, List, Optional, Any
 from flask import current_app
 
+from search_api.utils.tracing import traced
+
 from .base_handler import BaseSearchHandler
 
 
@@ -14,6 +16,7 @@ class AgentHandler(BaseSearchHandler):
     """Handler for Agent mode processing - complete query processing via agent stub."""
     
     @classmethod
+    @traced("search_handler.agent")
     def handle(cls, query: str, project_ids: Optional[List[str]] = None, 
                document_type_ids: Optional[List[str]] = None, 
                search_strategy: Optional[str] = None, 
@@ -143,6 +146,21 @@ class AgentHandler(BaseSearchHandler):
                 # Add detailed search execution visibility if available
                 if "search_execution_details" in agent_result:
                     metrics["search_execution_details"] = agent_result["search_execution_details"]
+
+                if agent_result.get("extraction_cache"):
+                    metrics["agent_extraction_cache"] = agent_result["extraction_cache"]
+                if agent_result.get("prompt_shortlist"):
+                    metrics["agent_prompt_shortlist"] = agent_result["prompt_shortlist"]
+                if agent_result.get("summary_context_packing"):
+                    metrics["summary_context_packing"] = agent_result["summary_context_packing"]
+                if agent_result.get("summary_answer_cache"):
+                    metrics["summary_answer_cache"] = agent_result["summary_answer_cache"]
+                if agent_result.get("plan_schedule"):
+                    metrics["agent_plan_schedule"] = agent_result["plan_schedule"]
+                if agent_result.get("search_variations"):
+                    metrics["agent_search_variations"] = agent_result["search_variations"]
+                if agent_result.get("chunk_validation", {}).get("steps"):
+                    metrics["agent_chunk_validation"] = agent_result["chunk_validation"]
                 
                 # Consolidation info (only if multiple searches)
                 if search_count > 1:
@@ -197,6 +215,8 @@ class AgentHandler(BaseSearchHandler):
                 
                 current_app.logger.info(f"🤖 AGENT MODE: Agent returned {len(agent_documents)} documents and {len(agent_document_chunks)} chunks")
             
+            summary_cached = bool(agent_result and (agent_result.get("summary_answer_cache") or {}).get("hit"))
+
             # Use agent-generated summary if available, otherwise generate fallback
             if agent_result and ("summary_result" in agent_result or "consolidated_summary" in agent_result):
                 if "consolidated_summary" in agent_result:
@@ -237,6 +257,11 @@ class AgentHandler(BaseSearchHandler):
                     if all_results:
                         summary_result = summarizer.summarize_search_results(query, all_results)
                         final_response = summary_result.get("summary", "No summary available")
+                        if summary_result.get("context_packing"):
+                            metrics["summary_context_packing"] = summary_result["context_packing"]
+                        if summary_result.get("answer_cache"):
+                            metrics["summary_answer_cache"] = summary_result["answer_cache"]
+                        summary_cached = summary_result.get("cached", False)
                         current_app.logger.info("🤖 AGENT MODE: Fallback AI summary generated successfully")
                     else:
                         final_response = "The agent processing completed but no relevant documents were found."
@@ -258,6 +283,7 @@ class AgentHandler(BaseSearchHandler):
             return {
                 "result": {
                     "response": final_response,
+                    "cached": summary_cached,
                     "documents": agent_documents,
                     "document_chunks": agent_document_chunks,
                     "metrics": metrics,
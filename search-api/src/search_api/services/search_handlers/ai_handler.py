@@ -7,6 +7,9 @@ import time
 from typing import Dict, List, Optional, Any
 from flask import current_app
 
+from search_api.utils import concurrency
+from search_api.utils.tracing import start_span, traced
+
 from .base_handler import BaseSearchHandler
 
 
@@ -14,6 +17,7 @@ class AIHandler(BaseSearchHandler):
     """Handler for AI mode processing - LLM parameter extraction plus AI summarization."""
     
     @classmethod
+    @traced("search_handler.ai")
     def handle(cls, query: str, project_ids: Optional[List[str]] = None, 
                document_type_ids: Optional[List[str]] = None, 
                search_strategy: Optional[str] = None, 
@@ -47,6 +51,63 @@ class AIHandler(BaseSearchHandler):
             Complete response dictionary with AI results
         """
         start_time = time.time()
+        resolved = cls._resolve_parameters(query, project_ids, document_type_ids, search_strategy, inference, ranking, metrics, user_location, project_status, years, start_time)
+        if "result" in resolved:
+            return resolved
+        search_result = cls._execute_vector_search(**resolved)
+        if not search_result["documents_or_chunks"]:
+            return cls._no_results(search_result, metrics, start_time)
+        
+        # Generate AI summary of search results
+        current_app.logger.info("🔍 AI MODE: Generating AI summary...")
+        summary_result = cls._generate_agentic_summary(search_result["documents_or_chunks"], query, metrics)
+        return cls._respond(query, search_result, summary_result, metrics, start_time)
+    
+    @classmethod
+    @traced("search_handler.ai")
+    async def handle_async(cls, query: str, project_ids: Optional[List[str]] = None,
+                           document_type_ids: Optional[List[str]] = None,
+                           search_strategy: Optional[str] = None,
+                           inference: Optional[List] = None,
+                           ranking: Optional[Dict] = None,
+                           metrics: Optional[Dict] = None,
+                           user_location: Optional[Dict] = None,
+                           project_status: Optional[str] = None,
+                           years: Optional[List] = None) -> Dict[str, Any]:
+        """Async version of ``handle``.
+        
+        The relevance check and the LLM parameter extraction are still synchronous and
+        run on a worker thread; the vector search and the summary wait on the event loop.
+        """
+        start_time = time.time()
+        resolved = await concurrency.offload(cls._resolve_parameters, query, project_ids, document_type_ids, search_strategy, inference, ranking, metrics, user_location, project_status, years, start_time)
+        if "result" in resolved:
+            return resolved
+        search_result = await cls._execute_vector_search_async(**resolved)
+        if not search_result["documents_or_chunks"]:
+            return cls._no_results(search_result, metrics, start_time)
+        
+        current_app.logger.info("🔍 AI MODE: Generating AI summary...")
+        summary_result = await cls._generate_agentic_summary_async(search_result["documents_or_chunks"], query, metrics)
+        return cls._respond(query, search_result, summary_result, metrics, start_time)
+    
+    @classmethod
+    def _resolve_parameters(cls, query: str, project_ids: Optional[List[str]],
+                            document_type_ids: Optional[List[str]],
+                            search_strategy: Optional[str],
+                            inference: Optional[List],
+                            ranking: Optional[Dict],
+                            metrics: Dict,
+                            user_location: Optional[Dict],
+                            project_status: Optional[str],
+                            years: Optional[List],
+                            start_time: float) -> Dict[str, Any]:
+        """Check query relevance and extract the search parameters with the LLM.
+        
+        Returns:
+            The early-exit response (with a "result" key) for queries outside EAO's
+            mandate, otherwise keyword arguments for ``_execute_vector_search``
+        """
         current_app.logger.info("=== AI MODE: Starting LLM parameter extraction + AI summarization processing ===")
         
         # Check query relevance up front
@@ -56,7 +117,8 @@ class AIHandler(BaseSearchHandler):
         try:
             from search_api.services.generation.factories import QueryValidatorFactory
             relevance_checker = QueryValidatorFactory.create_validator()
-            relevance_result = relevance_checker.validate_query_relevance(query)
+            with start_span("handler.relevance_check"):
+                relevance_result = relevance_checker.validate_query_relevance(query)
             
             relevance_time = round((time.time() - relevance_start) * 1000, 2)
             metrics["relevance_check_time_ms"] = relevance_time
@@ -142,18 +204,19 @@ class AIHandler(BaseSearchHandler):
             # Use LLM parameter extractor from generation package
             parameter_extractor = ParameterExtractorFactory.create_extractor()
             
-            extraction_result = parameter_extractor.extract_parameters(
-                query=query,
-                available_projects=available_projects,  # Now passing arrays directly
-                available_document_types=available_document_types,  # Now passing arrays directly
-                available_strategies=available_strategies,
-                supplied_project_ids=project_ids if project_ids else None,
-                supplied_document_type_ids=document_type_ids if document_type_ids else None,
-                supplied_search_strategy=search_strategy if search_strategy else None,
-                user_location=user_location,
-                supplied_project_status=project_status if project_status else None,
-                supplied_years=years if years else None
-            )
+            with start_span("handler.parameter_extraction", {"llm.provider": ParameterExtractorFactory.get_provider()}):
+                extraction_result = parameter_extractor.extract_parameters(
+                    query=query,
+                    available_projects=available_projects,  # Now passing arrays directly
+                    available_document_types=available_document_types,  # Now passing arrays directly
+                    available_strategies=available_strategies,
+                    supplied_project_ids=project_ids if project_ids else None,
+                    supplied_document_type_ids=document_type_ids if document_type_ids else None,
+                    supplied_search_strategy=search_strategy if search_strategy else None,
+                    user_location=user_location,
+                    supplied_project_status=project_status if project_status else None,
+                    supplied_years=years if years else None
+                )
             
             # Apply extracted parameters if not already provided
             if not project_ids and extraction_result.get('project_ids'):
@@ -214,11 +277,16 @@ class AIHandler(BaseSearchHandler):
             metrics["ai_semantic_query_generated"] = semantic_query != query
             metrics["ai_extraction_confidence"] = extraction_result.get('confidence', 0.0)
             metrics["ai_extraction_provider"] = ParameterExtractorFactory.get_provider()
+            extraction_cache_info = extraction_result.get('extraction_cache') or {}
+            metrics["ai_extraction_cache_hit"] = extraction_cache_info.get('hit', False)
+            metrics["ai_extraction_cache_saved_ms"] = extraction_cache_info.get('saved_ms', 0)
+            if extraction_result.get('prompt_shortlist'):
+                metrics["ai_prompt_shortlist"] = extraction_result['prompt_shortlist']
             
             # Add extraction summary for clarity
             extraction_sources = extraction_result.get('extraction_sources', {})
             metrics["agentic_extraction_summary"] = {
-                "llm_calls_made": sum(1 for source in extraction_sources.values() if source in ["llm_extracted", "llm_sequential", "llm_parallel"]),
+                "llm_calls_made": 0 if metrics["ai_extraction_cache_hit"] else sum(1 for source in extraction_sources.values() if source in ["llm_extracted", "llm_sequential", "llm_parallel"]),
                 "parameters_supplied": sum(1 for source in extraction_sources.values() if source == "supplied"),
                 "parameters_extracted": sum(1 for source in extraction_sources.values() if source in ["llm_extracted", "llm_sequential", "llm_parallel"]),
                 "parameters_fallback": sum(1 for source in extraction_sources.values() if source == "fallback")
@@ -243,35 +311,42 @@ class AIHandler(BaseSearchHandler):
         
         # Execute vector search with optimized parameters
         current_app.logger.info("🔍 AI MODE: Executing vector search...")
-        search_result = cls._execute_vector_search(
-            query, project_ids, document_type_ids, inference, ranking, 
-            search_strategy, semantic_query, metrics, 
-            location=final_location,
-            user_location=user_location,
-            project_status=final_project_status, 
-            years=final_years
-        )
-        
-        # Check if search returned no results
-        if not search_result["documents_or_chunks"]:
-            current_app.logger.warning("🔍 AI MODE: No documents found")
-            metrics["total_time_ms"] = round((time.time() - start_time) * 1000, 2)
-            return {
-                "result": {
-                    "response": "No relevant information found.",
-                    "documents": [],
-                    "document_chunks": [],
-                    "metrics": metrics,
-                    "search_quality": search_result["search_quality"],
-                    "project_inference": search_result["project_inference"],
-                    "document_type_inference": search_result["document_type_inference"]
-                }
+        return {
+            "query": query,
+            "project_ids": project_ids,
+            "document_type_ids": document_type_ids,
+            "inference": inference,
+            "ranking": ranking,
+            "search_strategy": search_strategy,
+            "semantic_query": semantic_query,
+            "metrics": metrics,
+            "location": final_location,
+            "user_location": user_location,
+            "project_status": final_project_status,
+            "years": final_years
+        }
+    
+    @classmethod
+    def _no_results(cls, search_result: Dict[str, Any], metrics: Dict, start_time: float) -> Dict[str, Any]:
+        """Build the response for a search that found nothing."""
+        current_app.logger.warning("🔍 AI MODE: No documents found")
+        metrics["total_time_ms"] = round((time.time() - start_time) * 1000, 2)
+        return {
+            "result": {
+                "response": "No relevant information found.",
+                "documents": [],
+                "document_chunks": [],
+                "metrics": metrics,
+                "search_quality": search_result["search_quality"],
+                "project_inference": search_result["project_inference"],
+                "document_type_inference": search_result["document_type_inference"]
             }
-        
-        # Generate AI summary of search results
-        current_app.logger.info("🔍 AI MODE: Generating AI summary...")
-        summary_result = cls._generate_agentic_summary(search_result["documents_or_chunks"], query, metrics)
-        
+        }
+    
+    @classmethod
+    def _respond(cls, query: str, search_result: Dict[str, Any], summary_result: Dict[str, Any],
+                 metrics: Dict, start_time: float) -> Dict[str, Any]:
+        """Build the response from the search result and its summary."""
         # Handle summary generation errors
         if isinstance(summary_result, dict) and "error" in summary_result:
             current_app.logger.error("🔍 AI MODE: AI summary generation failed")
@@ -317,6 +392,7 @@ class AIHandler(BaseSearchHandler):
         return {
             "result": {
                 "response": summary_result.get("response", "No response generated"),
+                "cached": summary_result.get("cached", False),
                 "documents": response_documents,
                 "document_chunks": response_document_chunks,
                 "metrics": metrics,
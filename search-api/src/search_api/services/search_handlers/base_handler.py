@@ -11,6 +11,7 @@ from typing import Dict, List, Optional, Any
 from flask import current_app
 
 from search_api.clients.vector_search_client import VectorSearchClient
+from search_api.utils.tracing import traced
 
 
 class BaseSearchHandler(ABC):
@@ -50,6 +51,7 @@ class BaseSearchHandler(ABC):
         pass
     
     @classmethod
+    @traced("handler.vector_search")
     def _execute_vector_search(cls, query: str, project_ids: Optional[List[str]], 
                               document_type_ids: Optional[List[str]], 
                               inference: Optional[List], ranking: Optional[Dict], 
@@ -57,7 +59,8 @@ class BaseSearchHandler(ABC):
                               metrics: Dict, location: Optional[str] = None, 
                               user_location: Optional[Dict] = None,
                               project_status: Optional[str] = None, 
-                              years: Optional[List] = None) -> Dict[str, Any]:
+                              years: Optional[List] = None,
+                              passthrough: bool = False) -> Dict[str, Any]:
         """Execute vector search and process the response.
         
         Args:
@@ -75,23 +78,12 @@ class BaseSearchHandler(ABC):
                                  This is ALWAYS passed through when provided by the user
             project_status (str): Project status parameter for status filtering
             years (list): Years parameter for temporal filtering
+            passthrough (bool): Keep the results encoded for handlers that return them unchanged
 
         Returns:
             dict: Search result containing documents_or_chunks, search metadata, etc.
         """
-        current_app.logger.info("=== VECTOR SEARCH: Starting search execution ===")
-
-        # Add LLM provider and model information
-        metrics["llm_provider"] = os.getenv("LLM_PROVIDER", "ollama")
-        if metrics["llm_provider"] == "openai":
-            metrics["llm_model"] = os.getenv("AZURE_OPENAI_DEPLOYMENT", "")
-        else:
-            metrics["llm_model"] = os.getenv("LLM_MODEL", "")
-        
-        current_app.logger.info(f"LLM Configuration - Provider: {metrics['llm_provider']}, Model: {metrics['llm_model']}")
-        
-        # Perform the vector DB search by calling the vector search api
-        current_app.logger.info("Starting vector search...")
+        cls._start_vector_search(metrics)
         search_start = time.time()
         documents, document_chunks, vector_api_response = VectorSearchClient.search(
             query=query, 
@@ -104,19 +96,84 @@ class BaseSearchHandler(ABC):
             location=location,
             project_status=project_status,
             years=years,
-            user_location=user_location
+            user_location=user_location,
+            passthrough=passthrough
+        )
+        return cls._process_vector_search(documents, document_chunks, vector_api_response, search_start, metrics)
+
+    @classmethod
+    @traced("handler.vector_search")
+    async def _execute_vector_search_async(cls, query: str, project_ids: Optional[List[str]],
+                                           document_type_ids: Optional[List[str]],
+                                           inference: Optional[List], ranking: Optional[Dict],
+                                           search_strategy: Optional[str], semantic_query: Optional[str],
+                                           metrics: Dict, location: Optional[str] = None,
+                                           user_location: Optional[Dict] = None,
+                                           project_status: Optional[str] = None,
+                                           years: Optional[List] = None,
+                                           passthrough: bool = False) -> Dict[str, Any]:
+        """Async version of ``_execute_vector_search``; takes the same arguments and returns the same result."""
+        cls._start_vector_search(metrics)
+        search_start = time.time()
+        documents, document_chunks, vector_api_response = await VectorSearchClient.search_async(
+            query=query,
+            project_ids=project_ids,
+            document_type_ids=document_type_ids,
+            inference=inference,
+            ranking=ranking,
+            search_strategy=search_strategy,
+            semantic_query=semantic_query,
+            location=location,
+            project_status=project_status,
+            years=years,
+            user_location=user_location,
+            passthrough=passthrough
         )
+        return cls._process_vector_search(documents, document_chunks, vector_api_response, search_start, metrics)
+
+    @classmethod
+    def _start_vector_search(cls, metrics: Dict) -> None:
+        """Record the LLM configuration before a vector search starts."""
+        current_app.logger.info("=== VECTOR SEARCH: Starting search execution ===")
+
+        # Add LLM provider and model information
+        metrics["llm_provider"] = os.getenv("LLM_PROVIDER", "ollama")
+        if metrics["llm_provider"] == "openai":
+            metrics["llm_model"] = os.getenv("AZURE_OPENAI_DEPLOYMENT", "")
+        else:
+            metrics["llm_model"] = os.getenv("LLM_MODEL", "")
+        
+        current_app.logger.info(f"LLM Configuration - Provider: {metrics['llm_provider']}, Model: {metrics['llm_model']}")
+        
+        # Perform the vector DB search by calling the vector search api
+        current_app.logger.info("Starting vector search...")
+
+    @classmethod
+    def _process_vector_search(cls, documents: List, document_chunks: List, vector_api_response: Any,
+                               search_start: float, metrics: Dict) -> Dict[str, Any]:
+        """Turn a vector search response into the search result used by the handlers.
+
+        Args:
+            documents (list): Documents returned by the vector API
+            document_chunks (list): Document chunks returned by the vector API
+            vector_api_response (dict): The complete vector API response
+            search_start (float): time.time() when the search started
+            metrics (dict): Metrics dictionary to update
+
+        Returns:
+            dict: Search result containing documents_or_chunks, search metadata, etc.
+        """
         search_duration = round((time.time() - search_start) * 1000, 2)
         current_app.logger.info(f"Vector search completed in {search_duration}ms")
         current_app.logger.info(f"Documents returned: {len(documents) if documents else 0}")
         current_app.logger.info(f"Document chunks returned: {len(document_chunks) if document_chunks else 0}")
         
-        # Combine documents and chunks for backwards compatibility where needed
-        documents_or_chunks = []
-        if documents:
-            documents_or_chunks.extend(documents)
-        if document_chunks:
-            documents_or_chunks.extend(document_chunks)
+        # Combine documents and chunks for backwards compatibility where needed; a single
+        # list is used as is so pass-through results stay encoded
+        if documents and document_chunks:
+            documents_or_chunks = [*documents, *document_chunks]
+        else:
+            documents_or_chunks = documents or document_chunks or []
         current_app.logger.info(f"Total documents/chunks: {len(documents_or_chunks)}")
         current_app.logger.info(f"Type of documents_or_chunks: {type(documents_or_chunks)}")
         
@@ -198,6 +255,7 @@ class BaseSearchHandler(ABC):
         }
     
     @classmethod
+    @traced("handler.summarize")
     def _generate_agentic_summary(cls, documents_or_chunks: List, query: str, 
                                  metrics: Dict) -> Dict[str, Any]:
         """Generate summary using LLM summarizer from generation package.
@@ -225,46 +283,88 @@ class BaseSearchHandler(ABC):
             summary_result = summarizer.summarize_search_results(
                 query=query,
                 documents_or_chunks=documents_or_chunks,
-                search_context={
-                    "context": "Agentic search summary",
-                    "search_strategy": "agentic",
-                    "total_documents": len(documents_or_chunks)
-                }
+                search_context=cls._summary_search_context(documents_or_chunks)
             )
-            
-            summary_text = summary_result['summary']
-            method = summary_result['method']
-            confidence = summary_result['confidence']
-            provider = summary_result['provider']
-            model = summary_result['model']
-            
-            current_app.logger.info(f"🤖 LLM: Summary generated using method: {method}, provider: {provider}, model: {model}, confidence: {confidence}")
-            
-            metrics["llm_time_ms"] = round((time.time() - llm_start) * 1000, 2)
-            metrics["agentic_summary_method"] = method
-            metrics["agentic_summary_confidence"] = confidence
-            metrics["agentic_summary_provider"] = provider
-            metrics["agentic_summary_model"] = model
-            
-            current_app.logger.info("=== AGENTIC SUMMARY: LLM summarizer generation complete ===")
-            return {"response": summary_text}
+            return cls._record_agentic_summary(summary_result, llm_start, metrics)
                 
         except Exception as e:
-            # Log the error and return error info
-            current_app.logger.error(f"🤖 LLM: Summary generation error: {str(e)}")
-            current_app.logger.error(f"🤖 LLM: Summary error type: {type(e).__name__}")
-            current_app.logger.error(f"🤖 LLM: Summary error traceback: {traceback.format_exc()}")
-            
-            metrics["agentic_summary_error"] = str(e)
-            metrics["llm_time_ms"] = round((time.time() - llm_start) * 1000, 2)
+            return cls._agentic_summary_error(e, llm_start, metrics)
+
+    @classmethod
+    @traced("handler.summarize")
+    async def _generate_agentic_summary_async(cls, documents_or_chunks: List, query: str,
+                                              metrics: Dict) -> Dict[str, Any]:
+        """Async version of ``_generate_agentic_summary``; the LLM call waits on the event loop."""
+        current_app.logger.info("=== AGENTIC SUMMARY: Starting LLM summarizer from generation package (async) ===")
+        
+        llm_start = time.time()
+        current_app.logger.info(f"Number of documents/chunks for summary: {len(documents_or_chunks) if documents_or_chunks else 0}")
+        
+        try:
+            from search_api.services.generation.factories import SummarizerFactory
             
-            current_app.logger.info("=== AGENTIC SUMMARY: Error occurred, returning fallback ===")
-            return {
-                "error": str(e),
-                "fallback_response": "An error occurred while generating the summary. Please try again later."
-            }
+            summarizer = SummarizerFactory.create_summarizer()
+            summary_result = await summarizer.summarize_search_results_async(
+                query=query,
+                documents_or_chunks=documents_or_chunks,
+                search_context=cls._summary_search_context(documents_or_chunks)
+            )
+            return cls._record_agentic_summary(summary_result, llm_start, metrics)
+                
+        except Exception as e:
+            return cls._agentic_summary_error(e, llm_start, metrics)
+
+    @classmethod
+    def _summary_search_context(cls, documents_or_chunks: List) -> Dict[str, Any]:
+        return {
+            "context": "Agentic search summary",
+            "search_strategy": "agentic",
+            "total_documents": len(documents_or_chunks)
+        }
+
+    @classmethod
+    def _record_agentic_summary(cls, summary_result: Dict[str, Any], llm_start: float, metrics: Dict) -> Dict[str, Any]:
+        """Record the summarizer result in the metrics and return the handler summary."""
+        summary_text = summary_result['summary']
+        method = summary_result['method']
+        confidence = summary_result['confidence']
+        provider = summary_result['provider']
+        model = summary_result['model']
+        
+        current_app.logger.info(f"🤖 LLM: Summary generated using method: {method}, provider: {provider}, model: {model}, confidence: {confidence}")
+        
+        metrics["llm_time_ms"] = round((time.time() - llm_start) * 1000, 2)
+        metrics["agentic_summary_method"] = method
+        metrics["agentic_summary_confidence"] = confidence
+        metrics["agentic_summary_provider"] = provider
+        metrics["agentic_summary_model"] = model
+        if summary_result.get('context_packing'):
+            metrics["summary_context_packing"] = summary_result['context_packing']
+        if summary_result.get('answer_cache'):
+            metrics["summary_answer_cache"] = summary_result['answer_cache']
+        
+        current_app.logger.info("=== AGENTIC SUMMARY: LLM summarizer generation complete ===")
+        return {"response": summary_text, "cached": summary_result.get('cached', False)}
+
+    @classmethod
+    def _agentic_summary_error(cls, e: Exception, llm_start: float, metrics: Dict) -> Dict[str, Any]:
+        """Record a failed summary in the metrics and return the fallback response."""
+        # Log the error and return error info
+        current_app.logger.error(f"🤖 LLM: Summary generation error: {str(e)}")
+        current_app.logger.error(f"🤖 LLM: Summary error type: {type(e).__name__}")
+        current_app.logger.error(f"🤖 LLM: Summary error traceback: {traceback.format_exc()}")
+        
+        metrics["agentic_summary_error"] = str(e)
+        metrics["llm_time_ms"] = round((time.time() - llm_start) * 1000, 2)
+        
+        current_app.logger.info("=== AGENTIC SUMMARY: Error occurred, returning fallback ===")
+        return {
+            "error": str(e),
+            "fallback_response": "An error occurred while generating the summary. Please try again later."
+        }
     
     @classmethod
+    @traced("handler.rag_summary")
     def _generate_rag_summary(cls, documents_or_chunks: List, query: str, 
                              metrics: Dict) -> Dict[str, Any]:
         """Generate basic summary for RAG mode (non-agentic).
@@ -355,7 +455,7 @@ class BaseSearchHandler(ABC):
             query (str): The original search query
         """
         doc_count = len(documents_or_chunks) if documents_or_chunks else 0
-        doc_type = "documents" if documents_or_chunks and hasattr(documents_or_chunks[0], 'document_id') else "document sections"
+        doc_type = "documents" if documents_or_chunks and isinstance(documents_or_chunks, list) and hasattr(documents_or_chunks[0], 'document_id') else "document sections"
         
         current_app.logger.info(f"Search completed: {doc_count} {doc_type} returned for query")
         current_app.logger.info(f"Query: '{query[:50]}{'...' if len(query) > 50 else ''}'")
\ No newline at end of file
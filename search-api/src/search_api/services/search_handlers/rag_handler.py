@@ -7,6 +7,9 @@ import time
 from typing import Dict, List, Optional, Any
 from flask import current_app
 
+from search_api.utils import json_codec
+from search_api.utils.tracing import traced
+
 from .base_handler import BaseSearchHandler
 
 
@@ -14,6 +17,7 @@ class RAGHandler(BaseSearchHandler):
     """Handler for RAG mode processing - direct retrieval without summarization."""
     
     @classmethod
+    @traced("search_handler.rag")
     def handle(cls, query: str, project_ids: Optional[List[str]] = None, 
                document_type_ids: Optional[List[str]] = None, 
                search_strategy: Optional[str] = None, 
@@ -29,7 +33,8 @@ class RAGHandler(BaseSearchHandler):
         - Query relevance check up front
         - Pattern-based extraction for project status and years only
         - Direct vector search with provided parameters (no AI extraction)
-        - Returns raw search results without summarization
+        - Returns raw search results without summarization (forwarded without decoding
+          them when SEARCH_RESULTS_PASSTHROUGH is enabled)
         
         Note: Location filtering is NOT supported in RAG mode. Location is only inferred
         in AI/Agent modes via LLM extraction. RAG mode only passes through user_location
@@ -51,6 +56,42 @@ class RAGHandler(BaseSearchHandler):
             Complete response dictionary with RAG results
         """
         start_time = time.time()
+        search_kwargs = cls._prepare_search(query, project_ids, document_type_ids, search_strategy, inference, ranking, metrics, user_location, project_status, years)
+        search_result = cls._execute_vector_search(**search_kwargs)
+        return cls._respond(query, search_result, metrics, start_time)
+    
+    @classmethod
+    @traced("search_handler.rag")
+    async def handle_async(cls, query: str, project_ids: Optional[List[str]] = None,
+                           document_type_ids: Optional[List[str]] = None,
+                           search_strategy: Optional[str] = None,
+                           inference: Optional[List] = None,
+                           ranking: Optional[Dict] = None,
+                           metrics: Optional[Dict] = None,
+                           user_location: Optional[Dict] = None,
+                           project_status: Optional[str] = None,
+                           years: Optional[List] = None) -> Dict[str, Any]:
+        """Async version of ``handle``: the vector search waits on the event loop."""
+        start_time = time.time()
+        search_kwargs = cls._prepare_search(query, project_ids, document_type_ids, search_strategy, inference, ranking, metrics, user_location, project_status, years)
+        search_result = await cls._execute_vector_search_async(**search_kwargs)
+        return cls._respond(query, search_result, metrics, start_time)
+    
+    @classmethod
+    def _prepare_search(cls, query: str, project_ids: Optional[List[str]] = None, 
+                        document_type_ids: Optional[List[str]] = None, 
+                        search_strategy: Optional[str] = None, 
+                        inference: Optional[List] = None, 
+                        ranking: Optional[Dict] = None, 
+                        metrics: Optional[Dict] = None,
+                        user_location: Optional[Dict] = None,
+                        project_status: Optional[str] = None, 
+                        years: Optional[List] = None) -> Dict[str, Any]:
+        """Record the request parameters and resolve the vector search arguments.
+        
+        Returns:
+            Keyword arguments for ``_execute_vector_search``
+        """
         current_app.logger.info("=== RAG MODE: Starting direct retrieval processing ===")
         
         # Initialize metrics for RAG mode
@@ -115,16 +156,25 @@ class RAGHandler(BaseSearchHandler):
         
         # Execute vector search with provided parameters
         current_app.logger.info("🔍 RAG MODE: Executing vector search...")
-        semantic_query = None  # RAG mode doesn't modify the query
-        
-        search_result = cls._execute_vector_search(
-            query, project_ids, document_type_ids, inference, ranking, 
-            search_strategy, semantic_query, metrics, 
-            user_location=user_location,
-            project_status=final_project_status, 
-            years=final_years
-        )
-        
+        return {
+            "query": query,
+            "project_ids": project_ids,
+            "document_type_ids": document_type_ids,
+            "inference": inference,
+            "ranking": ranking,
+            "search_strategy": search_strategy,
+            "semantic_query": None,  # RAG mode doesn't modify the query
+            "metrics": metrics,
+            "user_location": user_location,
+            "project_status": final_project_status,
+            "years": final_years,
+            # Results are returned unchanged, so they can stay encoded
+            "passthrough": json_codec.is_passthrough_enabled()
+        }
+    
+    @classmethod
+    def _respond(cls, query: str, search_result: Dict[str, Any], metrics: Dict, start_time: float) -> Dict[str, Any]:
+        """Build the response from the search result."""
         # Check if search returned no results
         if not search_result["documents_or_chunks"]:
             current_app.logger.warning("🔍 RAG MODE: No documents found")
@@ -7,6 +7,8 @@ import time
 from typing import Dict, List, Optional, Any
 from flask import current_app
 
+from search_api.utils.tracing import traced
+
 from .base_handler import BaseSearchHandler
 
 
@@ -14,6 +16,7 @@ class RAGSummaryHandler(BaseSearchHandler):
     """Handler for RAG + Summary mode processing - retrieval plus AI summarization."""
     
     @classmethod
+    @traced("search_handler.summary")
     def handle(cls, query: str, project_ids: Optional[List[str]] = None, 
                document_type_ids: Optional[List[str]] = None, 
                search_strategy: Optional[str] = None, 
@@ -51,6 +54,53 @@ class RAGSummaryHandler(BaseSearchHandler):
             Complete response dictionary with RAG+summary results
         """
         start_time = time.time()
+        search_kwargs = cls._prepare_search(query, project_ids, document_type_ids, search_strategy, inference, ranking, metrics, user_location, project_status, years)
+        search_result = cls._execute_vector_search(**search_kwargs)
+        if not search_result["documents_or_chunks"]:
+            return cls._no_results(search_result, metrics, start_time)
+        
+        # Generate AI summary of search results
+        current_app.logger.info("🔍 RAG+SUMMARY MODE: Generating AI summary...")
+        summary_result = cls._generate_agentic_summary(search_result["documents_or_chunks"], query, metrics)
+        return cls._respond(query, search_result, summary_result, metrics, start_time)
+    
+    @classmethod
+    @traced("search_handler.summary")
+    async def handle_async(cls, query: str, project_ids: Optional[List[str]] = None,
+                           document_type_ids: Optional[List[str]] = None,
+                           search_strategy: Optional[str] = None,
+                           inference: Optional[List] = None,
+                           ranking: Optional[Dict] = None,
+                           metrics: Optional[Dict] = None,
+                           user_location: Optional[Dict] = None,
+                           project_status: Optional[str] = None,
+                           years: Optional[List] = None) -> Dict[str, Any]:
+        """Async version of ``handle``: the vector search and the summary wait on the event loop."""
+        start_time = time.time()
+        search_kwargs = cls._prepare_search(query, project_ids, document_type_ids, search_strategy, inference, ranking, metrics, user_location, project_status, years)
+        search_result = await cls._execute_vector_search_async(**search_kwargs)
+        if not search_result["documents_or_chunks"]:
+            return cls._no_results(search_result, metrics, start_time)
+        
+        current_app.logger.info("🔍 RAG+SUMMARY MODE: Generating AI summary...")
+        summary_result = await cls._generate_agentic_summary_async(search_result["documents_or_chunks"], query, metrics)
+        return cls._respond(query, search_result, summary_result, metrics, start_time)
+    
+    @classmethod
+    def _prepare_search(cls, query: str, project_ids: Optional[List[str]] = None, 
+                        document_type_ids: Optional[List[str]] = None, 
+                        search_strategy: Optional[str] = None, 
+                        inference: Optional[List] = None, 
+                        ranking: Optional[Dict] = None, 
+                        metrics: Optional[Dict] = None,
+                        user_location: Optional[Dict] = None,
+                        project_status: Optional[str] = None, 
+                        years: Optional[List] = None) -> Dict[str, Any]:
+        """Record the request parameters and resolve the vector search arguments.
+        
+        Returns:
+            Keyword arguments for ``_execute_vector_search``
+        """
         current_app.logger.info("=== RAG+SUMMARY MODE: Starting retrieval + summarization processing ===")
         
         # Initialize metrics for RAG+summary mode
@@ -115,35 +165,40 @@ class RAGSummaryHandler(BaseSearchHandler):
         
         # Execute vector search with provided parameters
         current_app.logger.info("🔍 RAG+SUMMARY MODE: Executing vector search...")
-        semantic_query = None  # RAG+summary mode doesn't modify the query
-        
-        search_result = cls._execute_vector_search(
-            query, project_ids, document_type_ids, inference, ranking, 
-            search_strategy, semantic_query, metrics,
-            user_location=user_location,
-            project_status=final_project_status, 
-            years=final_years
-        )
-        
-        # Check if search returned no results
-        if not search_result["documents_or_chunks"]:
-            current_app.logger.warning("🔍 RAG+SUMMARY MODE: No documents found")
-            metrics["total_time_ms"] = round((time.time() - start_time) * 1000, 2)
-            return {
-                "result": {
-                    "response": "No relevant information found.",
-                    search_result["documents_key"]: [],
-                    "metrics": metrics,
-                    "search_quality": search_result["search_quality"],
-                    "project_inference": search_result["project_inference"],
-                    "document_type_inference": search_result["document_type_inference"]
-                }
+        return {
+            "query": query,
+            "project_ids": project_ids,
+            "document_type_ids": document_type_ids,
+            "inference": inference,
+            "ranking": ranking,
+            "search_strategy": search_strategy,
+            "semantic_query": None,  # RAG+summary mode doesn't modify the query
+            "metrics": metrics,
+            "user_location": user_location,
+            "project_status": final_project_status,
+            "years": final_years
+        }
+    
+    @classmethod
+    def _no_results(cls, search_result: Dict[str, Any], metrics: Dict, start_time: float) -> Dict[str, Any]:
+        """Build the response for a search that found nothing."""
+        current_app.logger.warning("🔍 RAG+SUMMARY MODE: No documents found")
+        metrics["total_time_ms"] = round((time.time() - start_time) * 1000, 2)
+        return {
+            "result": {
+                "response": "No relevant information found.",
+                search_result["documents_key"]: [],
+                "metrics": metrics,
+                "search_quality": search_result["search_quality"],
+                "project_inference": search_result["project_inference"],
+                "document_type_inference": search_result["document_type_inference"]
             }
-        
-        # Generate AI summary of search results
-        current_app.logger.info("🔍 RAG+SUMMARY MODE: Generating AI summary...")
-        summary_result = cls._generate_agentic_summary(search_result["documents_or_chunks"], query, metrics)
-        
+        }
+    
+    @classmethod
+    def _respond(cls, query: str, search_result: Dict[str, Any], summary_result: Dict[str, Any],
+                 metrics: Dict, start_time: float) -> Dict[str, Any]:
+        """Build the response from the search result and its summary."""
         # Handle summary generation errors
         if isinstance(summary_result, dict) and "error" in summary_result:
             current_app.logger.error("🔍 RAG+SUMMARY MODE: AI summary generation failed")
@@ -171,6 +226,7 @@ class RAGSummaryHandler(BaseSearchHandler):
         return {
             "result": {
                 "response": summary_result.get("response", "No response generated"),
+                "cached": summary_result.get("cached", False),
                 search_result["documents_key"]: search_result["documents_or_chunks"],
                 "metrics": metrics,
                 "search_quality": search_result["search_quality"],
@@ -14,6 +14,7 @@ import time
 from datetime import datetime, timezone
 from flask import current_app
 from search_api.clients.vector_search_client import VectorSearchClient
+from search_api.utils import concurrency
 
 class SearchService:
     """Service class for handling search operations.
@@ -75,6 +76,62 @@ class SearchService:
             (content-focused) depending on what the vector search API returns.
             All parameters except 'query' are optional and maintain backward compatibility.
         """
+        metrics = cls._start_query(query, project_ids, document_type_ids, inference, ranking, search_strategy,
+                                   mode, user_location, project_status, years)
+        
+        # Handle auto mode - determine optimal tier based on query complexity
+        if mode == "auto":
+            mode = cls._select_auto_mode(cls._determine_auto_mode(query, user_location, metrics, project_ids, document_type_ids), metrics)
+        
+        # Route to appropriate mode handler - each handler returns complete response
+        from search_api.services.search_handlers import RAGHandler, RAGSummaryHandler, AIHandler
+        
+        if mode == "agent":
+            # Agent mode handles entire query processing internally with fallback to AI mode
+            return cls._handle_agent(query, project_ids, document_type_ids, search_strategy, inference, ranking, metrics, user_location, project_status, years)
+        elif mode == "ai":
+            # AI mode handles LLM parameter extraction + AI summarization
+            return AIHandler.handle(query, project_ids, document_type_ids, search_strategy, inference, ranking, metrics, user_location, project_status, years)
+        elif mode == "summary":
+            # RAG+summary mode handles direct retrieval + AI summarization
+            return RAGSummaryHandler.handle(query, project_ids, document_type_ids, search_strategy, inference, ranking, metrics, user_location, project_status, years)
+        else:  # mode == "rag"
+            # RAG mode handles direct retrieval without summarization
+            return RAGHandler.handle(query, project_ids, document_type_ids, search_strategy, inference, ranking, metrics, user_location, project_status, years)
+
+    @classmethod
+    async def get_documents_by_query_async(cls, query, project_ids=None, document_type_ids=None, inference=None, ranking=None, search_strategy=None, mode="rag", user_location=None, location=None, project_status=None, years=None):
+        """Async version of ``get_documents_by_query`` for the asyncio request pipeline.
+        
+        The vector search and summary calls of the rag, summary and ai modes wait on the
+        event loop, so one worker keeps many searches in flight. Steps that are still
+        synchronous (an auto mode LLM escalation, AI mode parameter extraction and agent
+        mode) run on worker threads within the ``blocking`` concurrency limit.
+        
+        Takes the same arguments and returns the same response as ``get_documents_by_query``.
+        """
+        metrics = cls._start_query(query, project_ids, document_type_ids, inference, ranking, search_strategy,
+                                   mode, user_location, project_status, years)
+        
+        if mode == "auto":
+            auto_mode = await concurrency.offload(cls._determine_auto_mode, query, user_location, metrics, project_ids, document_type_ids)
+            mode = cls._select_auto_mode(auto_mode, metrics)
+        
+        from search_api.services.search_handlers import RAGHandler, RAGSummaryHandler, AIHandler
+        
+        if mode == "agent":
+            return await concurrency.offload(cls._handle_agent, query, project_ids, document_type_ids, search_strategy, inference, ranking, metrics, user_location, project_status, years)
+        elif mode == "ai":
+            return await AIHandler.handle_async(query, project_ids, document_type_ids, search_strategy, inference, ranking, metrics, user_location, project_status, years)
+        elif mode == "summary":
+            return await RAGSummaryHandler.handle_async(query, project_ids, document_type_ids, search_strategy, inference, ranking, metrics, user_location, project_status, years)
+        else:  # mode == "rag"
+            return await RAGHandler.handle_async(query, project_ids, document_type_ids, search_strategy, inference, ranking, metrics, user_location, project_status, years)
+
+    @classmethod
+    def _start_query(cls, query, project_ids, document_type_ids, inference, ranking, search_strategy, mode,
+                     user_location, project_status, years):
+        """Log the request parameters and initialize the metrics of a query."""
         current_app.logger.info("=== SearchService.get_documents_by_query started ===")
         current_app.logger.info(f"Query: {query[:200] if query else None}{'...' if query and len(query) > 200 else ''}")
         current_app.logger.info(f"Project IDs: {project_ids}")
@@ -92,39 +149,32 @@ class SearchService:
         start_time = time.time()
         metrics["start_time"] = datetime.fromtimestamp(start_time, tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
         metrics["processing_mode"] = mode
-        
-        # Handle auto mode - determine optimal tier based on query complexity
         if mode == "auto":
             current_app.logger.info("🤖 AUTO MODE: Analyzing query to determine optimal processing tier...")
-            auto_mode = cls._determine_auto_mode(query, user_location, metrics)
-            current_app.logger.info(f"🤖 AUTO MODE: Selected tier '{auto_mode}' for query")
-            mode = auto_mode
-            metrics["auto_selected_mode"] = auto_mode
+        return metrics
+
+    @classmethod
+    def _select_auto_mode(cls, auto_mode, metrics):
+        """Record the mode selected for an auto mode query."""
+        current_app.logger.info(f"🤖 AUTO MODE: Selected tier '{auto_mode}' for query")
+        metrics["auto_selected_mode"] = auto_mode
+        return auto_mode
+
+    @classmethod
+    def _handle_agent(cls, query, project_ids, document_type_ids, search_strategy, inference, ranking, metrics, user_location, project_status, years):
+        """Run agent mode, falling back to AI mode when the agent fails."""
+        from search_api.services.search_handlers import AIHandler, AgentHandler
         
-        # Route to appropriate mode handler - each handler returns complete response
-        from search_api.services.search_handlers import RAGHandler, RAGSummaryHandler, AIHandler, AgentHandler
+        result = AgentHandler.handle(query, project_ids, document_type_ids, search_strategy, inference, ranking, metrics, user_location, project_status, years)
         
-        if mode == "agent":
-            # Agent mode handles entire query processing internally with fallback to AI mode
-            result = AgentHandler.handle(query, project_ids, document_type_ids, search_strategy, inference, ranking, metrics, user_location, project_status, years)
-            
-            # Check if agent failed and fallback to AI mode
-            if result.get("result", {}).get("error") and result.get("result", {}).get("metrics", {}).get("agent_fallback"):
-                current_app.logger.info("🤖 AGENT MODE: Falling back to AI mode due to agent failure...")
-                # Reset metrics for AI mode processing
-                ai_metrics = result.get("result", {}).get("metrics", {})
-                return AIHandler.handle(query, project_ids, document_type_ids, search_strategy, inference, ranking, ai_metrics, user_location, project_status, years)
-            
-            return result
-        elif mode == "ai":
-            # AI mode handles LLM parameter extraction + AI summarization
-            return AIHandler.handle(query, project_ids, document_type_ids, search_strategy, inference, ranking, metrics, user_location, project_status, years)
-        elif mode == "summary":
-            # RAG+summary mode handles direct retrieval + AI summarization
-            return RAGSummaryHandler.handle(query, project_ids, document_type_ids, search_strategy, inference, ranking, metrics, user_location, project_status, years)
-        else:  # mode == "rag"
-            # RAG mode handles direct retrieval without summarization
-            return RAGHandler.handle(query, project_ids, document_type_ids, search_strategy, inference, ranking, metrics, user_location, project_status, years)
+        # Check if agent failed and fallback to AI mode
+        if result.get("result", {}).get("error") and result.get("result", {}).get("metrics", {}).get("agent_fallback"):
+            current_app.logger.info("🤖 AGENT MODE: Falling back to AI mode due to agent failure...")
+            # Reset metrics for AI mode processing
+            ai_metrics = result.get("result", {}).get("metrics", {})
+            return AIHandler.handle(query, project_ids, document_type_ids, search_strategy, inference, ranking, ai_metrics, user_location, project_status, years)
+        
+        return result
    
     @classmethod
     def get_document_similarity(cls, document_id, project_ids=None, limit=10):
@@ -189,9 +239,14 @@ class SearchService:
         }
 
     @classmethod
-    def _determine_auto_mode(cls, query: str, user_location: dict = None, metrics: dict = None) -> str:
+    def _determine_auto_mode(cls, query: str, user_location: dict = None, metrics: dict = None,
+                             project_ids: list = None, document_type_ids: list = None) -> str:
         """Determine the optimal processing mode based on query complexity analysis.
         
+        The query is classified locally in milliseconds; the LLM complexity analyzer is
+        only consulted when the local classifier is unsure (see complexity_classifier).
+        The decision source and latency are recorded in the metrics.
+        
         Uses the complexity analyzer to determine whether the query needs:
         - rag: Simple content search
         - summary: RAG + summarization
@@ -202,6 +257,8 @@ class SearchService:
             query: The user query to analyze
             user_location: Optional user location data
             metrics: Metrics dictionary to track analysis
+            project_ids: Optional project IDs selected in the UI
+            document_type_ids: Optional document type IDs selected in the UI
             
         Returns:
             The optimal mode string ("rag", "summary", "ai", or "agent")
@@ -209,21 +266,25 @@ class SearchService:
         try:
             current_app.logger.info("🤖 AUTO MODE: Starting complexity analysis...")
             
-            # Use the same complexity analyzer as AI/agent modes
-            from search_api.services.generation.implementations.openai.openai_query_complexity_analyzer import OpenAIQueryComplexityAnalyzer
-            complexity_analyzer = OpenAIQueryComplexityAnalyzer()
+            from search_api.services.generation.factories import QueryComplexityFactory
+            complexity_analyzer = QueryComplexityFactory.create_analyzer()
             
             # Analyze query complexity
-            complexity_result = complexity_analyzer.analyze_query_complexity(query, user_location)
+            analysis_start = time.time()
+            complexity_result = complexity_analyzer.analyze_complexity(query, project_ids, document_type_ids)
+            analysis_ms = round((time.time() - analysis_start) * 1000, 2)
             complexity_tier = complexity_result.get("complexity_tier", "simple")
             complexity_reason = complexity_result.get("reason", "Unknown")
+            decision_source = complexity_result.get("source", "llm")
             
-            current_app.logger.info(f"🤖 AUTO MODE: Complexity analysis result: {complexity_tier}")
+            current_app.logger.info(f"🤖 AUTO MODE: Complexity analysis result: {complexity_tier} ({decision_source}, {analysis_ms}ms)")
             current_app.logger.info(f"🤖 AUTO MODE: Reason: {complexity_reason}")
             
             # Store complexity analysis in metrics
             if metrics is not None:
                 metrics["auto_complexity_analysis"] = complexity_result
+                metrics["auto_decision_source"] = decision_source
+                metrics["auto_decision_ms"] = analysis_ms
             
             # Map complexity tiers to processing modes
             if complexity_tier == "simple":
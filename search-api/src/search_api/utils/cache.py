@@ -11,90 +11,452 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-"""Bring in the common cache."""
-from flask_caching import Cache
-import time
+"""Bring in the common cache.
+
+``cache_with_ttl`` memoizes function results in a pluggable backend:
+
+- ``memory`` (default): a per-process LRU bounded by entry count and by the pickled
+  size of the cached values, with a TTL per entry.
+- ``disk``: a SQLite file shared by every gunicorn worker on the host, so a value
+  computed by one worker is a hit for all of them. Values are pickled.
+
+A cache fault never fails the call: a backend error on lookup is treated as a
+miss and an error on store skips the store (both are counted as ``errors``).
+
+Keys are derived from the function's module and qualified name plus a SHA-256 of its
+arguments, ignoring ``self``/``cls`` so that all instances share entries. Concurrent
+misses for the same key within a process are coalesced: one caller computes the
+value and the others wait for it.
+
+Configuration (environment):
+    CACHE_BACKEND: ``memory`` (default) or ``disk``
+    CACHE_MAX_ENTRIES: Maximum entries kept by the memory backend (default: 1024)
+    CACHE_MAX_BYTES: Maximum pickled bytes kept by either backend (default: 67108864)
+    CACHE_DIR: Directory for the disk backend (default: <tmp>/search-api-cache)
+"""
 import functools
-from typing import Callable, Any
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask_caching import Cache
+
+logger = logging.getLogger(__name__)
 
 # lower case name as used by convention in most Flask apps
 cache = Cache(config={'CACHE_TYPE': 'simple'})  # pylint: disable=invalid-name
 
-# Simple in-memory cache with TTL for API responses
-_memory_cache = {}
+# Entries listed individually in stats
+_MAX_KEYS_REPORTED = 100
+
+# The disk backend records an access at most this often per entry
+_ACCESS_RESOLUTION_SECONDS = 30
+
+
+def _value_size(value: Any) -> int:
+    """Approximate the memory held by a cached value by its pickled size."""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:  # pylint: disable=broad-except
+        return sys.getsizeof(value)
+
+
+def make_key(func: Callable, args: tuple, kwargs: dict, skip_first: bool = False) -> str:
+    """Build a stable cache key for a call.
+
+    Args:
+        func: The cached function
+        args: Positional arguments of the call
+        kwargs: Keyword arguments of the call
+        skip_first: Drop the first positional argument (``self``/``cls``)
+
+    Returns:
+        ``<module>.<qualname>:<sha256 of the arguments>``
+    """
+    if skip_first:
+        args = args[1:]
+    payload = json.dumps([list(args), sorted(kwargs.items())], sort_keys=True, default=repr)
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{func.__module__}.{func.__qualname__}:{digest}"
+
+
+class CacheBackend:
+    """Interface for cache storage backends."""
+
+    name = "base"
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (found, value) for a key that has not expired."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        """Store a value for ``ttl_seconds``."""
+        raise NotImplementedError
+
+    def clear(self) -> int:
+        """Remove all entries; returns the number removed."""
+        raise NotImplementedError
+
+    def clear_expired(self) -> int:
+        """Remove expired entries; returns the number removed."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry counts, sizes and per-key ages."""
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU cache bounded by entry count and total value size."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (value, expires_at, size_bytes, created_at)
+        self._entries: "OrderedDict[str, Tuple[Any, float, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry[1] <= time.time():
+                self._remove(key)
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry[0]
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        size = _value_size(value)
+        if size > self.max_bytes:
+            logger.warning(f"Not caching {key}: {size} bytes exceeds CACHE_MAX_BYTES")
+            return
+        now = time.time()
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, now + ttl_seconds, size, now)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry[2]
+
+    def clear(self) -> int:
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+        return removed
+
+    def clear_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [key for key, entry in self._entries.items() if entry[1] <= now]
+            for key in expired:
+                self._remove(key)
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            entries = list(self._entries.items())
+            total_bytes = self._bytes
+            evictions = self._evictions
+        return {
+            'total_entries': len(entries),
+            'expired_entries': sum(1 for _, entry in entries if entry[1] <= now),
+            'total_bytes': total_bytes,
+            'max_bytes': self.max_bytes,
+            'max_entries': self.max_entries,
+            'evictions': evictions,
+            'cache_keys': [
+                {
+                    'key': key,
+                    'age_seconds': int(now - entry[3]),
+                    'is_expired': entry[1] <= now,
+                    'size_bytes': entry[2],
+                }
+                for key, entry in entries[-_MAX_KEYS_REPORTED:]
+            ],
+        }
+
+
+class DiskCacheBackend(CacheBackend):
+    """SQLite-backed LRU cache shared by every worker process on the host."""
+
+    name = "disk"
+
+    def __init__(self, directory: str, max_bytes: int = 64 * 1024 * 1024, timeout: float = 5):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "cache.sqlite3")
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, size_bytes INTEGER NOT NULL,"
+                " created_at REAL NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed ON cache_entries (accessed_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS cache_counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # WAL lets workers read while another writes; autocommit keeps locks short
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute(
+            "SELECT value, accessed_at FROM cache_entries WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        if row is None:
+            return False, None
+        if now - row[1] >= _ACCESS_RESOLUTION_SECONDS:
+            # Best effort: a hit must not wait for or fail on the write lock
+            try:
+                conn.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key))
+            except sqlite3.OperationalError as e:
+                logger.debug(f"Skipping access time update for {key}: {e}")
+        return True, pickle.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning(f"Not caching {key}: value cannot be pickled ({e})")
+            return
+        if len(blob) > self.max_bytes:
+            logger.warning(f"Not caching {key}: {len(blob)} bytes exceeds CACHE_MAX_BYTES")
+            return
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now + ttl_seconds, now),
+            )
+            evicted = self._evict(conn, now)
+            if evicted:
+                conn.execute(
+                    "INSERT INTO cache_counters VALUES ('evictions', ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                    (evicted,),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> int:
+        """Drop expired rows, then least recently used rows until under ``max_bytes``."""
+        evicted = conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,)).rowcount
+        total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM cache_entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return evicted
+        for key, size in conn.execute(
+            "SELECT key, size_bytes FROM cache_entries ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        return evicted
+
+    def clear(self) -> int:
+        return self._connect().execute("DELETE FROM cache_entries").rowcount
+
+    def clear_expired(self) -> int:
+        return self._connect().execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._connect()
+        now = time.time()
+        total, expired, total_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(CASE WHEN expires_at <= ? THEN 1 ELSE 0 END), 0),"
+            " COALESCE(SUM(size_bytes), 0) FROM cache_entries",
+            (now,),
+        ).fetchone()
+        evictions = conn.execute("SELECT value FROM cache_counters WHERE name = 'evictions'").fetchone()
+        rows = conn.execute(
+            "SELECT key, created_at, expires_at, size_bytes FROM cache_entries ORDER BY accessed_at DESC LIMIT ?",
+            (_MAX_KEYS_REPORTED,),
+        ).fetchall()
+        return {
+            'total_entries': total,
+            'expired_entries': expired,
+            'total_bytes': total_bytes,
+            'max_bytes': self.max_bytes,
+            'evictions': evictions[0] if evictions else 0,
+            'path': self.path,
+            'cache_keys': [
+                {
+                    'key': key,
+                    'age_seconds': int(now - created_at),
+                    'is_expired': expires_at <= now,
+                    'size_bytes': size,
+                }
+                for key, created_at, expires_at, size in rows
+            ],
+        }
+
+
+_backend: Optional[CacheBackend] = None
+_backend_lock = threading.Lock()
+_counters = {'hits': 0, 'misses': 0, 'coalesced': 0, 'errors': 0}
+_counters_lock = threading.Lock()
+_inflight: Dict[str, Future] = {}
+
+
+def get_backend() -> CacheBackend:
+    """Return the configured cache backend, creating it on first use."""
+    global _backend  # pylint: disable=global-statement
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                max_bytes = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+                if os.getenv("CACHE_BACKEND", "memory").lower() == "disk":
+                    directory = os.getenv("CACHE_DIR") or os.path.join(tempfile.gettempdir(), "search-api-cache")
+                    _backend = DiskCacheBackend(directory, max_bytes=max_bytes)
+                else:
+                    _backend = MemoryCacheBackend(
+                        max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "1024")), max_bytes=max_bytes
+                    )
+    return _backend
+
+
+def set_backend(backend: Optional[CacheBackend]) -> None:
+    """Replace the cache backend (None re-reads the configuration on next use)."""
+    global _backend  # pylint: disable=global-statement
+    with _backend_lock:
+        _backend = backend
+
+
+def _count(name: str) -> None:
+    with _counters_lock:
+        _counters[name] += 1
+
+
+def _backend_get(backend: CacheBackend, key: str) -> Tuple[bool, Any]:
+    """Look up a key, treating a backend error as a miss."""
+    try:
+        return backend.get(key)
+    except Exception as e:  # pylint: disable=broad-except
+        _count('errors')
+        logger.warning(f"Cache lookup failed for {key}, treating as a miss: {e}")
+        return False, None
+
+
+def _backend_set(backend: CacheBackend, key: str, value: Any, ttl_seconds: float) -> None:
+    """Store a value, skipping the store on a backend error."""
+    try:
+        backend.set(key, value, ttl_seconds)
+    except Exception as e:  # pylint: disable=broad-except
+        _count('errors')
+        logger.warning(f"Cache store failed for {key}, not cached: {e}")
+
 
 def cache_with_ttl(ttl_seconds: int = 3600):
     """
-    Simple TTL cache decorator for API responses.
-    
+    TTL cache decorator for API responses.
+
+    Cached values are shared between callers and must be treated as read-only.
+    Exceptions are not cached.
+
     Args:
         ttl_seconds (int): Time to live in seconds (default: 1 hour)
-    
+
     Returns:
         Decorator function
     """
     def decorator(func: Callable) -> Callable:
+        params = list(inspect.signature(func).parameters)
+        skip_first = bool(params) and params[0] in ("self", "cls")
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs) -> Any:
-            # Create cache key from function name and arguments
-            cache_key = f"{func.__name__}:{hash(str(args) + str(sorted(kwargs.items())))}"
-            
-            # Check if we have a cached value that hasn't expired
-            if cache_key in _memory_cache:
-                cached_data, timestamp = _memory_cache[cache_key]
-                if time.time() - timestamp < ttl_seconds:
-                    return cached_data
-                else:
-                    # Remove expired entry
-                    del _memory_cache[cache_key]
-            
-            # Call the function and cache the result
-            result = func(*args, **kwargs)
-            _memory_cache[cache_key] = (result, time.time())
-            
-            return result
+            cache_key = make_key(func, args, kwargs, skip_first=skip_first)
+            backend = get_backend()
+
+            found, value = _backend_get(backend, cache_key)
+            if found:
+                _count('hits')
+                return value
+
+            # Single flight: the first caller computes, concurrent callers wait for it
+            with _counters_lock:
+                future = _inflight.get(cache_key)
+                leader = future is None
+                if leader:
+                    future = _inflight[cache_key] = Future()
+            if not leader:
+                _count('coalesced')
+                return future.result()
+
+            _count('misses')
+            try:
+                result = func(*args, **kwargs)
+                _backend_set(backend, cache_key, result, ttl_seconds)
+                future.set_result(result)
+                return result
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            finally:
+                with _counters_lock:
+                    _inflight.pop(cache_key, None)
         return wrapper
     return decorator
 
 
 def get_cache_stats():
     """Get cache statistics for monitoring."""
-    current_time = time.time()
-    stats = {
-        'total_entries': len(_memory_cache),
-        'expired_entries': 0,
-        'cache_keys': []
+    with _counters_lock:
+        counters = dict(_counters)
+    lookups = counters['hits'] + counters['misses'] + counters['coalesced']
+    backend = get_backend()
+    return {
+        'backend': backend.name,
+        **counters,
+        'hit_ratio': round((counters['hits'] + counters['coalesced']) / lookups, 4) if lookups else 0.0,
+        **backend.stats(),
     }
-    
-    for key, (data, timestamp) in _memory_cache.items():
-        stats['cache_keys'].append({
-            'key': key,
-            'age_seconds': int(current_time - timestamp),
-            'is_expired': current_time - timestamp > 86400  # Default 24h TTL check
-        })
-        if current_time - timestamp > 86400:
-            stats['expired_entries'] += 1
-    
-    return stats
 
 
 def clear_cache():
     """Clear all cached entries."""
-    global _memory_cache
-    _memory_cache.clear()
+    return get_backend().clear()
 
 
 def clear_expired_cache():
     """Clear only expired cache entries."""
-    global _memory_cache
-    current_time = time.time()
-    expired_keys = []
-    
-    for key, (data, timestamp) in _memory_cache.items():
-        if current_time - timestamp > 86400:  # Default 24h TTL
-            expired_keys.append(key)
-    
-    for key in expired_keys:
-        del _memory_cache[key]
-    
-    return len(expired_keys)
\ No newline at end of file
+    return get_backend().clear_expired()
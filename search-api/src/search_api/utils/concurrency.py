@@ -0,0 +1,127 @@
+"""Per-downstream concurrency limits for the asyncio request pipeline.
+
+The ASGI entry point (``asgi.py``) serves searches on one event loop per worker, so
+a single worker keeps many requests in flight while they wait on the vector API and
+the LLM. Every downstream call made on that loop holds a slot of its downstream's
+limit, so a burst of requests queues inside the worker instead of overloading a
+dependency:
+
+- ``vector_api``: calls to the vector search API
+- ``llm``: LLM calls (OpenAI or Ollama)
+- ``blocking``: steps that are still synchronous (agent mode, LLM parameter
+  extraction, auto mode escalation) and run on worker threads
+
+Limits are asyncio semaphores created per event loop. In-flight, queued and peak
+counts per downstream are reported by the ``transport-status`` endpoint.
+
+Configuration (environment):
+    ASYNC_VECTOR_API_CONCURRENCY: Concurrent vector API calls per worker (default: 64)
+    ASYNC_LLM_CONCURRENCY: Concurrent LLM calls per worker (default: 16)
+    ASYNC_BLOCKING_CONCURRENCY: Synchronous steps run on threads at the same time per worker (default: 8)
+"""
+
+import asyncio
+import os
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Hashable
+
+DOWNSTREAMS = {
+    "vector_api": ("ASYNC_VECTOR_API_CONCURRENCY", 64),
+    "llm": ("ASYNC_LLM_CONCURRENCY", 16),
+    "blocking": ("ASYNC_BLOCKING_CONCURRENCY", 8),
+}
+
+_lock = threading.Lock()
+# Objects bound to one event loop (semaphores, async HTTP clients), per loop
+_loop_objects: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, Any]]" = weakref.WeakKeyDictionary()
+_stats: Dict[str, Dict[str, float]] = {}
+
+
+def capacity(downstream: str) -> int:
+    """Configured concurrency limit of a downstream."""
+    variable, default = DOWNSTREAMS[downstream]
+    return max(1, int(os.getenv(variable, str(default))))
+
+
+def loop_local(key: Hashable, factory: Callable[[], Any]) -> Any:
+    """Return the running event loop's object for ``key``, creating it on first use.
+
+    asyncio primitives and async HTTP clients must not be shared between event loops.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        objects = _loop_objects.setdefault(loop, {})
+        if key not in objects:
+            objects[key] = factory()
+        return objects[key]
+
+
+def _counters(downstream: str) -> Dict[str, float]:
+    counters = _stats.get(downstream)
+    if counters is None:
+        counters = _stats[downstream] = {
+            "calls": 0, "in_flight": 0, "max_in_flight": 0, "waiting": 0, "max_waiting": 0,
+            "queued_calls": 0, "total_wait_ms": 0.0, "max_wait_ms": 0.0,
+        }
+    return counters
+
+
+@asynccontextmanager
+async def limit(downstream: str):
+    """Hold one slot of a downstream's limit for the duration of the block."""
+    semaphore = loop_local(("limit", downstream), lambda: asyncio.Semaphore(capacity(downstream)))
+    start = time.perf_counter()
+    queued = semaphore.locked()
+    with _lock:
+        counters = _counters(downstream)
+        if queued:
+            counters["queued_calls"] += 1
+            counters["waiting"] += 1
+            counters["max_waiting"] = max(counters["max_waiting"], counters["waiting"])
+    try:
+        await semaphore.acquire()
+    finally:
+        if queued:
+            with _lock:
+                counters["waiting"] -= 1
+    wait_ms = (time.perf_counter() - start) * 1000
+    with _lock:
+        counters["calls"] += 1
+        counters["in_flight"] += 1
+        counters["max_in_flight"] = max(counters["max_in_flight"], counters["in_flight"])
+        counters["total_wait_ms"] += wait_ms
+        counters["max_wait_ms"] = max(counters["max_wait_ms"], wait_ms)
+    try:
+        yield
+    finally:
+        semaphore.release()
+        with _lock:
+            counters["in_flight"] -= 1
+
+
+async def offload(func: Callable, *args, **kwargs) -> Any:
+    """Run a synchronous step on a worker thread within the ``blocking`` limit.
+
+    The thread runs in a copy of the caller's context, so it shares the Flask
+    request context, the active trace span and the request deadline.
+    """
+    async with limit("blocking"):
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+
+def stats() -> Dict[str, Any]:
+    """Return the limit and in-flight, queued and wait-time counts per downstream."""
+    result = {}
+    with _lock:
+        for downstream in DOWNSTREAMS:
+            counters = dict(_counters(downstream))
+            calls = counters["calls"]
+            counters["avg_wait_ms"] = round(counters["total_wait_ms"] / calls, 2) if calls else 0.0
+            counters["total_wait_ms"] = round(counters["total_wait_ms"], 2)
+            counters["max_wait_ms"] = round(counters["max_wait_ms"], 2)
+            counters["limit"] = capacity(downstream)
+            result[downstream] = counters
+    return result
@@ -0,0 +1,153 @@
+"""Fast JSON encoding and vector API result pass-through.
+
+Search responses are encoded with orjson instead of the stdlib encoder; numpy
+scalars and arrays, datetimes (ISO 8601) and Decimal values are handled.
+
+The vector API reports where the result list sits in its ``/vector-search``
+response (``X-Result-Span``, ``X-Result-Count``). When a handler forwards the
+results unchanged (RAG mode), only the rest of the body is decoded; the list is
+kept as its encoded bytes (``RawJSONList``) and written into the search response
+and the feedback session as they are, instead of being decoded and re-encoded.
+The list is decoded on demand if anything reads its items.
+
+Configuration (environment):
+    SEARCH_RESULTS_PASSTHROUGH: Forward vector API results without decoding them when no transformation
+        is needed (default: true)
+"""
+
+import copy
+import decimal
+import os
+from collections.abc import Sequence
+from http import HTTPStatus
+from typing import Any, Optional
+
+import orjson
+from flask import Response
+from flask.json.provider import JSONProvider
+
+OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+RESULT_SPAN_HEADER = "X-Result-Span"
+RESULT_COUNT_HEADER = "X-Result-Count"
+
+# orjson.Fragment embeds encoded JSON as is (orjson >= 3.9)
+_Fragment = getattr(orjson, "Fragment", None)
+
+
+def is_passthrough_enabled() -> bool:
+    """Whether unchanged vector API results are forwarded without decoding them."""
+    return os.getenv("SEARCH_RESULTS_PASSTHROUGH", "true").lower() == "true"
+
+
+class RawJSONList(Sequence):
+    """A JSON array kept as its encoded bytes, decoded only when its items are read."""
+
+    def __init__(self, raw: bytes, count: int):
+        self.raw = raw
+        self._count = count
+        self._items: Optional[list] = None
+
+    @property
+    def items(self) -> list:
+        """The decoded items."""
+        if self._items is None:
+            self._items = orjson.loads(self.raw)
+        return self._items
+
+    @property
+    def decoded(self) -> bool:
+        """Whether the items have been decoded."""
+        return self._items is not None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __deepcopy__(self, memo):
+        if self._items is None:
+            # The encoded bytes are immutable
+            return self
+        return copy.deepcopy(self._items, memo)
+
+    def __repr__(self) -> str:
+        return f"RawJSONList({self._count} items, {len(self.raw)} bytes)"
+
+
+def _default(obj: Any) -> Any:
+    """Encode the types orjson does not handle natively."""
+    if isinstance(obj, RawJSONList):
+        if obj.decoded:
+            # Decoded items may have been modified, so they are encoded again
+            return obj.items
+        return _Fragment(obj.raw) if _Fragment is not None else orjson.loads(obj.raw)
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "dtype") and hasattr(obj, "item"):
+        # numpy scalar types orjson does not serialize (e.g. float16)
+        return obj.item()
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode an object to JSON bytes."""
+    return orjson.dumps(obj, default=_default, option=OPTIONS)
+
+
+def loads(data: Any) -> Any:
+    """Decode JSON bytes or text."""
+    return orjson.loads(data)
+
+
+def load_search_response(body: bytes, headers: Any, passthrough: bool = False) -> Any:
+    """Decode a ``/vector-search`` response body.
+
+    Args:
+        body: The response body
+        headers: The response headers
+        passthrough: Keep the result list encoded when the response reports its span
+    """
+    span = headers.get(RESULT_SPAN_HEADER)
+    count = headers.get(RESULT_COUNT_HEADER)
+    if not (passthrough and span and count):
+        return loads(body)
+    start, end = (int(offset) for offset in span.split("-"))
+    data = loads(body[:start] + b"[]" + body[end:])
+    vector_search = data.get("vector_search", {})
+    key = "documents" if "documents" in vector_search else "document_chunks"
+    vector_search[key] = RawJSONList(body[start:end], int(count))
+    return data
+
+
+def response(payload: Any, status: int = HTTPStatus.OK) -> Response:
+    """Build a JSON response."""
+    return Response(dumps(payload), status=status, mimetype="application/json")
+
+
+def output_json(data: Any, code: int, headers: Optional[dict] = None) -> Response:
+    """Flask-RESTX representation for ``application/json``."""
+    resp = Response(dumps(data), status=code, mimetype="application/json")
+    resp.headers.extend(headers or {})
+    return resp
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider (``jsonify``, ``request.get_json``) backed by orjson."""
+
+    mimetype = "application/json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps(obj).decode("utf-8")
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
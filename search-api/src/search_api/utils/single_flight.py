@@ -0,0 +1,165 @@
+"""Single-flight coalescing of identical in-flight searches.
+
+When many users submit the same query at once (e.g. after a public announcement)
+each request used to run its own parameter extraction, vector search and summary.
+Searches are now keyed by the normalized request; while one is running, identical
+requests in the same worker wait for it and share its result instead of running
+again. Waiting works from request threads (WSGI) and from coroutines on the event
+loop (ASGI) alike.
+
+The key covers the query (case-folded, whitespace collapsed), the project and
+document type filters (order-insensitive), mode, ranking, search strategy,
+inference, project status, years and user location, so requests that could
+produce different results are never merged.
+
+Each caller receives its own copy of the result. Followers' metrics carry
+``coalesced: true`` and the time they waited; the leader's carry the number of
+requests that shared its result (``coalesced_requests``).
+
+Followers share the leader's errors only when the search itself failed (an
+``Exception``). When the leader is interrupted instead, e.g. its coroutine is
+cancelled because its client disconnected, the followers are released to run
+the search again: the first of them leads a new flight and the rest follow it.
+
+Configuration (environment):
+    SEARCH_COALESCING_ENABLED: Share the result of an in-flight search with identical concurrent requests
+        (default: true)
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+_lock = threading.Lock()
+# key -> [future the followers wait on, number of followers]
+_inflight: Dict[str, list] = {}
+_stats = {"executed": 0, "coalesced": 0, "max_followers": 0, "abandoned": 0}
+# Handed to the followers of a leader that was interrupted, so that they search again
+_ABANDONED = object()
+
+
+def is_enabled() -> bool:
+    """Whether identical concurrent searches are coalesced."""
+    return os.getenv("SEARCH_COALESCING_ENABLED", "true").lower() == "true"
+
+
+def search_key(request_data: Dict[str, Any]) -> str:
+    """Return the coalescing key of a loaded search request."""
+    query = " ".join(str(request_data.get("query") or "").casefold().split())
+    normalized = {
+        "query": query,
+        "mode": request_data.get("mode") or "rag",
+        "projectIds": sorted(request_data.get("projectIds") or []),
+        "documentTypeIds": sorted(request_data.get("documentTypeIds") or []),
+        "years": sorted(request_data.get("years") or []),
+    }
+    for field in ("inference", "ranking", "searchStrategy", "projectStatus", "userLocation"):
+        normalized[field] = request_data.get(field)
+    encoded = json.dumps(normalized, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _join(key: str) -> Tuple[Future, bool]:
+    """Return the flight for a key and whether the caller leads it."""
+    with _lock:
+        flight = _inflight.get(key)
+        if flight is None:
+            flight = _inflight[key] = [Future(), 0]
+            _stats["executed"] += 1
+            return flight[0], True
+        flight[1] += 1
+        _stats["coalesced"] += 1
+        return flight[0], False
+
+
+def _land(key: str, result: Any = None, error: Optional[BaseException] = None) -> Any:
+    """Hand the leader's result (or error) to its followers.
+
+    Errors that are not an ``Exception`` (cancellation, interrupts) belong to the
+    leader's caller only; its followers are told to search again instead.
+    """
+    with _lock:
+        future, followers = _inflight.pop(key)
+        _stats["max_followers"] = max(_stats["max_followers"], followers)
+        if error is not None and not isinstance(error, Exception):
+            # The followers join again and are counted then
+            _stats["abandoned"] += 1
+            _stats["coalesced"] -= followers
+    if isinstance(error, Exception):
+        future.set_exception(error)
+        return None
+    if error is not None:
+        future.set_result(_ABANDONED)
+        return None
+    if followers:
+        # The leader's response is still modified by its route, so followers get a snapshot
+        future.set_result(copy.deepcopy(result))
+        _annotate(result, coalesced_requests=followers)
+    return result
+
+
+def _annotate(result: Any, **values) -> None:
+    metrics = result.get("result", {}).get("metrics") if isinstance(result, dict) else None
+    if isinstance(metrics, dict):
+        metrics.update(values)
+
+
+def _follow(shared: Any, start: float) -> Any:
+    result = copy.deepcopy(shared)
+    _annotate(result, coalesced=True, coalesced_wait_ms=round((time.perf_counter() - start) * 1000, 2))
+    return result
+
+
+def run(key: str, func: Callable, *args, **kwargs) -> Any:
+    """Run ``func`` unless an identical search is in flight, then share its result."""
+    if not is_enabled():
+        return func(*args, **kwargs)
+    start = time.perf_counter()
+    future, leader = _join(key)
+    while not leader:
+        shared = future.result()
+        if shared is not _ABANDONED:
+            return _follow(shared, start)
+        future, leader = _join(key)
+    try:
+        result = func(*args, **kwargs)
+    except BaseException as e:
+        _land(key, error=e)
+        raise
+    return _land(key, result)
+
+
+async def run_async(key: str, func: Callable, *args, **kwargs) -> Any:
+    """Await ``func(*args, **kwargs)`` unless an identical search is in flight, then share its result."""
+    if not is_enabled():
+        return await func(*args, **kwargs)
+    start = time.perf_counter()
+    future, leader = _join(key)
+    while not leader:
+        shared = await asyncio.wrap_future(future)
+        if shared is not _ABANDONED:
+            return _follow(shared, start)
+        future, leader = _join(key)
+    try:
+        result = await func(*args, **kwargs)
+    except BaseException as e:
+        _land(key, error=e)
+        raise
+    return _land(key, result)
+
+
+def stats() -> Dict[str, Any]:
+    """Return executed and coalesced search counts since the worker started."""
+    with _lock:
+        counters = dict(_stats)
+        counters["in_flight"] = len(_inflight)
+    requests = counters["executed"] + counters["coalesced"]
+    counters["coalesced_ratio"] = round(counters["coalesced"] / requests, 4) if requests else 0.0
+    counters["enabled"] = is_enabled()
+    return counters
@@ -0,0 +1,417 @@
+"""Lightweight distributed tracing with W3C Trace Context propagation.
+
+This module provides a small, dependency-free tracer used to follow a single
+request from the search-api through the vector-api:
+
+- Incoming ``traceparent`` headers are honoured so the search-api joins any
+  trace started by the web client.
+- Outgoing calls to the vector-api carry a ``traceparent`` header so spans
+  recorded there share the same trace id.
+- Spans wrap handler stages and LLM calls and are exported when the local
+  root span (normally the HTTP request) finishes.
+
+Exported spans use the OTLP/HTTP JSON encoding (``ExportTraceServiceRequest``)
+so they can be written to a local JSON-lines file for offline analysis or
+posted to any OpenTelemetry collector.
+
+Configuration (environment variables):
+    TRACING_EXPORTER: ``none`` (default), ``file`` or ``otlp``
+    TRACING_FILE_PATH: Output file for the ``file`` exporter (default: traces.jsonl)
+    TRACING_OTLP_ENDPOINT: Collector URL for the ``otlp`` exporter
+                           (default: http://localhost:4318/v1/traces)
+    TRACING_SAMPLE_RATIO: Fraction of new traces to record (default: 1.0)
+    TRACING_SERVICE_NAME: ``service.name`` resource attribute (default: search-api)
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = "traceparent"
+
+_TRACEPARENT_PATTERN = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+# Maximum number of traces buffered while waiting for their root span to end
+_MAX_PENDING_TRACES = 1000
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("search_api_current_span", default=None)
+
+
+class SpanKind:
+    """OTLP span kinds; exporters read the kind from the span, not from an attribute."""
+
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """Parse a W3C ``traceparent`` header value.
+
+    Args:
+        value: The raw header value, e.g. ``00-<trace-id>-<span-id>-01``
+
+    Returns:
+        Tuple of (trace_id, parent_span_id, sampled) or None if the value is invalid
+    """
+    if not value:
+        return None
+    match = _TRACEPARENT_PATTERN.match(value.strip().lower())
+    if not match:
+        return None
+    version, trace_id, span_id, flags = match.groups()
+    if version == "ff" or trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+        return None
+    return trace_id, span_id, bool(int(flags, 16) & 0x01)
+
+
+class Span:
+    """A single timed operation within a trace."""
+
+    def __init__(self, name: str, trace_id: str, parent_span_id: Optional[str] = None,
+                 sampled: bool = True, is_local_root: bool = False,
+                 attributes: Optional[Dict[str, Any]] = None, kind: int = SpanKind.INTERNAL):
+        """Initialize a span.
+
+        Args:
+            name: Operation name
+            trace_id: 32 hex character trace id shared by every span of the trace
+            parent_span_id: Span id of the parent span (local or remote)
+            sampled: Whether the span should be exported
+            is_local_root: True when the span has no parent inside this process
+            attributes: Initial span attributes
+            kind: OTLP span kind (see ``SpanKind``)
+        """
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.sampled = sampled
+        self.is_local_root = is_local_root
+        self.kind = kind
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status_code = 0
+        self.status_message = ""
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: Optional[int] = None
+
+    @property
+    def traceparent(self) -> str:
+        """Return the W3C ``traceparent`` header value identifying this span."""
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    @property
+    def duration_ms(self) -> float:
+        """Return the span duration in milliseconds (elapsed so far if still open)."""
+        end = self.end_time_ns if self.end_time_ns is not None else time.time_ns()
+        return round((end - self.start_time_ns) / 1_000_000, 2)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set a single span attribute."""
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        """Set several span attributes at once."""
+        self.attributes.update(attributes)
+
+    def record_exception(self, exc: BaseException) -> None:
+        """Mark the span as failed and record the exception details."""
+        self.status_code = 2
+        self.status_message = str(exc)[:500]
+        self.attributes["exception.type"] = type(exc).__name__
+        self.attributes["exception.message"] = str(exc)[:500]
+
+    def end(self) -> None:
+        """Finish the span and hand it to the exporter."""
+        if self.end_time_ns is not None:
+            return
+        self.end_time_ns = time.time_ns()
+        _TRACER.on_end(self)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Encode the span using the OTLP/HTTP JSON span representation."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns or time.time_ns()),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items() if v is not None],
+            "status": {"code": self.status_code},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    """Encode a single attribute as an OTLP ``KeyValue``."""
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    elif isinstance(value, (list, tuple)):
+        encoded = {"arrayValue": {"values": [_otlp_attribute("", v)["value"] for v in value]}}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+class _Tracer:
+    """Collects finished spans per trace and forwards them to the configured exporter."""
+
+    def __init__(self):
+        self.exporter_name = os.getenv("TRACING_EXPORTER", "none").lower()
+        self.file_path = os.getenv("TRACING_FILE_PATH", "traces.jsonl")
+        self.otlp_endpoint = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+        self.sample_ratio = float(os.getenv("TRACING_SAMPLE_RATIO", "1.0"))
+        self.service_name = os.getenv("TRACING_SERVICE_NAME", "search-api")
+        self._pending: Dict[str, List[Span]] = {}
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[List[Span]]" = queue.Queue(maxsize=1000)
+        self._worker: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Return True when spans are exported somewhere."""
+        return self.exporter_name in ("file", "otlp")
+
+    def should_sample(self) -> bool:
+        """Decide whether a brand new trace is recorded."""
+        return self.enabled and random.random() < self.sample_ratio
+
+    def on_end(self, span: Span) -> None:
+        """Buffer a finished span, flushing the whole trace when its local root ends."""
+        if not span.sampled or not self.enabled:
+            return
+        with self._lock:
+            if span.is_local_root:
+                batch = self._pending.pop(span.trace_id, [])
+                batch.append(span)
+            elif span.trace_id in self._pending or len(self._pending) < _MAX_PENDING_TRACES:
+                self._pending.setdefault(span.trace_id, []).append(span)
+                return
+            else:
+                # Root already flushed (late background span) or buffer full - export on its own
+                batch = [span]
+        self._enqueue(batch)
+
+    def _enqueue(self, batch: List[Span]) -> None:
+        """Queue a batch of spans for the background export worker."""
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                    self._worker.start()
+        try:
+            self._queue.put_nowait(batch)
+        except queue.Full:
+            logger.warning("Trace export queue full - dropping %d spans", len(batch))
+
+    def _run(self) -> None:
+        """Background loop that writes span batches to the exporter."""
+        while True:
+            batch = self._queue.get()
+            try:
+                self.export(batch)
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning(f"Trace export failed: {e}")
+
+    def export(self, spans: List[Span]) -> None:
+        """Export a batch of spans as one OTLP ``ExportTraceServiceRequest``."""
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": __name__},
+                    "spans": [span.to_otlp() for span in spans],
+                }],
+            }]
+        }
+        if self.exporter_name == "file":
+            line = json.dumps(payload, default=str)
+            with open(self.file_path, "a", encoding="utf-8") as trace_file:
+                trace_file.write(line + "\n")
+        elif self.exporter_name == "otlp":
+            import requests  # pylint: disable=import-outside-toplevel
+            requests.post(self.otlp_endpoint, json=payload, timeout=5)
+
+
+_TRACER = _Tracer()
+
+
+def get_current_span() -> Optional[Span]:
+    """Return the span active in the current context, if any."""
+    return _current_span.get()
+
+
+def current_traceparent() -> Optional[str]:
+    """Return the ``traceparent`` header value for the active span, if any."""
+    span = _current_span.get()
+    return span.traceparent if span is not None else None
+
+
+def inject_headers(headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Add the active ``traceparent`` to a header dictionary for an outgoing request.
+
+    Args:
+        headers: Existing headers to extend (a new dict is created if omitted)
+
+    Returns:
+        The header dictionary including ``traceparent`` when a span is active
+    """
+    headers = dict(headers or {})
+    traceparent = current_traceparent()
+    if traceparent:
+        headers[TRACEPARENT_HEADER] = traceparent
+    return headers
+
+
+def begin_span(name: str, attributes: Optional[Dict[str, Any]] = None,
+               traceparent: Optional[str] = None, kind: int = SpanKind.INTERNAL) -> Span:
+    """Create a span as a child of the active span or of a remote ``traceparent``.
+
+    The caller is responsible for activating (see ``activate``) and ending the span.
+    Most code should use the ``start_span`` context manager instead.
+    """
+    parent = _current_span.get()
+    remote = parse_traceparent(traceparent) if traceparent else None
+    if remote is not None:
+        trace_id, parent_span_id, sampled = remote
+        return Span(name, trace_id, parent_span_id, sampled, True, attributes, kind)
+    if parent is not None:
+        return Span(name, parent.trace_id, parent.span_id, parent.sampled, False, attributes, kind)
+    return Span(name, secrets.token_hex(16), None, _TRACER.should_sample(), True, attributes, kind)
+
+
+def activate(span: Optional[Span]) -> contextvars.Token:
+    """Make ``span`` the active span; returns a token for ``deactivate``."""
+    return _current_span.set(span)
+
+
+def deactivate(token: contextvars.Token) -> None:
+    """Restore the span that was active before ``activate``."""
+    _current_span.reset(token)
+
+
+@contextmanager
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None,
+               traceparent: Optional[str] = None, kind: int = SpanKind.INTERNAL):
+    """Context manager that records a span around a block of code.
+
+    Example:
+        >>> with start_span("llm.chat_completion", {"llm.provider": "openai"}) as span:
+        ...     response = client.chat(...)
+        ...     span.set_attribute("llm.total_tokens", 123)
+    """
+    span = begin_span(name, attributes, traceparent, kind)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as exc:
+        span.record_exception(exc)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
+
+
+def traced(name: str, attributes: Optional[Dict[str, Any]] = None, kind: int = SpanKind.INTERNAL) -> Callable:
+    """Decorator that wraps every call of the function in a span.
+
+    Coroutine functions are wrapped so that the span covers the awaited call.
+
+    Args:
+        name: Span name
+        attributes: Static attributes added to each span
+        kind: Span kind, e.g. ``SpanKind.CLIENT`` for calls to another service
+    """
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with start_span(name, attributes, kind=kind):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with start_span(name, attributes, kind=kind):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def bind_context(func: Callable) -> Callable:
+    """Bind a callable to a copy of the caller's context (including the active span).
+
+    Threads do not inherit context variables, so spans created in worker
+    threads would otherwise start new traces.
+    """
+    ctx = contextvars.copy_context()
+    return functools.partial(ctx.run, func)
+
+
+def submit_with_context(executor, func: Callable, *args, **kwargs):
+    """Submit work to an executor so that it runs inside the caller's trace context."""
+    return executor.submit(bind_context(func), *args, **kwargs)
+
+
+def init_app(app) -> None:
+    """Register request hooks that open a server span for every HTTP request."""
+    from flask import g, request  # pylint: disable=import-outside-toplevel
+
+    @app.before_request
+    def start_request_span():
+        span = begin_span(
+            f"{request.method} {request.path}",
+            {"http.method": request.method, "http.target": request.path},
+            traceparent=request.headers.get(TRACEPARENT_HEADER),
+            kind=SpanKind.SERVER,
+        )
+        g.trace_span = span
+        g.trace_token = activate(span)
+
+    @app.after_request
+    def add_trace_header(response):
+        span = g.get("trace_span")
+        if span is not None:
+            span.set_attribute("http.status_code", response.status_code)
+            response.headers[TRACEPARENT_HEADER] = span.traceparent
+        return response
+
+    @app.teardown_request
+    def end_request_span(exc):
+        span = g.pop("trace_span", None)
+        token = g.pop("trace_token", None)
+        if span is None:
+            return
+        if exc is not None:
+            span.record_exception(exc)
+        if token is not None:
+            try:
+                deactivate(token)
+            except ValueError:
+                # Token was created in a different context (e.g. streamed response)
+                pass
+        span.end()
@@ -0,0 +1,217 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the ASGI entry point.
+
+Test-Suite to ensure that searches run through the Flask request hooks and the role check on the event loop,
+that the async search handlers answer like the sync ones, and that other routes are served on a thread pool.
+"""
+import asyncio
+import json
+import threading
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from flask import Flask, jsonify, request
+
+from search_api import asgi
+from search_api.clients.vector_search_client import VectorSearchClient
+from search_api.services.search_handlers import AIHandler, RAGHandler, RAGSummaryHandler
+from search_api.services.search_service import SearchService
+
+CHUNKS = [{'document_id': 'doc-1', 'content': 'Caribou habitat'}]
+VECTOR_RESULT = ([], CHUNKS, {'vector_search': {'search_metrics': {}}})
+SUMMARY = {'response': 'Caribou habitat is affected.'}
+SEARCH_RESPONSE = {'result': {'response': 'Caribou habitat is affected.', 'document_chunks': CHUNKS}}
+
+
+def _flask_app(barrier=None):
+    """A Flask app with request hooks and a route that is not a search.
+
+    The document route waits on the barrier, if given, before answering.
+    """
+    app = Flask(__name__)
+
+    @app.before_request
+    def reject_blocked_clients():
+        if request.headers.get('X-Blocked'):
+            return jsonify({'error': 'blocked'}), 429
+        return None
+
+    @app.after_request
+    def add_hook_header(response):
+        response.headers['X-Hook'] = 'applied'
+        return response
+
+    @app.route('/api/document/view')
+    def view():
+        if barrier is not None:
+            barrier.wait()
+        return {'thread': threading.current_thread().name}
+
+    return app
+
+
+async def _request(application, path, method='POST', body=b'', headers=(), disconnect=False):
+    """Send one HTTP request through the ASGI application; return (status, headers, body)."""
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'method': method, 'path': path, 'query_string': b'',
+        'root_path': '', 'headers': [(b'content-type', b'application/json')] + list(headers),
+        'server': ('testserver', 80), 'client': ('127.0.0.1', 5000), 'scheme': 'http', 'http_version': '1.1',
+    }
+    request_message = {'type': 'http.request', 'body': body, 'more_body': False}
+    messages = [{'type': 'http.disconnect'}] if disconnect else [request_message]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(3600)
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    await application(scope, receive, send)
+    if not sent:
+        return None, {}, b''
+    payload = b''.join(message.get('body', b'') for message in sent[1:])
+    return sent[0]['status'], {k.decode(): v.decode() for k, v in sent[0]['headers']}, payload
+
+
+def _search(application, headers=()):
+    body = json.dumps({'query': 'caribou', 'mode': 'rag'}).encode()
+    return asyncio.run(_request(application, asgi.SEARCH_PATH, body=body, headers=headers))
+
+
+@pytest.fixture
+def search_service():
+    """Patch the downstream calls made by an authorized search."""
+    with patch.object(SearchService, 'get_documents_by_query_async', AsyncMock(return_value=SEARCH_RESPONSE)) as get, \
+            patch.object(VectorSearchClient, 'create_feedback_session_async', AsyncMock(return_value='session-1')):
+        yield get
+
+
+def test_authorized_search_runs_through_request_hooks(search_service):
+    """An authorized search is answered on the event loop and the after-request hooks apply."""
+    application = asgi.AsgiApplication(_flask_app())
+
+    with patch.object(asgi, '_authorize', return_value=None):
+        status, headers, payload = _search(application)
+
+    assert status == 200
+    assert headers['x-hook'] == 'applied'
+    assert headers['content-length'] == str(len(payload))
+    assert json.loads(payload)['feedback_session_id'] == 'session-1'
+    assert search_service.await_args.args[0] == 'caribou'
+
+
+def test_denied_search_returns_auth_error(search_service):
+    """A caller without a search role gets the role check's error and no search runs."""
+    application = asgi.AsgiApplication(_flask_app())
+    denied = ({'error': 'Forbidden', 'message': 'User does not have permission to access this endpoint'}, 403)
+
+    with patch.object(asgi, '_authorize', return_value=denied):
+        status, headers, payload = _search(application)
+
+    assert status == 403
+    assert json.loads(payload)['error'] == 'Forbidden'
+    assert headers['x-hook'] == 'applied'
+    search_service.assert_not_awaited()
+
+
+def test_before_request_response_short_circuits_search(search_service):
+    """A response from a before-request hook is returned without checking roles or searching."""
+    application = asgi.AsgiApplication(_flask_app())
+
+    with patch.object(asgi, '_authorize') as authorize:
+        status, headers, payload = _search(application, headers=[(b'x-blocked', b'1')])
+
+    assert status == 429
+    assert json.loads(payload) == {'error': 'blocked'}
+    assert headers['x-hook'] == 'applied'
+    authorize.assert_not_called()
+    search_service.assert_not_awaited()
+
+
+def test_search_error_returns_internal_server_error(search_service):
+    """A failing search is answered with a 500 that still passes through the hooks."""
+    application = asgi.AsgiApplication(_flask_app())
+    search_service.side_effect = RuntimeError('vector API down')
+
+    with patch.object(asgi, '_authorize', return_value=None):
+        status, headers, payload = _search(application)
+
+    assert status == 500
+    assert json.loads(payload) == {'error': 'Internal server error occurred'}
+    assert headers['x-hook'] == 'applied'
+
+
+def test_disconnected_client_gets_no_response(search_service):
+    """No search runs for a client that disconnected before sending its body."""
+    application = asgi.AsgiApplication(_flask_app())
+
+    status, _, _ = asyncio.run(_request(application, asgi.SEARCH_PATH, disconnect=True))
+
+    assert status is None
+    search_service.assert_not_awaited()
+
+
+def test_other_routes_are_served_concurrently_on_threads(monkeypatch):
+    """Routes served by Flask run on a thread pool, so one slow request does not block another."""
+    monkeypatch.setenv('ASGI_WSGI_THREADS', '4')
+    application = asgi.AsgiApplication(_flask_app(threading.Barrier(2, timeout=5)))
+
+    async def both():
+        return await asyncio.gather(*(_request(application, '/api/document/view', method='GET') for _ in range(2)))
+
+    responses = asyncio.run(both())
+
+    assert [status for status, _, _ in responses] == [200, 200]
+    threads = {json.loads(payload)['thread'] for _, _, payload in responses}
+    assert len(threads) == 2
+
+
+@pytest.mark.parametrize('mode, handler', [('rag', RAGHandler), ('summary', RAGSummaryHandler), ('ai', AIHandler)])
+def test_async_handlers_answer_like_sync_handlers(mode, handler):
+    """handle_async returns the same response as handle for each mode served on the event loop."""
+    def without_timings(value):
+        if isinstance(value, dict):
+            return {k: without_timings(v) for k, v in value.items()
+                    if not k.endswith('_ms') and k not in ('start_time', 'search_duration')}
+        return value
+
+    resolved = {
+        'query': 'caribou', 'project_ids': None, 'document_type_ids': None, 'inference': None, 'ranking': None,
+        'search_strategy': None, 'semantic_query': 'caribou', 'metrics': None, 'location': None,
+        'user_location': None, 'project_status': None, 'years': None,
+    }
+
+    def resolve_parameters(*args):
+        return {**resolved, 'metrics': args[6]}
+
+    with Flask(__name__).app_context(), \
+            patch.object(VectorSearchClient, 'search', return_value=VECTOR_RESULT), \
+            patch.object(VectorSearchClient, 'search_async', AsyncMock(return_value=VECTOR_RESULT)) as search_async, \
+            patch.object(handler, '_generate_agentic_summary', return_value=SUMMARY), \
+            patch.object(handler, '_generate_agentic_summary_async', AsyncMock(return_value=SUMMARY)), \
+            patch.object(AIHandler, '_resolve_parameters', side_effect=resolve_parameters):
+        expected = SearchService.get_documents_by_query('caribou', mode=mode)
+        actual = asyncio.run(SearchService.get_documents_by_query_async('caribou', mode=mode))
+
+    search_async.assert_awaited_once()
+    assert without_timings(actual) == without_timings(expected)
+    assert actual['result']['document_chunks'] == CHUNKS
+    if mode != 'rag':
+        assert actual['result']['response'] == SUMMARY['response']
@@ -0,0 +1,108 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the document view responses.
+
+Test-Suite to ensure that conditional and ranged S3 errors map to RFC 9110 responses
+and that cached documents fall back to S3 without fetching an object twice.
+"""
+import os
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+from flask import Flask
+
+from search_api.resources import document
+from search_api.services.document_cache import DocumentCache
+
+ETAG = '"5d41402abc4b2a76b9719d911017c592"'
+
+
+def _client_error(status, code, error=None, headers=None):
+    """Build the ClientError botocore raises for a GetObject status."""
+    return ClientError({
+        'Error': {'Code': code, **(error or {})},
+        'ResponseMetadata': {'HTTPStatusCode': status, 'HTTPHeaders': headers or {}},
+    }, 'GetObject')
+
+
+def test_not_modified_returns_the_object_etag():
+    """The 304 carries the object's ETag, not the client's If-None-Match list."""
+    error = _client_error(304, '304', headers={'etag': ETAG, 'last-modified': 'Wed, 01 May 2024 10:00:00 GMT'})
+
+    with Flask(__name__).app_context():
+        response = document._not_modified_response(error, 'docs/report.pdf')  # pylint: disable=protected-access
+
+    assert response.status_code == 304
+    assert response.headers['ETag'] == ETAG
+    assert response.headers['Last-Modified'] == 'Wed, 01 May 2024 10:00:00 GMT'
+
+
+def test_range_not_satisfiable_reports_the_size():
+    """The 416 carries Content-Range with the object size, looked up when S3 does not report it."""
+    with Flask(__name__).app_context():
+        response = document._range_not_satisfiable_response('docs/report.pdf', 2048)  # pylint: disable=protected-access
+        with patch.object(document, 'head_s3_object', return_value={'ContentLength': 512}):
+            looked_up = document._range_not_satisfiable_response('docs/report.pdf')  # pylint: disable=protected-access
+
+    assert response.status_code == 416
+    assert response.headers['Content-Range'] == 'bytes */2048'
+    assert looked_up.headers['Content-Range'] == 'bytes */512'
+    assert document._is_range_not_satisfiable(_client_error(416, 'InvalidRange'))  # pylint: disable=protected-access
+
+
+def _cached(tmp_path, revalidate_seconds=300):
+    """Build a document cache holding one PDF."""
+    cache = DocumentCache(str(tmp_path), max_bytes=10_000, max_object_bytes=10_000,
+                          revalidate_seconds=revalidate_seconds)
+    data = b'%PDF' + b'x' * 100
+    s3_object = {'ETag': ETAG, 'ContentLength': len(data), 'ContentType': 'application/pdf'}
+    for _ in cache.tee('docs/report.pdf', s3_object, iter([data])):
+        pass
+    return cache
+
+
+def test_evicted_entry_falls_back_to_s3(tmp_path):
+    """A data file evicted between the lookup and send_file is a miss, not a 404."""
+    cache = _cached(tmp_path)
+    lookup = cache.lookup
+
+    def lookup_then_evict(s3_key):
+        entry = lookup(s3_key)
+        os.remove(entry.path)
+        return entry
+
+    with Flask(__name__).test_request_context('/api/document/view'), \
+            patch.object(cache, 'lookup', side_effect=lookup_then_evict):
+        response, s3_object = document._serve_from_cache(cache, 'docs/report.pdf', 'report.pdf')  # pylint: disable=protected-access
+
+    assert response is None
+    assert s3_object is None
+
+
+def test_changed_object_is_fetched_once(tmp_path):
+    """A revalidation that finds a new version hands its response over instead of discarding it."""
+    cache = _cached(tmp_path, revalidate_seconds=0)
+    changed = {'ETag': '"new"', 'ContentLength': 10, 'ContentRange': 'bytes 0-9/200', 'Body': MagicMock()}
+
+    with Flask(__name__).test_request_context('/api/document/view'), \
+            patch.object(document, 'open_s3_object', return_value=changed) as open_s3_object:
+        response, s3_object = document._serve_from_cache(  # pylint: disable=protected-access
+            cache, 'docs/report.pdf', 'report.pdf', 'bytes=0-9'
+        )
+
+    assert response is None
+    assert s3_object is changed
+    open_s3_object.assert_called_once_with('docs/report.pdf', byte_range='bytes=0-9', if_none_match=ETAG)
+    changed['Body'].close.assert_not_called()
@@ -0,0 +1,92 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the streamed search endpoint.
+
+Test-Suite to ensure that server-sent events are sent in order and that every deferred summary is streamed.
+"""
+import inspect
+import json
+from unittest.mock import patch
+
+from flask import Flask
+
+from search_api.resources import search as search_resource
+from search_api.services.generation.factories import SummarizerFactory
+from search_api.services.generation.factories.summarizer_factory import DeferredSummary
+
+CHUNKS = [{'document_id': 'doc-1', 'content': 'Caribou habitat'}]
+
+
+def _stream(get_documents, tokens=None):
+    """Run POST /api/search/query/stream and return its (event, data) pairs."""
+    tokens = tokens or {}
+    post = inspect.unwrap(search_resource.SearchStream.post)
+
+    def stream(deferred):
+        return iter(tokens[deferred.query])
+
+    with Flask(__name__).test_request_context('/api/search/query/stream', method='POST',
+                                              json={'query': 'caribou', 'mode': 'summary'}), \
+            patch.object(search_resource.SearchService, 'get_documents_by_query', side_effect=get_documents), \
+            patch.object(search_resource.VectorSearchClient, 'create_feedback_session', return_value='session-1'), \
+            patch.object(DeferredSummary, 'stream', stream):
+        body = ''.join(post().response)
+
+    events = []
+    for block in body.strip().split('\n\n'):
+        event, data = block.split('\n', 1)
+        events.append((event[len('event: '):], json.loads(data[len('data: '):])))
+    return events
+
+
+def _summarizing_search(*queries):
+    """A search handler that requests one summary per query."""
+    def get_documents(*_args):
+        for query in queries:
+            SummarizerFactory.create_summarizer().summarize_search_results(query, CHUNKS)
+        return {'result': {'response': '', 'document_chunks': CHUNKS}}
+    return get_documents
+
+
+def test_events_are_sent_in_order():
+    """Documents are sent first, then summary tokens, then done with the full summary."""
+    events = _stream(_summarizing_search('caribou'), {'caribou': ['Caribou ', 'habitat.']})
+
+    assert [event for event, _ in events] == ['documents', 'token', 'token', 'done']
+    assert events[0][1]['result']['response'] == ''
+    assert [data['text'] for event, data in events if event == 'token'] == ['Caribou ', 'habitat.']
+    assert events[-1][1]['response'] == 'Caribou habitat.'
+    assert events[-1][1]['feedback_session_id'] == 'session-1'
+
+
+def test_every_deferred_summary_is_streamed():
+    """Several summaries requested by one search are all streamed, in order."""
+    events = _stream(_summarizing_search('first', 'second'), {'first': ['One.'], 'second': ['Two.']})
+
+    tokens = [data for event, data in events if event == 'token']
+    assert [(token['summary'], token['text']) for token in tokens] == [(0, 'One.'), (1, '\n\n'), (1, 'Two.')]
+    assert events[-1][1]['response'] == 'One.\n\nTwo.'
+
+
+def test_non_deferred_response_is_kept():
+    """Modes that do not summarize send no tokens and keep the handler's response."""
+    def get_documents(*_args):
+        return {'result': {'response': 'Found 1 document', 'document_chunks': CHUNKS}}
+
+    events = _stream(get_documents)
+
+    assert [event for event, _ in events] == ['documents', 'done']
+    assert events[-1][1]['response'] == 'Found 1 document'
+    assert 'summary_time_ms' not in events[-1][1]['metrics']
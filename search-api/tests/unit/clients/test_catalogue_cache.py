@@ -0,0 +1,70 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the catalogue cache.
+
+Test-Suite to ensure that catalogue responses are shared and revalidated with ETags.
+"""
+from unittest.mock import MagicMock, patch
+
+from search_api.clients.catalogue_cache import CatalogueCache
+
+
+URL = 'http://vector-api/api/tools/document-types'
+
+
+def _response(status_code, payload=None, etag=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {'ETag': etag} if etag else {}
+    response.json.return_value = payload
+    return response
+
+
+def test_fresh_copy_is_shared():
+    """Assert that a copy inside the revalidation interval is served without a request."""
+    cache = CatalogueCache(revalidate_seconds=60)
+    with patch('search_api.clients.catalogue_cache.vector_api_transport.get',
+               return_value=_response(200, {'document_types': []}, '"v1"')) as get:
+        first = cache.get(URL)
+        second = cache.get(URL)
+
+    assert get.call_count == 1
+    assert first is second
+    assert cache.stats()['hits'] == 1
+
+
+def test_revalidates_with_etag():
+    """Assert that an expired copy is revalidated with If-None-Match and kept on 304."""
+    cache = CatalogueCache(revalidate_seconds=0)
+    with patch('search_api.clients.catalogue_cache.vector_api_transport.get',
+               side_effect=[_response(200, {'document_types': []}, '"v1"'), _response(304)]) as get:
+        first = cache.get(URL)
+        second = cache.get(URL)
+
+    assert get.call_args.kwargs['headers']['If-None-Match'] == '"v1"'
+    assert first is second
+    assert cache.stats()['revalidated'] == 1
+
+
+def test_error_payload_not_cached():
+    """Assert that error payloads from the vector API are never kept."""
+    cache = CatalogueCache(revalidate_seconds=60)
+    with patch('search_api.clients.catalogue_cache.vector_api_transport.get',
+               return_value=_response(200, {'error': 'db down'})) as get:
+        cache.get(URL)
+        cache.get(URL)
+
+    assert get.call_count == 2
+    assert cache.stats()['entries'] == []
@@ -0,0 +1,81 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the vector API HTTP transport.
+
+Test-Suite to ensure that retries, deadlines and endpoint metrics behave as expected.
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from search_api.clients.http_transport import DeadlineExceeded, HttpTransport, deadline_scope, remaining_budget
+
+
+URL = 'http://vector-api/api/tools/projects'
+
+
+def _response(status_code):
+    response = MagicMock()
+    response.status_code = status_code
+    return response
+
+
+def test_get_retried_on_unavailable(monkeypatch):
+    """Assert that idempotent calls are retried on 503 and metrics count the retry."""
+    monkeypatch.setenv('VECTOR_API_RETRY_BACKOFF', '0')
+    transport = HttpTransport(pool_size=2)
+    with patch.object(requests.Session, 'request', side_effect=[_response(503), _response(200)]) as send:
+        response = transport.get(URL, 'tools/projects')
+
+    assert response.status_code == 200
+    assert send.call_count == 2
+    stats = transport.stats()['endpoints']['tools/projects']
+    assert stats['calls'] == 1
+    assert stats['retries'] == 1
+    assert stats['errors'] == 0
+
+
+def test_post_not_retried():
+    """Assert that non-idempotent calls are sent once."""
+    transport = HttpTransport(pool_size=2)
+    with patch.object(requests.Session, 'request', side_effect=requests.exceptions.ConnectionError('down')) as send:
+        with pytest.raises(requests.exceptions.ConnectionError):
+            transport.post(URL, 'tools/feedback', json={})
+
+    assert send.call_count == 1
+    assert transport.stats()['endpoints']['tools/feedback']['errors'] == 1
+
+
+def test_timeouts_capped_by_budget():
+    """Assert that connect and read timeouts never exceed the remaining budget."""
+    transport = HttpTransport(pool_size=2)
+    with deadline_scope(1.0):
+        with patch.object(requests.Session, 'request', return_value=_response(200)) as send:
+            transport.get(URL, 'tools/projects')
+        connect, read = send.call_args.kwargs['timeout']
+        assert connect <= 1.0
+        assert read <= 1.0
+    assert remaining_budget() is None
+
+
+def test_spent_budget_raises():
+    """Assert that no call is sent once the budget is spent."""
+    transport = HttpTransport(pool_size=2)
+    with deadline_scope(0):
+        with patch.object(requests.Session, 'request') as send:
+            with pytest.raises(DeadlineExceeded):
+                transport.get(URL, 'tools/projects')
+    send.assert_not_called()
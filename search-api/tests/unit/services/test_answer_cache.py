@@ -0,0 +1,171 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Tests to assure the semantic answer cache.
+
+Test-Suite to ensure that summaries are reused for paraphrased questions over the same chunks only.
+"""
+import pytest
+
+from search_api.services.generation.abstractions.summarizer import Summarizer
+from search_api.services.generation.factories.summarizer_factory import _CachingSummarizer
+from search_api.services.generation.implementations import answer_cache
+
+CHUNKS = [
+    {"document_id": "doc-1", "page_number": 4, "content": "Caribou habitat near the dam site."},
+    {"document_id": "doc-2", "page_number": 9, "content": "Mitigation measures for caribou."},
+]
+
+
+class _Client:  # pylint: disable=too-few-public-methods
+    def get_model_name(self):
+        return "test-model"
+
+
+class _StubSummarizer(Summarizer):
+    """Counts LLM calls; fails when asked to."""
+
+    def __init__(self, fail=False):
+        self.client = _Client()
+        self.calls = 0
+        self.fail = fail
+
+    def summarize_search_results(self, query, documents_or_chunks, search_context=None):
+        self.calls += 1
+        summary = self._fallback_summary(documents_or_chunks, query) if self.fail else f"Summary {self.calls}"
+        return {"summary": summary, "method": "stub_summarization", "provider": "stub", "model": "test-model"}
+
+    def _build_summarization_prompt(self, query, context=None):
+        return f"Summarize for: {query} {context or ''}"
+
+    def _fallback_summary(self, documents, query):
+        return f"Found {len(documents)} documents related to '{query}'."
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache(monkeypatch):
+    monkeypatch.delenv("ANSWER_CACHE_SIMILARITY", raising=False)
+    answer_cache.clear()
+    yield
+    answer_cache.clear()
+
+
+def test_paraphrases_embed_close_together():
+    """Reworded questions are more similar to each other than to a different question."""
+    a = answer_cache.embed_query("What are the impacts on caribou at Site C?")
+    b = answer_cache.embed_query("caribou impacts site c")
+    c = answer_cache.embed_query("Greenhouse gas emissions from the LNG facility")
+
+    assert answer_cache.cosine(a, b) >= 0.85
+    assert answer_cache.cosine(a, c) < 0.3
+
+
+def test_paraphrase_over_same_chunks_is_served_from_cache():
+    """The second, reworded question gets the cached summary without an LLM call."""
+    summarizer = _CachingSummarizer(_StubSummarizer())
+
+    first = summarizer.summarize_search_results("What are the impacts on caribou at Site C?", CHUNKS)
+    second = summarizer.summarize_search_results("what caribou impacts at site c", list(reversed(CHUNKS)))
+
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert second["summary"] == first["summary"]
+    assert second["answer_cache"]["similarity"] >= 0.85
+    assert summarizer._summarizer.calls == 1  # pylint: disable=protected-access
+    assert answer_cache.stats()["hits"] >= 1
+
+
+def test_different_chunks_or_question_miss():
+    """A changed chunk set or an unrelated question regenerates the summary."""
+    summarizer = _CachingSummarizer(_StubSummarizer())
+
+    summarizer.summarize_search_results("caribou impacts site c", CHUNKS)
+    changed = CHUNKS[:1] + [{"document_id": "doc-3", "page_number": 1, "content": "Other text."}]
+    assert summarizer.summarize_search_results("caribou impacts site c", changed)["cached"] is False
+    assert summarizer.summarize_search_results("fish passage at the dam", CHUNKS)["cached"] is False
+    assert summarizer._summarizer.calls == 3  # pylint: disable=protected-access
+
+
+@pytest.mark.parametrize("cached_query, query", [
+    ("Which conditions were not met by the proponent?", "Which conditions were met by the proponent?"),
+    ("Was the project approved?", "Was the project not approved?"),
+    ("Why didn't the proponent consult the Nation?", "Why did the proponent consult the Nation?"),
+    ("What are the impacts on caribou habitat?", "What are the impacts on moose habitat?"),
+    ("Noise limits within 500 m of the site", "Noise limits within 1500 m of the site"),
+    ("Emissions reported in 2019", "Emissions reported in 2020"),
+    ("When was the Site C project approved?", "Why was the Site C project approved?"),
+    ("Who approved the Site C project?", "When was the Site C project approved?"),
+    ("Do the conditions apply to all projects?", "Do the conditions apply to any projects?"),
+])
+def test_questions_with_different_meaning_miss(cached_query, query):
+    """Negation, question words, quantifiers, entity swaps and number changes regenerate the summary."""
+    summarizer = _CachingSummarizer(_StubSummarizer())
+
+    summarizer.summarize_search_results(cached_query, CHUNKS)
+    assert summarizer.summarize_search_results(query, CHUNKS)["cached"] is False
+    assert summarizer._summarizer.calls == 2  # pylint: disable=protected-access
+
+
+def test_failed_summaries_are_not_cached():
+    """A canned fallback summary from a failed LLM call is not stored."""
+    summarizer = _CachingSummarizer(_StubSummarizer(fail=True))
+
+    first = summarizer.summarize_search_results("caribou impacts", CHUNKS)
+    second = summarizer.summarize_search_results("caribou impacts", CHUNKS)
+
+    assert first["answer_cache"]["reason"] == "llm_failed"
+    assert second["cached"] is False
+    assert summarizer._summarizer.calls == 2  # pylint: disable=protected-access
+
+
+def test_streaming_hit_yields_cached_summary(monkeypatch):
+    """A streamed summary is stored, and a later streamed paraphrase is served whole from the cache."""
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    summarizer = _CachingSummarizer(_StubSummarizer())
+
+    assert "".join(summarizer.stream_search_results("caribou impacts site c", CHUNKS)) == "Summary 1"
+    assert summarizer.last_answer_cache["hit"] is False
+    assert list(summarizer.stream_search_results("impacts on caribou, Site C", CHUNKS)) == ["Summary 1"]
+    assert summarizer.last_answer_cache["hit"] is True
+
+
+def test_size_is_bounded(monkeypatch):
+    """The least recently used answers are evicted beyond the configured size."""
+    monkeypatch.setenv("ANSWER_CACHE_MAX_ENTRIES", "2")
+    for n in range(3):
+        answer_cache.store(f"question {n}", f"key-{n}", {"summary": str(n)}, 10.0)
+
+    assert answer_cache.stats()["entries"] == 2
+    assert answer_cache.lookup("question 0", "key-0") is None
+    assert answer_cache.lookup("question 2", "key-2")["summary"] == "2"
+
+
+def test_expired_answers_are_not_served(monkeypatch):
+    """Answers older than the TTL are dropped."""
+    monkeypatch.setenv("ANSWER_CACHE_TTL_SECONDS", "0")
+    answer_cache.store("question", "key", {"summary": "old"}, 10.0)
+
+    assert answer_cache.lookup("question", "key") is None
+    assert answer_cache.stats()["entries"] == 0
+
+
+@pytest.mark.parametrize("first, second", [
+    ("When was the Site C project approved?", "Why was the Site C project approved?"),
+    ("Who approved the Site C project?", "When was the Site C project approved?"),
+    ("Do the conditions apply to all projects?", "Do the conditions apply to any projects?"),
+])
+def test_question_words_and_quantifiers_are_terms(first, second):
+    """Interrogatives and quantifiers are kept as content terms, so the term sets differ."""
+    assert answer_cache.query_terms(first) != answer_cache.query_terms(second)
@@ -0,0 +1,83 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the extraction prompt candidate shortlist.
+
+Test-Suite to ensure that only the best matching catalogue entries reach the LLM prompt.
+"""
+from search_api.services.generation.implementations import candidate_shortlist
+from search_api.services.generation.implementations.base_parameter_extractor import BaseParameterExtractor
+
+
+class _PromptCapture(BaseParameterExtractor):
+    """Extractor that records prompts instead of calling an LLM."""
+
+    def __init__(self):
+        super().__init__(client=None)
+        self.prompts = []
+
+    def _make_llm_call(self, messages, temperature=0.1):
+        self.prompts.append(messages[0]['content'])
+        return {'choices': [{'message': {'content': '{"project_matches": []}'}}]}
+
+
+def _projects(count):
+    projects = [{'project_id': f'id{i}', 'project_name': f'Generic Facility {i}',
+                 'project_metadata': {'region': 'Omineca', 'proponent': {'name': 'Acme'}}}
+                for i in range(count)]
+    projects.append({'project_id': 'tilbury', 'project_name': 'Tilbury Marine Jetty',
+                     'project_metadata': {'region': 'Lower Mainland', 'proponent': {'name': 'FortisBC'}}})
+    return projects
+
+
+def test_named_project_is_shortlisted(monkeypatch):
+    """A query naming a project sends only the best candidates and records the token saving."""
+    monkeypatch.setenv('SHORTLIST_PROJECTS_TOP_K', '5')
+    extractor = _PromptCapture()
+    extractor._extract_project_ids_single_attempt('Tilbery jetty certificate', _projects(40), 0)
+
+    prompt = extractor.prompts[0]
+    assert 'Tilbury Marine Jetty' in prompt
+    assert prompt.count('Generic Facility') <= 4
+    info = extractor._prompt_shortlist['projects']
+    assert info['shortlisted'] is True
+    assert info['prompt_tokens'] < info['prompt_tokens_full']
+
+
+def test_low_confidence_uses_full_list(monkeypatch):
+    """A query that names nothing in the catalogue keeps every candidate."""
+    monkeypatch.setenv('SHORTLIST_PROJECTS_TOP_K', '5')
+    extractor = _PromptCapture()
+    extractor._extract_project_ids_single_attempt('caribou habitat impacts', _projects(40), 0)
+
+    assert extractor.prompts[0].count('Generic Facility') == 40
+    info = extractor._prompt_shortlist['projects']
+    assert info['reason'] == 'low_confidence'
+    assert info['prompt_tokens'] == info['prompt_tokens_full']
+
+
+def test_document_type_aliases_are_matched(monkeypatch):
+    """Document types are matched on their aliases with stemming."""
+    monkeypatch.setenv('SHORTLIST_DOCUMENT_TYPES_TOP_K', '2')
+    candidates = [candidate_shortlist.Candidate(i, [name] + aliases) for i, (name, aliases) in enumerate([
+        ('Letter', ['correspondence', 'email']),
+        ('Meeting Notes', ['minutes']),
+        ('Report/Study', ['technical report']),
+        ('Order', ['decision']),
+    ])]
+
+    keys, info = candidate_shortlist.shortlist('emails about the mine', candidates, 'document_types')
+
+    assert keys == [0]
+    assert info['shortlisted'] is True
@@ -0,0 +1,211 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Tests to assure the agent chunk validation.
+
+Test-Suite to ensure that chunks are validated by cross-encoder score, in shared batches.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask import Flask
+
+from search_api.services.search_handlers.agent import chunk_validation
+from search_api.services.search_handlers.agent.agent_stub import VectorSearchAgent
+
+CHUNKS = [{"content": "caribou habitat"}, {"content": "borderline text"}, {"content": "parking lot"}]
+SCORES = {"caribou habitat": 4.0, "borderline text": -2.6, "parking lot": -9.0}
+
+
+def _scorer(calls):
+    def score(pairs):
+        calls.append(len(pairs))
+        return [SCORES[pair["content"]] for pair in pairs]
+    return score
+
+
+def _llm_filter(calls, keep=()):
+    def llm_filter(query, chunks, step_name):
+        calls.append([c["content"] for c in chunks])
+        return [c for c in chunks if c["content"] in keep], {"step": step_name}
+    return llm_filter
+
+
+@pytest.fixture(autouse=True)
+def _settings(monkeypatch):
+    monkeypatch.setenv("AGENT_CHUNK_VALIDATION_BATCH_WINDOW_MS", "0")
+    for name in ("AGENT_CHUNK_VALIDATION", "AGENT_CHUNK_VALIDATION_THRESHOLD", "AGENT_CHUNK_VALIDATION_LLM_FALLBACK"):
+        monkeypatch.delenv(name, raising=False)
+
+
+def test_chunks_below_threshold_are_removed_without_llm():
+    """Chunks are kept by score and no LLM call is made."""
+    llm_calls = []
+    batcher = chunk_validation.ScoreBatcher(_scorer([]))
+
+    kept, summary = chunk_validation.validate("caribou", CHUNKS, "search_caribou", _llm_filter(llm_calls), batcher)
+
+    assert kept == CHUNKS[:2]
+    assert summary["method"] == "cross_encoder"
+    assert summary["valid_chunk_ids"] == ["caribou_chunk_1", "caribou_chunk_2"]
+    assert summary["low_margin_chunks"] == 1
+    assert summary["llm_calls_avoided"] == 1
+    assert llm_calls == []
+
+
+def test_llm_fallback_decides_only_low_margin_chunks(monkeypatch):
+    """With the fallback on, only the borderline chunk goes to the LLM."""
+    monkeypatch.setenv("AGENT_CHUNK_VALIDATION_LLM_FALLBACK", "true")
+    llm_calls = []
+    batcher = chunk_validation.ScoreBatcher(_scorer([]))
+
+    kept, summary = chunk_validation.validate("caribou", CHUNKS, "search_caribou", _llm_filter(llm_calls), batcher)
+
+    assert llm_calls == [["borderline text"]]
+    assert kept == CHUNKS[:1]
+    assert summary["llm_calls"] == 1
+
+
+def test_scoring_failure_falls_back_to_llm():
+    """Without scores the whole step is validated by the LLM."""
+    llm_calls = []
+    batcher = chunk_validation.ScoreBatcher(lambda pairs: None)
+
+    kept, summary = chunk_validation.validate(
+        "caribou", CHUNKS, "search_caribou", _llm_filter(llm_calls, keep={"parking lot"}), batcher
+    )
+
+    assert kept == CHUNKS[2:]
+    assert summary["method"] == "llm"
+    assert summary["reason"] == "scoring_unavailable"
+    assert len(llm_calls) == 1
+
+
+def test_concurrent_steps_share_one_scoring_request(monkeypatch):
+    """Steps arriving within the batch window are scored in a single call."""
+    monkeypatch.setenv("AGENT_CHUNK_VALIDATION_BATCH_WINDOW_MS", "200")
+    scorer_calls = []
+    batcher = chunk_validation.ScoreBatcher(_scorer(scorer_calls))
+    results = {}
+
+    def run(step):
+        results[step] = chunk_validation.validate("caribou", CHUNKS, step, _llm_filter([]), batcher)
+
+    threads = [threading.Thread(target=run, args=(f"search_{n}",)) for n in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert scorer_calls == [9]
+    assert all(summary["batch_pairs"] == 9 for _, summary in results.values())
+    assert all(kept == CHUNKS[:2] for kept, _ in results.values())
+
+
+def test_validate_all_scores_searches_in_one_request(monkeypatch):
+    """Searches validated together share one scoring request and keep their order."""
+    monkeypatch.setenv("AGENT_CHUNK_VALIDATION_BATCH_WINDOW_MS", "200")
+    scorer_calls = []
+    batcher = chunk_validation.ScoreBatcher(_scorer(scorer_calls))
+    steps = [("search_1", CHUNKS), ("search_2", CHUNKS[2:]), ("search_3", CHUNKS[:1])]
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        outcomes = chunk_validation.validate_all("caribou", steps, _llm_filter([]), executor, batcher)
+
+    assert scorer_calls == [5]
+    assert [kept for kept, _ in outcomes] == [CHUNKS[:2], [], CHUNKS[:1]]
+    assert [summary["step"] for _, summary in outcomes] == ["search_1", "search_2", "search_3"]
+
+
+def test_search_validation_is_off_by_default(monkeypatch):
+    """The default agent pipeline only validates its searches when enabled."""
+    monkeypatch.delenv("AGENT_VALIDATE_SEARCH_CHUNKS", raising=False)
+    assert not chunk_validation.searches_enabled()
+
+    monkeypatch.setenv("AGENT_VALIDATE_SEARCH_CHUNKS", "true")
+    assert chunk_validation.searches_enabled()
+
+
+def test_agent_drops_irrelevant_search_chunks(monkeypatch):
+    """The agent replaces each search's chunks with the kept ones and records the step."""
+    monkeypatch.setattr(chunk_validation, "_batcher", chunk_validation.ScoreBatcher(_scorer([])))
+    documents = [{"id": "doc-1"}]
+    search_results = [{"step_name": "search_1", "result": {"success": True, "result": (documents, list(CHUNKS))}}]
+
+    with Flask(__name__).app_context():
+        agent = VectorSearchAgent(llm_client=None)
+        agent.validate_search_chunks("caribou", search_results)
+
+    assert search_results[0]["result"]["result"] == (documents, CHUNKS[:2])
+    assert search_results[0]["chunk_validation"]["method"] == "cross_encoder"
+    assert agent.chunk_validation_stats["steps"] == 1
+    assert agent.chunk_validation_stats["llm_calls_avoided"] == 1
+
+
+def test_batches_are_split_at_the_request_limit(monkeypatch):
+    """A batch larger than one scoring request allows is scored in several requests."""
+    monkeypatch.setenv("AGENT_CHUNK_VALIDATION_BATCH_WINDOW_MS", "200")
+    monkeypatch.setenv("AGENT_CHUNK_VALIDATION_MAX_PAIRS", "4")
+    scorer_calls = []
+    batcher = chunk_validation.ScoreBatcher(_scorer(scorer_calls))
+    steps = [(f"search_{n}", CHUNKS) for n in range(3)]
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        outcomes = chunk_validation.validate_all("caribou", steps, _llm_filter([]), executor, batcher)
+
+    assert scorer_calls == [4, 4, 1]
+    assert all(kept == CHUNKS[:2] for kept, _ in outcomes)
+    assert all(summary["method"] == "cross_encoder" for _, summary in outcomes)
+
+
+def test_failed_request_only_affects_its_pairs(monkeypatch):
+    """Steps whose pairs were in a failed request fall back to the LLM; the others keep their scores."""
+    monkeypatch.setenv("AGENT_CHUNK_VALIDATION_BATCH_WINDOW_MS", "200")
+    monkeypatch.setenv("AGENT_CHUNK_VALIDATION_MAX_PAIRS", "3")
+
+    def scorer(pairs):
+        if pairs[0]["query"] == "moose":
+            return None
+        return [SCORES[pair["content"]] for pair in pairs]
+
+    batcher = chunk_validation.ScoreBatcher(scorer)
+    llm_calls = []
+
+    def run(query):
+        return chunk_validation.validate(query, CHUNKS, f"search_{query}", _llm_filter(llm_calls), batcher)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        caribou = executor.submit(run, "caribou")
+        moose = executor.submit(lambda: (time.sleep(0.05), run("moose"))[1])
+        (_, caribou_summary), (_, moose_summary) = caribou.result(), moose.result()
+
+    assert caribou_summary["method"] == "cross_encoder"
+    assert caribou_summary["batch_pairs"] == 6
+    assert moose_summary["method"] == "llm"
+    assert len(llm_calls) == 1
+
+
+def test_step_without_chunks_sends_no_request():
+    """An empty step is validated without calling the vector API."""
+    scorer_calls = []
+    batcher = chunk_validation.ScoreBatcher(_scorer(scorer_calls))
+
+    kept, summary = chunk_validation.validate("caribou", [], "search_empty", _llm_filter([]), batcher)
+
+    assert kept == []
+    assert summary["method"] == "cross_encoder"
+    assert scorer_calls == []
@@ -0,0 +1,96 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Tests to assure the auto mode complexity classifier.
+
+Test-Suite to ensure that auto mode is decided locally and escalates to the LLM only when unsure.
+"""
+import json
+
+import pytest
+
+from search_api.services.generation.factories import query_complexity_factory
+from search_api.services.generation.implementations import complexity_classifier
+
+
+class _LLMAnalyzer:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def analyze_complexity(self, query, project_ids=None, document_type_ids=None):
+        self.calls.append(query)
+        return {"complexity_tier": "complex", "reason": "LLM", "confidence": 0.9}
+
+
+@pytest.fixture(autouse=True)
+def _settings(monkeypatch, tmp_path):
+    for name in ("AUTO_MODE_CLASSIFIER", "AUTO_MODE_CONFIDENCE_THRESHOLD", "AUTO_MODE_EXAMPLES_PATH"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("AUTO_MODE_DECISION_LOG", str(tmp_path / "decisions.jsonl"))
+    complexity_classifier.reset()
+    yield
+    complexity_classifier.reset()
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(query_complexity_factory.QueryComplexityFactory, "create_llm_analyzer",
+                        staticmethod(lambda: _LLMAnalyzer(calls)))
+    return calls
+
+
+def test_clear_queries_are_decided_locally(llm_calls):
+    """Temporal comparisons and UI-scoped content searches need no LLM call."""
+    analyzer = query_complexity_factory.QueryComplexityFactory.create_analyzer()
+
+    agent = analyzer.analyze_complexity("compare caribou impacts before 2015 and after")
+    simple = analyzer.analyze_complexity("letters that mention the Nooaitch Indian Band", project_ids=["p1"])
+
+    assert (agent["complexity_tier"], agent["source"]) == ("agent_required", "local")
+    assert (simple["complexity_tier"], simple["source"]) == ("simple", "local")
+    assert agent["latency_ms"] < 100
+    assert llm_calls == []
+
+
+def test_unsure_queries_escalate_and_are_learned(llm_calls):
+    """A low-confidence query goes to the LLM once; its answer is reused for the same query."""
+    analyzer = query_complexity_factory.QueryComplexityFactory.create_analyzer()
+
+    first = analyzer.analyze_complexity("environmental assessment certificate amendments")
+    second = analyzer.analyze_complexity("environmental assessment certificate amendments")
+
+    assert first["source"] == "llm"
+    assert first["local"]["confidence"] < complexity_classifier.confidence_threshold()
+    assert (second["complexity_tier"], second["source"]) == ("complex", "local")
+    assert llm_calls == ["environmental assessment certificate amendments"]
+
+
+def test_decision_log_trains_examples(llm_calls, tmp_path):
+    """LLM decisions and corrected labels in the log become labelled examples."""
+    analyzer = query_complexity_factory.QueryComplexityFactory.create_analyzer()
+    analyzer.analyze_complexity("environmental assessment certificate amendments")
+    analyzer.analyze_complexity("compare caribou impacts before 2015 and after")
+    log = tmp_path / "decisions.jsonl"
+    with open(log, "a", encoding="utf-8") as handle:
+        handle.write(json.dumps({"query": "fish", "label": "simple", "source": "local"}) + "\n")
+
+    examples = tmp_path / "examples.jsonl"
+    written = complexity_classifier.train_from_log(str(log), str(examples))
+
+    lines = [json.loads(line) for line in examples.read_text().splitlines()]
+    assert written == 2
+    assert {"query": "fish", "complexity_tier": "simple"} in lines
+    assert {"query": "environmental assessment certificate amendments", "complexity_tier": "complex"} in lines
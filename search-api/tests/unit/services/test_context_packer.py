@@ -0,0 +1,58 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the summarization context packer.
+
+Test-Suite to ensure that prompt context is deduplicated, ordered by relevance and kept within budget.
+"""
+from search_api.services.generation.implementations import context_packer
+
+
+def _header(i, doc):
+    return f"Document {i}: {doc['title']}"
+
+
+def _words(prefix, count):
+    return " ".join(f"{prefix}{n}" for n in range(count))
+
+
+def test_orders_by_relevance_and_drops_duplicates():
+    """The best scored chunk comes first and overlapping chunks are packed once."""
+    shared = _words("caribou", 60)
+    documents = [
+        {"title": "low", "content": _words("fish", 40), "relevance_score": -2.0},
+        {"title": "high", "content": shared, "relevance_score": 5.0},
+        {"title": "overlap", "content": shared + " extra words", "relevance_score": 1.0},
+    ]
+
+    content, stats = context_packer.pack(documents, 10000, _header)
+
+    assert content.startswith("Document 1: high")
+    assert "overlap" not in content
+    assert stats["duplicates_dropped"] == 1
+    assert stats["packed_chunks"] == 2
+
+
+def test_respects_token_budget(monkeypatch):
+    """Chunks beyond the budget are truncated or dropped and counted."""
+    monkeypatch.setenv("SUMMARY_CONTEXT_MAX_CHUNK_TOKENS", "10000")
+    documents = [{"title": f"doc{i}", "content": _words(f"w{i}x", 200), "relevance_score": float(-i)}
+                 for i in range(5)]
+
+    content, stats = context_packer.pack(documents, 1200, _header)
+
+    assert stats["packed_tokens"] <= 1200
+    assert context_packer.estimate_tokens(content) <= 1200 + stats["packed_chunks"]
+    assert stats["truncated"] + stats["budget_dropped"] >= 1
+    assert stats["packed_chunks"] + stats["budget_dropped"] == 5
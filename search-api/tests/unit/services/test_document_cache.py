@@ -0,0 +1,77 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the S3 document disk cache.
+
+Test-Suite to ensure that documents are cached by key and ETag and evicted by size.
+"""
+import os
+
+from search_api.services.document_cache import DocumentCache
+
+
+def _s3_object(etag, size):
+    return {'ETag': etag, 'ContentLength': size, 'ContentType': 'application/pdf'}
+
+
+def _fill(cache, key, etag, data):
+    for _ in cache.tee(key, _s3_object(etag, len(data)), iter([data[:10], data[10:]])):
+        pass
+
+
+def test_tee_commits_complete_objects(tmp_path):
+    """Assert that a fully streamed object is cached under its ETag."""
+    cache = DocumentCache(str(tmp_path), max_bytes=10_000, max_object_bytes=10_000, revalidate_seconds=300)
+    _fill(cache, 'a/doc.pdf', '"e1"', b'%PDF' + b'x' * 100)
+
+    entry = cache.lookup('a/doc.pdf')
+    assert entry is not None
+    assert entry.etag == '"e1"'
+    with open(entry.path, 'rb') as f:
+        assert f.read().startswith(b'%PDF')
+    assert not cache.needs_revalidation(entry)
+
+
+def test_abandoned_stream_not_cached(tmp_path):
+    """Assert that a client disconnect leaves no entry or partial file."""
+    cache = DocumentCache(str(tmp_path), max_bytes=10_000, max_object_bytes=10_000, revalidate_seconds=300)
+    stream = cache.tee('a/doc.pdf', _s3_object('"e1"', 100), iter([b'x' * 10, b'x' * 90]))
+    next(stream)
+    stream.close()
+
+    assert cache.lookup('a/doc.pdf') is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_new_etag_replaces_old_file(tmp_path):
+    """Assert that a changed object replaces the previous version."""
+    cache = DocumentCache(str(tmp_path), max_bytes=10_000, max_object_bytes=10_000, revalidate_seconds=300)
+    _fill(cache, 'a/doc.pdf', '"e1"', b'x' * 100)
+    _fill(cache, 'a/doc.pdf', '"e2"', b'y' * 100)
+
+    assert cache.lookup('a/doc.pdf').etag == '"e2"'
+    assert cache.stats()['entries'] == 1
+
+
+def test_lru_eviction(tmp_path):
+    """Assert that the least recently used document is evicted over the size bound."""
+    cache = DocumentCache(str(tmp_path), max_bytes=250, max_object_bytes=10_000, revalidate_seconds=300)
+    _fill(cache, 'a', '"a"', b'a' * 100)
+    _fill(cache, 'b', '"b"', b'b' * 100)
+    os.utime(cache.lookup('b').path, (1, 1))
+    _fill(cache, 'c', '"c"', b'c' * 100)
+
+    assert cache.lookup('b') is None
+    assert cache.lookup('a') is not None
+    assert cache.stats()['evictions'] == 1
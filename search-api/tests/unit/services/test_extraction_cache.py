@@ -0,0 +1,86 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the parameter extraction cache.
+
+Test-Suite to ensure that repeated extractions are served without LLM calls.
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from search_api.services.generation.implementations import extraction_cache
+from search_api.services.generation.implementations.base_parameter_extractor import BaseParameterExtractor
+from search_api.utils import cache as cache_module
+from search_api.utils.cache import MemoryCacheBackend
+
+
+PROJECTS = [{'project_id': 'p1', 'project_name': 'Alpha Mine'}]
+RESULT = {'project_ids': ['p1'], 'document_type_ids': [], 'search_strategy': 'HYBRID_PARALLEL',
+          'semantic_query': 'alpha mine', 'extraction_sources': {}}
+
+
+@pytest.fixture(autouse=True)
+def memory_backend():
+    """Give every test a fresh in-memory backend."""
+    cache_module.set_backend(MemoryCacheBackend())
+    yield
+    cache_module.set_backend(None)
+
+
+def _extractor():
+    client = MagicMock()
+    client.get_provider_name.return_value = 'ollama'
+    client.get_model_name.return_value = 'qwen'
+    return BaseParameterExtractor(client)
+
+
+def test_repeated_query_served_from_cache():
+    """Assert that an equivalent query with the same catalogue skips extraction."""
+    extractor = _extractor()
+    with patch.object(BaseParameterExtractor, '_extract_parameters_parallel', return_value=dict(RESULT)) as run:
+        first = extractor.extract_parameters('Alpha Mine?', available_projects=PROJECTS)
+        second = extractor.extract_parameters('  alpha   mine ', available_projects=PROJECTS)
+
+    assert run.call_count == 1
+    assert first['extraction_cache']['hit'] is False
+    assert second['extraction_cache']['hit'] is True
+    assert second['project_ids'] == ['p1']
+    assert extraction_cache.stats()['hits'] >= 1
+
+
+def test_catalogue_change_misses():
+    """Assert that a new project in the catalogue invalidates cached extractions."""
+    extractor = _extractor()
+    with patch.object(BaseParameterExtractor, '_extract_parameters_parallel', return_value=dict(RESULT)) as run:
+        extractor.extract_parameters('alpha mine', available_projects=PROJECTS)
+        extractor.extract_parameters('alpha mine', available_projects=PROJECTS + [{'project_id': 'p2', 'project_name': 'Beta'}])
+
+    assert run.call_count == 2
+
+
+def test_fallback_results_not_cached():
+    """Assert that results produced after an LLM failure are not stored."""
+    extractor = _extractor()
+
+    def degraded(*args, **kwargs):
+        extractor._used_fallback = True  # pylint: disable=protected-access
+        return dict(RESULT)
+
+    with patch.object(BaseParameterExtractor, '_extract_parameters_parallel', side_effect=degraded) as run:
+        first = extractor.extract_parameters('alpha mine', available_projects=PROJECTS)
+        extractor.extract_parameters('alpha mine', available_projects=PROJECTS)
+
+    assert run.call_count == 2
+    assert first['extraction_cache']['reason'] == 'fallback_used'
@@ -0,0 +1,121 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the Ollama client.
+
+Test-Suite to ensure that Ollama calls share a bounded pool and send the model options.
+"""
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from search_api.services.generation.implementations.ollama import ollama_client
+from search_api.services.generation.implementations.ollama.ollama_client import OllamaClient
+
+
+class _StubOllama(BaseHTTPRequestHandler):
+    """Minimal /api/chat and /api/generate server recording payloads and concurrency."""
+
+    server_version = "StubOllama"
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        state = self.server.state
+        with state["lock"]:
+            state["payloads"].append((self.path, payload))
+            state["active"] += 1
+            state["max_active"] = max(state["max_active"], state["active"])
+        try:
+            time.sleep(state["delay"])
+            self.send_response(200)
+            if payload.get("stream"):
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.end_headers()
+                for piece in ("Hello", " world"):
+                    self.wfile.write(json.dumps({"message": {"content": piece}, "done": False}).encode() + b"\n")
+                self.wfile.write(json.dumps({"message": {"content": ""}, "done": True, "eval_count": 2}).encode() + b"\n")
+            else:
+                body = json.dumps({"message": {"role": "assistant", "content": "ok"}, "done": True}).encode()
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+        finally:
+            with state["lock"]:
+                state["active"] -= 1
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    """Run a stub Ollama server and give the client a fresh shared connection."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOllama)
+    server.state = {"lock": threading.Lock(), "payloads": [], "active": 0, "max_active": 0, "delay": 0.0}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("LLM_HOST", f"http://127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setenv("OLLAMA_KEEP_ALIVE", "1h")
+    monkeypatch.setenv("OLLAMA_NUM_CTX", "4096")
+    monkeypatch.setattr(ollama_client, "_connection", ollama_client._OllamaConnection())
+    yield server.state
+    server.shutdown()
+    server.server_close()
+
+
+def test_chat_sends_keep_alive_and_num_ctx(stub_server):
+    """Requests carry the configured keep_alive and context size."""
+    result = OllamaClient().chat_completion([{"role": "user", "content": "hi"}], temperature=0.1)
+
+    assert result["choices"][0]["message"]["content"] == "ok"
+    path, payload = stub_server["payloads"][0]
+    assert path == "/api/chat"
+    assert payload["keep_alive"] == "1h"
+    assert payload["options"]["num_ctx"] == 4096
+
+
+def test_stream_yields_message_pieces(stub_server):
+    """Ollama's line-delimited stream is turned into text pieces."""
+    pieces = list(OllamaClient().chat_completion_stream([{"role": "user", "content": "hi"}]))
+
+    assert pieces == ["Hello", " world"]
+    assert stub_server["payloads"][0][1]["stream"] is True
+
+
+def test_concurrency_is_bounded(stub_server, monkeypatch):
+    """Calls beyond OLLAMA_MAX_CONCURRENCY wait for a slot and are counted as queued."""
+    monkeypatch.setenv("OLLAMA_MAX_CONCURRENCY", "1")
+    stub_server["delay"] = 0.1
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        list(executor.map(lambda _: OllamaClient().chat_completion([{"role": "user", "content": "hi"}]), range(3)))
+
+    stats = ollama_client.get_ollama_stats()
+    assert stub_server["max_active"] == 1
+    assert stats["calls"] == 3
+    assert stats["queued_calls"] == 2
+    assert stats["max_wait_ms"] > 0
+
+
+def test_warm_up_loads_model(stub_server):
+    """Warm-up asks Ollama to load the model without a prompt."""
+    assert OllamaClient().warm_up() is True
+
+    path, payload = stub_server["payloads"][0]
+    assert path == "/api/generate"
+    assert payload == {"model": OllamaClient().model_name, "keep_alive": "1h"}
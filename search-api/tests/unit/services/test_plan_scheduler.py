@@ -0,0 +1,113 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Tests to assure the agent plan scheduler.
+
+Test-Suite to ensure that plan steps run as soon as the steps they reference are done.
+"""
+import threading
+import time
+
+from search_api.services.search_handlers.agent import plan_scheduler
+
+PLAN = [
+    {"step_name": "get_projects", "tool": "get_projects_list", "parameters": {}},
+    {"step_name": "search_a", "tool": "search", "parameters": {"query": "a", "project_ids": ["obtained from get_projects"]}},
+    {"step_name": "search_b", "tool": "search", "parameters": {"query": "b"}},
+    {"step_name": "filter_a", "tool": "validate_chunks_relevance",
+     "parameters": {"search_results": "results_from_search_a", "step_name": "search_a"}},
+    {"step_name": "filter_b", "tool": "validate_chunks_relevance",
+     "parameters": {"search_results": "results_from_search_b", "step_name": "search_b"}},
+    {"step_name": "verify_reduce", "tool": "verify_reduce", "parameters": {"filter_steps": ["filter_a", "filter_b"]}},
+    {"step_name": "consolidate_results", "tool": "consolidate_results", "parameters": {}},
+    {"step_name": "summarize_results", "tool": "summarize_results", "parameters": {}},
+]
+
+
+def _failed(index, error):
+    return {"index": index, "error": error}
+
+
+def test_dependencies_follow_parameter_references():
+    """References, placeholders and context readers become graph edges."""
+    dependencies = plan_scheduler.step_dependencies(PLAN)
+
+    assert dependencies[0] == []
+    assert dependencies[1] == [0]
+    assert dependencies[2] == [0]  # searches wait for catalogue steps
+    assert dependencies[3] == [1]
+    assert dependencies[4] == [2]
+    assert dependencies[5] == [3, 4]
+    assert dependencies[6] == [1, 2, 3, 4, 5]
+    assert dependencies[7] == [6]
+
+
+def test_step_starts_when_its_inputs_are_ready():
+    """A filter step does not wait for an unrelated slow search."""
+    dependencies = [[], [], [0], [1]]  # fast search, slow search, filters of each
+    delays = [0.01, 0.3, 0.01, 0.01]
+    finished = {}
+
+    def execute(index):
+        time.sleep(delays[index])
+        return index
+
+    def on_complete(index, result):
+        finished[index] = time.perf_counter()
+
+    outcome = plan_scheduler.run(dependencies, execute, _failed, on_complete,
+                                 names=["fast", "slow", "filter_fast", "filter_slow"], timeout=5)
+
+    assert outcome["results"] == [0, 1, 2, 3]
+    assert finished[2] < finished[1]
+    timing = outcome["timing"]
+    assert [step["step"] for step in timing["critical_path"]] == ["slow", "filter_slow"]
+    assert timing["critical_path_ms"] >= 300
+    assert timing["parallelism"] > 1
+
+
+def test_missed_deadline_fails_the_step_and_continues():
+    """A step past its deadline gets the failure result and its dependents still run."""
+    release = threading.Event()
+
+    def execute(index):
+        if index == 0:
+            release.wait(2)
+        return "ok"
+
+    outcome = plan_scheduler.run([[], [0]], execute, _failed, names=["stuck", "after"], timeout=0.1)
+    release.set()
+
+    assert outcome["results"][0] == {"index": 0, "error": "Step timed out after 0.1s"}
+    assert outcome["results"][1] == "ok"
+    assert outcome["timing"]["timed_out"] == ["stuck"]
+
+
+def test_sequential_mode_runs_in_plan_order():
+    """With parallel execution off every step runs on the calling thread in order."""
+    order = []
+
+    def execute(index):
+        order.append((index, threading.current_thread().name))
+        if index == 1:
+            raise RuntimeError("boom")
+        return index
+
+    outcome = plan_scheduler.run([[], [], [0, 1]], execute, _failed, parallel=False)
+
+    assert [index for index, _ in order] == [0, 1, 2]
+    assert {name for _, name in order} == {threading.current_thread().name}
+    assert outcome["results"][1] == {"index": 1, "error": "boom"}
+    assert outcome["timing"]["mode"] == "sequential"
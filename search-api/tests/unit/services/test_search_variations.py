@@ -0,0 +1,34 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Tests to assure the agent search variation dispatch.
+
+Test-Suite to ensure that search variations are forwarded to the vector API as configured.
+"""
+from search_api.services.search_handlers.agent import search_variations
+
+
+def test_variations_are_sent_as_one_request_by_default(monkeypatch):
+    """Without configuration the variations go to the vector API as query variants."""
+    monkeypatch.delenv("AGENT_VARIATION_DISPATCH", raising=False)
+
+    assert search_variations.dispatch_mode() == "multi_query"
+
+
+def test_separate_dispatch(monkeypatch):
+    """Separate dispatch can be configured in any case."""
+    monkeypatch.setenv("AGENT_VARIATION_DISPATCH", "Separate")
+
+    assert search_variations.dispatch_mode() == "separate"
@@ -0,0 +1,32 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the streamed summaries.
+
+Test-Suite to ensure that summaries can be deferred and streamed token by token.
+"""
+from search_api.services.generation.factories import SummarizerFactory
+
+
+def test_deferred_summaries_are_recorded():
+    """Summaries requested inside the deferred scope are recorded, not generated."""
+    documents = [{'title': 'Doc', 'content': 'text'}]
+    with SummarizerFactory.deferred() as pending:
+        result = SummarizerFactory.create_summarizer().summarize_search_results('query', documents)
+
+    assert result['summary'] == ''
+    assert result['method'] == 'streamed'
+    assert len(pending) == 1
+    assert pending[0].query == 'query'
+    assert pending[0].documents_or_chunks is documents
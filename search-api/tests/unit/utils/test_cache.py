@@ -0,0 +1,153 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the cache utilities.
+
+Test-Suite to ensure that cache_with_ttl keys, bounds and backends behave as expected.
+"""
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from search_api.utils import cache as cache_module
+from search_api.utils.cache import DiskCacheBackend, MemoryCacheBackend, cache_with_ttl, get_cache_stats
+
+
+@pytest.fixture(autouse=True)
+def memory_backend():
+    """Give every test a fresh in-memory backend."""
+    backend = MemoryCacheBackend(max_entries=3, max_bytes=1024 * 1024)
+    cache_module.set_backend(backend)
+    yield backend
+    cache_module.set_backend(None)
+
+
+class Lookup:
+    """Stand-in for a service whose method is cached."""
+
+    calls = 0
+
+    @cache_with_ttl(ttl_seconds=60)
+    def fetch(self, name):
+        """Return a value and count the calls."""
+        Lookup.calls += 1
+        return {'name': name}
+
+
+def test_key_ignores_self():
+    """Assert that different instances share cached method results."""
+    Lookup.calls = 0
+    assert Lookup().fetch('a') == Lookup().fetch('a')
+    assert Lookup.calls == 1
+    assert get_cache_stats()['hits'] >= 1
+
+
+def test_lru_eviction(memory_backend):
+    """Assert that the least recently used entry is evicted at the entry bound."""
+    for key in ('a', 'b', 'c'):
+        memory_backend.set(key, key, 60)
+    memory_backend.get('a')
+    memory_backend.set('d', 'd', 60)
+
+    assert memory_backend.get('b') == (False, None)
+    assert memory_backend.get('a') == (True, 'a')
+    assert memory_backend.stats()['evictions'] == 1
+
+
+def test_ttl_expiry(memory_backend):
+    """Assert that expired entries are not served."""
+    memory_backend.set('a', 'a', 0.01)
+    time.sleep(0.02)
+    assert memory_backend.get('a') == (False, None)
+
+
+def test_single_flight():
+    """Assert that concurrent misses for the same key run the function once."""
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    @cache_with_ttl(ttl_seconds=60)
+    def slow(value):
+        calls.append(value)
+        started.set()
+        release.wait(5)
+        return value
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(slow(1))) for _ in range(4)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == [1, 1, 1, 1]
+
+
+def test_disk_backend_shared(tmp_path):
+    """Assert that disk backends on the same directory share entries."""
+    writer = DiskCacheBackend(str(tmp_path))
+    reader = DiskCacheBackend(str(tmp_path))
+    writer.set('k', {'projects': [1, 2]}, 60)
+
+    assert reader.get('k') == (True, {'projects': [1, 2]})
+    assert reader.stats()['total_entries'] == 1
+
+
+def test_locked_disk_cache_does_not_fail_calls(tmp_path):
+    """Assert that a locked database degrades to misses and skipped stores instead of errors."""
+    backend = DiskCacheBackend(str(tmp_path), timeout=0.05)
+    backend.set('cached', 'value', 60)
+    backend._connect().execute("UPDATE cache_entries SET accessed_at = 0")  # pylint: disable=protected-access
+    cache_module.set_backend(backend)
+
+    @cache_with_ttl(ttl_seconds=60)
+    def compute(value):
+        return value * 2
+
+    # Another worker holds the write lock
+    other = sqlite3.connect(backend.path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        errors = get_cache_stats()['errors']
+        # Hits skip the access time update rather than waiting for the lock
+        assert backend.get('cached') == (True, 'value')
+        # The store fails, the call does not
+        assert compute(21) == 42
+        assert cache_module._counters['errors'] == errors + 1  # pylint: disable=protected-access
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+
+
+def test_failed_lookup_is_a_miss():
+    """Assert that a backend error on lookup falls through to the function."""
+    class BrokenBackend(MemoryCacheBackend):
+        def get(self, key):
+            raise sqlite3.OperationalError('database is locked')
+
+    cache_module.set_backend(BrokenBackend())
+
+    @cache_with_ttl(ttl_seconds=60)
+    def compute(value):
+        return value + 1
+
+    assert compute(1) == 2
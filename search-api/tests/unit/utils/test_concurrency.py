@@ -0,0 +1,62 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the asyncio concurrency limits.
+
+Test-Suite to ensure that downstream limits cap in-flight calls and that offloaded steps run on threads.
+"""
+import asyncio
+import threading
+
+from search_api.utils import concurrency
+
+
+def test_limit_caps_in_flight_calls(monkeypatch):
+    """Calls beyond a downstream's limit queue until a slot is free."""
+    monkeypatch.setenv("ASYNC_LLM_CONCURRENCY", "2")
+    in_flight = []
+    peak = []
+
+    async def call():
+        async with concurrency.limit("llm"):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+
+    async def burst():
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    before = concurrency.stats()["llm"]
+    asyncio.run(burst())
+    after = concurrency.stats()["llm"]
+
+    assert max(peak) == 2
+    assert after["calls"] - before["calls"] == 6
+    assert after["queued_calls"] - before["queued_calls"] == 4
+    assert after["in_flight"] == 0
+    assert after["limit"] == 2
+
+
+def test_offload_runs_on_a_worker_thread():
+    """Synchronous steps run off the event loop thread and return their result."""
+    loop_thread = threading.get_ident()
+
+    async def run():
+        return await concurrency.offload(lambda value: (threading.get_ident(), value * 2), 21)
+
+    thread_id, result = asyncio.run(run())
+
+    assert result == 42
+    assert thread_id != loop_thread
@@ -0,0 +1,78 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the orjson encoding and vector API result pass-through.
+
+Test-Suite to ensure that search payload types are encoded and that forwarded result lists stay encoded.
+"""
+import copy
+import decimal
+import json
+
+import numpy as np
+
+from search_api.utils import json_codec
+
+CHUNKS = [
+    {"document_id": "doc-1", "content": "Caribou \"habitat\" ranges", "relevance_score": 3.5},
+    {"document_id": "doc-2", "content": "Noise study", "relevance_score": 1.25},
+]
+
+
+def _vector_response():
+    """Encode a /vector-search body with its result span headers, as the vector API does."""
+    prefix = b'{"vector_search":{"document_chunks":'
+    results = json.dumps(CHUNKS).encode("utf-8")
+    body = prefix + results + b',"search_quality":"normal"}}'
+    headers = {
+        json_codec.RESULT_SPAN_HEADER: f"{len(prefix)}-{len(prefix) + len(results)}",
+        json_codec.RESULT_COUNT_HEADER: str(len(CHUNKS)),
+    }
+    return body, headers
+
+
+def test_numpy_and_decimal_values_are_encoded():
+    """Cross-encoder scores and Decimal values are encoded as numbers."""
+    encoded = json_codec.dumps({"score": np.float32(2.5), "page": np.int64(4), "similarity": decimal.Decimal("0.75")})
+
+    assert json.loads(encoded) == {"score": 2.5, "page": 4, "similarity": 0.75}
+
+
+def test_passthrough_keeps_results_encoded():
+    """Only the envelope is decoded and the results are forwarded as they are."""
+    body, headers = _vector_response()
+
+    data = json_codec.load_search_response(body, headers, passthrough=True)
+    results = data["vector_search"]["document_chunks"]
+
+    assert isinstance(results, json_codec.RawJSONList)
+    assert len(results) == 2
+    assert data["vector_search"]["search_quality"] == "normal"
+    assert copy.deepcopy(data)["vector_search"]["document_chunks"] is results
+
+    response = json.loads(json_codec.dumps({"result": {"document_chunks": results}}))
+    assert response["result"]["document_chunks"] == CHUNKS
+    assert not results.decoded
+
+
+def test_results_are_decoded_when_read_or_not_passed_through():
+    """Reading the items decodes them, and without pass-through the whole body is decoded."""
+    body, headers = _vector_response()
+
+    results = json_codec.load_search_response(body, headers, passthrough=True)["vector_search"]["document_chunks"]
+    assert results[0]["document_id"] == "doc-1"
+    assert results.decoded
+
+    data = json_codec.load_search_response(body, headers)
+    assert data["vector_search"]["document_chunks"] == CHUNKS
@@ -0,0 +1,146 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the search single-flight layer.
+
+Test-Suite to ensure that identical concurrent searches run once and share their result.
+"""
+import asyncio
+import threading
+import time
+
+from search_api.utils import single_flight
+
+
+def test_search_key_normalizes_equivalent_requests():
+    """Case, spacing and filter order do not change the key; the mode does."""
+    key = single_flight.search_key({"query": "Caribou  habitat", "projectIds": ["b", "a"]})
+
+    assert key == single_flight.search_key({"query": "caribou habitat", "projectIds": ["a", "b"], "mode": "rag"})
+    assert key != single_flight.search_key({"query": "caribou habitat", "projectIds": ["a", "b"], "mode": "summary"})
+
+
+def test_concurrent_duplicates_share_one_execution():
+    """Threads submitting the same search wait for the first one and get their own copy."""
+    release = threading.Event()
+    calls = []
+
+    def search():
+        calls.append(1)
+        release.wait(5)
+        return {"result": {"response": "ok", "metrics": {}}}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(single_flight.run("k1", search))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while single_flight.stats()["in_flight"] == 0 or len(calls) == 0:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sum(1 for r in results if r["result"]["metrics"].get("coalesced")) == 3
+    assert len({id(r) for r in results}) == 4
+
+
+def test_async_duplicates_share_one_execution():
+    """Coroutines on the event loop coalesce in the same way."""
+    calls = []
+
+    async def search():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return {"result": {"metrics": {}}}
+
+    async def burst():
+        return await asyncio.gather(*(single_flight.run_async("k2", search) for _ in range(3)))
+
+    results = asyncio.run(burst())
+
+    assert len(calls) == 1
+    assert [r["result"]["metrics"].get("coalesced_requests") for r in results].count(2) == 1
+
+
+def test_search_errors_are_shared_with_followers():
+    """Followers of a search that fails receive its error."""
+    async def search():
+        await asyncio.sleep(0.02)
+        raise ValueError("vector API down")
+
+    async def burst():
+        return await asyncio.gather(*(single_flight.run_async("k3", search) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(burst())
+
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_follower_takes_over_from_cancelled_leader():
+    """When the leader is cancelled its followers search again instead of being cancelled too."""
+    calls = []
+
+    async def search():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"result": {"metrics": {}}}
+
+    async def burst():
+        leader = asyncio.ensure_future(single_flight.run_async("k4", search))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(single_flight.run_async("k4", search)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return leader, await asyncio.gather(*followers)
+
+    leader, results = asyncio.run(burst())
+
+    assert leader.cancelled()
+    assert len(calls) == 2
+    assert [r["result"]["metrics"].get("coalesced_requests") for r in results].count(1) == 1
+    assert [r["result"]["metrics"].get("coalesced") for r in results].count(True) == 1
+    assert single_flight.stats()["in_flight"] == 0
+
+
+def test_thread_follower_takes_over_from_interrupted_leader():
+    """A follower thread runs the search itself when the leading thread is interrupted."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def interrupted():
+        started.set()
+        release.wait(5)
+        raise KeyboardInterrupt
+
+    def leader():
+        try:
+            single_flight.run("k5", interrupted)
+        except KeyboardInterrupt:
+            pass
+
+    results = []
+    leading = threading.Thread(target=leader)
+    leading.start()
+    started.wait(5)
+    following = threading.Thread(
+        target=lambda: results.append(single_flight.run("k5", lambda: {"result": {"metrics": {}}})))
+    following.start()
+    time.sleep(0.05)
+    release.set()
+    leading.join()
+    following.join()
+
+    assert results == [{"result": {"metrics": {}}}]
@@ -0,0 +1,45 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the tracing helpers.
+
+Test-Suite to ensure that spans carry their kind in the exported span rather than as an attribute.
+"""
+from search_api.utils import tracing
+
+
+def test_traced_sets_span_kind():
+    """Client spans are exported with the OTLP client kind."""
+    recorded = []
+
+    @tracing.traced("vector_search_client.search", kind=tracing.SpanKind.CLIENT)
+    def search():
+        recorded.append(tracing.get_current_span())
+
+    search()
+
+    otlp = recorded[0].to_otlp()
+    assert otlp["kind"] == tracing.SpanKind.CLIENT
+    assert "span.kind" not in {attribute["key"] for attribute in otlp["attributes"]}
+
+
+def test_child_spans_default_to_internal():
+    """Spans opened without a kind are internal and join the active trace."""
+    with tracing.start_span("request", kind=tracing.SpanKind.SERVER) as parent:
+        with tracing.start_span("handler.stage") as child:
+            pass
+
+    assert parent.kind == tracing.SpanKind.SERVER
+    assert child.kind == tracing.SpanKind.INTERNAL
+    assert child.trace_id == parent.trace_id
@@ -11,6 +11,8 @@ import os
 
 from flask import Flask
 
+from utils import tracing
+from utils.json_codec import OrjsonProvider
 from utils.config import get_named_config, VectorSettings, SearchSettings, ModelSettings
 from utils.version import get_version
 
@@ -40,6 +42,7 @@ def create_app(run_mode=os.getenv("FLASK_ENV", "development")):
 
     # Flask app initialize
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
 
     version = get_version()
     LOGGER.info("Starting Vector Search API - version %s (mode=%s)", version, run_mode)
@@ -57,4 +60,7 @@ def create_app(run_mode=os.getenv("FLASK_ENV", "development")):
     app.search_settings = SearchSettings(app.config)
     app.model_settings = ModelSettings(app.config)
 
+    # Join traces propagated by callers via the W3C traceparent header
+    tracing.init_app(app)
+
     return app
@@ -28,9 +28,11 @@ different API resources while providing consistent documentation through Swagger
 
 from flask import Blueprint
 
+from utils.json_codec import output_json
+
 from .apihelper import Api
 
-from .search import API as SEARCH_VECTOR_API, SIMILARITY_API as DOCUMENT_SIMILARITY_API
+from .search import API as SEARCH_VECTOR_API, SIMILARITY_API as DOCUMENT_SIMILARITY_API, RELEVANCE_API
 from .stats import API as STATS_API
 from .tools import API as TOOLS_API
 from .ops import API as OPS_API
@@ -61,9 +63,14 @@ HEALTH = Api(
     description="Health and operational status endpoints for monitoring and diagnostics",
 )
 
+# Encode resource responses with orjson
+API.representation("application/json")(output_json)
+HEALTH.representation("application/json")(output_json)
+
 # Register namespaces with their respective API blueprints
 API.add_namespace(SEARCH_VECTOR_API)
 API.add_namespace(DOCUMENT_SIMILARITY_API)
+API.add_namespace(RELEVANCE_API)
 API.add_namespace(STATS_API)
 API.add_namespace(TOOLS_API)
 HEALTH.add_namespace(OPS_API)
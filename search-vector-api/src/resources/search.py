@@ -30,15 +30,12 @@ Database Structure:
 - document_chunks table: Contains text chunks with embeddings for semantic search
 """
 
-from http import HTTPStatus
-
 from flask_restx import Namespace, Resource
-from flask import Response
-from marshmallow import EXCLUDE, Schema, fields
-
-import json
+from marshmallow import EXCLUDE, Schema, fields, validate
 
+from services.projection import RESULT_FIELDS
 from services.search_service import SearchService
+from utils import json_codec
 from .apihelper import Api as ApiHelper
 from .query_enhancement import is_query_location_relevant, format_user_location_for_query
 
@@ -137,6 +134,9 @@ class SearchRequestSchema(Schema):
         projectIds: Optional list of project IDs to filter search results
         documentTypeIds: Optional list of document type IDs to filter search results
         inference: Optional list of inference types to run ('PROJECT', 'DOCUMENTTYPE')
+        queryVariants: Optional paraphrases of the query retrieved in the same pass
+        resultFields: Optional result fields to return (``fields`` in the request)
+        snippetChars: Optional maximum characters of content per result
     """
 
     class Meta:  # pylint: disable=too-few-public-methods
@@ -168,10 +168,60 @@ class SearchRequestSchema(Schema):
                               metadata={"description": "Optional project status context to enhance search relevance (e.g., 'recent', 'active', 'completed'). Currently appended to search query for improved semantic matching."})
     years = fields.List(fields.Int(), data_key="years", required=False,
                        metadata={"description": "Optional list of years to focus search on (e.g., [2023, 2024, 2025]). Currently appended to search query for improved semantic matching."})
+    queryVariants = fields.List(fields.Str(), data_key="queryVariants", required=False,
+                               validate=lambda x: len(x) <= 10,
+                               metadata={"description": "Optional paraphrases of the query (up to 10). Near-duplicates are collapsed (QUERY_VARIANT_SIMILARITY, MAX_QUERY_VARIANTS) and semantic search retrieves the union of the nearest chunks of the query and each remaining variant in a single pass, re-ranked against the query."})
+    resultFields = fields.List(fields.Str(validate=validate.OneOf(RESULT_FIELDS)), data_key="fields", required=False,
+                               metadata={"description": f"Optional result fields to return, e.g. ['document_id', 'relevance_score', 'content']. Unrequested document fields are not extracted by direct metadata searches. Valid values: {', '.join(RESULT_FIELDS)}. All fields are returned when not provided."})
+    snippetChars = fields.Int(data_key="snippetChars", required=False, validate=validate.Range(min=1),
+                              metadata={"description": "Optional maximum number of characters of content returned per result; longer content is cut at a word boundary and ends with '…'. Full content is still used for re-ranking."})
+
+
+class RelevancePairSchema(Schema):
+    """Schema for one (query, text) pair to be scored for relevance.
+    
+    Attributes:
+        query: The query the text is judged against
+        content: The text (typically a document chunk) to score
+    """
+
+    class Meta:  # pylint: disable=too-few-public-methods
+        """Exclude unknown fields in the deserialized output."""
+
+        unknown = EXCLUDE
+
+    query = fields.Str(data_key="query", required=True,
+                      metadata={"description": "Query the text is judged against"})
+    content = fields.Str(data_key="content", required=True,
+                        metadata={"description": "Text to score, typically a document chunk"})
+
+
+class RelevanceRequestSchema(Schema):
+    """Schema for validating relevance scoring requests.
+    
+    Scores caller-supplied (query, text) pairs with the cross-encoder re-ranker,
+    so clients can validate chunks they already hold without another search.
+    
+    Attributes:
+        pairs: The pairs to score, in one batch
+        batchSize: Optional re-ranker batch size
+    """
+
+    class Meta:  # pylint: disable=too-few-public-methods
+        """Exclude unknown fields in the deserialized output."""
+
+        unknown = EXCLUDE
+
+    pairs = fields.List(fields.Nested(RelevancePairSchema), data_key="pairs", required=True,
+                       validate=lambda x: 1 <= len(x) <= 500,
+                       metadata={"description": "Query/content pairs to score (1-500). Pairs may use different queries."})
+    batchSize = fields.Int(data_key="batchSize", required=False, validate=lambda x: 1 <= x <= 256,
+                          metadata={"description": "Optional re-ranker batch size. If not provided, uses RERANKER_BATCH_SIZE."})
 
 
 API = Namespace("vector-search", description="Endpoints for semantic and keyword vector search operations")
 SIMILARITY_API = Namespace("document-similarity", description="Endpoints for document similarity search operations")
+RELEVANCE_API = Namespace("relevance", description="Endpoints for cross-encoder relevance scoring")
 
 search_request_model = ApiHelper.convert_ma_schema_to_restx_model(
     API, SearchRequestSchema(), "Vector Search Request"
@@ -181,6 +231,10 @@ document_similarity_request_model = ApiHelper.convert_ma_schema_to_restx_model(
     SIMILARITY_API, DocumentSimilarityRequestSchema(), "Document Similarity Request"
 )
 
+relevance_request_model = ApiHelper.convert_ma_schema_to_restx_model(
+    RELEVANCE_API, RelevanceRequestSchema(), "Relevance Scoring Request"
+)
+
 
 @API.route("", methods=["POST", "OPTIONS"])
 class Search(Resource):
@@ -263,6 +317,17 @@ class Search(Resource):
         - years: List of relevant years (e.g., [2023, 2024, 2025]) - appended to query
         These parameters are currently integrated into the search query text for semantic processing.
         
+        Multi-Query Search:
+        The optional 'queryVariants' list carries paraphrases of the query. They are embedded in one
+        batch, near-duplicates are collapsed, and each semantic SQL statement retrieves the nearest
+        chunks of the query and of every remaining variant together. The whole pipeline runs once,
+        instead of once per paraphrase, and reports the collapse in search_metrics.query_variants.
+        
+        Field Projection:
+        The optional 'fields' list selects the result fields returned and 'snippetChars' caps the
+        content of each result. The serialized size of the results before and after projection
+        is reported in search_metrics.payload.
+        
         Returns:
             Response: JSON containing matched documents and detailed search metrics
                      for each stage of the search pipeline, including project inference
@@ -280,6 +345,9 @@ class Search(Resource):
         location = request_data.get("location", None)  # Optional parameter
         project_status = request_data.get("projectStatus", None)  # Optional parameter
         years = request_data.get("years", None)  # Optional parameter
+        query_variants = request_data.get("queryVariants", None)  # Optional parameter
+        result_fields = request_data.get("resultFields", None)  # Optional parameter
+        snippet_chars = request_data.get("snippetChars", None)  # Optional parameter
         
         # Extract ranking parameters with fallback to None (will use env defaults)
         min_relevance_score = ranking_config.get("minScore") if ranking_config else None
@@ -324,10 +392,10 @@ class Search(Resource):
         if query_enhancements:
             enhanced_query = f"{query} ({' | '.join(query_enhancements)})"
         
-        documents = SearchService.get_documents_by_query(enhanced_query, project_ids, document_type_ids, inference, min_relevance_score, top_n, search_strategy, semantic_query)
-        return Response(
-            json.dumps(documents), status=HTTPStatus.OK, mimetype="application/json"
-        )
+        documents = SearchService.get_documents_by_query(enhanced_query, project_ids, document_type_ids, inference, min_relevance_score, top_n, search_strategy, semantic_query, query_variants, result_fields, snippet_chars)
+        # Report where the result list sits in the body so callers can forward it undecoded
+        results_key = "documents" if "documents" in documents["vector_search"] else "document_chunks"
+        return json_codec.response(documents, span=("vector_search", results_key))
 
 
 @SIMILARITY_API.route("", methods=["POST", "OPTIONS"])
@@ -374,6 +442,32 @@ class DocumentSimilarity(Resource):
         limit = request_data.get("limit", 10)
         
         similar_documents = SearchService.get_similar_documents(document_id, project_ids, limit)
-        return Response(
-            json.dumps(similar_documents), status=HTTPStatus.OK, mimetype="application/json"
-        )
+        return json_codec.response(similar_documents)
+
+
+@RELEVANCE_API.route("", methods=["POST", "OPTIONS"])
+class RelevanceScoring(Resource):
+    """REST resource for scoring query/text relevance with the cross-encoder.
+    
+    The same model that re-ranks search results scores caller-supplied pairs in a
+    single batch. The search API uses it to validate the chunks of several agent
+    search steps at once instead of asking an LLM per step.
+    """
+
+    @staticmethod
+    @ApiHelper.swagger_decorators(RELEVANCE_API, endpoint_description="Score query/text pairs with the cross-encoder re-ranker")
+    @RELEVANCE_API.expect(relevance_request_model)
+    @API.response(400, "Bad Request")
+    @API.response(200, "Scoring successful")
+    def post():
+        """Score the relevance of each text to its query.
+        
+        Scores are raw cross-encoder logits in request order; higher is more
+        relevant (see MIN_RELEVANCE_SCORE for typical ranges).
+        
+        Returns:
+            Response: JSON containing the scores and scoring time
+        """
+        request_data = RelevanceRequestSchema().load(RELEVANCE_API.payload)
+        result = SearchService.score_relevance(request_data["pairs"], request_data.get("batchSize"))
+        return json_codec.response(result)
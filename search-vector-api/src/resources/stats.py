@@ -222,27 +222,7 @@ class ProcessingSummary(Resource):
                 }
         """
         try:
-            # Get full stats and extract summary
-            full_stats = StatsService.get_processing_stats()
-            summary = full_stats.get("processing_stats", {}).get("summary", {})
-            projects = full_stats.get("processing_stats", {}).get("projects", [])
-            
-            # Calculate additional summary metrics
-            projects_with_failures = len([p for p in projects if p.get("failed_files", 0) > 0])
-            projects_with_skipped_files = len([p for p in projects if p.get("skipped_files", 0) > 0])
-            avg_success_rate = (
-                sum(p.get("overall_success_rate", 0) for p in projects) / len(projects)
-                if projects else 0.0
-            )
-            
-            enhanced_summary = {
-                "processing_summary": {
-                    **summary,
-                    "projects_with_failures": projects_with_failures,
-                    "projects_with_skipped_files": projects_with_skipped_files,
-                    "avg_success_rate_per_project": round(avg_success_rate, 2)
-                }
-            }
+            enhanced_summary = StatsService.get_processing_summary()
             
             return Response(
                 response=json.dumps(enhanced_summary),
@@ -8,6 +8,10 @@ The endpoints include:
 1. Project listings for external tool integration
 2. Document type lookups and metadata access
 3. Simple data access utilities for MCP systems
+
+The catalogue endpoints (projects, document types, search strategies) return an
+ETag derived from the catalogue version and answer If-None-Match revalidation
+with 304 Not Modified, so clients can keep a local copy and refresh it cheaply.
 """
 
 from http import HTTPStatus
@@ -16,10 +20,39 @@ from flask import request, Response
 from marshmallow import EXCLUDE, Schema, fields
 import json
 
-from services.tools_service import ToolsService
+from services.tools_service import ToolsService, content_version
 from .apihelper import Api as ApiHelper
 
 
+def _catalogue_etag(resource: str, version) -> str:
+    """Build the (unquoted) ETag value for a catalogue resource at a given version."""
+    return f"{resource}-{version}"
+
+
+def _not_modified(etag: str) -> Response:
+    """Return a 304 response confirming the client's cached copy is current."""
+    response = Response(status=HTTPStatus.NOT_MODIFIED)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def _catalogue_response(result: dict, etag: str, status=HTTPStatus.OK) -> Response:
+    """Return a JSON catalogue response tagged with its ETag.
+    
+    Error payloads are returned untagged so clients never cache them.
+    """
+    response = Response(
+        response=json.dumps(result),
+        status=status,
+        mimetype="application/json"
+    )
+    if "error" not in result:
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
 class DocumentTypeRequestSchema(Schema):
     """Schema for validating document type lookup requests.
     
@@ -80,12 +113,19 @@ class ProjectsList(Resource):
                 }
         """
         try:
+            # Read the generation before the list so a concurrent change can only make the tag stale, never the data
+            generation = ToolsService.get_catalogue_generation()
+            if generation is not None:
+                etag = _catalogue_etag("projects", f"g{generation}")
+                if request.if_none_match.contains(etag):
+                    return _not_modified(etag)
+            
             result = ToolsService.get_projects_list()
-            return Response(
-                response=json.dumps(result),
-                status=HTTPStatus.OK,
-                mimetype="application/json"
-            )
+            if generation is None:
+                etag = _catalogue_etag("projects", content_version(result))
+                if request.if_none_match.contains(etag):
+                    return _not_modified(etag)
+            return _catalogue_response(result, etag)
         except Exception as e:
             error_response = {
                 "error": "Failed to retrieve projects list",
@@ -144,12 +184,12 @@ class DocumentTypesList(Resource):
                 }
         """
         try:
+            etag = _catalogue_etag("document-types", ToolsService.get_static_catalogue_version())
+            if request.if_none_match.contains(etag):
+                return _not_modified(etag)
+            
             result = ToolsService.get_document_types()
-            return Response(
-                response=json.dumps(result),
-                status=HTTPStatus.OK,
-                mimetype="application/json"
-            )
+            return _catalogue_response(result, etag)
         except Exception as e:
             error_response = {
                 "error": "Failed to retrieve document types",
@@ -198,6 +238,10 @@ class DocumentTypeDetails(Resource):
                 }
         """
         try:
+            etag = _catalogue_etag("document-types", ToolsService.get_static_catalogue_version())
+            if request.if_none_match.contains(etag):
+                return _not_modified(etag)
+            
             result = ToolsService.get_document_type_by_id(type_id)
             
             # Check if document type was found
@@ -208,11 +252,7 @@ class DocumentTypeDetails(Resource):
                     mimetype="application/json"
                 )
             
-            return Response(
-                response=json.dumps(result),
-                status=HTTPStatus.OK,
-                mimetype="application/json"
-            )
+            return _catalogue_response(result, etag)
         except Exception as e:
             error_response = {
                 "error": f"Failed to retrieve document type {type_id}",
@@ -239,12 +279,12 @@ class SearchStrategiesResource(Resource):
         and capabilities.
         """
         try:
+            etag = _catalogue_etag("search-strategies", ToolsService.get_static_catalogue_version())
+            if request.if_none_match.contains(etag):
+                return _not_modified(etag)
+            
             strategies = ToolsService.get_search_strategies()
-            return Response(
-                response=json.dumps(strategies),
-                status=HTTPStatus.OK,
-                mimetype="application/json"
-            )
+            return _catalogue_response(strategies, etag)
         except Exception as e:
             error_response = {
                 "error": "Failed to retrieve search strategies",
@@ -14,8 +14,11 @@ from flask import current_app
 import numpy as np
 from typing import Union, List
 
+from utils.tracing import traced
+
 _model = None
 
+@traced("embedding.encode")
 def get_embedding(texts: Union[str, List[str]]) -> np.ndarray:
     """Generate vector embeddings for the provided text(s).
     
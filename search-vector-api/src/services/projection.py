@@ -0,0 +1,132 @@
+"""Field projection and content truncation for search results.
+
+A search request may name the result ``fields`` it needs and cap ``content`` at
+``snippetChars`` characters. Callers that only need ids, scores and short snippets
+(agent validation, deduplication, document listings) then receive a fraction of
+the full payload.
+
+The projection is pushed down into the SQL select lists where the pipeline itself
+does not need the data:
+
+- Whatever the request asks for, chunk queries never select the ``embedding``
+  column and strip the ``keywords``, ``tags`` and ``headings`` arrays from chunk
+  metadata (they are only used in WHERE clauses); the document-level filter stage
+  only selects document ids.
+- Direct metadata searches only extract the requested document fields.
+
+Chunk ``content`` is still fetched in full, because the cross-encoder re-ranks on
+it; it is truncated when the results are formatted. When a projection is requested,
+the serialized size of the results before and after it is reported in
+``search_metrics.payload``; otherwise only the result count is, so unprojected
+searches do not encode their results an extra time.
+"""
+
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from utils import json_codec
+
+# Fields of a formatted search result that a request may select
+RESULT_FIELDS = (
+    "document_id", "document_type", "document_name", "document_saved_name", "document_display_name",
+    "document_date", "page_number", "project_id", "project_name", "proponent_name", "s3_key",
+    "content", "relevance_score", "search_mode", "search_quality", "search_note",
+)
+
+# Chunk metadata keys only used for filtering in SQL, never read from results
+UNUSED_CHUNK_METADATA_KEYS = ("keywords", "tags", "headings")
+
+# Document fields extracted from document_metadata by direct metadata searches
+_DOCUMENT_METADATA_FIELDS = ("document_date", "document_name", "document_saved_name",
+                             "project_name", "proponent_name", "s3_key")
+# Result fields derived from the whole document_metadata object
+_DOCUMENT_METADATA_DERIVED = ("document_type", "document_display_name")
+
+# (fields, snippet_chars) of the current request
+_active: contextvars.ContextVar = contextvars.ContextVar("result_projection", default=(None, None))
+
+
+@contextmanager
+def using(fields: Optional[Sequence[str]] = None, snippet_chars: Optional[int] = None):
+    """Apply a result projection to searches run inside the block."""
+    token = _active.set((frozenset(fields) if fields else None, snippet_chars))
+    try:
+        yield
+    finally:
+        _active.reset(token)
+
+
+def wants(field: str) -> bool:
+    """Whether the active projection keeps a result field."""
+    fields, _ = _active.get()
+    return fields is None or field in fields
+
+
+def chunk_metadata_sql(column: str = "metadata") -> str:
+    """Select-list expression for chunk metadata without the filter-only arrays."""
+    removed = " - ".join(f"'{key}'" for key in UNUSED_CHUNK_METADATA_KEYS)
+    return f"{column} - {removed} AS {column}"
+
+
+def document_metadata_columns(required: Sequence[str] = ()) -> List[Tuple[str, str]]:
+    """(SQL expression, column name) pairs for a direct metadata search.
+
+    Args:
+        required: Columns selected whatever the projection, e.g. the ORDER BY column
+    """
+    columns = [("document_id", "document_id"), ("project_id", "project_id")]
+    if any(wants(field) for field in _DOCUMENT_METADATA_DERIVED):
+        columns.append(("document_metadata", "document_metadata"))
+    columns.append(("created_at", "created_at"))
+    for field in _DOCUMENT_METADATA_FIELDS:
+        if wants(field) or field in required:
+            columns.append((f"document_metadata->>'{field}' as {field}", field))
+    return columns
+
+
+def _payload_bytes(results: List[Dict[str, Any]]) -> int:
+    return len(json_codec.dumps(results))
+
+
+def _truncate(content: Any, limit: int) -> Any:
+    if not isinstance(content, str) or len(content) <= limit:
+        return content
+    cut = content[:limit]
+    # Prefer ending on a word boundary when one is close
+    space = cut.rfind(" ")
+    if space >= limit * 0.8:
+        cut = cut[:space]
+    return cut.rstrip() + "…"
+
+
+def apply(results: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Project and truncate formatted results.
+
+    Returns:
+        The projected results and payload metrics: the result count, plus the fields,
+        snippet length and serialized bytes before and after projection when a
+        projection is active.
+    """
+    fields, snippet_chars = _active.get()
+    if fields is None and snippet_chars is None:
+        return results, {"result_count": len(results)}
+
+    projected = []
+    for result in results:
+        if fields is not None:
+            result = {key: value for key, value in result.items() if key in fields}
+        if snippet_chars is not None and "content" in result:
+            result = {**result, "content": _truncate(result["content"], snippet_chars)}
+        projected.append(result)
+
+    full_bytes = _payload_bytes(results)
+    projected_bytes = _payload_bytes(projected)
+    return projected, {
+        "result_count": len(projected),
+        "fields": sorted(fields) if fields is not None else None,
+        "snippet_chars": snippet_chars,
+        "unprojected_bytes": full_bytes,
+        "payload_bytes": projected_bytes,
+        "bytes_saved": full_bytes - projected_bytes,
+    }
@@ -0,0 +1,163 @@
+"""Multi-query semantic retrieval for paraphrased query variants.
+
+A search request may carry paraphrases of its query (``queryVariants``). Instead of
+running the whole search pipeline once per paraphrase, the variants are:
+
+1. Embedded in a single batch together with the query
+2. Collapsed by cosine similarity, dropping variants that are near-duplicates of the
+   query or of a variant already kept
+3. Attached to the request so that each semantic SQL statement retrieves the
+   nearest chunks of the query and of every remaining variant, merged by id
+
+One pass through the pipeline (inference, document filtering, semantic and keyword
+search, re-ranking) therefore retrieves over the union of the variants'
+neighbourhoods. Keyword search and re-ranking still use the main query, so variants
+widen recall without changing how results are scored.
+"""
+
+import contextvars
+import logging
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .embedding import get_embedding
+
+# Embeddings of the variants kept for the current request
+_active: contextvars.ContextVar = contextvars.ContextVar("query_variant_vectors", default=())
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def collapse(query: str, variants: Sequence[str], similarity: float,
+             max_variants: int) -> Tuple[List[str], List[List[float]], Dict[str, Any]]:
+    """Drop variants that are near-duplicates of the query or of each other.
+
+    Variants are considered in request order; a variant is kept when its cosine
+    similarity to the query and to every variant kept so far is below the
+    threshold, up to max_variants.
+
+    Args:
+        query: The main search query
+        variants: Paraphrases of the query
+        similarity: Cosine similarity at or above which a variant is a duplicate
+        max_variants: Maximum number of variants kept
+
+    Returns:
+        The kept variants, their embeddings and collapse metrics.
+    """
+    start = time.time()
+    seen = {query.strip().lower()}
+    candidates = []
+    for variant in variants:
+        key = variant.strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            candidates.append(variant.strip())
+
+    kept: List[str] = []
+    kept_vectors: List[List[float]] = []
+    if candidates and max_variants > 0:
+        embeddings = np.asarray(get_embedding([query] + candidates), dtype=float)
+        unit = _normalize(embeddings)
+        selected = [0]
+        for index in range(1, len(unit)):
+            if len(selected) - 1 >= max_variants:
+                break
+            if float(np.max(unit[selected] @ unit[index])) < similarity:
+                selected.append(index)
+        kept = [candidates[i - 1] for i in selected[1:]]
+        kept_vectors = [embeddings[i].tolist() for i in selected[1:]]
+
+    metrics = {
+        "received": len(variants),
+        "used": len(kept),
+        "collapsed": len(variants) - len(kept),
+        "similarity_threshold": similarity,
+        "collapse_ms": round((time.time() - start) * 1000, 2),
+    }
+    logging.info(f"Query variants: kept {len(kept)} of {len(variants)} ({kept})")
+    return kept, kept_vectors, metrics
+
+
+@contextmanager
+def using(vectors: Sequence[List[float]]):
+    """Make variant embeddings available to semantic searches run inside the block."""
+    token = _active.set(tuple(vectors))
+    try:
+        yield
+    finally:
+        _active.reset(token)
+
+
+def query_vectors(query: str) -> List[List[float]]:
+    """Embedding of the query followed by the embeddings of the active variants."""
+    return [get_embedding([query])[0].tolist()] + list(_active.get())
+
+
+def nearest_sql(columns: str, table: str, where_clause: str, count: int) -> str:
+    """SQL for the rows nearest to any of ``count`` query vectors.
+
+    With a single vector this is the usual ``ORDER BY embedding <=> vector`` query.
+    With several, each vector gets its own index-ordered branch and the branches
+    are merged in the same statement, keeping each row's smallest distance, so the
+    HNSW index is still used. Rows are returned with a ``similarity`` column.
+    Columns may be expressions with an ``AS`` alias.
+
+    Parameters are bound by ``nearest_params``.
+    """
+    if count <= 1:
+        return f"""
+            SELECT {columns}, 1 - (embedding <=> %s::vector) as similarity
+            FROM {table}
+            WHERE {where_clause}
+            ORDER BY embedding <=> %s::vector
+            LIMIT %s
+            """
+    branch = f"""(SELECT {columns}, embedding <=> %s::vector AS distance
+              FROM {table}
+              WHERE {where_clause}
+              ORDER BY embedding <=> %s::vector
+              LIMIT %s)"""
+    return f"""
+            SELECT {_output_names(columns)}, 1 - distance as similarity
+            FROM (
+                SELECT DISTINCT ON (id) *
+                FROM ({" UNION ALL ".join([branch] * count)}) AS candidates
+                ORDER BY id, distance
+            ) AS nearest
+            ORDER BY distance
+            LIMIT %s
+            """
+
+
+def _output_names(columns: str) -> str:
+    """Names of the columns of a select list, for selecting them again from a subquery."""
+    names, depth, start = [], 0, 0
+    for index, char in enumerate(columns + ","):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            expression = columns[start:index].strip()
+            names.append(re.split(r"\s+as\s+", expression, flags=re.IGNORECASE)[-1])
+            start = index + 1
+    return ", ".join(names)
+
+
+def nearest_params(vectors: Sequence[List[float]], where_params: List[Any], limit: int) -> List[Any]:
+    """Parameters for ``nearest_sql`` in placeholder order."""
+    params: List[Any] = []
+    for vector in vectors:
+        params.extend([vector] + list(where_params) + [vector, limit])
+    if len(vectors) > 1:
+        params.append(limit)
+    return params
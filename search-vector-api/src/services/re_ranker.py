@@ -20,7 +20,7 @@ import pandas as pd
 from flask import current_app
 from sentence_transformers import CrossEncoder
 from functools import lru_cache
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, List
 
 @lru_cache(maxsize=1)
 def get_cross_encoder():
@@ -284,3 +284,25 @@ def rerank_results_with_metrics(query: str, items: pd.DataFrame, top_n: int, bat
                     f"({exclusion_percentage:.1f}%) below threshold {min_relevance_score}")
         
     return final_results, filtering_metrics
+
+
+def score_pairs(pairs: List[Tuple[str, str]], batch_size: int = 32) -> List[float]:
+    """Score (query, text) pairs with the cross-encoder in a single batched call.
+    
+    Used by clients that need relevance judgements for text they already hold, such
+    as the agent's chunk validation, without running a search. Pairs may come from
+    different queries; they are scored together so one request covers many steps.
+    
+    Args:
+        pairs (List[Tuple[str, str]]): (query, text) pairs to score
+        batch_size (int): Batch size for the model's predict call
+        
+    Returns:
+        List[float]: Raw cross-encoder scores (logits, higher is more relevant), in
+        the order of the pairs. See rerank_results for how to read them.
+    """
+    if not pairs:
+        return []
+    model = get_cross_encoder()
+    scores = model.predict([[query, text] for query, text in pairs], batch_size=batch_size)
+    return [float(score) for score in scores]
@@ -21,8 +21,13 @@ while maintaining a consistent API for clients.
 """
 
 import logging
+import time
 from typing import Dict, List, Any
 
+from utils.tracing import start_span
+
+from . import projection
+from . import query_variants as variants
 from .vector_search import search, document_similarity_search
 from .inference import InferencePipeline
 
@@ -39,7 +44,7 @@ class SearchService:
     """
 
     @classmethod
-    def get_documents_by_query(cls, query: str, project_ids: List[str] = None, document_type_ids: List[str] = None, inference: List[str] = None, min_relevance_score: float = None, top_n: int = None, search_strategy: str = None, semantic_query: str = None) -> Dict[str, Any]:
+    def get_documents_by_query(cls, query: str, project_ids: List[str] = None, document_type_ids: List[str] = None, inference: List[str] = None, min_relevance_score: float = None, top_n: int = None, search_strategy: str = None, semantic_query: str = None, query_variants: List[str] = None, fields: List[str] = None, snippet_chars: int = None) -> Dict[str, Any]:
         """Retrieve relevant documents using an advanced two-stage search strategy with intelligent project inference.
         
         This method implements a modern search approach that leverages document-level
@@ -128,6 +133,13 @@ class SearchService:
                                            Valid values: 'HYBRID_SEMANTIC_FALLBACK', 'HYBRID_KEYWORD_FALLBACK',
                                            'SEMANTIC_ONLY', 'KEYWORD_ONLY', 'HYBRID_PARALLEL'.
                                            If None, uses the DEFAULT_SEARCH_STRATEGY config value.
+            query_variants (List[str], optional): Paraphrases of the query retrieved in the same pass.
+                                                Near-duplicates are collapsed first (QUERY_VARIANT_SIMILARITY);
+                                                semantic search then returns the union of the nearest chunks
+                                                of the query and each remaining variant.
+            fields (List[str], optional): Result fields to return (see projection.RESULT_FIELDS).
+                                        All fields are returned when not provided.
+            snippet_chars (int, optional): Maximum characters of content returned per result.
         
         Returns:
             Dict[str, Any]: Search results including documents and detailed metrics
@@ -216,14 +228,16 @@ class SearchService:
         inference_start_time = time.time()
         
         # Process query through inference pipeline with controlled inference options
-        inference_results = pipeline.process_query(
-            query=query,
-            project_ids=project_ids,
-            document_type_ids=document_type_ids,
-            skip_generic_cleaning=is_generic_request,
-            run_project_inference=run_project_inference,
-            run_document_type_inference=run_document_type_inference
-        )
+        with start_span("inference", {"inference.project": run_project_inference,
+                                      "inference.document_type": run_document_type_inference}):
+            inference_results = pipeline.process_query(
+                query=query,
+                project_ids=project_ids,
+                document_type_ids=document_type_ids,
+                skip_generic_cleaning=is_generic_request,
+                run_project_inference=run_project_inference,
+                run_document_type_inference=run_document_type_inference
+            )
         
         # Calculate inference timing
         inference_time_ms = round((time.time() - inference_start_time) * 1000, 2)
@@ -272,9 +286,28 @@ class SearchService:
         if not semantic_query and not is_generic_request and (project_ids or document_type_ids) and final_search_query != query:
             additional_semantic_cleaning_applied = True
         
+        # Collapse near-duplicate query variants before retrieving over their union
+        variant_vectors = []
+        variant_metrics = None
+        if query_variants:
+            with start_span("query_variants.collapse", {"query_variants.received": len(query_variants)}):
+                kept_variants, variant_vectors, variant_metrics = variants.collapse(
+                    final_search_query,
+                    query_variants,
+                    current_app.search_settings.query_variant_similarity,
+                    current_app.search_settings.max_query_variants,
+                )
+            variant_metrics["variants"] = kept_variants
+        
         # Track search stage timing
         search_start_time = time.time()
-        documents, search_metrics = search(final_search_query, project_ids, document_type_ids, min_relevance_score, top_n, search_strategy, semantic_query)
+        with start_span("search", {"search.strategy": search_strategy}) as span, variants.using(variant_vectors), \
+                projection.using(fields, snippet_chars):
+            documents, search_metrics = search(final_search_query, project_ids, document_type_ids, min_relevance_score, top_n, search_strategy, semantic_query)
+            span.set_attribute("search.result_count", len(documents))
+            # Quality flags are read before the projection may drop them
+            has_low_confidence = any(doc.get("search_quality") == "low_confidence" for doc in documents)
+            documents, payload_metrics = projection.apply(documents)
         search_time_ms = round((time.time() - search_start_time) * 1000, 2)
         
         # Create comprehensive stage-specific metrics
@@ -303,6 +336,9 @@ class SearchService:
         comprehensive_metrics = {**search_metrics, **stage_metrics}
         comprehensive_metrics["inference_breakdown"] = inference_breakdown
         comprehensive_metrics["strategy_metrics"] = strategy_metrics
+        if variant_metrics is not None:
+            comprehensive_metrics["query_variants"] = variant_metrics
+        comprehensive_metrics["payload"] = payload_metrics
 
         # Check if results have low confidence (indicating possible query-document mismatch)
         search_quality = "normal"
@@ -310,7 +346,6 @@ class SearchService:
         
         if documents:
             # Check if any document has low confidence flag
-            has_low_confidence = any(doc.get("search_quality") == "low_confidence" for doc in documents)
             if has_low_confidence:
                 search_quality = "low_confidence"
                 search_note = "The query may not be well-matched to the available documents. Consider refining your search terms or using more specific keywords related to the document content."
@@ -454,3 +489,40 @@ class SearchService:
             response["document_similarity"]["request_parameters"]["project_filter_applied"] = False
         
         return response
+
+    @classmethod
+    def score_relevance(cls, pairs: List[Dict[str, str]], batch_size: int = None) -> Dict[str, Any]:
+        """Score the relevance of texts to queries with the cross-encoder re-ranker.
+        
+        Args:
+            pairs (List[Dict[str, str]]): Items with "query" and "content" keys
+            batch_size (int, optional): Re-ranker batch size. If None, uses the
+                                        RERANKER_BATCH_SIZE setting.
+            
+        Returns:
+            dict: Scores in request order plus timing:
+                {
+                    "relevance": {
+                        "scores": [3.2, -7.9, ...],
+                        "metrics": {"pairs": 2, "scoring_ms": 41.7}
+                    }
+                }
+        """
+        from flask import current_app
+        from .re_ranker import score_pairs
+
+        if batch_size is None:
+            batch_size = current_app.search_settings.reranker_batch_size
+        start_time = time.time()
+        with start_span("rerank.score_pairs", {"rerank.pairs": len(pairs)}):
+            scores = score_pairs([(pair["query"], pair["content"]) for pair in pairs], batch_size)
+        return {
+            "relevance": {
+                "scores": scores,
+                "metrics": {
+                    "pairs": len(pairs),
+                    "scoring_ms": round((time.time() - start_time) * 1000, 2)
+                }
+            }
+        }
+
@@ -12,6 +12,8 @@ import pandas as pd
 from flask import current_app
 from typing import Tuple, List, Optional, Dict, Any
 
+from utils.tracing import bind_context
+
 from .base_strategy import BaseSearchStrategy
 from .strategy_factory import SearchStrategyFactory
 
@@ -139,8 +141,8 @@ class HybridParallelStrategy(BaseSearchStrategy):
                     logging.error(f"HYBRID_PARALLEL - Failed to put keyword error result in queue: {queue_error}")
         
         # Start both search threads
-        semantic_thread = threading.Thread(target=semantic_search_worker, name="SemanticSearch")
-        keyword_thread = threading.Thread(target=keyword_search_worker, name="KeywordSearch")
+        semantic_thread = threading.Thread(target=bind_context(semantic_search_worker), name="SemanticSearch")
+        keyword_thread = threading.Thread(target=bind_context(keyword_search_worker), name="KeywordSearch")
         
         parallel_start = time.time()
         semantic_thread.start()
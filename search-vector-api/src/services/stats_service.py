@@ -1,9 +1,13 @@
 """Statistics service for retrieving file processing metrics.
 
 This service module provides functionality to retrieve processing statistics
-by joining the processing_logs table with the projects table to provide
+by joining the project_processing_stats table with the projects table to provide
 comprehensive information about document processing status by project.
 
+The per-project counters are maintained by a trigger the embedder installs on
+processing_logs, so the stats are point reads whose cost does not grow with the
+number of processing logs.
+
 The service returns aggregated statistics including:
 1. Total number of files processed per project
 2. Number of successful processing operations per project  
@@ -16,15 +20,34 @@ The service returns aggregated statistics including:
 
 import logging
 import psycopg
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from flask import current_app
 
 
+# Aggregate over processing_logs, used only until the embedder has created
+# the project_processing_stats table on this database
+LEGACY_STATS_QUERY = """
+SELECT 
+    p.project_id,
+    p.project_name,
+    COUNT(pl.*) as total_files,
+    COUNT(CASE WHEN pl.status = 'success' THEN 1 END) as successful_files,
+    COUNT(CASE WHEN pl.status = 'failure' THEN 1 END) as failed_files,
+    COUNT(CASE WHEN pl.status = 'skipped' THEN 1 END) as skipped_files
+FROM projects p
+LEFT JOIN processing_logs pl ON p.project_id = pl.project_id
+{where_clause}
+GROUP BY p.project_id, p.project_name
+ORDER BY p.project_name;
+"""
+
+
 class StatsService:
     """Statistics service for document processing metrics.
     
     This service class provides functionality to retrieve and aggregate
-    document processing statistics from the processing_logs and projects tables.
+    document processing statistics from the project_processing_stats, processing_logs
+    and projects tables.
     It returns comprehensive metrics about file processing success/failure/skipped rates
     organized by project.
     """
@@ -33,10 +56,11 @@ class StatsService:
     def get_processing_stats(cls, project_ids: List[str] = None) -> Dict[str, Any]:
         """Retrieve processing statistics aggregated by project.
         
-        This method queries the processing_logs table and joins with the projects
-        table to provide comprehensive processing statistics. It aggregates the
-        data to show total files processed, successful operations, failed
-        operations, and skipped operations for each project.
+        This method reads the per-project counters in project_processing_stats and
+        joins with the projects table to show total files processed, successful
+        operations, failed operations, and skipped operations for each project.
+        If the counters table has not been created yet, it falls back to
+        aggregating the processing_logs table.
         
         Args:
             project_ids (List[str], optional): List of project IDs to filter results.
@@ -91,40 +115,29 @@ class StatsService:
                 
             where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
             
-            # SQL query to get processing statistics by project
+            # Per-project counters are maintained by the embedder's processing_logs trigger,
+            # so this is one indexed row per project rather than an aggregate over every log
             stats_query = f"""
             SELECT 
                 p.project_id,
                 p.project_name,
-                COUNT(pl.*) as total_files,
-                COUNT(CASE WHEN pl.status = 'success' THEN 1 END) as successful_files,
-                COUNT(CASE WHEN pl.status = 'failure' THEN 1 END) as failed_files,
-                COUNT(CASE WHEN pl.status = 'skipped' THEN 1 END) as skipped_files,
-                CASE 
-                    WHEN COUNT(pl.*) > 0 THEN 
-                        ROUND((COUNT(CASE WHEN pl.status = 'success' THEN 1 END) * 100.0 / COUNT(pl.*)), 2)
-                    ELSE 0 
-                END as success_rate,
-                CASE 
-                    WHEN (COUNT(CASE WHEN pl.status = 'success' THEN 1 END) + COUNT(CASE WHEN pl.status = 'failure' THEN 1 END)) > 0 THEN 
-                        ROUND((COUNT(CASE WHEN pl.status = 'success' THEN 1 END) * 100.0 / (COUNT(CASE WHEN pl.status = 'success' THEN 1 END) + COUNT(CASE WHEN pl.status = 'failure' THEN 1 END))), 2)
-                    ELSE 0 
-                END as processed_success_rate
-            FROM projects p
-            LEFT JOIN processing_logs pl ON p.project_id = pl.project_id
+                s.total_files,
+                s.successful_files,
+                s.failed_files,
+                s.skipped_files
+            FROM project_processing_stats s
+            JOIN projects p ON p.project_id = s.project_id
             {where_clause}
-            GROUP BY p.project_id, p.project_name
             ORDER BY p.project_name;
             """
             
             logging.info(f"Executing stats query with params: {params}")
             
-            # Execute the query
-            conn_params = current_app.vector_settings.database_url
-            with psycopg.connect(conn_params) as conn:
-                with conn.cursor() as cur:
-                    cur.execute(stats_query, params)
-                    results = cur.fetchall()
+            try:
+                results = cls._fetch_all(stats_query, params)
+            except psycopg.errors.UndefinedTable:
+                logging.warning("project_processing_stats not found, aggregating processing_logs instead")
+                results = cls._fetch_all(LEGACY_STATS_QUERY.format(where_clause=where_clause), params)
             
             # Process the results
             projects_stats = []
@@ -135,10 +148,11 @@ class StatsService:
             total_skipped_all = 0
             
             for row in results:
-                project_id, project_name, total_files, successful_files, failed_files, skipped_files, success_rate, processed_success_rate = row
+                project_id, project_name, total_files, successful_files, failed_files, skipped_files = row
                 
                 # Only include projects that have processing logs
                 if total_files > 0:
+                    success_rate, processed_success_rate = cls._success_rates(total_files, successful_files, failed_files)
                     projects_stats.append({
                         "project_id": project_id,
                         "project_name": project_name,
@@ -146,8 +160,8 @@ class StatsService:
                         "successful_files": successful_files,
                         "failed_files": failed_files,
                         "skipped_files": skipped_files,
-                        "overall_success_rate": float(success_rate) if success_rate else 0.0,
-                        "processing_success_rate": float(processed_success_rate) if processed_success_rate else 0.0
+                        "overall_success_rate": success_rate,
+                        "processing_success_rate": processed_success_rate
                     })
                     
                     total_projects += 1
@@ -156,17 +170,9 @@ class StatsService:
                     total_failed_all += failed_files
                     total_skipped_all += skipped_files
             
-            # Calculate overall success rate
-            overall_success_rate = (
-                round((total_successful_all * 100.0 / total_files_all), 2) 
-                if total_files_all > 0 else 0.0
-            )
-            
-            # Calculate overall processed success rate (successful vs processed, excluding skipped)
-            total_processed_all = total_successful_all + total_failed_all
-            overall_processing_success_rate = (
-                round((total_successful_all * 100.0 / total_processed_all), 2) 
-                if total_processed_all > 0 else 0.0
+            # Calculate overall success rates (all files, and processed files excluding skipped)
+            overall_success_rate, overall_processing_success_rate = cls._success_rates(
+                total_files_all, total_successful_all, total_failed_all
             )
             
             response = {
@@ -193,19 +199,97 @@ class StatsService:
             return {
                 "processing_stats": {
                     "projects": [],
-                    "summary": {
-                        "total_projects": 0,
-                        "total_files_across_all_projects": 0,
-                        "total_successful_files": 0,
-                        "total_failed_files": 0,
-                        "total_skipped_files": 0,
-                        "overall_success_rate": 0.0,
-                        "overall_processing_success_rate": 0.0
-                    }
+                    "summary": cls._empty_summary()
                 },
                 "error": str(e)
             }
 
+    @classmethod
+    def get_processing_summary(cls) -> Dict[str, Any]:
+        """Retrieve system-wide processing summary statistics.
+        
+        Sums the per-project counters in a single query, so the cost depends on
+        the number of projects rather than the number of processing logs.
+        
+        Returns:
+            dict: Summary statistics:
+                {
+                    "processing_summary": {
+                        "total_projects": 5,
+                        "total_files_across_all_projects": 750,
+                        "total_successful_files": 720,
+                        "total_failed_files": 25,
+                        "total_skipped_files": 5,
+                        "overall_success_rate": 96.0,
+                        "overall_processing_success_rate": 96.64,
+                        "projects_with_failures": 2,
+                        "projects_with_skipped_files": 1,
+                        "avg_success_rate_per_project": 95.5
+                    }
+                }
+        """
+        summary_query = """
+        SELECT 
+            COUNT(*),
+            COALESCE(SUM(s.total_files), 0),
+            COALESCE(SUM(s.successful_files), 0),
+            COALESCE(SUM(s.failed_files), 0),
+            COALESCE(SUM(s.skipped_files), 0),
+            COUNT(*) FILTER (WHERE s.failed_files > 0),
+            COUNT(*) FILTER (WHERE s.skipped_files > 0),
+            COALESCE(AVG(ROUND(s.successful_files * 100.0 / s.total_files, 2)), 0)
+        FROM project_processing_stats s
+        JOIN projects p ON p.project_id = s.project_id
+        WHERE s.total_files > 0;
+        """
+        
+        try:
+            row = cls._fetch_all(summary_query, [])[0]
+        except psycopg.errors.UndefinedTable:
+            logging.warning("project_processing_stats not found, deriving summary from full processing stats")
+            return cls._summary_from_project_stats()
+        
+        total_projects, total_files, successful, failed, skipped, with_failures, with_skipped, avg_rate = row
+        overall_success_rate, overall_processing_success_rate = cls._success_rates(total_files, successful, failed)
+        
+        logging.info(f"Retrieved processing summary for {total_projects} projects")
+        return {
+            "processing_summary": {
+                "total_projects": total_projects,
+                "total_files_across_all_projects": int(total_files),
+                "total_successful_files": int(successful),
+                "total_failed_files": int(failed),
+                "total_skipped_files": int(skipped),
+                "overall_success_rate": overall_success_rate,
+                "overall_processing_success_rate": overall_processing_success_rate,
+                "projects_with_failures": with_failures,
+                "projects_with_skipped_files": with_skipped,
+                "avg_success_rate_per_project": round(float(avg_rate), 2)
+            }
+        }
+
+    @classmethod
+    def _summary_from_project_stats(cls) -> Dict[str, Any]:
+        """Build the system summary from per-project stats (used before the summary table exists)."""
+        full_stats = cls.get_processing_stats()
+        if "error" in full_stats:
+            raise RuntimeError(full_stats["error"])
+        summary = full_stats.get("processing_stats", {}).get("summary", {})
+        projects = full_stats.get("processing_stats", {}).get("projects", [])
+        
+        avg_success_rate = (
+            sum(p.get("overall_success_rate", 0) for p in projects) / len(projects)
+            if projects else 0.0
+        )
+        return {
+            "processing_summary": {
+                **summary,
+                "projects_with_failures": len([p for p in projects if p.get("failed_files", 0) > 0]),
+                "projects_with_skipped_files": len([p for p in projects if p.get("skipped_files", 0) > 0]),
+                "avg_success_rate_per_project": round(avg_success_rate, 2)
+            }
+        }
+
     @classmethod
     def get_project_processing_details(cls, project_id: str) -> Dict[str, Any]:
         """Get detailed processing information for a specific project.
@@ -246,79 +330,74 @@ class StatsService:
         """
         
         try:
-            # SQL query to get detailed processing logs for a specific project
-            details_query = """
+            # Project row and its counters: a primary-key lookup on each table
+            project_query = """
             SELECT 
                 p.project_id,
                 p.project_name,
+                s.total_files,
+                s.successful_files,
+                s.failed_files,
+                s.skipped_files
+            FROM projects p
+            LEFT JOIN project_processing_stats s ON s.project_id = p.project_id
+            WHERE p.project_id = %s;
+            """
+            
+            # Individual logs, served by the (project_id, processed_at) index
+            logs_query = """
+            SELECT 
                 pl.id as log_id,
                 pl.document_id,
                 pl.status,
                 pl.processed_at,
                 pl.metrics
-            FROM projects p
-            LEFT JOIN processing_logs pl ON p.project_id = pl.project_id
-            WHERE p.project_id = %s
+            FROM processing_logs pl
+            WHERE pl.project_id = %s
             ORDER BY pl.processed_at DESC;
             """
             
             logging.info(f"Getting detailed stats for project: {project_id}")
             
-            # Execute the query
-            conn_params = current_app.vector_settings.database_url
-            with psycopg.connect(conn_params) as conn:
-                with conn.cursor() as cur:
-                    cur.execute(details_query, [project_id])
-                    results = cur.fetchall()
+            try:
+                project_rows = cls._fetch_all(project_query, [project_id])
+                counters_available = True
+            except psycopg.errors.UndefinedTable:
+                logging.warning("project_processing_stats not found, counting processing_logs instead")
+                project_rows = cls._fetch_all(
+                    "SELECT project_id, project_name, NULL, NULL, NULL, NULL FROM projects WHERE project_id = %s;",
+                    [project_id]
+                )
+                counters_available = False
             
-            if not results:
+            if not project_rows:
                 return {
                     "project_details": None,
                     "error": f"Project {project_id} not found"
                 }
             
-            # Process the results
-            project_id_result = results[0][0]
-            project_name = results[0][1]
-            
-            processing_logs = []
-            total_files = 0
-            successful_files = 0
-            failed_files = 0
-            skipped_files = 0
+            project_id_result, project_name, total_files, successful_files, failed_files, skipped_files = project_rows[0]
+            results = cls._fetch_all(logs_query, [project_id])
             
-            for row in results:
-                _, _, log_id, document_id, status, processed_at, metrics = row
-                
-                # Skip rows where there's no processing log (only project info)
-                if log_id is not None:
-                    processing_logs.append({
-                        "log_id": log_id,
-                        "document_id": document_id,
-                        "status": status,
-                        "processed_at": processed_at.isoformat() if processed_at else None,
-                        "metrics": metrics
-                    })
-                    
-                    total_files += 1
-                    if status == 'success':
-                        successful_files += 1
-                    elif status == 'failure':
-                        failed_files += 1
-                    elif status == 'skipped':
-                        skipped_files += 1
+            processing_logs = [
+                {
+                    "log_id": log_id,
+                    "document_id": document_id,
+                    "status": status,
+                    "processed_at": processed_at.isoformat() if processed_at else None,
+                    "metrics": metrics
+                }
+                for log_id, document_id, status, processed_at, metrics in results
+            ]
             
-            overall_success_rate = (
-                round((successful_files * 100.0 / total_files), 2) 
-                if total_files > 0 else 0.0
-            )
+            if not counters_available or total_files is None:
+                statuses = [log["status"] for log in processing_logs]
+                total_files = len(statuses)
+                successful_files = statuses.count('success')
+                failed_files = statuses.count('failure')
+                skipped_files = statuses.count('skipped')
             
-            # Calculate processed success rate (successful vs processed, excluding skipped)
-            total_processed = successful_files + failed_files
-            processing_success_rate = (
-                round((successful_files * 100.0 / total_processed), 2) 
-                if total_processed > 0 else 0.0
-            )
+            overall_success_rate, processing_success_rate = cls._success_rates(total_files, successful_files, failed_files)
             
             response = {
                 "project_details": {
@@ -345,3 +424,38 @@ class StatsService:
                 "project_details": None,
                 "error": str(e)
             }
+
+    @staticmethod
+    def _fetch_all(query: str, params: List[Any]) -> List[tuple]:
+        """Run a read-only query against the vector database and return all rows."""
+        with psycopg.connect(current_app.vector_settings.database_url) as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+                return cur.fetchall()
+
+    @staticmethod
+    def _success_rates(total_files: int, successful_files: int, failed_files: int) -> Tuple[float, float]:
+        """Return (overall success rate, processing success rate excluding skipped) as percentages."""
+        overall_success_rate = (
+            round((successful_files * 100.0 / total_files), 2) 
+            if total_files > 0 else 0.0
+        )
+        total_processed = successful_files + failed_files
+        processing_success_rate = (
+            round((successful_files * 100.0 / total_processed), 2) 
+            if total_processed > 0 else 0.0
+        )
+        return overall_success_rate, processing_success_rate
+
+    @staticmethod
+    def _empty_summary() -> Dict[str, Any]:
+        """Return an all-zero processing summary."""
+        return {
+            "total_projects": 0,
+            "total_files_across_all_projects": 0,
+            "total_successful_files": 0,
+            "total_failed_files": 0,
+            "total_skipped_files": 0,
+            "overall_success_rate": 0.0,
+            "overall_processing_success_rate": 0.0
+        }
@@ -6,8 +6,11 @@ tools including project listings and document type information access.
 The service provides:
 1. Simple project listing without processing statistics 
 2. Document type lookups and metadata
+3. Catalogue versions used as ETags so clients can revalidate cheaply
 """
 
+import functools
+import hashlib
 import json
 import logging
 import psycopg
@@ -22,6 +25,19 @@ from utils.document_types import (
 )
 
 
+def content_version(payload: Any) -> str:
+    """Return a short, stable hash of a JSON-serializable payload.
+    
+    Args:
+        payload: The payload to hash
+        
+    Returns:
+        str: The first 16 hex characters of the SHA-1 of the canonical JSON encoding
+    """
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
 class ToolsService:
     """Tools service for MCP utilities and data access.
     
@@ -48,6 +64,45 @@ class ToolsService:
             # Default fallback, though this shouldn't happen with current data
             return "unknown_act"
 
+    @classmethod
+    def get_catalogue_generation(cls) -> Optional[int]:
+        """Return the project catalogue generation number.
+        
+        The embedder keeps a single-row catalogue_generation table whose counter is
+        bumped by a trigger whenever a project is added, changed or removed, so the
+        number identifies one version of the projects list.
+        
+        Returns:
+            Optional[int]: The current generation, or None if it cannot be read
+                           (e.g. the embedder has not created the table yet)
+        """
+        try:
+            conn_params = current_app.vector_settings.database_url
+            with psycopg.connect(conn_params) as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT generation FROM catalogue_generation WHERE id = 1;")
+                    row = cur.fetchone()
+            return row[0] if row else None
+        except psycopg.errors.UndefinedTable:
+            logging.warning("catalogue_generation table not found, projects ETag will use a content hash")
+            return None
+        except Exception as e:
+            logging.error(f"Error reading catalogue generation: {e}")
+            return None
+
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def get_static_catalogue_version(cls) -> str:
+        """Return a version for the code-defined catalogue (document types and search strategies).
+        
+        These only change with a deployment, so the version is a hash of their content,
+        computed once per process. It is identical across workers running the same code.
+        
+        Returns:
+            str: A short content hash
+        """
+        return content_version([cls.get_document_types(), cls.get_search_strategies()])
+
     @classmethod
     def get_projects_list(cls) -> Dict[str, Any]:
         """Retrieve a simple list of all projects.
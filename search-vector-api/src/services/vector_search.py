@@ -34,6 +34,7 @@ from flask import current_app
 from .keywords.query_keyword_extractor import get_keywords
 from .re_ranker import rerank_results_with_metrics
 from .vector_store import VectorStore
+from utils.tracing import start_span, traced
 
 
 def get_document_type_name(document_metadata, chunk_metadata=None):
@@ -295,19 +296,20 @@ def search(question, project_ids=None, document_type_ids=None, min_relevance_sco
     
     try:
         strategy = get_search_strategy(search_strategy)
-        return strategy.execute(
-            question=question,
-            vec_store=vec_store,
-            project_ids=project_ids,
-            document_type_ids=document_type_ids,
-            doc_limit=doc_limit,
-            chunk_limit=chunk_limit,
-            top_n=top_n,
-            min_relevance_score=min_relevance_score,
-            metrics=metrics,
-            start_time=start_time,
-            semantic_query=semantic_query
-        )
+        with start_span(f"strategy.{search_strategy}", {"search.top_n": top_n}):
+            return strategy.execute(
+                question=question,
+                vec_store=vec_store,
+                project_ids=project_ids,
+                document_type_ids=document_type_ids,
+                doc_limit=doc_limit,
+                chunk_limit=chunk_limit,
+                top_n=top_n,
+                min_relevance_score=min_relevance_score,
+                metrics=metrics,
+                start_time=start_time,
+                semantic_query=semantic_query
+            )
     except Exception as e:
         # Fallback to default strategy if something goes wrong
         logging.error(f"Error executing search strategy '{search_strategy}': {e}")
@@ -483,6 +485,7 @@ def limit_chunks_per_document(results, max_chunks_per_doc):
         return pd.DataFrame(columns=results.columns)
 
 
+@traced("rerank")
 def perform_reranking(query, combined_results, top_n, min_relevance_score=None):
     """Re-rank the results using the cross-encoder re-ranker model.
     
@@ -599,30 +602,35 @@ def format_data(data):
         documents = np.array(data)
         
         for i, row in enumerate(documents):
-            # Try to intelligently determine the structure based on row length and content
-            if len(row) >= 6:
-                # Semantic search format with document_metadata: id, metadata, content, embedding, document_metadata, similarity
-                metadata = row[1] if len(row) > 1 else {}
-                content = row[2] if len(row) > 2 else ''
-                document_metadata = row[4] if len(row) > 4 else {}
-                relevance_score = float(row[5]) if len(row) > 5 else 0.0
-            elif len(row) >= 5:
-                # Check if this is a 5-column format with document_metadata or without
-                # If row[3] looks like a dict/JSON, it might be document_metadata
-                # If row[4] is a float, it's likely the score
+            # Determine the structure from the row length and content. VectorStore never
+            # selects the embedding column, so rows are laid out as:
+            #   semantic search on documents:       id, metadata, content, document_metadata, similarity
+            #   semantic search on document_chunks: id, metadata, content, similarity
+            #   keyword search:                     id, content, metadata, document_metadata, rank
+            if len(row) >= 5:
+                if isinstance(row[1], dict):
+                    # Semantic search on documents: metadata comes before content
+                    metadata = row[1]
+                    content = row[2]
+                    document_metadata = row[3] or {}
+                else:
+                    # Keyword search: content comes before metadata
+                    content = row[1]
+                    metadata = row[2] or {}
+                    document_metadata = row[3] or {}
                 try:
-                    score_candidate = float(row[4])
-                    # This looks like: id, content, metadata, document_metadata, rank
-                    content = row[1] if len(row) > 1 else ''
-                    metadata = row[2] if len(row) > 2 else {}
-                    document_metadata = row[3] if len(row) > 3 else {}
-                    relevance_score = score_candidate
+                    relevance_score = float(row[4])
                 except (ValueError, TypeError):
-                    # This looks like: id, metadata, content, embedding, similarity (no document_metadata)
-                    metadata = row[1] if len(row) > 1 else {}
-                    content = row[2] if len(row) > 2 else ''
-                    document_metadata = {}
-                    relevance_score = float(row[4]) if len(row) > 4 else 0.0
+                    relevance_score = 0.0
+            elif len(row) == 4:
+                # Semantic search on document_chunks (no document_metadata)
+                metadata = row[1] or {}
+                content = row[2]
+                document_metadata = {}
+                try:
+                    relevance_score = float(row[3])
+                except (ValueError, TypeError):
+                    relevance_score = 0.0
             else:
                 # Fallback for unknown format
                 metadata = row[1] if len(row) > 1 else {}
@@ -756,7 +764,8 @@ def perform_semantic_search_all_chunks(vec_store, query, limit, project_ids=None
         # Add empty document_metadata column for compatibility with format_data function  
         semantic_results["document_metadata"] = [{}] * len(semantic_results)
         
-        # For semantic search on all chunks, semantic_search returns: [id, metadata, content, embedding, similarity]
+        # For semantic search on all chunks, semantic_search returns: [id, metadata, content, similarity]
+        # (the embedding column is not selected); document_metadata was added above
         # We need to reorder to: [id, content, search_type, similarity, metadata, document_metadata]
         semantic_results = semantic_results[["id", "content", "search_type", "similarity", "metadata", "document_metadata"]]
     
@@ -1038,6 +1047,7 @@ def is_generic_document_request(query: str) -> bool:
     return False
 
 
+@traced("strategy.DOCUMENT_ONLY")
 def perform_direct_metadata_search(vec_store, project_ids, document_type_ids, limit):
     """Perform direct metadata-based document search without semantic analysis.
     
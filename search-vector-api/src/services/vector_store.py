@@ -22,7 +22,9 @@ import psycopg
 from typing import Any, List, Optional, Tuple, Union
 from datetime import datetime
 from flask import current_app
-from .embedding import get_embedding
+from utils.tracing import SpanKind, start_span
+from .projection import chunk_metadata_sql, document_metadata_columns
+from .query_variants import nearest_params, nearest_sql, query_vectors
 from .tags.tag_extractor import get_tags
 
 class VectorStore:
@@ -53,8 +55,8 @@ class VectorStore:
             A pandas DataFrame with the search results.
         """
         if columns is None:
-            # Default columns for backward compatibility
-            columns = ["id", "metadata", "content", "embedding", "distance"]
+            # Default columns of a chunk semantic search (the embedding column is not selected)
+            columns = ["id", "metadata", "content", "similarity"]
             
         df = pd.DataFrame(results, columns=columns)
         df["id"] = df["id"].astype(str)
@@ -74,6 +76,8 @@ class VectorStore:
         
         This method performs a semantic search using vector similarity with pgvector,
         converting the query text into embeddings and finding the most similar documents.
+        When query variants are active (see query_variants), the nearest rows of the
+        query and of each variant are retrieved in the same statement.
         
         Args:
             table_name: The table to search in.
@@ -86,7 +90,7 @@ class VectorStore:
         Returns:
             Either a pandas DataFrame or a list of tuples containing search results.
         """
-        query_embedding = get_embedding([query])
+        vectors = query_vectors(query)
         start_time = time.time()
 
         # Build the WHERE clause based on filters
@@ -167,39 +171,23 @@ class VectorStore:
         logging.info(f"Document search WHERE clause: {where_clause}")
         logging.info(f"Document search parameters: {params}")
         
-        # Convert numpy array to Python list for database
-        embedding_list = query_embedding[0].tolist()
-        
         # Prepare parameters in the correct order for the SQL query
-        # Order: embedding (for similarity), WHERE clause params, embedding (for ordering), limit
-        sql_params = [embedding_list] + params + [embedding_list, limit]
+        # Order per query vector: embedding (for similarity), WHERE clause params, embedding (for ordering), limit
+        sql_params = nearest_params(vectors, params, limit)
         
         # Construct the SQL query using cosine distance with pgvector
         # Note: document_metadata only exists on documents table, not on document_chunks
+        # The embedding column is never selected; results are matched on similarity only
         if table_name == "documents":
-            search_sql = f"""
-            SELECT id, metadata, content, embedding, document_metadata, 1 - (embedding <=> %s::vector) as similarity
-            FROM {table_name}
-            WHERE {where_clause}
-            ORDER BY embedding <=> %s::vector
-            LIMIT %s
-            """
+            search_sql = nearest_sql(
+                "id, metadata, content, document_metadata", table_name, where_clause, len(vectors)
+            )
         else:
             # For document_chunks table, don't select document_metadata
-            search_sql = f"""
-            SELECT id, metadata, content, embedding, 1 - (embedding <=> %s::vector) as similarity
-            FROM {table_name}
-            WHERE {where_clause}
-            ORDER BY embedding <=> %s::vector
-            LIMIT %s
-            """
+            search_sql = nearest_sql(f"id, {chunk_metadata_sql()}, content", table_name, where_clause, len(vectors))
         
         # Execute the query using psycopg
-        conn_params = current_app.vector_settings.database_url
-        with psycopg.connect(conn_params) as conn:
-            with conn.cursor() as cur:
-                cur.execute(search_sql, sql_params)
-                results = cur.fetchall()
+        results = self._execute_query(search_sql, sql_params, "semantic_search")
         
         elapsed_time = time.time() - start_time
         self._log_search_time("Vector", elapsed_time)
@@ -208,9 +196,9 @@ class VectorStore:
             # Specify the correct column order for the semantic search results
             # Note: document_metadata only included when querying documents table
             if table_name == "documents":
-                columns = ["id", "metadata", "content", "embedding", "document_metadata", "similarity"]
+                columns = ["id", "metadata", "content", "document_metadata", "similarity"]
             else:
-                columns = ["id", "metadata", "content", "embedding", "similarity"]
+                columns = ["id", "metadata", "content", "similarity"]
             return self._create_dataframe_from_results(results, columns)
         else:
             return results
@@ -263,11 +251,7 @@ class VectorStore:
         LIMIT %s
         """
         doc_params.append(limit)
-        conn_params = current_app.vector_settings.database_url
-        with psycopg.connect(conn_params) as conn:
-            with conn.cursor() as cur:
-                cur.execute(doc_search_sql, doc_params)
-                doc_id_results = cur.fetchall()
+        doc_id_results = self._execute_query(doc_search_sql, doc_params, "keyword_search.documents")
         document_ids = [row[0] for row in doc_id_results]
 
         # If searching documents, return those results
@@ -283,10 +267,7 @@ class VectorStore:
                 WHERE document_id IN ({placeholders})
                 ORDER BY document_id DESC
                 """
-                with psycopg.connect(conn_params) as conn:
-                    with conn.cursor() as cur:
-                        cur.execute(fetch_sql, document_ids)
-                        results = cur.fetchall()
+                results = self._execute_query(fetch_sql, document_ids, "keyword_search.fetch_documents")
             elapsed_time = time.time() - start_time
             self._log_search_time("Keyword", elapsed_time)
             if return_dataframe:
@@ -324,17 +305,14 @@ class VectorStore:
                     chunk_where_conditions.append("(" + " OR ".join(chunk_search_conditions) + ")")
                 chunk_where_clause = " AND ".join(chunk_where_conditions)
                 chunk_sql = f"""
-                SELECT id, content, metadata
+                SELECT id, content, {chunk_metadata_sql()}
                 FROM {chunks_table}
                 WHERE {chunk_where_clause}
                 ORDER BY id DESC
                 LIMIT %s
                 """
                 chunk_params.append(limit)
-                with psycopg.connect(conn_params) as conn:
-                    with conn.cursor() as cur:
-                        cur.execute(chunk_sql, chunk_params)
-                        results = cur.fetchall()
+                results = self._execute_query(chunk_sql, chunk_params, "keyword_search.chunks")
             elapsed_time = time.time() - start_time
             self._log_search_time("Keyword", elapsed_time)
             if return_dataframe:
@@ -438,11 +416,7 @@ class VectorStore:
         """
         doc_params.append(limit)
         
-        conn_params = current_app.vector_settings.database_url
-        with psycopg.connect(conn_params) as conn:
-            with conn.cursor() as cur:
-                cur.execute(doc_search_sql, doc_params)
-                doc_id_results = cur.fetchall()
+        doc_id_results = self._execute_query(doc_search_sql, doc_params, "keyword_search_with_predicates.documents")
                 
         document_ids = [row[0] for row in doc_id_results]
         logging.info(f"VectorStore.keyword_search_with_predicates - Found {len(document_ids)} matching documents")
@@ -460,10 +434,7 @@ class VectorStore:
                 WHERE document_id IN ({placeholders})
                 ORDER BY document_id DESC
                 """
-                with psycopg.connect(conn_params) as conn:
-                    with conn.cursor() as cur:
-                        cur.execute(fetch_sql, document_ids)
-                        results = cur.fetchall()
+                results = self._execute_query(fetch_sql, document_ids, "keyword_search_with_predicates.fetch_documents")
             
             elapsed_time = time.time() - start_time
             self._log_search_time("Keyword (with predicates)", elapsed_time)
@@ -507,7 +478,7 @@ class VectorStore:
                 
                 chunk_where_clause = " AND ".join(chunk_where_conditions)
                 chunk_sql = f"""
-                SELECT id, content, metadata
+                SELECT id, content, {chunk_metadata_sql()}
                 FROM {chunks_table}
                 WHERE {chunk_where_clause}
                 ORDER BY id DESC
@@ -518,10 +489,7 @@ class VectorStore:
                 logging.info(f"VectorStore.keyword_search_with_predicates - Chunk search WHERE clause: {chunk_where_clause}")
                 logging.info(f"VectorStore.keyword_search_with_predicates - Chunk search parameters: {chunk_params}")
                 
-                with psycopg.connect(conn_params) as conn:
-                    with conn.cursor() as cur:
-                        cur.execute(chunk_sql, chunk_params)
-                        results = cur.fetchall()
+                results = self._execute_query(chunk_sql, chunk_params, "keyword_search_with_predicates.chunks")
             
             elapsed_time = time.time() - start_time
             self._log_search_time("Keyword (with predicates)", elapsed_time)
@@ -680,8 +648,7 @@ class VectorStore:
         # Construct the SQL query for document-level search
         documents_table = current_app.vector_settings.documents_table_name
         search_sql = f"""
-        SELECT document_id, document_keywords, document_tags, document_headings, 
-               project_id, embedding, created_at
+        SELECT document_id, project_id, created_at
         FROM {documents_table}
         WHERE {where_clause}
         ORDER BY created_at DESC
@@ -694,11 +661,7 @@ class VectorStore:
         logging.info(f"VectorStore.document_level_search - Complete parameters list: {params}")
         
         # Execute the query using psycopg
-        conn_params = current_app.vector_settings.database_url
-        with psycopg.connect(conn_params) as conn:
-            with conn.cursor() as cur:
-                cur.execute(search_sql, params)
-                results = cur.fetchall()
+        results = self._execute_query(search_sql, params, "document_level_search")
         
         logging.info(f"VectorStore.document_level_search - Query returned {len(results)} rows")
         
@@ -708,8 +671,7 @@ class VectorStore:
         if return_dataframe:
             df = pd.DataFrame(
                 results, 
-                columns=["document_id", "document_keywords", "document_tags", 
-                        "document_headings", "project_id", "embedding", "created_at"]
+                columns=["document_id", "project_id", "created_at"]
             )
             df["document_id"] = df["document_id"].astype(str)
             return df
@@ -769,15 +731,10 @@ class VectorStore:
         
         # Construct the SQL query for direct metadata search
         documents_table = current_app.vector_settings.documents_table_name
+        # Only the document fields the request asks for are extracted (see projection)
+        columns = document_metadata_columns(required=[order_by.split()[0]])
         metadata_sql = f"""
-        SELECT document_id, document_keywords, document_tags, document_headings, 
-               project_id, document_metadata, created_at,
-               document_metadata->>'document_date' as document_date,
-               document_metadata->>'document_name' as document_name,
-               document_metadata->>'document_saved_name' as document_saved_name,
-               document_metadata->>'project_name' as project_name,
-               document_metadata->>'proponent_name' as proponent_name,
-               document_metadata->>'s3_key' as s3_key
+        SELECT {", ".join(expression for expression, _ in columns)}
         FROM {documents_table}
         WHERE {where_clause}
         ORDER BY {order_by}
@@ -787,13 +744,8 @@ class VectorStore:
         params.append(limit)
         
         # Execute the query using psycopg
-        conn_params = current_app.vector_settings.database_url
-        with psycopg.connect(conn_params) as conn:
-            with conn.cursor() as cur:
-                cur.execute(metadata_sql, params)
-                results = cur.fetchall()
-                
-                logging.info(f"Direct metadata search returned {len(results)} results")
+        results = self._execute_query(metadata_sql, params, "get_documents_by_metadata")
+        logging.info(f"Direct metadata search returned {len(results)} results")
         
         elapsed_time = time.time() - start_time
         self._log_search_time("Direct metadata", elapsed_time)
@@ -801,10 +753,7 @@ class VectorStore:
         if return_dataframe:
             df = pd.DataFrame(
                 results, 
-                columns=["document_id", "document_keywords", "document_tags", 
-                        "document_headings", "project_id", "document_metadata", 
-                        "created_at", "document_date", "document_name", "document_saved_name",
-                        "project_name", "proponent_name", "s3_key"]
+                columns=[name for _, name in columns]
             )
             df["document_id"] = df["document_id"].astype(str)
             return df
@@ -840,13 +789,10 @@ class VectorStore:
             else:
                 return []
         
-        from .embedding import get_embedding
-        
         start_time = time.time()
         
-        # Get query embedding
-        query_embedding = get_embedding([query])
-        embedding_list = query_embedding[0].tolist()
+        # Get query embedding (plus any active query variant embeddings)
+        vectors = query_vectors(query)
         
         # Create placeholders for document IDs
         placeholders = ','.join(['%s'] * len(document_ids))
@@ -854,24 +800,16 @@ class VectorStore:
         # Construct the SQL query for chunk search within specific documents
         chunks_table = current_app.vector_settings.vector_table_name
         # Note: document_metadata does not exist on document_chunks table
-        search_sql = f"""
-        SELECT id, metadata, content, document_id, project_id,
-               1 - (embedding <=> %s::vector) as similarity
-        FROM {chunks_table}
-        WHERE document_id IN ({placeholders})
-        ORDER BY embedding <=> %s::vector
-        LIMIT %s
-        """
+        search_sql = nearest_sql(
+            f"id, {chunk_metadata_sql()}, content, document_id, project_id", chunks_table,
+            f"document_id IN ({placeholders})", len(vectors)
+        )
         
-        # Prepare parameters: embedding, document_ids, embedding again, limit
-        params = [embedding_list] + document_ids + [embedding_list, limit]
+        # Prepare parameters per query vector: embedding, document_ids, embedding again, limit
+        params = nearest_params(vectors, document_ids, limit)
         
         # Execute the query using psycopg
-        conn_params = current_app.vector_settings.database_url
-        with psycopg.connect(conn_params) as conn:
-            with conn.cursor() as cur:
-                cur.execute(search_sql, params)
-                results = cur.fetchall()
+        results = self._execute_query(search_sql, params, "search_chunks_by_documents")
         
         elapsed_time = time.time() - start_time
         self._log_search_time("Chunk-within-documents", elapsed_time)
@@ -887,6 +825,38 @@ class VectorStore:
         else:
             return results
 
+    def _execute_query(self, sql: str, params, operation: str, fetch_one: bool = False):
+        """
+        Execute a SQL statement against the vector database and return its rows.
+        
+        Each statement is recorded as a tracing span so that database time can be
+        attributed to the individual queries issued by a search strategy. When
+        HNSW_EF_SEARCH is configured it is applied to the session first.
+        
+        Args:
+            sql: The SQL statement to execute.
+            params: Parameters bound to the statement placeholders.
+            operation: Short name of the calling operation, used in the span name.
+            fetch_one: If True, return a single row instead of a list of rows.
+            
+        Returns:
+            A list of result tuples, or a single tuple (or None) when fetch_one is True.
+        """
+        statement = " ".join(sql.split())
+        with start_span(f"sql.{operation}", {"db.system": "postgresql", "db.statement": statement[:2000]},
+                        kind=SpanKind.CLIENT) as span:
+            with psycopg.connect(current_app.vector_settings.database_url) as conn:
+                with conn.cursor() as cur:
+                    ef_search = current_app.vector_settings.hnsw_ef_search
+                    if ef_search:
+                        cur.execute("SELECT set_config('hnsw.ef_search', %s, false)", [str(ef_search)])
+                    cur.execute(sql, params)
+                    if fetch_one:
+                        return cur.fetchone()
+                    rows = cur.fetchall()
+            span.set_attribute("db.rows", len(rows))
+            return rows
+
     def _log_search_time(self, search_type: str, elapsed_time: float) -> None:
         """
         Log the time taken for a search operation.
@@ -917,11 +887,7 @@ class VectorStore:
         """
         
         # Execute the query using psycopg
-        conn_params = current_app.vector_settings.database_url
-        with psycopg.connect(conn_params) as conn:
-            with conn.cursor() as cur:
-                cur.execute(search_sql, (document_id,))
-                result = cur.fetchone()
+        result = self._execute_query(search_sql, (document_id,), "get_document_embedding", fetch_one=True)
         
         elapsed_time = time.time() - start_time
         self._log_search_time("Document embedding retrieval", elapsed_time)
@@ -1042,11 +1008,7 @@ class VectorStore:
         final_params = [embedding_str] + params + [embedding_str, limit]
         
         # Execute the query using psycopg
-        conn_params = current_app.vector_settings.database_url
-        with psycopg.connect(conn_params) as conn:
-            with conn.cursor() as cur:
-                cur.execute(search_sql, final_params)
-                results = cur.fetchall()
+        results = self._execute_query(search_sql, final_params, "document_similarity_search")
         
         elapsed_time = time.time() - start_time
         self._log_search_time("Document similarity", elapsed_time)
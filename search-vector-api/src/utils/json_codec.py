@@ -0,0 +1,114 @@
+"""Fast JSON encoding of API responses.
+
+Search responses carry hundreds of result dicts with long content strings, and
+the stdlib encoder spent a noticeable part of each request serializing them.
+Responses are encoded with orjson instead, which handles numpy scalars and arrays
+(the cross-encoder relevance scores), datetimes (ISO 8601) and Decimal values.
+
+Search responses also report where their result list sits in the body: the
+``X-Result-Span`` header holds its ``start-end`` byte offsets and
+``X-Result-Count`` the number of results. The search API uses them to forward
+the list into its own response without decoding and re-encoding it.
+"""
+
+import decimal
+import uuid
+from http import HTTPStatus
+from typing import Any, Optional, Sequence, Tuple
+
+import orjson
+from flask import Response
+from flask.json.provider import JSONProvider
+
+OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+RESULT_SPAN_HEADER = "X-Result-Span"
+RESULT_COUNT_HEADER = "X-Result-Count"
+
+
+def _default(obj: Any) -> Any:
+    """Encode the types orjson does not handle natively."""
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "dtype") and hasattr(obj, "item"):
+        # numpy scalar types orjson does not serialize (e.g. float16)
+        return obj.item()
+    if hasattr(obj, "isoformat"):
+        # pandas Timestamp, date and time values
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode an object to JSON bytes."""
+    return orjson.dumps(obj, default=_default, option=OPTIONS)
+
+
+def loads(data: Any) -> Any:
+    """Decode JSON bytes or text."""
+    return orjson.loads(data)
+
+
+def dumps_with_span(payload: dict, path: Sequence[str]) -> Tuple[bytes, Tuple[int, int], int]:
+    """Encode a payload and locate the list at ``path`` in the encoded bytes.
+
+    Returns:
+        The body, the (start, end) byte offsets of the list and its length.
+    """
+    *parents, key = path
+    container = payload
+    for name in parents:
+        container = container[name]
+    results = container[key]
+
+    marker = f"\x00{uuid.uuid4().hex}\x00"
+    container[key] = marker
+    try:
+        envelope = dumps(payload)
+    finally:
+        container[key] = results
+    encoded_marker = dumps(marker)
+    start = envelope.index(encoded_marker)
+    encoded = dumps(results)
+    body = envelope[:start] + encoded + envelope[start + len(encoded_marker):]
+    return body, (start, start + len(encoded)), len(results)
+
+
+def response(payload: Any, status: int = HTTPStatus.OK, span: Optional[Sequence[str]] = None) -> Response:
+    """Build a JSON response.
+
+    Args:
+        payload: The response body
+        status: The HTTP status
+        span: Path of a result list whose byte span and length are reported in headers
+    """
+    if span is None:
+        return Response(dumps(payload), status=status, mimetype="application/json")
+    body, (start, end), count = dumps_with_span(payload, span)
+    headers = {RESULT_SPAN_HEADER: f"{start}-{end}", RESULT_COUNT_HEADER: str(count)}
+    return Response(body, status=status, mimetype="application/json", headers=headers)
+
+
+def output_json(data: Any, code: int, headers: Optional[dict] = None) -> Response:
+    """Flask-RESTX representation for ``application/json``."""
+    resp = Response(dumps(data), status=code, mimetype="application/json")
+    resp.headers.extend(headers or {})
+    return resp
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider (``jsonify``, ``request.get_json``) backed by orjson."""
+
+    mimetype = "application/json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps(obj).decode("utf-8")
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
@@ -0,0 +1,49 @@
+"""Test module for formatting search result rows.
+
+This module contains tests to ensure rows that are not DataFrames are read with
+the column layouts VectorStore selects, which no longer include the embedding.
+"""
+
+import unittest
+import sys
+import os
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
+
+from services.vector_search import format_data
+
+METADATA = {"document_id": "doc-1", "project_id": "p-1", "page_number": 4}
+DOCUMENT_METADATA = {"document_type": "Report"}
+
+
+class TestFormatDataRows(unittest.TestCase):
+    """Test cases for the row layouts handled without a DataFrame."""
+
+    def test_semantic_chunk_row(self):
+        """id, metadata, content, similarity."""
+        result = format_data([("c-1", METADATA, "Caribou habitat", 0.82)])[0]
+
+        self.assertEqual(result["content"], "Caribou habitat")
+        self.assertEqual(result["document_id"], "doc-1")
+        self.assertAlmostEqual(result["relevance_score"], 0.82)
+
+    def test_semantic_document_row(self):
+        """id, metadata, content, document_metadata, similarity."""
+        result = format_data([("d-1", METADATA, "Caribou habitat", DOCUMENT_METADATA, 0.75)])[0]
+
+        self.assertEqual(result["content"], "Caribou habitat")
+        self.assertEqual(result["page_number"], 4)
+        self.assertAlmostEqual(result["relevance_score"], 0.75)
+
+    def test_keyword_row(self):
+        """id, content, metadata, document_metadata, rank."""
+        result = format_data([("c-2", "Noise study", METADATA, DOCUMENT_METADATA, 1.5)])[0]
+
+        self.assertEqual(result["content"], "Noise study")
+        self.assertEqual(result["project_id"], "p-1")
+        self.assertAlmostEqual(result["relevance_score"], 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Test module for result field projection and content truncation.
+
+This module contains tests to ensure requested fields are kept, content is cut
+to the snippet length and the select lists only fetch the columns needed.
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
+
+from services import projection
+from services.query_variants import _output_names
+
+RESULTS = [
+    {
+        "document_id": "doc-1",
+        "document_name": "Caribou Habitat Assessment",
+        "page_number": 12,
+        "content": "Caribou habitat within the project area overlaps seasonal ranges used in winter.",
+        "relevance_score": 4.2,
+    },
+    {
+        "document_id": "doc-2",
+        "document_name": "Noise Study",
+        "page_number": 3,
+        "content": "Short content.",
+        "relevance_score": 1.1,
+    },
+]
+
+
+class TestProjection(unittest.TestCase):
+    """Test cases for result projection and projected select lists."""
+
+    def test_results_unchanged_without_projection(self):
+        """Without fields or a snippet length the results are returned as they are and not encoded."""
+        with patch.object(projection.json_codec, "dumps") as dumps:
+            projected, metrics = projection.apply(RESULTS)
+
+        self.assertIs(projected, RESULTS)
+        self.assertEqual(metrics, {"result_count": 2})
+        dumps.assert_not_called()
+
+    def test_fields_are_projected_and_content_truncated(self):
+        """Only requested fields are kept and long content is cut on a word boundary."""
+        with projection.using(["document_id", "content", "relevance_score"], 30):
+            projected, metrics = projection.apply(RESULTS)
+
+        self.assertEqual(set(projected[0]), {"document_id", "content", "relevance_score"})
+        self.assertEqual(projected[0]["content"], "Caribou habitat within the…")
+        self.assertEqual(projected[1]["content"], "Short content.")
+        self.assertEqual(metrics["fields"], ["content", "document_id", "relevance_score"])
+        self.assertEqual(metrics["snippet_chars"], 30)
+        self.assertGreater(metrics["bytes_saved"], 0)
+        self.assertEqual(metrics["unprojected_bytes"] - metrics["payload_bytes"], metrics["bytes_saved"])
+        # The input results are not modified
+        self.assertIn("document_name", RESULTS[0])
+
+    def test_metadata_columns_follow_projection(self):
+        """Direct metadata searches only extract requested document fields."""
+        with projection.using(["document_id", "document_name"]):
+            names = [name for _, name in projection.document_metadata_columns(required=["document_date"])]
+
+        self.assertEqual(names, ["document_id", "project_id", "created_at", "document_date", "document_name"])
+
+        all_names = [name for _, name in projection.document_metadata_columns()]
+        self.assertIn("document_metadata", all_names)
+        self.assertIn("s3_key", all_names)
+
+    def test_chunk_metadata_and_aliased_output_names(self):
+        """Filter-only metadata arrays are stripped and aliased columns are selected by name."""
+        metadata = projection.chunk_metadata_sql()
+
+        self.assertEqual(metadata, "metadata - 'keywords' - 'tags' - 'headings' AS metadata")
+        self.assertEqual(
+            _output_names(f"id, content, {metadata}, coalesce(a, b) as score"),
+            "id, content, metadata, score",
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Test module for multi-query search over query variants.
+
+This module contains tests to ensure near-duplicate query variants are collapsed
+before retrieval and that the semantic SQL covers every remaining variant.
+"""
+
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+import numpy as np
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
+
+from services import query_variants
+
+EMBEDDINGS = {
+    "caribou habitat impacts": [1.0, 0.0, 0.0],
+    "impacts on caribou habitat": [0.99, 0.1, 0.0],
+    "caribou range disturbance": [0.6, 0.8, 0.0],
+    "wildlife corridor mitigation": [0.0, 0.2, 0.98],
+}
+
+
+def fake_embedding(texts):
+    """Return fixed embeddings for the test queries."""
+    return np.array([EMBEDDINGS[text] for text in texts])
+
+
+@patch("services.query_variants.get_embedding", side_effect=fake_embedding)
+class TestQueryVariants(unittest.TestCase):
+    """Test cases for query variant collapsing and multi-query SQL."""
+
+    def test_near_duplicates_are_collapsed(self, _embedding):
+        """Paraphrases too close to the query or a kept variant are dropped."""
+        kept, vectors, metrics = query_variants.collapse(
+            "caribou habitat impacts",
+            ["impacts on caribou habitat", "Caribou habitat impacts", "caribou range disturbance",
+             "wildlife corridor mitigation"],
+            similarity=0.92,
+            max_variants=4,
+        )
+
+        self.assertEqual(kept, ["caribou range disturbance", "wildlife corridor mitigation"])
+        self.assertEqual(vectors, [EMBEDDINGS[text] for text in kept])
+        self.assertEqual(metrics["received"], 4)
+        self.assertEqual(metrics["collapsed"], 2)
+
+    def test_max_variants_limits_kept_variants(self, _embedding):
+        """No more than max_variants variants are kept."""
+        kept, _, metrics = query_variants.collapse(
+            "caribou habitat impacts",
+            ["caribou range disturbance", "wildlife corridor mitigation"],
+            similarity=0.92,
+            max_variants=1,
+        )
+
+        self.assertEqual(kept, ["caribou range disturbance"])
+        self.assertEqual(metrics["used"], 1)
+
+    def test_active_variants_are_searched_in_one_statement(self, _embedding):
+        """Each active variant adds a nearest-neighbour branch to the same query."""
+        with query_variants.using([EMBEDDINGS["wildlife corridor mitigation"]]):
+            vectors = query_variants.query_vectors("caribou habitat impacts")
+        sql = query_variants.nearest_sql("id, content", "document_chunks", "project_id = %s", len(vectors))
+        params = query_variants.nearest_params(vectors, ["p1"], 10)
+
+        self.assertEqual(len(vectors), 2)
+        self.assertEqual(sql.count("UNION ALL"), 1)
+        self.assertEqual(sql.count("%s"), len(params))
+        self.assertEqual(query_variants.query_vectors("caribou habitat impacts"), [EMBEDDINGS["caribou habitat impacts"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
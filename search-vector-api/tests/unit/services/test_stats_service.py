@@ -0,0 +1,64 @@
+"""Test module for the processing statistics service.
+
+Checks that stats are served from the per-project counters table and that the
+service still works against databases where the embedder has not created it yet.
+"""
+
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+import psycopg
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
+
+from services.stats_service import StatsService, LEGACY_STATS_QUERY
+
+
+class TestStatsService(unittest.TestCase):
+    """Test cases for StatsService."""
+
+    def test_processing_stats_from_counters(self):
+        """Test that project stats and totals are built from the counter rows."""
+        rows = [
+            ("p1", "Alpha Mine", 10, 8, 1, 1),
+            ("p2", "Beta LNG", 0, 0, 0, 0),
+        ]
+        with patch.object(StatsService, "_fetch_all", return_value=rows) as fetch:
+            result = StatsService.get_processing_stats()
+
+        self.assertIn("project_processing_stats", fetch.call_args[0][0])
+        projects = result["processing_stats"]["projects"]
+        self.assertEqual(len(projects), 1)
+        self.assertEqual(projects[0]["overall_success_rate"], 80.0)
+        self.assertEqual(projects[0]["processing_success_rate"], 88.89)
+        self.assertEqual(result["processing_stats"]["summary"]["total_files_across_all_projects"], 10)
+
+    def test_processing_stats_falls_back_without_counters(self):
+        """Test that a missing counters table falls back to aggregating processing_logs."""
+        legacy_rows = [("p1", "Alpha Mine", 4, 2, 2, 0)]
+        with patch.object(
+            StatsService, "_fetch_all", side_effect=[psycopg.errors.UndefinedTable("missing"), legacy_rows]
+        ) as fetch:
+            result = StatsService.get_processing_stats()
+
+        self.assertEqual(fetch.call_args[0][0], LEGACY_STATS_QUERY.format(where_clause=""))
+        self.assertEqual(result["processing_stats"]["summary"]["overall_processing_success_rate"], 50.0)
+
+    def test_processing_summary(self):
+        """Test that the system summary comes from a single aggregate row."""
+        row = (2, 30, 25, 3, 2, 1, 2, 83.3333)
+        with patch.object(StatsService, "_fetch_all", return_value=[row]):
+            summary = StatsService.get_processing_summary()["processing_summary"]
+
+        self.assertEqual(summary["total_projects"], 2)
+        self.assertEqual(summary["overall_success_rate"], 83.33)
+        self.assertEqual(summary["overall_processing_success_rate"], 89.29)
+        self.assertEqual(summary["projects_with_failures"], 1)
+        self.assertEqual(summary["avg_success_rate_per_project"], 83.33)
+
+
+if __name__ == "__main__":
+    unittest.main()
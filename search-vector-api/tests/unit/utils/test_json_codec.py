@@ -0,0 +1,58 @@
+"""Test module for the orjson response encoding.
+
+This module contains tests to ensure search payload types are encoded and that
+the reported byte span of a result list matches the encoded body.
+"""
+
+import datetime
+import decimal
+import json
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
+
+from utils import json_codec
+
+
+class TestJsonCodec(unittest.TestCase):
+    """Test cases for response encoding."""
+
+    def test_numpy_datetime_and_decimal_values(self):
+        """Cross-encoder scores, datetimes and Decimal values are encoded."""
+        encoded = json_codec.dumps({
+            "relevance_score": np.float32(2.5),
+            "page_number": np.int64(4),
+            "embedding": np.array([0.5, 0.25]),
+            "document_date": datetime.datetime(2024, 3, 1, 9, 30),
+            "similarity": decimal.Decimal("0.75"),
+        })
+
+        self.assertEqual(json.loads(encoded), {
+            "relevance_score": 2.5,
+            "page_number": 4,
+            "embedding": [0.5, 0.25],
+            "document_date": "2024-03-01T09:30:00",
+            "similarity": 0.75,
+        })
+
+    def test_result_span_locates_the_result_list(self):
+        """The reported span holds exactly the encoded result list."""
+        chunks = [{"document_id": "doc-1", "content": "Caribou \"habitat\" ranges"}, {"document_id": "doc-2"}]
+        payload = {"vector_search": {"document_chunks": chunks, "original_query": "caribou"}}
+
+        body, (start, end), count = json_codec.dumps_with_span(payload, ("vector_search", "document_chunks"))
+
+        self.assertEqual(count, 2)
+        self.assertEqual(json.loads(body[start:end]), chunks)
+        self.assertEqual(json.loads(body), payload)
+        # The payload is left unchanged
+        self.assertIs(payload["vector_search"]["document_chunks"], chunks)
+
+
+if __name__ == '__main__':
+    unittest.main()
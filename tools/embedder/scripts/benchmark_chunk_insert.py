@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark chunk loading: SQLAlchemy ORM batches versus binary COPY.
+
+This script:
+1. Generates synthetic chunks shaped like the embedder's output (content,
+   chunk metadata and an embedding of EMBEDDING_DIMENSIONS floats)
+2. Loads them into document_chunks with the ORM path (CHUNK_INSERT_MODE=orm)
+   and with the binary COPY path (CHUNK_INSERT_MODE=copy)
+3. Reports rows/s for each path and the speedup
+4. Deletes the benchmark rows
+
+The rows are written under a throwaway document ID, so the script can run
+against a live database, but it does add (and then remove) rows and index
+entries: prefer a development or staging database.
+
+Usage:
+    python scripts/benchmark_chunk_insert.py [--rows ROWS] [--runs RUNS]
+
+Arguments:
+    --rows: Number of chunks per load (default: 1000)
+    --runs: Number of loads per path; the best run is reported (default: 3)
+"""
+
+import os
+import sys
+import argparse
+import time
+import uuid
+
+import numpy as np
+
+# Add the project root to Python path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+sys.path.insert(0, project_root)
+
+# Import project modules
+from src.path_setup import setup_paths
+setup_paths()
+
+from src.config.settings import get_settings
+from src.models import get_session
+from src.models.pgvector.vector_models import DocumentChunk
+from src.services.loader import _copy_chunks, _insert_chunk_objects
+
+settings = get_settings()
+
+
+def make_chunks(rows: int, dimensions: int) -> list:
+    """Generate synthetic chunks similar in size to real ones."""
+    rng = np.random.default_rng(42)
+    content = ("Caribou habitat within the project area overlaps seasonal ranges. " * 15)[:1000]
+    chunks = []
+    for i in range(rows):
+        chunks.append({
+            "embedding": rng.random(dimensions, dtype=np.float32),
+            "metadata": {
+                "page_number": i // 4 + 1,
+                "keywords": ["caribou", "habitat", "seasonal range"],
+                "tags": ["Wildlife", "Environment"],
+                "headings": ["Wildlife Assessment"],
+                "document_metadata": {"document_name": "benchmark.pdf", "document_type": "Report"},
+            },
+            "content": content,
+        })
+    return chunks
+
+
+def run(label: str, load, session, chunks: list, doc_id: str, runs: int) -> float:
+    """Load the chunks ``runs`` times and return the best rows/s."""
+    best = 0.0
+    for attempt in range(runs):
+        # Each load starts from an empty document
+        session.query(DocumentChunk).filter_by(document_id=doc_id).delete(synchronize_session=False)
+        session.commit()
+        start = time.perf_counter()
+        load(session, chunks, doc_id)
+        elapsed = time.perf_counter() - start
+        rows_per_sec = len(chunks) / elapsed
+        best = max(best, rows_per_sec)
+        print(f"  {label} run {attempt + 1}: {elapsed:.3f}s ({rows_per_sec:,.0f} rows/s)")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ORM versus binary COPY chunk loading')
+    parser.add_argument('--rows', type=int, default=1000, help='Number of chunks per load')
+    parser.add_argument('--runs', type=int, default=3, help='Number of loads per path')
+    args = parser.parse_args()
+
+    dimensions = int(settings.vector_store_settings.embedding_dimensions)
+    chunks = make_chunks(args.rows, dimensions)
+    doc_id = f"benchmark-{uuid.uuid4()}"
+    project_id = "benchmark"
+    batch_size = settings.multi_processing_settings.chunk_insert_batch_size
+
+    print(f"Loading {args.rows} chunks of {dimensions} dimensions, best of {args.runs} runs")
+    session = get_session()
+    try:
+        orm = run(f"ORM (batch size {batch_size})",
+                  lambda s, c, d: _insert_chunk_objects(s, c, d, project_id, batch_size),
+                  session, chunks, doc_id, args.runs)
+        copy = run("Binary COPY",
+                   lambda s, c, d: _copy_chunks(s, c, d, project_id),
+                   session, chunks, doc_id, args.runs)
+        print(f"\nORM:         {orm:,.0f} rows/s")
+        print(f"Binary COPY: {copy:,.0f} rows/s")
+        print(f"Speedup:     {copy / orm:.1f}x")
+    finally:
+        session.rollback()
+        session.query(DocumentChunk).filter_by(document_id=doc_id).delete(synchronize_session=False)
+        session.commit()
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -20,10 +20,12 @@ class EmbeddingModelSettings(BaseModel):
     
     Attributes:
         model_name (str): Name of the sentence transformer model to use for document embeddings
+        batch_size (int): Number of chunks encoded per batch (chunks are sorted by token length first)
     """
     model_name: str = Field(default_factory=lambda:
         os.environ.get("EMBEDDING_MODEL_NAME", "all-mpnet-base-v2")
     )
+    batch_size: int = Field(default_factory=lambda: int(os.environ.get("EMBEDDING_BATCH_SIZE", 32)))
 
 class KeywordExtractionSettings(BaseModel):
     """
@@ -79,12 +81,14 @@ class MultiProcessingSettings(BaseModel):
     Attributes:
         files_concurrency_size (int): Number of documents to process in parallel (use all cores for server)
         chunk_insert_batch_size (int): Number of chunks to insert per database batch
+        chunk_insert_mode (str): How chunks are written: copy (binary COPY via a staging table) or orm
         keyword_extraction_workers (int): Number of threads per document for keyword extraction
         keyword_extraction_mode (str): Mode for keyword extraction (standard, fast, simplified)
         debug_file_size_issues (bool): Whether to log debug info for missing file size information
     """
     files_concurrency_size: int = Field(default_factory=lambda: _parse_files_concurrency())
     chunk_insert_batch_size: int = Field(default_factory=lambda: int(os.environ.get("CHUNK_INSERT_BATCH_SIZE", 25)))
+    chunk_insert_mode: str = Field(default_factory=lambda: os.environ.get("CHUNK_INSERT_MODE", "copy").lower())
     keyword_extraction_workers: int = Field(default_factory=lambda: _parse_keyword_workers())
     keyword_extraction_mode: str = Field(default_factory=lambda: os.environ.get("KEYWORD_EXTRACTION_MODE", "standard"))
     debug_file_size_issues: bool = Field(default_factory=lambda: os.environ.get("DEBUG_FILE_SIZE_ISSUES", "true").lower() in ("true", "1", "yes"))
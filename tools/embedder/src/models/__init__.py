@@ -17,7 +17,7 @@
 
 from .pgvector.vector_db_utils import init_vec_db, SessionLocal
 from .pgvector.vector_store import VectorStore
-from .pgvector.vector_models import DocumentChunk, Document, Project, ProcessingLog, Base
+from .pgvector.vector_models import DocumentChunk, Document, Project, ProcessingLog, ProjectProcessingStats, Base
 from .pgvector import VectorStore as PgVectorStore
 
 def get_session():
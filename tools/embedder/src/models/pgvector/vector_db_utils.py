@@ -35,6 +35,193 @@ def ensure_search_feedback_columns(conn):
 
     conn.commit()
 
+def ensure_processing_stats_maintenance(conn):
+    """
+    Install the trigger that keeps project_processing_stats in step with processing_logs.
+    
+    Every insert, status change, or delete on processing_logs adjusts the owning
+    project's counters in the same transaction, whichever code path wrote the row
+    (ORM sessions, bulk deletes in the repair tools, or the retrospective scripts).
+    The stats endpoints then read one row per project instead of aggregating logs.
+    
+    The triggers are installed and the counters backfilled in one transaction that
+    holds a SHARE ROW EXCLUSIVE lock on processing_logs, so no log row can be written
+    between the two steps (it would be counted by the trigger and missed by the
+    backfill, or counted twice). The counters are rebuilt when the row trigger was
+    not installed yet, i.e. when nothing has been maintaining them.
+    """
+    from sqlalchemy import text
+
+    print("Ensuring processing stats trigger exists...")
+
+    # Blocks concurrent writes to processing_logs (and a concurrent run of this
+    # function) until the commit below
+    conn.execute(text("LOCK TABLE processing_logs IN SHARE ROW EXCLUSIVE MODE;"))
+    trigger_installed = conn.execute(text("""
+        SELECT EXISTS (
+            SELECT 1 FROM pg_trigger
+            WHERE tgname = 'trg_processing_logs_stats'
+              AND tgrelid = 'processing_logs'::regclass
+        );
+    """)).scalar()
+
+    conn.execute(text("""
+        CREATE OR REPLACE FUNCTION apply_processing_stats_delta(
+            p_project_id VARCHAR, p_status VARCHAR, p_delta INTEGER, p_processed_at TIMESTAMPTZ
+        ) RETURNS VOID AS $$
+        BEGIN
+            INSERT INTO project_processing_stats AS s (
+                project_id, total_files, successful_files, failed_files, skipped_files,
+                last_processed_at, updated_at
+            ) VALUES (
+                p_project_id, p_delta,
+                CASE WHEN p_status = 'success' THEN p_delta ELSE 0 END,
+                CASE WHEN p_status = 'failure' THEN p_delta ELSE 0 END,
+                CASE WHEN p_status = 'skipped' THEN p_delta ELSE 0 END,
+                p_processed_at, now()
+            )
+            ON CONFLICT (project_id) DO UPDATE SET
+                total_files = s.total_files + EXCLUDED.total_files,
+                successful_files = s.successful_files + EXCLUDED.successful_files,
+                failed_files = s.failed_files + EXCLUDED.failed_files,
+                skipped_files = s.skipped_files + EXCLUDED.skipped_files,
+                last_processed_at = GREATEST(s.last_processed_at, EXCLUDED.last_processed_at),
+                updated_at = now();
+        END;
+        $$ LANGUAGE plpgsql;
+    """))
+
+    conn.execute(text("""
+        CREATE OR REPLACE FUNCTION maintain_project_processing_stats() RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM apply_processing_stats_delta(NEW.project_id, NEW.status, 1, NEW.processed_at);
+            ELSIF TG_OP = 'DELETE' THEN
+                PERFORM apply_processing_stats_delta(OLD.project_id, OLD.status, -1, NULL);
+            ELSIF NEW.project_id IS DISTINCT FROM OLD.project_id OR NEW.status IS DISTINCT FROM OLD.status THEN
+                PERFORM apply_processing_stats_delta(OLD.project_id, OLD.status, -1, NULL);
+                PERFORM apply_processing_stats_delta(NEW.project_id, NEW.status, 1, NEW.processed_at);
+            ELSE
+                PERFORM apply_processing_stats_delta(NEW.project_id, NEW.status, 0, NEW.processed_at);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """))
+
+    conn.execute(text("""
+        CREATE OR REPLACE FUNCTION truncate_project_processing_stats() RETURNS TRIGGER AS $$
+        BEGIN
+            DELETE FROM project_processing_stats;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """))
+
+    conn.execute(text("DROP TRIGGER IF EXISTS trg_processing_logs_stats ON processing_logs;"))
+    conn.execute(text("""
+        CREATE TRIGGER trg_processing_logs_stats
+        AFTER INSERT OR UPDATE OR DELETE ON processing_logs
+        FOR EACH ROW EXECUTE FUNCTION maintain_project_processing_stats();
+    """))
+    conn.execute(text("DROP TRIGGER IF EXISTS trg_processing_logs_stats_truncate ON processing_logs;"))
+    conn.execute(text("""
+        CREATE TRIGGER trg_processing_logs_stats_truncate
+        AFTER TRUNCATE ON processing_logs
+        FOR EACH STATEMENT EXECUTE FUNCTION truncate_project_processing_stats();
+    """))
+    if not trigger_installed:
+        _rebuild_processing_stats(conn)
+    conn.commit()
+
+def ensure_catalogue_generation(conn):
+    """
+    Ensure the catalogue_generation counter and its trigger on projects exist.
+    
+    The search APIs use the counter as the version (ETag) of the projects catalogue,
+    so clients can revalidate with a cheap 304 instead of refetching the full list.
+    Any insert, delete, truncate, or update that actually changes a project row bumps it.
+    """
+    from sqlalchemy import text
+
+    print("Ensuring catalogue generation counter exists...")
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS catalogue_generation (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            generation BIGINT NOT NULL,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+    """))
+    conn.execute(text("""
+        INSERT INTO catalogue_generation (id, generation) VALUES (1, 1)
+        ON CONFLICT (id) DO NOTHING;
+    """))
+    conn.execute(text("""
+        CREATE OR REPLACE FUNCTION bump_catalogue_generation() RETURNS TRIGGER AS $$
+        BEGIN
+            UPDATE catalogue_generation SET generation = generation + 1, updated_at = now() WHERE id = 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """))
+    conn.execute(text("DROP TRIGGER IF EXISTS trg_projects_catalogue_generation ON projects;"))
+    conn.execute(text("""
+        CREATE TRIGGER trg_projects_catalogue_generation
+        AFTER INSERT OR DELETE OR TRUNCATE ON projects
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_catalogue_generation();
+    """))
+    conn.execute(text("DROP TRIGGER IF EXISTS trg_projects_catalogue_generation_update ON projects;"))
+    conn.execute(text("""
+        CREATE TRIGGER trg_projects_catalogue_generation_update
+        AFTER UPDATE ON projects
+        FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+        EXECUTE FUNCTION bump_catalogue_generation();
+    """))
+    conn.commit()
+
+def rebuild_processing_stats(conn):
+    """
+    Recompute project_processing_stats from processing_logs in a single transaction.
+    
+    Safe to run at any time: processing_logs is locked against writes until the
+    rebuild commits, so no trigger update can be lost or counted twice.
+    """
+    from sqlalchemy import text
+
+    conn.execute(text("LOCK TABLE processing_logs IN SHARE ROW EXCLUSIVE MODE;"))
+    _rebuild_processing_stats(conn)
+    conn.commit()
+    print("project_processing_stats rebuilt.")
+
+def _rebuild_processing_stats(conn):
+    """
+    Recompute project_processing_stats from processing_logs within the caller's transaction.
+    
+    The caller must hold a lock on processing_logs that excludes writers.
+    """
+    from sqlalchemy import text
+
+    print("Rebuilding project_processing_stats from processing_logs...")
+    conn.execute(text("LOCK TABLE project_processing_stats IN EXCLUSIVE MODE;"))
+    conn.execute(text("DELETE FROM project_processing_stats;"))
+    conn.execute(text("""
+        INSERT INTO project_processing_stats (
+            project_id, total_files, successful_files, failed_files, skipped_files,
+            last_processed_at, updated_at
+        )
+        SELECT
+            project_id,
+            COUNT(*),
+            COUNT(*) FILTER (WHERE status = 'success'),
+            COUNT(*) FILTER (WHERE status = 'failure'),
+            COUNT(*) FILTER (WHERE status = 'skipped'),
+            MAX(processed_at),
+            now()
+        FROM processing_logs
+        GROUP BY project_id;
+    """))
+
 from .vector_store import VectorStore
 from sqlalchemy.orm import sessionmaker
 
@@ -53,7 +240,7 @@ Vector Database Utilities module for unified pgvector integration and ORM manage
 """
 
 from src.config.settings import get_settings
-from src.models.pgvector.vector_models import Base, DocumentChunk, Document, Project, ProcessingLog, SearchFeedback
+from src.models.pgvector.vector_models import Base, DocumentChunk, Document, Project, ProcessingLog, ProjectProcessingStats, SearchFeedback
 from sqlalchemy import create_engine, text, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.engine import Engine
@@ -144,11 +331,11 @@ def init_vec_db(skip_hnsw=False):
     # Drop and recreate tables if reset_db is True (dev/test only!)
     if settings.vector_store_settings.reset_db:
         print("[WARNING] RESET_DB=True - Dropping all existing tables and data!")
-        Base.metadata.drop_all(engine, tables=[DocumentChunk.__table__, Document.__table__, Project.__table__, ProcessingLog.__table__])
+        Base.metadata.drop_all(engine, tables=[DocumentChunk.__table__, Document.__table__, Project.__table__, ProcessingLog.__table__, ProjectProcessingStats.__table__])
         print("[DB RESET] All tables dropped successfully.")
 
     # Create tables and PKs if missing (safe for production)
-    Base.metadata.create_all(engine, tables=[DocumentChunk.__table__, Document.__table__, Project.__table__, ProcessingLog.__table__,SearchFeedback.__table__])
+    Base.metadata.create_all(engine, tables=[DocumentChunk.__table__, Document.__table__, Project.__table__, ProcessingLog.__table__, ProjectProcessingStats.__table__, SearchFeedback.__table__])
 
     # Add metadata, GIN, and regular indexes for metadata, tags, keywords, headings, project_id, etc.
     with engine.connect() as conn:
@@ -161,6 +348,8 @@ def init_vec_db(skip_hnsw=False):
         ensure_primary_key(conn, 'search_feedback', 'id')
 
         ensure_search_feedback_columns(conn)
+        ensure_processing_stats_maintenance(conn)
+        ensure_catalogue_generation(conn)
         
         create_index(conn,
             """CREATE INDEX IF NOT EXISTS idx_documents_metadata_type_id 
@@ -237,7 +426,17 @@ def init_vec_db(skip_hnsw=False):
             ON search_feedback (session_id);""",
             "idx_search_feedback_session",
         )
-        # ProcessingLog: no custom indexes needed
+        # ProcessingLog: lookups by (project_id, document_id) on every write, per-project listing by date
+        create_index(conn,
+            """CREATE INDEX IF NOT EXISTS idx_processing_logs_project_document
+            ON processing_logs (project_id, document_id);""",
+            "idx_processing_logs_project_document"
+        )
+        create_index(conn,
+            """CREATE INDEX IF NOT EXISTS idx_processing_logs_project_processed_at
+            ON processing_logs (project_id, processed_at DESC);""",
+            "idx_processing_logs_project_processed_at"
+        )
         conn.commit()
         print("All metadata and regular indexes initialized")
 
@@ -6,6 +6,7 @@ Defines all ORM models for:
 - Document: stores document-level tags, keywords, headings, and semantic embedding
 - Project: stores project metadata
 - ProcessingLog: stores structured processing metrics and status
+- ProjectProcessingStats: per-project processing counters kept in step with processing_logs
 
 All models use SQLAlchemy ORM and are compatible with pgvector and HNSW indexes.
 
@@ -82,6 +83,21 @@ class ProcessingLog(Base):
     processed_at = Column(DateTime(timezone=True), default=datetime.datetime.utcnow)
     metrics = Column(JSONB, nullable=True)  # Stores per-method timing metrics as JSONB
 
+class ProjectProcessingStats(Base):
+    """
+    ORM model for the project_processing_stats table.
+    Holds per-project processing counters so stats can be read without scanning processing_logs.
+    Rows are maintained by a trigger on processing_logs (see vector_db_utils), never written directly.
+    """
+    __tablename__ = 'project_processing_stats'
+    project_id = Column(String, primary_key=True)
+    total_files = Column(Integer, nullable=False, default=0)
+    successful_files = Column(Integer, nullable=False, default=0)
+    failed_files = Column(Integer, nullable=False, default=0)
+    skipped_files = Column(Integer, nullable=False, default=0)
+    last_processed_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), default=datetime.datetime.utcnow)
+
 class SearchFeedback(Base):
     __tablename__ = "search_feedback"
 
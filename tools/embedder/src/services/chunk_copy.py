@@ -0,0 +1,115 @@
+"""
+Bulk loader for document chunks using PostgreSQL binary COPY.
+
+The ORM path builds one DocumentChunk object per chunk and converts every
+embedding to a Python list of floats before SQLAlchemy and psycopg adapt it
+again. This module streams the chunks of a document into the database as one
+binary COPY instead:
+
+- Rows are encoded directly in PostgreSQL's binary COPY format. Embeddings use
+  pgvector's binary encoding (int16 dimensions, int16 unused, big-endian float4
+  values) straight from the numpy array, metadata is sent as binary jsonb.
+- The rows are copied into a temporary staging table. The document's existing
+  chunks are then replaced by the staged rows in the same transaction, so a
+  document never has a partial or duplicated set of chunks: a failed attempt
+  leaves the table untouched and can simply be retried.
+"""
+
+import datetime
+import struct
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import orjson
+
+COPY_COLUMNS = ("embedding", "metadata", "content", "document_id", "project_id", "created_at")
+
+STAGING_TABLE = "document_chunks_staging"
+
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_COPY_TRAILER = struct.pack(">h", -1)
+_FIELD_COUNT = struct.pack(">h", len(COPY_COLUMNS))
+_NULL = struct.pack(">i", -1)
+_JSONB_VERSION = b"\x01"
+_POSTGRES_EPOCH = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def encode_vector(embedding: Any) -> bytes:
+    """Encode an embedding in pgvector's binary format."""
+    values = np.asarray(embedding, dtype=">f4")
+    return struct.pack(">HH", values.shape[0], 0) + values.tobytes()
+
+
+def encode_jsonb(value: Any) -> bytes:
+    """Encode a value as binary jsonb (version byte followed by the JSON text)."""
+    return _JSONB_VERSION + orjson.dumps(value, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+def encode_timestamptz(value: datetime.datetime) -> bytes:
+    """Encode a timezone-aware datetime as microseconds since the PostgreSQL epoch."""
+    delta = value - _POSTGRES_EPOCH
+    return struct.pack(">q", (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds)
+
+
+def _field(data: Optional[bytes]) -> bytes:
+    if data is None:
+        return _NULL
+    return struct.pack(">i", len(data)) + data
+
+
+def encode_row(embedding: Any, metadata: Optional[Dict[str, Any]], content: Optional[str],
+               document_id: str, project_id: Optional[str], created_at: datetime.datetime) -> bytes:
+    """Encode one document_chunks row as a binary COPY tuple."""
+    return b"".join((
+        _FIELD_COUNT,
+        _field(encode_vector(embedding) if embedding is not None else None),
+        _field(encode_jsonb(metadata) if metadata is not None else None),
+        _field(content.encode("utf-8") if content is not None else None),
+        _field(document_id.encode("utf-8")),
+        _field(project_id.encode("utf-8") if project_id is not None else None),
+        _field(encode_timestamptz(created_at)),
+    ))
+
+
+def copy_chunks(session, chunks: Iterable[Dict[str, Any]], doc_id: str, project_id: Optional[str]) -> int:
+    """
+    Replace the chunks of a document with the given chunks using binary COPY.
+
+    Each chunk is a dict with ``embedding`` (numpy array or list), ``metadata`` and
+    ``content`` already sanitized for PostgreSQL. The work runs in the session's
+    transaction and is committed at the end; on error the transaction is rolled
+    back by the caller and nothing has changed.
+
+    Args:
+        session: SQLAlchemy session bound to a psycopg (v3) engine
+        chunks: The chunks to load
+        doc_id: Document ID of the chunks
+        project_id: Project ID of the chunks
+
+    Returns:
+        int: Number of rows loaded
+    """
+    columns = ", ".join(COPY_COLUMNS)
+    created_at = datetime.datetime.now(datetime.timezone.utc)
+    connection = session.connection().connection.driver_connection
+
+    rows = 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} ON COMMIT DROP AS "
+            f"SELECT {columns} FROM document_chunks WITH NO DATA"
+        )
+        with cursor.copy(f"COPY {STAGING_TABLE} ({columns}) FROM STDIN (FORMAT BINARY)") as copy:
+            copy.write(_COPY_HEADER)
+            for chunk in chunks:
+                copy.write(encode_row(chunk["embedding"], chunk["metadata"], chunk["content"],
+                                      doc_id, project_id, created_at))
+                rows += 1
+            copy.write(_COPY_TRAILER)
+
+        # Swap: the document's previous chunks (e.g. from an earlier attempt) are
+        # replaced by the staged rows atomically
+        cursor.execute("DELETE FROM document_chunks WHERE document_id = %s", (doc_id,))
+        cursor.execute(f"INSERT INTO document_chunks ({columns}) SELECT {columns} FROM {STAGING_TABLE}")
+    session.commit()
+    return rows
@@ -3,7 +3,8 @@ Embedding service module for generating vector embeddings from text.
 
 This module provides functionality to convert text into vector embeddings 
 using a pre-trained sentence transformer model. It implements lazy loading
-to initialize the model only when needed.
+to initialize the model only when needed, and batched encoding of many texts
+(e.g. all chunks of a document) sorted by token length.
 """
 
 # Import and run path setup
@@ -13,21 +14,18 @@ setup_paths()
 from src.config.settings import get_settings
 settings = get_settings()
 
-from typing import Union, List
+import time
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
 
 _model = None
 
 
-def get_embedding(texts: Union[str, List[str]]) -> List:
+def _get_model():
     """
-    Generate vector embeddings for one or more text inputs.
+    Return the sentence transformer model, loading it on first use.
     
-    Args:
-        texts (str or list): A single text string or a list of text strings to embed
-        
-    Returns:
-        list: A list of vector embeddings, each corresponding to an input text
-        
     Raises:
         RuntimeError: If model loading fails, with helpful guidance for Windows memory issues
     """
@@ -60,6 +58,23 @@ def get_embedding(texts: Union[str, List[str]]) -> List:
                 
         except Exception as e:
             raise RuntimeError(f"Failed to load embedding model: {e}") from e
+    return _model
+
+
+def get_embedding(texts: Union[str, List[str]]) -> List:
+    """
+    Generate vector embeddings for one or more text inputs.
+    
+    Args:
+        texts (str or list): A single text string or a list of text strings to embed
+        
+    Returns:
+        list: A list of vector embeddings, each corresponding to an input text
+        
+    Raises:
+        RuntimeError: If model loading fails, with helpful guidance for Windows memory issues
+    """
+    model = _get_model()
     
     # Convert single string to list if needed
     if isinstance(texts, str):
@@ -67,7 +82,85 @@ def get_embedding(texts: Union[str, List[str]]) -> List:
     
     # Generate embeddings
     try:
-        embeddings = _model.encode(texts, convert_to_tensor=False, show_progress_bar=False)
+        embeddings = model.encode(texts, convert_to_tensor=False, show_progress_bar=False)
         return embeddings
     except Exception as e:
-        raise RuntimeError(f"Failed to generate embeddings: {e}") from e
\ No newline at end of file
+        raise RuntimeError(f"Failed to generate embeddings: {e}") from e
+
+
+def _token_lengths(model, texts: List[str]) -> List[int]:
+    """Token count of each text as the model will see it (truncated to its maximum sequence length)."""
+    try:
+        max_length = model.max_seq_length
+        encoded = model.tokenizer(texts, truncation=True, max_length=max_length)
+        return [len(ids) for ids in encoded["input_ids"]]
+    except Exception:
+        # Character length still orders texts well enough for batching
+        return [len(text) for text in texts]
+
+
+def embed_in_batches(texts: List[str], batch_size: int = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    Embed many texts in fixed-size batches of similar token length.
+    
+    The texts are sorted by token length, so each batch pads to a similar length,
+    encoded in batches of ``batch_size`` and returned in their original order.
+    
+    Args:
+        texts (list): Texts to embed, e.g. all chunks of a document
+        batch_size (int, optional): Texts per batch (default: EMBEDDING_BATCH_SIZE)
+        
+    Returns:
+        tuple: (embeddings in input order, metrics) where metrics has the batch
+        size, totals and per-batch size, tokens, padding ratio, time and throughput
+        
+    Raises:
+        RuntimeError: If model loading or encoding fails
+    """
+    batch_size = batch_size or settings.embedding_model_settings.batch_size
+    metrics = {"chunks": len(texts), "batch_size": batch_size, "batches": []}
+    if not texts:
+        metrics.update({"time_total": 0.0, "chunks_per_sec": None, "tokens_per_sec": None})
+        return np.empty((0, 0), dtype=np.float32), metrics
+    
+    model = _get_model()
+    lengths = _token_lengths(model, texts)
+    order = sorted(range(len(texts)), key=lambda i: lengths[i], reverse=True)
+    
+    embeddings = None
+    total_time = 0.0
+    total_tokens = 0
+    for start in range(0, len(order), batch_size):
+        batch = order[start:start + batch_size]
+        batch_texts = [texts[i] for i in batch]
+        tokens = sum(lengths[i] for i in batch)
+        padded = max(lengths[i] for i in batch) * len(batch)
+        
+        t_batch = time.perf_counter()
+        try:
+            batch_embeddings = model.encode(batch_texts, batch_size=len(batch), convert_to_numpy=True,
+                                            show_progress_bar=False)
+        except Exception as e:
+            raise RuntimeError(f"Failed to generate embeddings: {e}") from e
+        elapsed = time.perf_counter() - t_batch
+        
+        # Scatter the batch back to the input positions
+        if embeddings is None:
+            embeddings = np.empty((len(texts), batch_embeddings.shape[1]), dtype=batch_embeddings.dtype)
+        embeddings[batch] = batch_embeddings
+        
+        total_time += elapsed
+        total_tokens += tokens
+        metrics["batches"].append({
+            "size": len(batch),
+            "tokens": tokens,
+            "padding_ratio": round(1 - tokens / padded, 3) if padded else 0.0,
+            "time": round(elapsed, 4),
+            "chunks_per_sec": round(len(batch) / elapsed, 1) if elapsed > 0 else None,
+            "tokens_per_sec": round(tokens / elapsed, 1) if elapsed > 0 else None,
+        })
+    
+    metrics["time_total"] = total_time
+    metrics["chunks_per_sec"] = round(len(texts) / total_time, 1) if total_time > 0 else None
+    metrics["tokens_per_sec"] = round(total_tokens / total_time, 1) if total_time > 0 else None
+    return embeddings, metrics
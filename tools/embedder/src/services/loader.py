@@ -9,7 +9,8 @@ This module orchestrates the full document processing pipeline:
 - Stores all data using SQLAlchemy ORM and pgvector
 - Collects and stores structured processing metrics
 
-All database operations use SQLAlchemy ORM. Vector columns use pgvector and HNSW indexes for fast semantic search.
+Database operations use SQLAlchemy ORM, except chunk loading which uses binary COPY by
+default (see chunk_copy). Vector columns use pgvector and HNSW indexes for fast semantic search.
 """
 
 import os
@@ -27,7 +28,7 @@ from src.models.pgvector.vector_models import DocumentChunk, Document, Processin
 from .s3_reader import read_file_from_s3
 from .markdown_splitter import chunk_markdown_text
 from .tags.tag_extractor import extract_tags_from_chunks
-from .embedding import get_embedding
+from .embedding import get_embedding, embed_in_batches
 from .file_validation import validate_file
 from .markdown_reader import read_as_pages
 from .word_reader import read_word_as_pages
@@ -180,6 +181,10 @@ def chunk_and_embed_pages(
     Also aggregates all unique tags, keywords, and headings for the document.
     Optionally collects per-chunk metrics if a metrics dict is provided.
 
+    Chunks are collected across all pages and embedded once per document, sorted
+    by token length and encoded in batches of EMBEDDING_BATCH_SIZE, so batches are
+    full and padded to similar lengths instead of one small batch per page.
+
     Args:
         pages: List of page dicts with 'text' key.
         base_metadata: Metadata to attach to each chunk.
@@ -195,6 +200,8 @@ def chunk_and_embed_pages(
     """
     headers = [f"Header {i}" for i in range(1, 7)]
     chunks_to_upsert = []
+    document_texts = []
+    document_metadatas = []
     all_tags = set()
     all_keywords = set()
     all_headings = set()
@@ -205,7 +212,6 @@ def chunk_and_embed_pages(
         chunk_metrics["chunks_per_page"] = []
         chunk_metrics["_get_tags_times"] = []
         chunk_metrics["_get_keywords_times"] = []
-        chunk_metrics["_embedding_times"] = []
     for page_index, page_markdown in enumerate(pages):
         if not page_markdown.get("text", "").strip():
             if chunk_metrics is not None:
@@ -351,25 +357,29 @@ def chunk_and_embed_pages(
             for i, chunk_dict in enumerate(chunk_dicts):
                 # keywords already set in chunk_metadatas[i]["keywords"] by extract_keywords_from_chunks
                 pass
-        if chunk_metrics is not None:
-            t_emb = time.perf_counter() if chunk_metrics is not None else None
-            embeddings = get_embedding(chunk_texts)
-            if chunk_metrics is not None:
-                chunk_metrics["_embedding_times"].append(time.perf_counter() - t_emb)
-            for i, text in enumerate(chunk_texts):
-                record_id = str(uuid.uuid1())
-                record = {
-                    "id": record_id,
-                    "metadata": chunk_metadatas[i],
-                    "content": text,
-                    "embedding": embeddings[i],
-                }
-                chunks_to_upsert.append(record)
+        # Embedding is done once for the whole document below
+        document_texts.extend(chunk_texts)
+        document_metadatas.extend(chunk_metadatas)
+
+    embeddings, embedding_metrics = embed_in_batches(document_texts)
+    for i, text in enumerate(document_texts):
+        record_id = str(uuid.uuid1())
+        record = {
+            "id": record_id,
+            "metadata": document_metadatas[i],
+            "content": text,
+            "embedding": embeddings[i],
+        }
+        chunks_to_upsert.append(record)
     # At the end, sum the times and store as total values
     if chunk_metrics is not None:
         chunk_metrics["get_tags_time_total"] = sum(chunk_metrics.pop("_get_tags_times", []))
         chunk_metrics["get_keywords_time_total"] = sum(chunk_metrics.pop("_get_keywords_times", []))
-        chunk_metrics["embedding_time_total"] = sum(chunk_metrics.pop("_embedding_times", []))
+        chunk_metrics["embedding_time_total"] = embedding_metrics["time_total"]
+        chunk_metrics["embedding_batch_size"] = embedding_metrics["batch_size"]
+        chunk_metrics["embedding_chunks_per_sec"] = embedding_metrics["chunks_per_sec"]
+        chunk_metrics["embedding_tokens_per_sec"] = embedding_metrics["tokens_per_sec"]
+        chunk_metrics["embedding_batches"] = embedding_metrics["batches"]
         # Calculate average chunks per page and store as avg_chunks_per_page
         chunks_per_page = chunk_metrics.pop("chunks_per_page", [])
         if chunks_per_page:
@@ -525,42 +535,100 @@ def _download_and_validate_pdf(s3_key: str, temp_dir: str = None, metrics: dict
         print(f"[ERROR] Failed to download/process {s3_key}: {e}")
         return None, doc_info
 
+def _is_connection_error(error) -> bool:
+    """Whether a database error is a dropped connection worth retrying."""
+    return "SSL SYSCALL error" in str(error) or "EOF detected" in str(error)
+
 def _process_and_insert_chunks(session, chunks_to_upsert, doc_id, project_id):
     """
-    Insert chunk records into the chunk table using SQLAlchemy ORM.
-    Uses batched inserts to prevent connection timeouts with large documents.
+    Insert chunk records into the chunk table.
+
+    With CHUNK_INSERT_MODE=copy (default) the document's chunks are streamed with
+    binary COPY into a staging table and swapped in atomically (see chunk_copy);
+    a retry after a dropped connection starts over without leaving partial chunks.
+    With CHUNK_INSERT_MODE=orm, DocumentChunk objects are inserted in batches.
     Expects project_id column to exist in the table. If not, fix your DB migration/init logic.
+
+    Returns:
+        dict: Insert metrics (mode, rows, seconds, rows_per_sec)
     """
-    import time
-    from sqlalchemy.exc import OperationalError
     from src.config.settings import get_settings
     
     settings = get_settings()
+    mode = settings.multi_processing_settings.chunk_insert_mode
     
-    chunk_objs = []
+    chunks = []
     for record in chunks_to_upsert:
         record["document_id"] = doc_id
         record["project_id"] = project_id
-        embedding = record["embedding"]
+        # Sanitize content and metadata to remove null bytes that PostgreSQL cannot handle
+        chunks.append({
+            "embedding": record["embedding"],
+            "metadata": sanitize_metadata_for_postgres(record["metadata"]),
+            "content": sanitize_text_for_postgres(record["content"]),
+        })
+    
+    start = time.perf_counter()
+    if mode == "copy":
+        rows = _copy_chunks(session, chunks, doc_id, project_id)
+    else:
+        rows = _insert_chunk_objects(session, chunks, doc_id, project_id, settings.multi_processing_settings.chunk_insert_batch_size)
+    elapsed = time.perf_counter() - start
+    
+    print(f"[DB] [{doc_id}] Inserted {rows} chunks in {elapsed:.2f}s ({mode})")
+    return {
+        "mode": mode,
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(rows / elapsed, 1) if elapsed > 0 else None,
+    }
+
+def _copy_chunks(session, chunks, doc_id, project_id, max_retries=3):
+    """
+    Load a document's chunks with binary COPY, retrying the whole load on connection errors.
+    """
+    from sqlalchemy.exc import OperationalError
+    from psycopg import OperationalError as PsycopgOperationalError
+    from .chunk_copy import copy_chunks
+    
+    for attempt in range(max_retries):
+        try:
+            return copy_chunks(session, chunks, doc_id, project_id)
+        except (OperationalError, PsycopgOperationalError) as e:
+            if not _is_connection_error(e):
+                raise
+            print(f"[DB] [{doc_id}] Connection error during chunk COPY, attempt {attempt + 1}/{max_retries}: {e}")
+            # Nothing was committed, so the load can start over on a fresh connection
+            session.invalidate()
+            if attempt == max_retries - 1:
+                print(f"[DB] [{doc_id}] Failed to load chunks after {max_retries} attempts")
+                raise
+            time.sleep(2 ** attempt)  # Exponential backoff
+
+def _insert_chunk_objects(session, chunks, doc_id, project_id, batch_size):
+    """
+    Insert chunks as SQLAlchemy ORM objects.
+    Uses batched inserts to prevent connection timeouts with large documents.
+    """
+    from sqlalchemy.exc import OperationalError
+    
+    chunk_objs = []
+    for chunk in chunks:
+        embedding = chunk["embedding"]
         # Convert numpy ndarray to list for DB insert (not JSON string)
         if isinstance(embedding, np.ndarray):
             embedding = embedding.tolist()
         
-        # Sanitize content and metadata to remove null bytes that PostgreSQL cannot handle
-        content = sanitize_text_for_postgres(record["content"])
-        metadata = sanitize_metadata_for_postgres(record["metadata"])
-        
         chunk_obj = DocumentChunk(
             embedding=embedding,  # assign as list, not JSON string
-            chunk_metadata=metadata,
-            content=content,
+            chunk_metadata=chunk["metadata"],
+            content=chunk["content"],
             document_id=doc_id,
             project_id=project_id
         )
         chunk_objs.append(chunk_obj)
     
     # Insert in batches to prevent connection timeouts
-    batch_size = settings.multi_processing_settings.chunk_insert_batch_size
     total_chunks = len(chunk_objs)
     print(f"[DB] [{doc_id}] Inserting {total_chunks} chunks in batches of {batch_size}...")
     
@@ -578,7 +646,7 @@ def _process_and_insert_chunks(session, chunks_to_upsert, doc_id, project_id):
                 print(f"[DB] [{doc_id}] Inserted batch {batch_num}/{total_batches} ({len(batch)} chunks)")
                 break
             except OperationalError as e:
-                if "SSL SYSCALL error" in str(e) or "EOF detected" in str(e):
+                if _is_connection_error(e):
                     print(f"[DB] [{doc_id}] Connection error on batch {batch_num}, attempt {attempt + 1}/{max_retries}: {e}")
                     if attempt < max_retries - 1:
                         # Rollback and wait before retry
@@ -591,6 +659,7 @@ def _process_and_insert_chunks(session, chunks_to_upsert, doc_id, project_id):
                 else:
                     # Non-connection error, re-raise immediately
                     raise
+    return total_chunks
 
 def _upsert_document_record(session, doc_id, all_tags, all_keywords, all_headings, project_id, semantic_embedding=None, document_metadata=None):
     """
@@ -1063,7 +1132,7 @@ def load_data(
             return None
 
         t3 = time.perf_counter()
-        _process_and_insert_chunks(session, chunks_to_upsert, doc_id, project_id)
+        metrics["chunk_insert"] = _process_and_insert_chunks(session, chunks_to_upsert, doc_id, project_id)
         metrics["process_and_insert_chunks"] = time.perf_counter() - t3
 
         t4 = time.perf_counter()